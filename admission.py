@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Admission Control Modul
+
+Dieses Modul begrenzt die eingehende Last auf den Chatbot. Es kombiniert ein
+Token-Bucket-Ratenlimit pro Client (IP-Adresse oder API-Key) mit einer globalen
+Obergrenze für gleichzeitig bearbeitete Anfragen. Anfragen, die keinen freien
+Platz bekommen, warten in einer begrenzten Prioritäts-Warteschlange; ist diese
+voll, wird die Anfrage sofort abgelehnt.
+"""
+
+import os
+import time
+import heapq
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Standardwerte, überschreibbar über Umgebungsvariablen
+DEFAULT_RATE = 1.0              # Nachgefüllte Tokens pro Sekunde und Client
+DEFAULT_BURST = 10              # Maximale Anzahl Tokens pro Client
+DEFAULT_MAX_CONCURRENT = 8      # Gleichzeitig bearbeitete Anfragen pro Prozess
+DEFAULT_QUEUE_SIZE = 32         # Maximale Anzahl wartender Anfragen
+DEFAULT_QUEUE_TIMEOUT = 10.0    # Maximale Wartezeit in der Warteschlange (Sekunden)
+DEFAULT_MAX_CLIENTS = 10000     # Maximale Anzahl gespeicherter Client-Buckets
+
+
+class AdmissionRejected(Exception):
+    """
+    Wird ausgelöst, wenn eine Anfrage nicht zugelassen wird.
+
+    Attributes:
+        reason (str): Grund der Ablehnung ("rate_limited", "queue_full", "queue_timeout")
+        retry_after (float): Empfohlene Wartezeit in Sekunden bis zum nächsten Versuch
+    """
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Anfrage abgelehnt: {reason} (Retry-After {retry_after:.1f}s)")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Klassischer Token-Bucket: füllt sich mit `rate` Tokens pro Sekunde bis zur
+    Kapazität `capacity` auf. Jede Anfrage verbraucht ein Token.
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic() if now is None else now
+
+    def try_acquire(self, now=None):
+        """
+        Versucht, ein Token zu entnehmen.
+
+        Args:
+            now (float): Optionaler Zeitstempel (time.monotonic), vor allem für Tests
+
+        Returns:
+            tuple: (erfolgreich, sekunden_bis_zum_naechsten_token)
+        """
+        now = time.monotonic() if now is None else now
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True, 0.0
+
+        if self.rate <= 0:
+            # Ohne Nachfüllung gibt es keinen sinnvollen Zeitpunkt, konservativ 60 s melden
+            return False, 60.0
+        return False, (1.0 - self.tokens) / self.rate
+
+
+class _Waiter:
+    """Eintrag in der Warteschlange einer wartenden Anfrage."""
+
+    __slots__ = ("event", "granted", "cancelled")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+        self.cancelled = False
+
+
+class AdmissionController:
+    """
+    Zulassungskontrolle mit Ratenlimit pro Client, globaler Nebenläufigkeitsgrenze
+    und begrenzter Prioritäts-Warteschlange.
+
+    Niedrigere Prioritätswerte werden zuerst bedient, bei gleicher Priorität gilt
+    die Ankunftsreihenfolge.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST,
+                 max_concurrent=DEFAULT_MAX_CONCURRENT, queue_size=DEFAULT_QUEUE_SIZE,
+                 queue_timeout=DEFAULT_QUEUE_TIMEOUT, max_clients=DEFAULT_MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.max_clients = max_clients
+
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+        self._active = 0
+        self._queue = []
+        self._waiting = 0
+        self._sequence = itertools.count()
+
+        # Einfache Zähler für Diagnosezwecke
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "rate_limited": 0,
+            "queue_full": 0,
+            "queue_timeout": 0,
+        }
+
+    def _check_rate(self, client_key, now):
+        """Prüft das Token-Bucket des Clients. Muss unter self._lock aufgerufen werden."""
+        bucket = self._buckets.get(client_key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, now)
+            self._buckets[client_key] = bucket
+            # Älteste Clients verwerfen, damit der Speicher begrenzt bleibt
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_key)
+        return bucket.try_acquire(now)
+
+    def _estimate_queue_wait(self):
+        """Grobe Schätzung der Wartezeit, wenn die Warteschlange voll ist."""
+        return max(1.0, self.queue_timeout / 2)
+
+    def acquire(self, client_key, priority=1):
+        """
+        Lässt eine Anfrage zu oder lehnt sie ab.
+
+        Blockiert höchstens `queue_timeout` Sekunden, falls alle Plätze belegt sind.
+        Nach erfolgreicher Zulassung muss `release()` aufgerufen werden.
+
+        Args:
+            client_key (str): Schlüssel des Clients (z.B. "ip:1.2.3.4" oder "key:abc")
+            priority (int): Priorität der Anfrage (0 = höchste)
+
+        Raises:
+            AdmissionRejected: Wenn die Anfrage nicht zugelassen wird
+        """
+        with self._lock:
+            allowed, retry_after = self._check_rate(client_key, time.monotonic())
+            if not allowed:
+                self.stats["rate_limited"] += 1
+                raise AdmissionRejected("rate_limited", retry_after)
+
+            # Freier Platz und niemand wartet: sofort zulassen
+            if self._active < self.max_concurrent and self._waiting == 0:
+                self._active += 1
+                self.stats["admitted"] += 1
+                return
+
+            if self._waiting >= self.queue_size:
+                self.stats["queue_full"] += 1
+                raise AdmissionRejected("queue_full", self._estimate_queue_wait())
+
+            waiter = _Waiter()
+            heapq.heappush(self._queue, (priority, next(self._sequence), waiter))
+            self._waiting += 1
+            self.stats["queued"] += 1
+
+        waiter.event.wait(self.queue_timeout)
+
+        with self._lock:
+            if waiter.granted:
+                self.stats["admitted"] += 1
+                return
+            # Zeitüberschreitung: Eintrag wird beim nächsten Pop übersprungen
+            waiter.cancelled = True
+            self._waiting -= 1
+            self.stats["queue_timeout"] += 1
+        raise AdmissionRejected("queue_timeout", self._estimate_queue_wait())
+
+    def release(self):
+        """
+        Gibt einen Platz frei und reicht ihn ggf. an die wartende Anfrage mit der
+        höchsten Priorität weiter.
+        """
+        with self._lock:
+            while self._queue:
+                _, _, waiter = heapq.heappop(self._queue)
+                if waiter.cancelled:
+                    continue
+                # Platz direkt übergeben, self._active bleibt unverändert
+                waiter.granted = True
+                self._waiting -= 1
+                waiter.event.set()
+                return
+            self._active = max(0, self._active - 1)
+
+    def snapshot(self):
+        """
+        Liefert den aktuellen Zustand für Diagnosezwecke.
+
+        Returns:
+            dict: Aktive und wartende Anfragen, Anzahl Clients und Zähler
+        """
+        with self._lock:
+            return {
+                "active": self._active,
+                "waiting": self._waiting,
+                "clients": len(self._buckets),
+                "stats": dict(self.stats),
+            }
+
+
+def create_admission_controller():
+    """
+    Erstellt einen AdmissionController mit Werten aus den Umgebungsvariablen.
+
+    Unterstützte Variablen: ADMISSION_RATE, ADMISSION_BURST, ADMISSION_MAX_CONCURRENT,
+    ADMISSION_QUEUE_SIZE, ADMISSION_QUEUE_TIMEOUT, ADMISSION_MAX_CLIENTS.
+
+    Returns:
+        AdmissionController: Konfigurierter Controller
+    """
+    return AdmissionController(
+        rate=float(os.getenv("ADMISSION_RATE", DEFAULT_RATE)),
+        burst=int(os.getenv("ADMISSION_BURST", DEFAULT_BURST)),
+        max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", DEFAULT_MAX_CONCURRENT)),
+        queue_size=int(os.getenv("ADMISSION_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)),
+        queue_timeout=float(os.getenv("ADMISSION_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT)),
+        max_clients=int(os.getenv("ADMISSION_MAX_CLIENTS", DEFAULT_MAX_CLIENTS)),
+    )
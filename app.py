@@ -1,18 +1,57 @@
 import os
 import json
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
 from flask_cors import CORS  # CORS für Cross-Origin-Anfragen hinzugefügt
 from dotenv import load_dotenv
-import requests
 from datetime import datetime
-from dateutil import parser
 import logging
 import re
+import math
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 # Import the specialized Trendlink API module
-from trendlink_api import get_curated_trends, get_trend_instruments
+from trendlink_api import (get_curated_trends, get_trend_instruments, fetch_curated_trends,
+                           get_trend_instrument_page, get_trend_sync, load_trend_catalogue,
+                           get_instrument_trends, ensure_fresh_catalogue, probe_upstream,
+                           TRENDLINK_NICE_TOP)
+from trend_catalogue import get_catalogue
+from instrument_index import extract_identifiers, ISIN
+from portfolio_exposure import PortfolioError, parse_positions, parse_top, analyze_portfolio, format_exposure_summary
 # Import the OpenAI client module
 from openai_client import get_gpt_response
+# Import the model routing module
+from model_router import route_request, recent_decisions
+# Import the admission control module
+from admission import AdmissionRejected, create_admission_controller
+# Import the opt-in request profiling module
+from profiling import profiled, verify_profile_request
+# Import the traffic capture module for performance regression tests
+from traffic_capture import captured, captured_call, set_intent
+# Import the last-known-good store for Trendlink outages
+from last_known_good import get_store as get_last_known_good, describe_age
+# Import the push channel for curated-trend updates
+from trend_push import CuratedTrendBroadcaster, TooManySubscribers, PUSH_TREND_LIMIT
+# Import end-to-end request deadlines
+from deadline import with_deadline, snapshot as deadline_snapshot
+# Import token usage and latency accounting for OpenAI calls
+from usage_accounting import get_accountant
+# Import the outbound OpenAI limiter (queueing, rate-limit budget, retries)
+from openai_limiter import get_limiter
+# Import the asynchronous job mode for /chat
+from chat_jobs import ChatJobQueue, QueueFull, dedup_key, CHAT_JOB_MAX_WAIT, DONE, FAILED
+# Import memory diagnostics for the admin endpoints
+import memory_diagnostics
+from memory_diagnostics import TracingNotActive, UnknownSnapshot
+from latency import all_snapshots as latency_snapshots
+# Import lightweight tracing spans for the chat pipeline
+import tracing
+# Import the pluggable JSON codec (orjson if installed)
+from json_codec import CodecJSONProvider, loads as json_loads
+# Import the readiness probe and the shared upstream connection pool
+from readiness import ReadinessCheck, READINESS_PROBE_TIMEOUT
+from upstream_http import pool_stats
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +62,8 @@ load_dotenv()
 
 # Initialize Flask app
 app = Flask(__name__)
+# JSON-Antworten und request.get_json() über den schnellsten verfügbaren Codec
+app.json = CodecJSONProvider(app)
 # CORS aktivieren, um Cross-Origin-Anfragen zu erlauben
 CORS(app)
 
@@ -35,6 +76,108 @@ CORS(app)
 TRENDLINK_API_URL = os.getenv("TRENDLINK_API_URL")
 TRENDLINK_API_KEY = os.getenv("TRENDLINK_API_KEY")
 
+# Admission Control: Ratenlimit pro Client und globale Nebenläufigkeitsgrenze
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+# Anzahl vertrauenswürdiger Proxies vor der App (z.B. 1 auf Render)
+ADMISSION_PROXY_HOPS = int(os.getenv("ADMISSION_PROXY_HOPS", "0"))
+# API-Keys, deren Anfragen in der Warteschlange bevorzugt werden
+ADMISSION_PRIORITY_KEYS = {
+    key.strip() for key in os.getenv("ADMISSION_PRIORITY_KEYS", "").split(",") if key.strip()
+}
+# Bekannte API-Keys mit eigenem Ratenlimit; unbekannte Keys zählen zur IP-Adresse
+ADMISSION_API_KEYS = {
+    key.strip() for key in os.getenv("ADMISSION_API_KEYS", "").split(",") if key.strip()
+} | ADMISSION_PRIORITY_KEYS
+admission_controller = create_admission_controller()
+
+# Mehrere Trends in einer Frage: Obergrenze pro Anfrage und gemeinsamer Pool für die Abrufe
+TREND_MAX_PER_QUESTION = int(os.getenv("TREND_MAX_PER_QUESTION", "4"))
+TREND_FETCH_WORKERS = int(os.getenv("TREND_FETCH_WORKERS", "8"))
+_trend_fetch_executor = ThreadPoolExecutor(max_workers=TREND_FETCH_WORKERS,
+                                           thread_name_prefix="trend-fetch")
+
+# Ein Poller pro Prozess verteilt Änderungen der kuratierten Trends an alle SSE-Clients
+curated_trend_broadcaster = CuratedTrendBroadcaster(lambda: fetch_curated_trends(limit=PUSH_TREND_LIMIT))
+
+# Readiness pro Worker: gecachtes Ergebnis, Upstream-Prüfung im Hintergrund
+readiness_check = ReadinessCheck(
+    catalogue=get_catalogue,
+    probe=lambda: probe_upstream(READINESS_PROBE_TIMEOUT),
+    warm=load_trend_catalogue,
+    pools=pool_stats
+)
+
+# Geheimnis für die Admin-Endpunkte (leer = Endpunkte deaktiviert); signiert wie X-Profile-Request
+ADMIN_SECRET = os.getenv("ADMIN_SECRET", "")
+ADMIN_HEADER = "X-Admin-Request"
+
+def _client_identity():
+    """
+    Ermittelt Schlüssel und Priorität des anfragenden Clients.
+    
+    Returns:
+        tuple: (client_key, priority) - API-Key falls konfiguriert, sonst IP-Adresse
+    """
+    # Nur bekannte Keys erhalten einen eigenen Bucket; sonst ließe sich das Limit
+    # mit einem neuen Zufalls-Key pro Anfrage umgehen
+    api_key = request.headers.get("X-API-Key")
+    if api_key and api_key in ADMISSION_API_KEYS:
+        priority = 0 if api_key in ADMISSION_PRIORITY_KEYS else 1
+        return f"key:{api_key}", priority
+    
+    client_ip = request.remote_addr
+    if ADMISSION_PROXY_HOPS > 0 and len(request.access_route) >= ADMISSION_PROXY_HOPS:
+        # Die vom letzten vertrauenswürdigen Proxy eingetragene Adresse verwenden
+        client_ip = request.access_route[-ADMISSION_PROXY_HOPS]
+    return f"ip:{client_ip}", 2
+
+def admission_controlled(view):
+    """
+    Decorator, der einen Endpunkt durch die Admission Control schützt.
+    Abgelehnte Anfragen erhalten sofort einen 429 mit Retry-After-Header.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMISSION_ENABLED:
+            return view(*args, **kwargs)
+        
+        client_key, priority = _client_identity()
+        try:
+            admission_controller.acquire(client_key, priority)
+        except AdmissionRejected as e:
+            logger.warning(f"Anfrage von {client_key} abgelehnt: {e.reason}")
+            response = jsonify({
+                "error": "Zu viele Anfragen. Bitte versuchen Sie es später erneut.",
+                "reason": e.reason
+            })
+            response.status_code = 429
+            response.headers["Retry-After"] = str(max(1, math.ceil(e.retry_after)))
+            return response
+        
+        try:
+            return view(*args, **kwargs)
+        finally:
+            admission_controller.release()
+    
+    return wrapper
+
+def admin_protected(view):
+    """
+    Decorator für Admin-Endpunkte. Erwartet einen mit ADMIN_SECRET signierten
+    X-Admin-Request-Header (Format wie X-Profile-Request, siehe profiling.sign_profile_request).
+    Ohne ADMIN_SECRET antworten die Endpunkte mit 404.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_SECRET:
+            return jsonify({"error": "Not found"}), 404
+        if not verify_profile_request(request.headers.get(ADMIN_HEADER), secret=ADMIN_SECRET):
+            logger.warning(f"Admin-Anfrage ohne gültige Signatur: {request.path}")
+            return jsonify({"error": "Ungültige oder fehlende Admin-Signatur"}), 403
+        return view(*args, **kwargs)
+    
+    return wrapper
+
 # Utility function to fetch data from Trendlink API
 def fetch_trendlink_data(query_params=None):
     """
@@ -46,6 +189,9 @@ def fetch_trendlink_data(query_params=None):
     Returns:
         dict: JSON response from the API
     """
+    # requests wird nur für diesen selten genutzten Pfad benötigt
+    import requests
+    
     headers = {
         "Authorization": f"Bearer {TRENDLINK_API_KEY}",
         "Content-Type": "application/json"
@@ -58,7 +204,7 @@ def fetch_trendlink_data(query_params=None):
             params=query_params
         )
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
     except requests.exceptions.RequestException as e:
         app.logger.error(f"Error fetching data from Trendlink API: {e}")
         return {"error": str(e)}
@@ -110,10 +256,10 @@ def extract_trend_request(message):
     """
     # Muster für Anfragen nach Aktien in einem bestimmten Trend
     patterns = [
-        r'(?:aktien|wertpapiere|etfs?|fonds|investment|investieren|anlage)\s+(?:zu|für|im|zum|über|in|bereich|sektor|thema|themen|trend)\s+([a-zäöüß\s-]+)',
-        r'(?:top|beste|gute|empfehlen\w*|interessante|lohnend\w*|wichtig\w*)\s+(?:\d+\s+)?(?:aktien|wertpapiere|etfs?|fonds|titel|investments?)\s+(?:zu|für|im|zum|über|in|bereich|sektor|thema|themen|trend)\s+([a-zäöüß\s-]+)',
-        r'(?:welche|was\s+sind)\s+(?:die|)\s+(?:top|beste|gute|empfehlen\w*|interessante|lohnend\w*|wichtig\w*)\s+(?:\d+\s+)?(?:aktien|wertpapiere|etfs?|fonds|titel|investments?)\s+(?:zu|für|im|zum|über|in|bereich|sektor|thema|themen|trend)\s+([a-zäöüß\s-]+)',
-        r'(?:nice|top)\s+(?:\d+)?\s+(?:aktien|wertpapiere|etfs?|fonds|titel|investment|investments?)\s+(?:im|zum|zu|für|über|in|bereich|sektor|thema|themen|trend)\s+([a-zäöüß\s-]+)'
+        r'(?:aktien|wertpapiere|etfs?|fonds|investment|investieren|anlage)\s+(?:zu|für|im|zum|über|in|bereich|sektor|thema|themen|trend)\s+([a-zäöüß\s,&/-]+)',
+        r'(?:top|beste|gute|empfehlen\w*|interessante|lohnend\w*|wichtig\w*)\s+(?:\d+\s+)?(?:aktien|wertpapiere|etfs?|fonds|titel|investments?)\s+(?:zu|für|im|zum|über|in|bereich|sektor|thema|themen|trend)\s+([a-zäöüß\s,&/-]+)',
+        r'(?:welche|was\s+sind)\s+(?:die|)\s+(?:top|beste|gute|empfehlen\w*|interessante|lohnend\w*|wichtig\w*)\s+(?:\d+\s+)?(?:aktien|wertpapiere|etfs?|fonds|titel|investments?)\s+(?:zu|für|im|zum|über|in|bereich|sektor|thema|themen|trend)\s+([a-zäöüß\s,&/-]+)',
+        r'(?:nice|top)\s+(?:\d+)?\s+(?:aktien|wertpapiere|etfs?|fonds|titel|investment|investments?)\s+(?:im|zum|zu|für|über|in|bereich|sektor|thema|themen|trend)\s+([a-zäöüß\s,&/-]+)'
     ]
     
     message_lower = message.lower()
@@ -126,6 +272,103 @@ def extract_trend_request(message):
     
     return False, None
 
+# Trennwörter zwischen mehreren Trendnamen ("Elektroautos und Wasserstoff")
+_TREND_SEPARATOR_PATTERN = re.compile(r'\s*(?:,|;|/|&|\bund\b|\bsowie\b|\boder\b)\s*')
+
+def extract_trend_requests(message):
+    """
+    Extrahiert alle Trendnamen einer Trend-Anfrage, z.B. "Aktien zu Elektroautos und Wasserstoff".
+    
+    Args:
+        message (str): Die Nachricht des Nutzers
+        
+    Returns:
+        tuple: (ist_trend_aktien_anfrage, [trendnamen]) oder (False, []) wenn keine solche Anfrage
+    """
+    is_trend_stock_query, trend_name = extract_trend_request(message)
+    if not is_trend_stock_query:
+        return False, []
+    
+    trend_names = []
+    for name in _TREND_SEPARATOR_PATTERN.split(trend_name):
+        name = name.strip(" -")
+        if name and name not in trend_names:
+            trend_names.append(name)
+    
+    if len(trend_names) > TREND_MAX_PER_QUESTION:
+        logger.info(f"{len(trend_names)} Trends angefragt, verwende die ersten {TREND_MAX_PER_QUESTION}")
+        trend_names = trend_names[:TREND_MAX_PER_QUESTION]
+    return bool(trend_names), trend_names
+
+def extract_instrument_requests(message):
+    """
+    Extrahiert ISINs und WKNs aus der Nutzereingabe, z.B. "In welchen Trends ist DE0007164600 enthalten?".
+    
+    Args:
+        message (str): Die Nachricht des Nutzers
+        
+    Returns:
+        list: Kennungen ("DE0007164600" bzw. "WKN 716460"), höchstens TREND_MAX_PER_QUESTION
+    """
+    identifiers = [value if kind == ISIN else f"WKN {value}" for kind, value in extract_identifiers(message)]
+    if len(identifiers) > TREND_MAX_PER_QUESTION:
+        logger.info(f"{len(identifiers)} Instrumente angefragt, verwende die ersten {TREND_MAX_PER_QUESTION}")
+        identifiers = identifiers[:TREND_MAX_PER_QUESTION]
+    return identifiers
+
+def _fetch_trendlink(kind, key, func, *args, **kwargs):
+    """
+    Ruft einen Trendlink-Datensatz ab und greift bei Ausfällen auf den letzten bekannten Stand zurück.
+    
+    Returns:
+        tuple: (daten, alter_in_sekunden oder None bei frischen Daten)
+    """
+    with tracing.span(kind, **{"trendlink.key": key}) as span:
+        data, age = get_last_known_good().fetch(kind, key, captured_call, kind, key, func, *args, **kwargs)
+        if age is not None:
+            span.set_attribute("cache.fallback", "last_known_good")
+            span.set_attribute("data_age_seconds", round(age, 1))
+        return data, age
+
+def _stale_data_note(age):
+    """Hinweis für den System-Prompt, wenn gespeicherte statt aktueller Daten verwendet werden."""
+    return (f"\n\nHinweis: Die Trendlink-Datenbank ist gerade nicht erreichbar. Die folgenden Daten "
+            f"stammen aus dem letzten erfolgreichen Abruf vor {describe_age(age)}. Weise den Nutzer "
+            f"kurz darauf hin, dass die Daten nicht ganz aktuell sein könnten.")
+
+def _fetch_trend_instruments(trend_name):
+    """Ruft die Instrument-Daten eines Trends ab; Fehler werden als Ergebnis zurückgegeben."""
+    try:
+        data, age = _fetch_trendlink("trendlink.trend_instruments", trend_name,
+                                     get_trend_instruments, trend_name)
+        return trend_name, data, age, None
+    except Exception as e:
+        logger.error(f"Error fetching trend instruments for '{trend_name}': {e}")
+        return trend_name, None, None, e
+
+def fetch_trend_instruments_concurrently(trend_names):
+    """
+    Ruft die Instrument-Daten mehrerer Trends parallel über einen begrenzten Pool ab.
+    
+    Die Gesamtdauer entspricht damit etwa dem langsamsten Einzelabruf. Jeder Abruf läuft
+    im Kontext der aufrufenden Anfrage, damit die Traffic-Aufzeichnung ihn erfasst.
+    
+    Args:
+        trend_names (list): Namen der Trends
+        
+    Returns:
+        list: Tupel (trendname, daten oder None, datenalter oder None, fehler oder None)
+            in der Reihenfolge der Namen
+    """
+    if len(trend_names) <= 1:
+        return [_fetch_trend_instruments(name) for name in trend_names]
+    
+    futures = [
+        _trend_fetch_executor.submit(contextvars.copy_context().run, _fetch_trend_instruments, name)
+        for name in trend_names
+    ]
+    return [future.result() for future in futures]
+
 # Helfer-Funktion zur Überprüfung, ob eine Anfrage themenrelevant ist
 def is_finance_trend_related(message):
     """
@@ -164,108 +407,394 @@ def index():
     """
     return render_template("index.html")
 
-# Chat endpoint
-@app.route("/chat", methods=["POST"])
-def chat():
+def _classify_message(user_message):
     """
-    Chat endpoint that processes user messages and responds using OpenAI's GPT-4,
-    incorporating data from Trendlink when relevant.
+    Ordnet eine Nachricht ein: themenrelevant, Trend-Aktien-Anfrage mit Trendnamen,
+    Frage zu einzelnen Instrumenten (ISIN/WKN) oder allgemeine Trend-Anfrage.
     
-    This bot ONLY answers finance and trend-related questions, using Trendlink data
-    as the primary source for all trend information. Non-relevant questions will be
-    politely declined.
+    Returns:
+        tuple: (themenrelevant, ist_trend_aktien_anfrage, [trendnamen], ist_allgemeine_trend_anfrage,
+            [instrument_kennungen])
     """
-    try:
-        data = request.json
-        
-        if not data or "message" not in data:
-            return jsonify({"error": "No message provided"}), 400
-            
-        user_message = data["message"]
+    with tracing.span("chat.classify") as span:
+        # ISINs und WKNs machen eine Nachricht auch ohne Finanzbegriffe themenrelevant
+        instrument_ids = extract_instrument_requests(user_message)
         
         # Prüfen, ob die Anfrage themenrelevant ist (Finanzen/Trends)
-        if not is_finance_trend_related(user_message):
-            # Nicht-themenrelevante Anfrage höflich ablehnen
-            return jsonify({
-                "response": "Ich bin spezialisiert auf Finanz- und Trend-Themen und kann Ihnen leider keine Informationen zu anderen Bereichen geben. Bitte stellen Sie mir Fragen zu Trends, Aktien, Märkten oder Finanzthemen.",
-                "has_trend_data": False,
-                "query_type": "off_topic"
-            })
+        if not instrument_ids and not is_finance_trend_related(user_message):
+            span.set_attribute("query.type", "off_topic")
+            return False, False, [], False, []
         
         # Prüfen, ob es eine Anfrage nach Aktien in einem spezifischen Trend ist
-        is_trend_stock_query, trend_name = extract_trend_request(user_message)
+        is_trend_stock_query, trend_names = extract_trend_requests(user_message)
         
         # Standard Trend-Keywords für allgemeine Trend-Anfragen
         trend_keywords = ["trend", "trends", "trending", "aktuell", "neu", "neueste", "markt", 
                          "finanzen", "wirtschaft", "entwicklung", "zukunft", "investition"]
         
-        # Prüfen, ob es eine allgemeine trend-bezogene Anfrage ist
-        is_general_trend_query = any(keyword in user_message.lower() for keyword in trend_keywords) and not is_trend_stock_query
+        # Prüfen, ob es eine allgemeine trend-bezogene Anfrage ist; Fragen nach den Trends
+        # eines Instruments werden über den ISIN-Index beantwortet
+        is_general_trend_query = (any(keyword in user_message.lower() for keyword in trend_keywords)
+                                  and not is_trend_stock_query and not instrument_ids)
+        span.set_attribute("query.is_trend_stock_query", is_trend_stock_query)
+        span.set_attribute("query.is_general_trend_query", is_general_trend_query)
+        span.set_attribute("query.trend_count", len(trend_names))
+        span.set_attribute("query.instrument_count", len(instrument_ids))
+        return True, is_trend_stock_query, trend_names, is_general_trend_query, instrument_ids
+
+# Strengen System-Prompt definieren, der das Modell auf Trendlink-Daten beschränkt
+BASE_SYSTEM_PROMPT = (
+    "Du bist ein spezialisierter Finanztrend-Bot, der AUSSCHLIESSLICH auf Basis der Trendlink-Datenbank "
+    "antwortet. VERWENDE NIEMALS dein allgemeines Wissen bei Trend-bezogenen Fragen, sondern NUR die "
+    "bereitgestellten Daten. Bei Fragen zu bestimmten Trends oder Aktien antworte NUR mit den Informationen, "
+    "die direkt aus den Trendlink-Daten stammen. Wenn keine relevanten Daten vorhanden sind, teile dies dem "
+    "Nutzer mit, anstatt allgemeine Informationen zu geben. "
+    "Deine Antworten sollten präzise, faktenbasiert und effizient sein. "
+    "Beantworte ausschließlich Fragen zu Finanzen, Märkten und Trends."
+)
+
+def _build_system_prompt(is_trend_stock_query, trend_names, is_general_trend_query, instrument_ids=()):
+    """
+    Baut den System-Prompt und reichert ihn mit den passenden Trendlink-Daten an.
+    
+    Returns:
+        tuple: (system_prompt, trendlink_context, trendlink_data_type, data_ages)
+    """
+    system_prompt = BASE_SYSTEM_PROMPT
+    
+    trendlink_context = ""
+    trendlink_data_type = None
+    # Alter ausgelieferter Daten aus dem Last-Known-Good-Speicher
+    data_ages = []
+    
+    # Bei Fragen zu einzelnen Instrumenten die enthaltenden Trends aus dem ISIN-Index nachschlagen
+    instrument_contexts = []
+    for identifier in instrument_ids:
+        logger.info(f"Instrument query detected for {identifier}")
+        try:
+            instrument_trends, data_age = _fetch_trendlink("trendlink.instrument_trends", identifier,
+                                                           get_instrument_trends, identifier)
+        except Exception as e:
+            logger.error(f"Error fetching trends for instrument '{identifier}': {e}")
+            system_prompt += f"\n\nIch habe versucht, die Trends zum Instrument '{identifier}' abzurufen, aber leider sind keine Daten verfügbar. Bitte teile dem Nutzer mit, dass derzeit keine Informationen aus der Trendlink-Datenbank zu diesem Instrument verfügbar sind."
+            continue
         
-        # Strengen System-Prompt definieren, der das Modell auf Trendlink-Daten beschränkt
-        system_prompt = (
-            "Du bist ein spezialisierter Finanztrend-Bot, der AUSSCHLIESSLICH auf Basis der Trendlink-Datenbank "
-            "antwortet. VERWENDE NIEMALS dein allgemeines Wissen bei Trend-bezogenen Fragen, sondern NUR die "
-            "bereitgestellten Daten. Bei Fragen zu bestimmten Trends oder Aktien antworte NUR mit den Informationen, "
-            "die direkt aus den Trendlink-Daten stammen. Wenn keine relevanten Daten vorhanden sind, teile dies dem "
-            "Nutzer mit, anstatt allgemeine Informationen zu geben. "
-            "Deine Antworten sollten präzise, faktenbasiert und effizient sein. "
-            "Beantworte ausschließlich Fragen zu Finanzen, Märkten und Trends."
-        )
+        if data_age is not None:
+            data_ages.append(data_age)
+            system_prompt += _stale_data_note(data_age)
         
-        trendlink_context = ""
-        trendlink_data_type = None
+        system_prompt += f"\n\nHier sind die Trends, in denen das Instrument '{identifier}' enthalten ist:\n\n{instrument_trends}"
+        instrument_contexts.append(instrument_trends)
+    
+    if instrument_contexts:
+        system_prompt += "\n\nBasiere deine Antwort AUSSCHLIESSLICH auf diesen Daten. Ergänze KEINE zusätzlichen Informationen aus deinem eigenen Wissen."
+        trendlink_context = "\n\n".join(instrument_contexts)
+        trendlink_data_type = "instrument_trends"
+    
+    # Bei Anfragen für Aktien zu einem oder mehreren spezifischen Trends
+    if is_trend_stock_query and trend_names:
+        logger.info(f"Trend stock query detected for trends: {', '.join(trend_names)}")
         
-        # Bei Anfragen für Aktien zu einem spezifischen Trend
-        if is_trend_stock_query and trend_name:
-            try:
-                logger.info(f"Trend stock query detected for trend: {trend_name}")
-                
-                # Abrufen der Instrument-Daten für den Trend
-                trend_instruments = get_trend_instruments(trend_name)
-                trendlink_context = trend_instruments
-                trendlink_data_type = "trend_instruments"
-                
-                # Erweitere den System-Prompt mit den Trend-Aktien-Daten
-                system_prompt += f"\n\nHier sind die Top-Aktien im Trend '{trend_name}':\n\n{trend_instruments}"
-                system_prompt += "\n\nBasiere deine Antwort AUSSCHLIESSLICH auf diesen Daten. Ergänze KEINE zusätzlichen Informationen aus deinem eigenen Wissen."
-                logger.info(f"Successfully incorporated trend instruments data for '{trend_name}'")
-            except Exception as e:
-                logger.error(f"Error fetching trend instruments: {e}")
+        # Abrufen der Instrument-Daten für alle Trends (parallel)
+        trend_contexts = []
+        for trend_name, trend_instruments, data_age, error in fetch_trend_instruments_concurrently(trend_names):
+            if error is not None:
                 system_prompt += f"\n\nIch habe versucht, Informationen zum Trend '{trend_name}' abzurufen, aber leider sind keine Daten verfügbar. Bitte teile dem Nutzer mit, dass keine Informationen in der Trendlink-Datenbank für diesen Trend gefunden wurden."
+                continue
+            
+            if data_age is not None:
+                data_ages.append(data_age)
+                system_prompt += _stale_data_note(data_age)
+            
+            # Erweitere den System-Prompt mit den Trend-Aktien-Daten
+            system_prompt += f"\n\nHier sind die Top-Aktien im Trend '{trend_name}':\n\n{trend_instruments}"
+            trend_contexts.append(trend_instruments)
+            logger.info(f"Successfully incorporated trend instruments data for '{trend_name}'")
         
-        # Bei allgemeinen Trend-Anfragen die kuratierten Trends abrufen
-        elif is_general_trend_query:
-            try:
-                logger.info("General trend query detected - fetching curated trends")
-                trend_data = get_curated_trends(limit=5)
-                
-                # Trend-Daten in den System-Prompt einbauen
-                if trend_data:
-                    system_prompt += f"\n\nHier sind die aktuellen Trend-Daten aus der Trendlink-Datenbank:\n\n{trend_data}"
-                    system_prompt += "\n\nBasiere deine Antwort AUSSCHLIESSLICH auf diesen Daten. Ergänze KEINE zusätzlichen Informationen aus deinem eigenen Wissen."
-                    trendlink_context = trend_data
-                    trendlink_data_type = "curated_trends"
-                    logger.info("Successfully incorporated general trend data")
-            except Exception as e:
-                logger.error(f"Error fetching curated trends: {e}")
-                system_prompt += "\n\nIch habe versucht, aktuelle Trend-Daten abzurufen, aber leider sind keine Daten verfügbar. Bitte teile dem Nutzer mit, dass derzeit keine Trend-Informationen in der Trendlink-Datenbank verfügbar sind."
+        if trend_contexts:
+            system_prompt += "\n\nBasiere deine Antwort AUSSCHLIESSLICH auf diesen Daten. Ergänze KEINE zusätzlichen Informationen aus deinem eigenen Wissen."
+            trendlink_context = "\n\n".join(instrument_contexts + trend_contexts)
+            trendlink_data_type = "trend_instruments"
+    
+    # Bei allgemeinen Trend-Anfragen die kuratierten Trends abrufen
+    elif is_general_trend_query:
+        try:
+            logger.info("General trend query detected - fetching curated trends")
+            trend_data, data_age = _fetch_trendlink("trendlink.curated_trends", "5",
+                                                    get_curated_trends, limit=5)
+            
+            # Trend-Daten in den System-Prompt einbauen
+            if trend_data:
+                if data_age is not None:
+                    data_ages.append(data_age)
+                    system_prompt += _stale_data_note(data_age)
+                system_prompt += f"\n\nHier sind die aktuellen Trend-Daten aus der Trendlink-Datenbank:\n\n{trend_data}"
+                system_prompt += "\n\nBasiere deine Antwort AUSSCHLIESSLICH auf diesen Daten. Ergänze KEINE zusätzlichen Informationen aus deinem eigenen Wissen."
+                trendlink_context = trend_data
+                trendlink_data_type = "curated_trends"
+                logger.info("Successfully incorporated general trend data")
+        except Exception as e:
+            logger.error(f"Error fetching curated trends: {e}")
+            system_prompt += "\n\nIch habe versucht, aktuelle Trend-Daten abzurufen, aber leider sind keine Daten verfügbar. Bitte teile dem Nutzer mit, dass derzeit keine Trend-Informationen in der Trendlink-Datenbank verfügbar sind."
+    
+    return system_prompt, trendlink_context, trendlink_data_type, data_ages
+
+def process_chat_message(user_message):
+    """
+    Beantwortet eine Nutzernachricht mit GPT und bezieht dabei Trendlink-Daten ein.
+    
+    Wird vom synchronen /chat-Endpunkt und von den asynchronen Chat-Jobs verwendet.
+    Frist, Traffic-Aufzeichnung, query_type und Trace werden über den Kontext des
+    Aufrufers weitergegeben. Jede Stufe (Klassifikation, Prompt-Aufbau mit den
+    Trendlink-Abrufen, Modellwahl, OpenAI-Aufruf) ist ein eigener Trace-Span.
+    
+    Args:
+        user_message (str): Die Nachricht des Nutzers
+        
+    Returns:
+        tuple: (antwort_dict, http_statuscode)
+    """
+    try:
+        (is_relevant, is_trend_stock_query, trend_names, is_general_trend_query,
+         instrument_ids) = _classify_message(user_message)
+        if not is_relevant:
+            set_intent(query_type="off_topic")
+            # Nicht-themenrelevante Anfrage höflich ablehnen
+            return {
+                "response": "Ich bin spezialisiert auf Finanz- und Trend-Themen und kann Ihnen leider keine Informationen zu anderen Bereichen geben. Bitte stellen Sie mir Fragen zu Trends, Aktien, Märkten oder Finanzthemen.",
+                "has_trend_data": False,
+                "query_type": "off_topic"
+            }, 200
+        
+        set_intent(trend_name=", ".join(trend_names), is_trend_stock_query=is_trend_stock_query,
+                   is_general_trend_query=is_general_trend_query, instruments=", ".join(instrument_ids))
+        
+        with tracing.span("chat.build_prompt") as span:
+            system_prompt, trendlink_context, trendlink_data_type, data_ages = _build_system_prompt(
+                is_trend_stock_query, trend_names, is_general_trend_query, instrument_ids
+            )
+            span.set_attribute("prompt.chars", len(system_prompt))
+        
+        query_type = trendlink_data_type if trendlink_data_type else "general_finance"
+        set_intent(query_type=query_type)
         
-        # GPT-4 Antwort mit get_gpt_response generieren
-        logger.info("Generating response with GPT-4")
-        response_text = get_gpt_response(user_message, system_prompt)
+        # Modell und Token-Limit passend zur Anfrage wählen
+        with tracing.span("chat.route", **{"query.type": query_type}) as span:
+            routing = route_request(query_type, user_message, system_prompt)
+            span.set_attribute("llm.model", routing.model)
         
-        # Antwort als JSON zurückgeben
-        return jsonify({
+        # Antwort mit get_gpt_response generieren
+        logger.info(f"Generating response with {routing.model}")
+        with tracing.span("chat.generate", **{"llm.model": routing.model}):
+            response_text = captured_call("openai.chat", user_message, get_gpt_response,
+                                          user_message, system_prompt,
+                                          model=routing.model, max_tokens=routing.max_tokens,
+                                          query_type=query_type)
+        
+        return {
             "response": response_text,
             "has_trend_data": bool(trendlink_context),
-            "query_type": trendlink_data_type if trendlink_data_type else "general_finance"
-        })
+            "query_type": query_type,
+            "model": routing.model,
+            "degraded": bool(data_ages),
+            "data_age_seconds": round(max(data_ages), 1) if data_ages else None
+        }, 200
+        
+    except Exception as e:
+        logger.error(f"Error in chat endpoint: {e}")
+        return {"error": str(e)}, 500
+
+def _wants_async(data):
+    """True, wenn der Client den asynchronen Job-Modus anfordert (Body-Flag oder Prefer-Header)."""
+    if isinstance(data, dict) and data.get("async") is True:
+        return True
+    return "respond-async" in request.headers.get("Prefer", "").lower()
+
+def _process_chat_job(user_message):
+    """Verarbeitet einen Chat-Job als Fortsetzung des Traces der annehmenden Anfrage."""
+    with tracing.root_span("chat.job", kind=tracing.INTERNAL, traceparent=tracing.current_traceparent()):
+        return process_chat_message(user_message)
+
+# Asynchrone Chat-Jobs: begrenzter Pool pro Prozess, Ergebnisse für alle Worker abrufbar
+chat_jobs = ChatJobQueue(_process_chat_job)
+
+# Chat endpoint
+@app.route("/chat", methods=["POST"])
+@tracing.traced
+def chat():
+    """
+    Chat endpoint that processes user messages and responds using OpenAI's GPT-4,
+    incorporating data from Trendlink when relevant.
+    
+    This bot ONLY answers finance and trend-related questions, using Trendlink data
+    as the primary source for all trend information. Non-relevant questions will be
+    politely declined.
+    
+    Mit "async": true im Body oder dem Header "Prefer: respond-async" wird die Anfrage
+    als Job angenommen (202); das Ergebnis liefert GET /chat/jobs/<job_id>.
+    
+    Jede Antwort trägt die Trace-ID in den Headern traceparent und X-Trace-Id.
+    """
+    if _wants_async(request.get_json(silent=True)):
+        return submit_chat_job()
+    return chat_sync()
+
+@with_deadline
+@admission_controlled
+@profiled
+@captured
+def chat_sync():
+    """
+    Beantwortet eine Chat-Anfrage innerhalb der HTTP-Anfrage.
+    """
+    try:
+        data = request.json
+        
+        if not data or "message" not in data:
+            return jsonify({"error": "No message provided"}), 400
+        
+        payload, status_code = process_chat_message(data["message"])
+        return jsonify(payload), status_code
         
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}")
         return jsonify({"error": str(e)}), 500
 
+def _job_status_url(job_id):
+    return f"/chat/jobs/{job_id}"
+
+@admission_controlled
+def submit_chat_job():
+    """
+    Nimmt eine Chat-Anfrage als Job an und antwortet sofort mit 202 und der Job-ID.
+    Gleiche Anfragen desselben Clients erhalten die ID des bereits laufenden Jobs.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get("message"), str):
+        return jsonify({"error": "No message provided"}), 400
+    
+    client_key, _ = _client_identity()
+    try:
+        job_id, deduplicated = chat_jobs.submit(data["message"], dedup_key(client_key, data["message"]))
+    except QueueFull as e:
+        logger.warning(f"Chat-Job abgelehnt: {e}")
+        response = jsonify({"error": "Zu viele offene Anfragen. Bitte versuchen Sie es später erneut."})
+        response.status_code = 503
+        response.headers["Retry-After"] = "5"
+        return response
+    
+    response = jsonify({
+        "job_id": job_id,
+        "status_url": _job_status_url(job_id),
+        "deduplicated": deduplicated
+    })
+    response.status_code = 202
+    response.headers["Location"] = _job_status_url(job_id)
+    response.headers["Retry-After"] = "1"
+    return response
+
+@app.route("/chat/jobs/<job_id>", methods=["GET"])
+def chat_job_result(job_id):
+    """
+    Liefert Status und Ergebnis eines Chat-Jobs.
+    
+    Mit ?wait=<sekunden> wird bis zu CHAT_JOB_MAX_WAIT Sekunden auf das Ergebnis gewartet (Long-Poll).
+    Laufende Jobs antworten mit 202, abgeschlossene mit 200, unbekannte oder abgelaufene mit 404.
+    """
+    try:
+        wait = min(max(float(request.args.get("wait", "0")), 0.0), CHAT_JOB_MAX_WAIT)
+    except ValueError:
+        return jsonify({"error": "Ungültiger Wert für wait"}), 400
+    
+    record = chat_jobs.wait(job_id, wait) if wait > 0 else chat_jobs.get(job_id)
+    if record is None:
+        return jsonify({"error": "Unbekannter oder abgelaufener Job"}), 404
+    
+    body = {"job_id": job_id, "status": record["status"]}
+    if record["status"] in (DONE, FAILED):
+        body["status_code"] = record["status_code"]
+        body["result"] = record["result"]
+        return jsonify(body)
+    
+    response = jsonify(body)
+    response.status_code = 202
+    response.headers["Retry-After"] = "1"
+    return response
+
+# Seitenweiser Abruf der Instrumente eines Trends
+@app.route("/trends/instruments", methods=["GET"])
+@with_deadline
+@admission_controlled
+def trend_instruments():
+    """
+    Liefert die Instrumente eines Trends seitenweise in der Rangfolge des Prompts
+    (nice vor Gewichtung). Die erste Seite wird mit ?trend=<name>&limit=<k> abgefragt,
+    weitere Seiten mit ?cursor=<next_cursor>.
+    """
+    try:
+        limit = int(request.args.get("limit", TRENDLINK_NICE_TOP))
+        page = get_trend_instrument_page(request.args.get("trend"), limit, request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error fetching trend instrument page: {e}")
+        return jsonify({"error": str(e)}), 502
+    
+    if page is None:
+        return jsonify({"error": "Kein passender Trend gefunden"}), 404
+    return jsonify(page)
+
+# Trend-Exposure eines Portfolios
+@app.route("/portfolio/exposure", methods=["POST"])
+@tracing.traced
+@with_deadline
+@admission_controlled
+def portfolio_exposure():
+    """
+    Berechnet, wie stark ein Portfolio in den Trends des Katalogs engagiert ist.
+    Body: {"positions": [{"isin": ..., "weight": ...}, ...]} oder {"portfolio": "<ISIN/WKN je Zeile>"},
+    optional "top" (höchstens PORTFOLIO_MAX_TOP) und "question". Mit "question" wird zusätzlich eine Antwort des Modells
+    auf Basis der Zusammenfassung erzeugt.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "JSON-Objekt mit positions oder portfolio erwartet"}), 400
+    try:
+        positions = parse_positions(data.get("positions", data.get("portfolio")))
+        top = parse_top(data.get("top"))
+    except PortfolioError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    try:
+        with tracing.span("portfolio.catalogue"):
+            catalogue = ensure_fresh_catalogue()
+    except Exception as e:
+        logger.error(f"Error syncing trend catalogue for portfolio exposure: {e}")
+        return jsonify({"error": str(e)}), 502
+    
+    try:
+        with tracing.span("portfolio.analyze", **{"portfolio.positions": len(positions)}):
+            result = analyze_portfolio(catalogue, positions, top=top)
+    except PortfolioError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    question = data.get("question")
+    if isinstance(question, str) and question.strip():
+        system_prompt = (BASE_SYSTEM_PROMPT + "\n\nHier ist die Trend-Auswertung des Portfolios des Nutzers:\n\n"
+                         + format_exposure_summary(result))
+        routing = route_request("portfolio_exposure", question, system_prompt)
+        try:
+            with tracing.span("portfolio.generate", **{"llm.model": routing.model}):
+                result["response"] = get_gpt_response(question, system_prompt, model=routing.model,
+                                                      max_tokens=routing.max_tokens,
+                                                      query_type="portfolio_exposure")
+        except Exception as e:
+            logger.error(f"Error generating portfolio exposure response: {e}")
+            return jsonify({"error": str(e)}), 500
+        result["model"] = routing.model
+    
+    return jsonify(result)
+
 # Health check endpoint
 @app.route("/health", methods=["GET"])
 def health_check():
@@ -277,6 +806,209 @@ def health_check():
         "timestamp": datetime.now().isoformat()
     })
 
+# Readiness-Probe für Render und den Starthelfer
+@app.route("/ready", methods=["GET"])
+def readiness():
+    """
+    Meldet, ob dieser Worker bereit für Traffic ist (Katalog geladen, Zustand der
+    Verbindungspools, letzte Upstream-Prüfung). Bereit: 200, sonst 503.
+    Das Ergebnis wird gecacht; eine Probe löst keinen eigenen API-Aufruf aus.
+    """
+    result = readiness_check.check()
+    return jsonify(result), 200 if result["ready"] else 503
+
+# Push-Kanal für Änderungen der kuratierten Trends (Server-Sent Events)
+@app.route("/events/curated-trends", methods=["GET"])
+def curated_trend_events():
+    """
+    Streamt Änderungen der kuratierten Trends als Server-Sent Events.
+    Zuerst wird der aktuelle Stand als "snapshot" gesendet, danach jede Änderung als "diff".
+    """
+    try:
+        subscriber = curated_trend_broadcaster.subscribe()
+    except TooManySubscribers as e:
+        logger.warning(f"Push-Verbindung abgelehnt: {e}")
+        response = jsonify({"error": "Zu viele verbundene Clients. Bitte versuchen Sie es später erneut."})
+        response.status_code = 503
+        response.headers["Retry-After"] = "30"
+        return response
+    
+    return Response(
+        stream_with_context(curated_trend_broadcaster.stream(subscriber)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route("/metrics/push", methods=["GET"])
+def push_metrics():
+    """
+    Liefert Kennzahlen des Push-Kanals (verbundene Clients, Abfragen, verteilte Änderungen)
+    """
+    return jsonify(curated_trend_broadcaster.snapshot())
+
+# Token-Verbrauch und Latenz der OpenAI-Aufrufe pro query_type
+@app.route("/metrics/openai", methods=["GET"])
+@admin_protected
+def openai_metrics():
+    """
+    Liefert Token-Verbrauch, geschätzte Kosten und Latenzen der OpenAI-Aufrufe pro query_type
+    sowie den Zustand des ausgehenden Limiters (Warteschlange, Rate-Limit-Budget, Wiederholungen)
+    """
+    return jsonify(dict(get_accountant().snapshot(), limiter=get_limiter().snapshot()))
+
+# Zuletzt abgeschlossene, gesampelte Traces dieses Workers (langsamste zuerst)
+@app.route("/metrics/traces", methods=["GET"])
+@admin_protected
+def trace_metrics():
+    """
+    Liefert die letzten gesampelten Traces mit der Dauer jeder Stufe.
+    Mit ?min_ms=<dauer> nur langsame Anfragen, mit ?trace_id=<id> ein bestimmter Trace.
+    """
+    try:
+        min_ms = float(request.args.get("min_ms", "0"))
+        limit = _int_arg("limit", 20, tracing.TRACE_RECENT)
+    except ValueError:
+        return jsonify({"error": "Ungültiger Wert für min_ms oder limit"}), 400
+    traces = tracing.recent_traces(limit=tracing.TRACE_RECENT, min_duration_ms=min_ms)
+    trace_id = request.args.get("trace_id")
+    if trace_id:
+        traces = [trace for trace in traces if trace["trace_id"] == trace_id]
+    return jsonify({
+        "pid": os.getpid(),
+        "sample_rate": tracing.TRACE_SAMPLE_RATE,
+        "traces": traces[:limit]
+    })
+
+# Offene und abgeschlossene Chat-Jobs für Diagnosezwecke
+@app.route("/metrics/jobs", methods=["GET"])
+def job_metrics():
+    """
+    Liefert die Kennzahlen der asynchronen Chat-Jobs dieses Prozesses
+    """
+    return jsonify(chat_jobs.snapshot())
+
+# Fristen und Überschreitungen für Diagnosezwecke
+@app.route("/metrics/deadlines", methods=["GET"])
+def deadline_metrics():
+    """
+    Liefert die Zähler zu Anfrage-Fristen und gekürzten Upstream-Timeouts
+    """
+    return jsonify(deadline_snapshot())
+
+# Routing-Entscheidungen für Diagnosezwecke
+@app.route("/metrics/routing", methods=["GET"])
+def routing_metrics():
+    """
+    Liefert die zuletzt getroffenen Model-Routing-Entscheidungen
+    """
+    return jsonify({"decisions": recent_decisions()})
+
+# Zustand des Last-Known-Good-Speichers für Diagnosezwecke
+@app.route("/metrics/fallback", methods=["GET"])
+def fallback_metrics():
+    """
+    Liefert Kennzahlen zu gespeicherten und ersatzweise ausgelieferten Trendlink-Daten
+    """
+    return jsonify(get_last_known_good().snapshot())
+
+def _usage_cache_stats():
+    usage = get_accountant().snapshot()
+    return {"query_types": len(usage["query_types"]), "recent": len(usage["recent"])}
+
+def _latency_cache_stats():
+    trackers = latency_snapshots()
+    return {"trackers": len(trackers), "samples": sum(tracker["count"] for tracker in trackers.values())}
+
+# Caches der App für den Speicherbericht der Admin-Endpunkte
+memory_diagnostics.register_cache("trend_catalogue", lambda: get_catalogue().stats())
+memory_diagnostics.register_cache("trend_sync", lambda: get_trend_sync().stats())
+memory_diagnostics.register_cache("last_known_good", lambda: get_last_known_good().snapshot())
+memory_diagnostics.register_cache("routing_decisions", lambda: {"entries": len(recent_decisions())})
+memory_diagnostics.register_cache("latency_trackers", _latency_cache_stats)
+memory_diagnostics.register_cache("openai_usage", _usage_cache_stats)
+memory_diagnostics.register_cache("chat_jobs", lambda: chat_jobs.snapshot())
+memory_diagnostics.register_cache("push_subscribers", lambda: curated_trend_broadcaster.snapshot())
+
+def _int_arg(name, default, maximum):
+    """Liest einen ganzzahligen Query-Parameter und begrenzt ihn auf 1..maximum."""
+    return min(max(int(request.args.get(name, default)), 1), maximum)
+
+# Speicherdiagnose des antwortenden Workers (PID in jeder Antwort)
+@app.route("/admin/memory", methods=["GET"])
+@admin_protected
+def admin_memory():
+    """
+    Liefert RSS, tracemalloc-Status und die Größe der App-Caches dieses Workers.
+    Mit ?objects=1 zusätzlich die GC-Objektzähler nach Typ.
+    """
+    report = memory_diagnostics.memory_report()
+    if request.args.get("objects") in ("1", "true"):
+        report["objects"] = memory_diagnostics.object_counts()
+    return jsonify(report)
+
+@app.route("/admin/memory/tracing", methods=["POST", "DELETE"])
+@admin_protected
+def admin_memory_tracing():
+    """
+    Startet (POST, optional ?frames=<n>) oder stoppt (DELETE) tracemalloc in diesem Worker.
+    """
+    if request.method == "DELETE":
+        return jsonify(memory_diagnostics.stop_tracing())
+    try:
+        frames = _int_arg("frames", memory_diagnostics.MEMORY_TRACE_FRAMES, 100)
+    except ValueError:
+        return jsonify({"error": "Ungültiger Wert für frames"}), 400
+    return jsonify(memory_diagnostics.start_tracing(frames))
+
+@app.route("/admin/memory/snapshots", methods=["POST"])
+@admin_protected
+def admin_memory_snapshot():
+    """
+    Nimmt einen benannten Snapshot auf (?name=<name>) für spätere Vergleiche.
+    """
+    try:
+        return jsonify(memory_diagnostics.take_snapshot(request.args.get("name")))
+    except TracingNotActive as e:
+        return jsonify({"error": str(e)}), 409
+
+@app.route("/admin/memory/top", methods=["GET"])
+@admin_protected
+def admin_memory_top():
+    """
+    Liefert die Allokationsstellen mit dem meisten belegten Speicher
+    (?limit=<n>&group_by=lineno|filename|traceback).
+    """
+    try:
+        return jsonify(memory_diagnostics.top_allocations(
+            _int_arg("limit", 20, 200), request.args.get("group_by", "lineno")
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except TracingNotActive as e:
+        return jsonify({"error": str(e)}), 409
+
+@app.route("/admin/memory/diff", methods=["GET"])
+@admin_protected
+def admin_memory_diff():
+    """
+    Vergleicht zwei Snapshots (?base=<name>&target=<name>) bzw. einen Snapshot mit dem
+    aktuellen Stand, wenn target fehlt, und liefert die Stellen mit dem größten Zuwachs.
+    """
+    base = request.args.get("base")
+    if not base:
+        return jsonify({"error": "Parameter base fehlt"}), 400
+    try:
+        return jsonify(memory_diagnostics.diff_snapshots(
+            base, request.args.get("target"), _int_arg("limit", 20, 200),
+            request.args.get("group_by", "lineno")
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except UnknownSnapshot as e:
+        return jsonify({"error": str(e)}), 404
+    except TracingNotActive as e:
+        return jsonify({"error": str(e)}), 409
+
 # Main entry point
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=int(os.getenv("PORT", 5001)), debug=True) 
\ No newline at end of file
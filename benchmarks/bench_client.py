@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Durchsatz des Python-Clients gegen einen lokalen Stand-in-Server.
+
+Der Stand-in beantwortet POST /chat nach einer festen Latenz (simulierte OpenAI-Antwort)
+und lehnt optional einen Anteil der Anfragen mit 429 und Retry-After: 0 ab. Verglichen
+werden:
+
+- naive:  requests.post pro Nachricht, nacheinander, ohne Verbindungswiederverwendung
+          (bisheriges examples/api_client.py)
+- sync:   ChatClient.chat_many mit Verbindungspool und Threads
+- async:  AsyncChatClient.chat_many mit asyncio
+
+Aufruf:
+    python -m benchmarks.bench_client [--messages 200] [--latency 0.02] [--concurrency 16]
+                                      [--reject-rate 0.05]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.messages import MESSAGES
+from trendlink_client import ChatClient, AsyncChatClient
+
+
+def make_handler(latency, reject_rate):
+    """Erzeugt den Request-Handler des Stand-in-Servers."""
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", "0"))
+            message = json.loads(self.rfile.read(length))["message"]
+            if random.random() < reject_rate:
+                self._send(429, {"error": "Zu viele Anfragen"}, {"Retry-After": "0"})
+                return
+            time.sleep(latency)
+            self._send(200, {"response": f"Antwort auf {message}", "query_type": "general_finance",
+                             "has_trend_data": False})
+
+    return StandInHandler
+
+
+def start_server(latency, reject_rate):
+    """Startet den Stand-in auf einem freien Port und liefert (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(latency, reject_rate))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def run_naive(base_url, messages, concurrency):
+    """Eine neue Verbindung pro Nachricht, keine Parallelität, keine Wiederholung."""
+    ok = 0
+    for message in messages:
+        response = requests.post(f"{base_url}/chat", json={"message": message})
+        ok += response.status_code == 200
+    return ok
+
+
+def run_sync(base_url, messages, concurrency):
+    with ChatClient(base_url, max_connections=concurrency, backoff=0.01) as client:
+        results = client.chat_many(messages, concurrency=concurrency, return_exceptions=True)
+    return sum(isinstance(result, dict) for result in results)
+
+
+def run_async(base_url, messages, concurrency):
+    async def run():
+        async with AsyncChatClient(base_url, max_connections=concurrency, backoff=0.01) as client:
+            return await client.chat_many(messages, concurrency=concurrency, return_exceptions=True)
+    return sum(isinstance(result, dict) for result in asyncio.run(run()))
+
+
+VARIANTS = (("naive", run_naive), ("sync", run_sync), ("async", run_async))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200, help="Anzahl Nachrichten pro Variante")
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulierte Antwortzeit in Sekunden")
+    parser.add_argument("--concurrency", type=int, default=16, help="Parallele Anfragen der Clients")
+    parser.add_argument("--reject-rate", type=float, default=0.05, help="Anteil der 429-Antworten")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.latency, args.reject_rate)
+    messages = [MESSAGES[i % len(MESSAGES)] for i in range(args.messages)]
+    print(f"{args.messages} Nachrichten, Latenz {args.latency * 1000:.0f} ms, "
+          f"Parallelität {args.concurrency}, 429-Anteil {args.reject_rate:.0%}")
+    print(f"{'Variante':<8} {'Sekunden':>9} {'Nachr./s':>9} {'erfolgreich':>12}")
+    try:
+        for name, run in VARIANTS:
+            start = time.perf_counter()
+            ok = run(base_url, messages, args.concurrency)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<8} {elapsed:>9.2f} {args.messages / elapsed:>9.1f} {ok:>8}/{args.messages}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
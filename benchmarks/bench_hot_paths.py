@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Durchsatz und Speicherbedarf der reinen Python-Hot-Paths.
+
+Misst für jeden Fall Aufrufe pro Sekunde und die Spitzen-Allokation pro Aufruf
+(tracemalloc) und vergleicht sie mit den gespeicherten Baselines:
+
+- extract_trend_request / extract_trend_requests / is_finance_trend_related
+  über realistische deutsche Nachrichten (benchmarks/messages.py)
+- catalogue.search: Trend-Suche im In-Memory-Katalog (Treffer in der Mitte, kein Treffer)
+- stream.find_trend: Trend-Suche im Antwort-Stream der API
+- format_trend_data / format_trend_with_instruments
+
+Die Durchsätze werden auf eine feste Referenzschleife normiert, damit Baselines
+zwischen Rechnern vergleichbar bleiben. Fällt ein Fall um mehr als die Toleranz
+hinter seine Baseline zurück (auch nach erneuter Messung), endet das Skript mit Exit-Code 1. Alle Daten werden
+synthetisch erzeugt; es ist kein Netzwerkzugriff nötig.
+
+Aufruf:
+    python -m benchmarks.bench_hot_paths [größe ...]
+    python -m benchmarks.bench_hot_paths --update-baseline
+    python -m benchmarks.bench_hot_paths --filter catalogue --tolerance 0.4
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.catalogue import make_trend, make_catalogue_bytes, make_curated_response, iter_chunks
+from benchmarks.messages import MESSAGES
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+# Größter Katalog, der zusätzlich als Stream durchsucht wird (darüber dauert ein Aufruf Sekunden)
+STREAM_MAX_SIZE = 10000
+INSTRUMENTS_PER_TREND = 10
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "hot_paths.json")
+# Zulässiger Rückgang des normierten Durchsatzes (0.3 = 30 %)
+DEFAULT_TOLERANCE = 0.3
+# Zulässiger Anstieg der Spitzen-Allokation und absoluter Spielraum in Bytes
+DEFAULT_ALLOC_TOLERANCE = 0.2
+ALLOC_SLACK_BYTES = 1024
+# Mindestdauer einer Messreihe und Anzahl Wiederholungen (bester Wert zählt)
+MIN_TIME = 0.2
+REPEATS = 5
+# Zusätzliche Messungen eines langsameren Falls, bevor er als Regression gilt
+CONFIRM_RUNS = 2
+
+
+class Case:
+    """
+    Ein Benchmark-Fall.
+
+    Args:
+        name (str): Eindeutiger Name, unter dem die Baseline gespeichert wird
+        func (callable): Führt einen Durchlauf aus
+        calls (int): Anzahl der Aufrufe der gemessenen Funktion pro Durchlauf
+    """
+
+    def __init__(self, name, func, calls=1):
+        self.name = name
+        self.func = func
+        self.calls = calls
+
+
+def _reference_workload():
+    """Feste Referenzschleife aus Zeichenketten- und Listenoperationen zur Normierung."""
+    words = ("aktien", "wasserstoff", "börse", "elektroautos", "rendite", "solar")
+    total = 0
+    for i in range(2000):
+        word = words[i % len(words)]
+        if "e" in word.upper().lower():
+            total += len(word + str(i))
+    return total
+
+
+def measure_throughput(func, min_time=MIN_TIME, repeats=REPEATS):
+    """
+    Misst Durchläufe pro Sekunde (bester Wert aus mehreren Messreihen).
+
+    Args:
+        func (callable): Zu messende Funktion
+        min_time (float): Mindestdauer einer Messreihe in Sekunden
+        repeats (int): Anzahl Messreihen
+
+    Returns:
+        float: Durchläufe pro Sekunde
+    """
+    # Anzahl Durchläufe pro Messreihe so wählen, dass min_time erreicht wird
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed < min_time / 4 else 1 + int(min_time / max(elapsed, 1e-9))
+
+    best = elapsed / number
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return 1.0 / best
+
+
+def measure_peak_allocation(func):
+    """
+    Misst die Spitzen-Allokation eines Durchlaufs mit tracemalloc.
+
+    Args:
+        func (callable): Zu messende Funktion (wurde bereits einmal aufgerufen)
+
+    Returns:
+        int: Bytes oberhalb des Ausgangsstands
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - before
+
+
+def build_catalogue(size):
+    """Erzeugt einen geladenen TrendCatalogue, ohne alle Dictionaries gleichzeitig zu halten."""
+    from trend_catalogue import TrendCatalogue
+    from trend_model import Trend
+
+    rng = random.Random(42)
+    catalogue = TrendCatalogue()
+    catalogue.load(Trend.from_dict(make_trend(i, rng, INSTRUMENTS_PER_TREND)) for i in range(size))
+    return catalogue
+
+
+def build_cases(sizes):
+    """
+    Stellt alle Benchmark-Fälle zusammen.
+
+    Args:
+        sizes (list): Kataloggrößen für die Suchfälle
+
+    Returns:
+        list: Case-Objekte
+    """
+    from app import extract_trend_request, extract_trend_requests, is_finance_trend_related
+    from trendlink_api import format_trend_data, format_trend_with_instruments
+    from trend_model import Trend
+    from trend_stream import find_trend
+
+    def over_messages(func):
+        def run():
+            for message in MESSAGES:
+                func(message)
+        return run
+
+    cases = [
+        Case("extract_trend_request", over_messages(extract_trend_request), len(MESSAGES)),
+        Case("extract_trend_requests", over_messages(extract_trend_requests), len(MESSAGES)),
+        Case("is_finance_trend_related", over_messages(is_finance_trend_related), len(MESSAGES)),
+    ]
+
+    curated = make_curated_response(5)
+    curated_compact = {"trends": [Trend.from_dict(trend) for trend in curated["trends"]]}
+    trend = make_trend(0, random.Random(42), instruments_per_trend=30)
+    trend_compact = Trend.from_dict(trend)
+    cases += [
+        Case("format_trend_data[dict]", lambda: format_trend_data(curated)),
+        Case("format_trend_data[compact]", lambda: format_trend_data(curated_compact)),
+        Case("format_trend_with_instruments[dict]", lambda: format_trend_with_instruments(trend)),
+        Case("format_trend_with_instruments[compact]", lambda: format_trend_with_instruments(trend_compact)),
+    ]
+
+    for size in sizes:
+        catalogue = build_catalogue(size)
+        middle = catalogue.get(f"t{size // 2}").name
+        cases += [
+            Case(f"catalogue.search[{size}, Mitte]", lambda c=catalogue, t=middle: c.search(t)),
+            Case(f"catalogue.search[{size}, kein Treffer]", lambda c=catalogue: c.search("Zeppelin")),
+        ]
+        if size <= STREAM_MAX_SIZE:
+            payload = make_catalogue_bytes(size, instruments_per_trend=INSTRUMENTS_PER_TREND)
+            cases.append(Case(f"stream.find_trend[{size}, kein Treffer]",
+                              lambda p=payload: find_trend(iter_chunks(p), "Zeppelin")))
+    return cases
+
+
+def measure_case(case):
+    """
+    Misst einen Fall.
+
+    Args:
+        case (Case): Zu messender Fall
+
+    Returns:
+        tuple: (durchläufe_der_referenzschleife_pro_sekunde, {"ops_per_sec", "relative", "peak_bytes"})
+    """
+    case.func()  # Aufwärmen (Regex-Cache, Lazy Imports)
+    ops = measure_throughput(case.func) * case.calls
+    # Referenz direkt neben dem Fall messen, damit Lastschwankungen beide gleich treffen
+    reference = measure_throughput(_reference_workload)
+    return reference, {
+        "ops_per_sec": round(ops, 1),
+        "relative": float(f"{ops / reference:.6g}"),
+        "peak_bytes": int(measure_peak_allocation(case.func) / case.calls),
+    }
+
+
+def run_cases(cases, name_filter=None):
+    """
+    Misst alle Fälle.
+
+    Args:
+        cases (list): Case-Objekte aus build_cases()
+        name_filter (str): Nur Fälle messen, deren Name diesen Text enthält
+
+    Returns:
+        tuple: (höchster Durchsatz der Referenzschleife, {name: Messwerte aus measure_case()})
+    """
+    references = []
+    results = {}
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        reference, results[case.name] = measure_case(case)
+        references.append(reference)
+    return max(references, default=0.0), results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, alloc_tolerance=DEFAULT_ALLOC_TOLERANCE):
+    """
+    Vergleicht Messwerte mit der Baseline.
+
+    Args:
+        results (dict): Ergebnis von run_cases()
+        baseline (dict): Gespeicherte Baseline ("results" wie von run_cases())
+        tolerance (float): Zulässiger Rückgang des normierten Durchsatzes
+        alloc_tolerance (float): Zulässiger Anstieg der Spitzen-Allokation
+
+    Returns:
+        dict: Name -> (status, durchsatz_verhältnis oder None) mit status "ok", "langsamer",
+            "speicher" oder "neu"
+    """
+    verdicts = {}
+    stored = baseline.get("results", {}) if baseline else {}
+    for name, result in results.items():
+        reference = stored.get(name)
+        if reference is None:
+            verdicts[name] = ("neu", None)
+            continue
+        ratio = result["relative"] / reference["relative"]
+        if ratio < 1 - tolerance:
+            verdicts[name] = ("langsamer", ratio)
+        elif result["peak_bytes"] > reference["peak_bytes"] * (1 + alloc_tolerance) + ALLOC_SLACK_BYTES:
+            verdicts[name] = ("speicher", ratio)
+        else:
+            verdicts[name] = ("ok", ratio)
+    return verdicts
+
+
+def load_baseline(path):
+    """Liest die gespeicherte Baseline oder None, wenn keine existiert."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path, reference, results, existing=None):
+    """Schreibt die Baseline; nicht gemessene Fälle der bisherigen Baseline bleiben erhalten."""
+    merged = dict(existing.get("results", {})) if existing else {}
+    merged.update(results)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "reference_ops_per_sec": round(reference, 1),
+            "results": dict(sorted(merged.items())),
+        }, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks der Hot Paths mit Baseline-Vergleich")
+    parser.add_argument("sizes", nargs="*", type=int, default=list(DEFAULT_SIZES),
+                        help="Kataloggrößen für die Suchfälle")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Pfad der Baseline-Datei")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Messwerte als neue Baseline speichern statt zu vergleichen")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Zulässiger Rückgang des normierten Durchsatzes (Standard: 0.3)")
+    parser.add_argument("--alloc-tolerance", type=float, default=DEFAULT_ALLOC_TOLERANCE,
+                        help="Zulässiger Anstieg der Spitzen-Allokation (Standard: 0.2)")
+    parser.add_argument("--filter", help="Nur Fälle messen, deren Name diesen Text enthält")
+    args = parser.parse_args(argv)
+
+    # Log-Ausgaben der App (z.B. beim Laden des Katalogs) würden die Tabelle zerreißen
+    logging.disable(logging.INFO)
+
+    baseline = load_baseline(args.baseline)
+    cases = build_cases(args.sizes)
+    reference, results = run_cases(cases, args.filter)
+
+    if args.update_baseline:
+        save_baseline(args.baseline, reference, results, baseline)
+        print(f"Baseline mit {len(results)} Fällen gespeichert: {args.baseline}")
+        return 0
+
+    verdicts = compare(results, baseline, args.tolerance, args.alloc_tolerance)
+    # Langsamere Fälle erneut messen, bevor sie als Regression gelten (Lastspitzen auf dem Rechner)
+    cases_by_name = {case.name: case for case in cases}
+    for _ in range(CONFIRM_RUNS):
+        slower = [name for name, (status, _) in verdicts.items() if status == "langsamer"]
+        if not slower:
+            break
+        for name in slower:
+            _, result = measure_case(cases_by_name[name])
+            if result["relative"] > results[name]["relative"]:
+                results[name] = result
+        verdicts = compare(results, baseline, args.tolerance, args.alloc_tolerance)
+    print(f"Referenzschleife: {reference:,.0f} Durchläufe/s")
+    print(f"{'Fall':<42} {'Aufrufe/s':>12} {'vs. Basis':>10} {'B/Aufruf':>10}  Status")
+    for name, result in results.items():
+        status, ratio = verdicts[name]
+        ratio_str = f"{ratio:.2f}x" if ratio is not None else "-"
+        print(f"{name:<42} {result['ops_per_sec']:>12,.0f} {ratio_str:>10} "
+              f"{result['peak_bytes']:>10,}  {status}")
+
+    regressions = [name for name, (status, _) in verdicts.items() if status in ("langsamer", "speicher")]
+    if regressions:
+        print(f"\n{len(regressions)} Regression(en) gegenüber der Baseline: {', '.join(regressions)}")
+        return 1
+    if baseline is None:
+        print("\nKeine Baseline vorhanden; mit --update-baseline anlegen.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON-Codec (Standardbibliothek vs. orjson) auf den Nutzdaten des Chatbots.
+
+Misst Parsen und Serialisieren für die tatsächlich verarbeiteten Formen:
+
+- loads curated:     Antwort von `/v2/trends/curated` (trendlink_api)
+- loads catalogue:   kompletter `/v2/trends`-Katalog als Bytes
+- loads completion:  Chat-Completion-Antwort der OpenAI API (Fallback ohne SDK)
+- dumps chat:        Antwort von POST /chat (jsonify, sortierte Schlüssel)
+- dumps instruments: Seite von GET /trends/instruments
+- dumps snapshot:    SSE-Snapshot von /events/curated-trends
+
+Ausgegeben werden Mikrosekunden pro Aufruf je Codec und der Faktor gegenüber json.
+Ist orjson nicht installiert, wird nur die Standardbibliothek gemessen.
+
+Aufruf:
+    python -m benchmarks.bench_json_codec [katalog-größe ...]
+"""
+
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec
+from benchmarks.catalogue import make_catalogue, make_catalogue_bytes, make_curated_response
+
+DEFAULT_SIZES = (100, 1000)
+# Mindestdauer einer Messreihe und Anzahl Wiederholungen (bester Wert zählt)
+MIN_TIME = 0.2
+REPEATS = 3
+
+
+def completion_response():
+    """Antwort von /v1/chat/completions mit einer typischen Antwortlänge."""
+    return {
+        "id": "chatcmpl-8abc", "object": "chat.completion", "created": 1700000000, "model": "gpt-4-0613",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {
+            "role": "assistant",
+            "content": "Der Trend Wasserstoff umfasst Unternehmen entlang der gesamten Wertschöpfungskette. " * 25,
+        }}],
+        "usage": {"prompt_tokens": 1450, "completion_tokens": 520, "total_tokens": 1970},
+    }
+
+
+def chat_reply():
+    """Antwort von POST /chat."""
+    return {
+        "response": completion_response()["choices"][0]["message"]["content"],
+        "has_trend_data": True,
+        "is_finance_related": True,
+        "query_type": "trend_instruments",
+        "model": "gpt-4",
+    }
+
+
+def instrument_page():
+    """Seite von GET /trends/instruments mit 50 Instrumenten."""
+    trend = make_catalogue(1, instruments_per_trend=50)[0]
+    return {"trend": {"id": trend["id"], "name": trend["name"]}, "instruments": trend["instruments"],
+            "next_cursor": "eyJpZCI6InQwIiwibmFtZSI6IkVuZXJnaWUgMCIsIm9mZnNldCI6NTB9"}
+
+
+def per_call(func):
+    """Bester Wert aus REPEATS Messreihen in Mikrosekunden pro Aufruf."""
+    best = None
+    for _ in range(REPEATS):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_TIME:
+                break
+        value = elapsed / calls * 1e6
+        best = value if best is None else min(best, value)
+    return best
+
+
+def cases(sizes):
+    curated = json_codec.dumps_bytes(make_curated_response(20))
+    completion = json_codec.dumps_bytes(completion_response())
+    yield "loads curated", len(curated), lambda: json_codec.loads(curated)
+    for size in sizes:
+        catalogue = make_catalogue_bytes(size, instruments_per_trend=30)
+        yield f"loads catalogue {size}", len(catalogue), lambda payload=catalogue: json_codec.loads(payload)
+    yield "loads completion", len(completion), lambda: json_codec.loads(completion)
+
+    reply, page, snapshot = chat_reply(), instrument_page(), make_curated_response(20)
+    yield "dumps chat", None, lambda: json_codec.dumps_bytes(reply, sort_keys=True)
+    yield "dumps instruments", None, lambda: json_codec.dumps_bytes(page, sort_keys=True)
+    yield "dumps snapshot", None, lambda: json_codec.dumps(snapshot)
+
+
+def main(sizes):
+    codecs = [("json", None)]
+    if json_codec._orjson is not None:
+        codecs.append(("orjson", json_codec._orjson))
+
+    header = f"{'Fall':<24} {'Bytes':>9}" + "".join(f" {name + ' (µs)':>14}" for name, _ in codecs)
+    print(header + (f" {'Faktor':>8}" if len(codecs) > 1 else ""))
+    for label, size, func in cases(sizes):
+        timings = []
+        for _, codec in codecs:
+            with mock.patch.object(json_codec, "_orjson", codec):
+                timings.append(per_call(func))
+        line = f"{label:<24} {size or '':>9}" + "".join(f" {value:>14.1f}" for value in timings)
+        if len(timings) > 1:
+            line += f" {timings[0] / timings[1]:>7.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Trend-Exposure eines Portfolios (Schleife über den Katalog vs. Trend-Matrix).
+
+- loop:    für jeden Trend die Instrumente durchlaufen und Portfoliogewichte nachschlagen
+- matrix:  portfolio_exposure.analyze_portfolio() auf der gecachten Trend-Matrix
+- build:   einmaliger Aufbau der Matrix nach einer Katalogänderung
+
+Ausgegeben werden Millisekunden pro Auswertung je Katalog- und Portfoliogröße.
+
+Aufruf:
+    python -m benchmarks.bench_portfolio_exposure [katalog-größe ...]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.catalogue import make_catalogue
+from instrument_index import ISIN
+from portfolio_exposure import Position, TrendMatrix, analyze_portfolio, normalize_weights
+from trend_catalogue import TrendCatalogue
+from trend_model import Trend
+
+DEFAULT_SIZES = (1000, 10000)
+PORTFOLIO_SIZES = (20, 500)
+# Mindestdauer einer Messreihe und Anzahl Wiederholungen (bester Wert zählt)
+MIN_TIME = 0.2
+REPEATS = 3
+
+
+def loop_exposure(catalogue, positions):
+    """Exposure je Trend ohne Matrix: eine Schleife über alle Instrumente des Katalogs."""
+    weights = dict(zip((position.identifier for position in positions), normalize_weights(positions)))
+    exposure = {}
+    for trend in catalogue.trends():
+        total = sum(weights.get(instrument.isin, 0.0) for instrument in trend.instruments)
+        if total:
+            exposure[trend.id] = total
+    return sorted(exposure.items(), key=lambda item: -item[1])[:10]
+
+
+def per_call(func):
+    """Bester Wert aus REPEATS Messreihen in Millisekunden pro Aufruf."""
+    best = None
+    for _ in range(REPEATS):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_TIME:
+                break
+        value = elapsed / calls * 1e3
+        best = value if best is None else min(best, value)
+    return best
+
+
+def main(sizes):
+    print(f"{'Trends':>8} {'Positionen':>11} {'loop (ms)':>11} {'matrix (ms)':>12} {'Faktor':>8} {'build (ms)':>11}")
+    for size in sizes:
+        trends = make_catalogue(size, instruments_per_trend=30, isin_pool_size=size * 5)
+        catalogue = TrendCatalogue()
+        catalogue.load(Trend.from_dict(trend) for trend in trends)
+        pool = sorted({instrument["isin"] for trend in trends for instrument in trend["instruments"]})
+        build = per_call(lambda: TrendMatrix(catalogue.trends(), catalogue.version))
+
+        rng = random.Random(size)
+        for count in PORTFOLIO_SIZES:
+            positions = [Position(ISIN, isin, rng.uniform(1, 10)) for isin in rng.sample(pool, min(count, len(pool)))]
+            loop = per_call(lambda: loop_exposure(catalogue, positions))
+            matrix = per_call(lambda: analyze_portfolio(catalogue, positions))
+            print(f"{size:>8} {count:>11} {loop:>11.2f} {matrix:>12.3f} {loop / matrix:>7.0f}x {build:>11.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
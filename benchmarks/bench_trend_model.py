@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Speicherbedarf der Trend-Darstellung (Dictionaries vs. kompaktes Modell).
+
+Misst mit tracemalloc den dauerhaft belegten Speicher eines geladenen Katalogs:
+
+- dict:    reduzierte Trend-Dictionaries, wie sie trend_stream.iter_trends liefert
+- compact: trend_model.Trend mit InstrumentTable
+
+Ausgegeben werden Bytes pro Trend (ohne Instrumente) und Bytes pro Instrument.
+
+Aufruf:
+    python -m benchmarks.bench_trend_model [größe ...]
+"""
+
+import os
+import sys
+import gc
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.catalogue import make_catalogue_bytes, iter_chunks
+from trend_stream import iter_trends
+from trend_model import Trend, InstrumentTable
+
+DEFAULT_SIZES = (1000, 10000)
+INSTRUMENTS_PER_TREND = 30
+
+
+def retained_bytes(build):
+    """
+    Liefert den nach dem Aufbau dauerhaft belegten Speicher.
+
+    Args:
+        build (callable): Funktion, die die zu messende Datenstruktur erzeugt
+
+    Returns:
+        int: Belegte Bytes
+    """
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    data = build()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return after - before
+
+
+def main(sizes):
+    print(f"{'Trends':>8} {'Darstellung':>12} {'Gesamt (KiB)':>13} {'B/Trend':>9} {'B/Instrument':>13}")
+    for size in sizes:
+        payload = make_catalogue_bytes(size, instruments_per_trend=INSTRUMENTS_PER_TREND)
+        instrument_count = size * INSTRUMENTS_PER_TREND
+
+        variants = (
+            ("dict",
+             lambda: list(iter_trends(iter_chunks(payload))),
+             lambda: [trend["instruments"] for trend in iter_trends(iter_chunks(payload))]),
+            ("compact",
+             lambda: [Trend.from_dict(trend) for trend in iter_trends(iter_chunks(payload))],
+             lambda: [InstrumentTable(trend["instruments"]) for trend in iter_trends(iter_chunks(payload))]),
+        )
+        for label, build_all, build_instruments in variants:
+            total = retained_bytes(build_all)
+            instruments = retained_bytes(build_instruments)
+            per_instrument = instruments / instrument_count
+            per_trend = (total - instruments) / size
+            print(f"{size:>8} {label:>12} {total / 1024:>13.0f} {per_trend:>9.0f} {per_instrument:>13.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
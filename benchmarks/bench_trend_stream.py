@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vollständiges Parsen vs. inkrementelles Parsen des Trend-Katalogs.
+
+Vergleicht für wachsende Kataloggrößen die Spitzen-Speichernutzung und die
+Laufzeit der Suche nach einem Trend:
+
+- full:          response.content + json.loads + lineare Suche (bisheriger Pfad)
+- stream-end:    trend_stream.find_trend, Treffer am Ende des Katalogs (schlechtester Fall)
+- stream-middle: trend_stream.find_trend, Treffer in der Mitte (vorzeitiger Abbruch)
+
+Aufruf:
+    python -m benchmarks.bench_trend_stream [größe ...]
+"""
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.catalogue import make_catalogue_bytes, iter_chunks
+from trend_stream import find_trend, compile_search, trend_matches
+
+DEFAULT_SIZES = (100, 1000, 10000, 50000)
+
+
+def search_full(payload, trend_name):
+    """Bisheriger Pfad: alles laden, parsen und linear suchen."""
+    content = b"".join(iter_chunks(payload))
+    trends = json.loads(content)
+    search_term_lower, search_pattern = compile_search(trend_name)
+    for trend in trends:
+        if trend_matches(trend, search_term_lower, search_pattern):
+            return trend
+    return None
+
+
+def search_stream(payload, trend_name):
+    """Neuer Pfad: inkrementell parsen, beim ersten Treffer abbrechen."""
+    trend, _ = find_trend(iter_chunks(payload), trend_name)
+    return trend
+
+
+def measure(func, *args):
+    """
+    Misst Laufzeit und Spitzen-Speicher eines Aufrufs.
+
+    Die Laufzeit wird ohne tracemalloc gemessen, da dessen Overhead sie verfälschen würde.
+
+    Returns:
+        tuple: (sekunden, spitzen_bytes)
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    assert result is not None
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(sizes):
+    print(f"{'Trends':>8} {'Payload':>10} {'Variante':>14} {'Zeit (ms)':>10} {'Peak (KiB)':>11}")
+    for size in sizes:
+        payload = make_catalogue_bytes(size)
+        # Namen sind eindeutig ("<Thema> <index>"), daher trifft die Suche genau einen Trend
+        cases = (
+            ("full", search_full, f"{size - 1}"),
+            ("stream-end", search_stream, f"{size - 1}"),
+            ("stream-middle", search_stream, f"{size // 2}"),
+        )
+        for label, func, needle in cases:
+            # Der Trendname endet auf den Index; " <index>" reicht als eindeutiger Suchbegriff
+            seconds, peak = measure(func, payload, f" {needle}")
+            print(f"{size:>8} {len(payload) // 1024:>8}KiB {label:>14} "
+                  f"{seconds * 1000:>10.1f} {peak / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
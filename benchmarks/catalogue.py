@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Synthetische Trend-Kataloge für Benchmarks.
+
+Erzeugt deterministische Kataloge in der Struktur von `/v2/trends` (siehe
+Documentation-Trendlink-API-v2.5.pdf), damit Benchmarks ohne Netzwerkzugriff
+und reproduzierbar laufen.
+"""
+
+import json
+import random
+
+WEIGHTINGS = ("high", "normal", "low")
+
+_WORDS = (
+    "Energie", "Wasserstoff", "Elektroautos", "Batterie", "Halbleiter", "Robotik",
+    "Cloud", "Gesundheit", "Biotechnologie", "Infrastruktur", "Rohstoffe", "Solar",
+    "Windkraft", "Logistik", "Fintech", "Cybersecurity", "Gaming", "Agrar",
+)
+
+_COUNTRIES = ("DE", "US", "FR", "NL", "GB", "JP", "CH")
+
+_ALPHANUM = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+
+def make_isin(rng):
+    """Erzeugt eine syntaktisch plausible ISIN (ohne gültige Prüfziffer)."""
+    country = rng.choice(_COUNTRIES)
+    if country == "DE":
+        return "DE000" + "".join(rng.choice(_ALPHANUM) for _ in range(6)) + str(rng.randrange(10))
+    return country + "".join(rng.choice(_ALPHANUM) for _ in range(9)) + str(rng.randrange(10))
+
+
+def make_trend(index, rng, instruments_per_trend=30, isin_pool=None):
+    """
+    Erzeugt einen einzelnen Trend im Format der API.
+
+    Args:
+        index (int): Laufende Nummer des Trends
+        rng (random.Random): Zufallsgenerator
+        instruments_per_trend (int): Anzahl Instrumente des Trends
+        isin_pool (list): Optionaler Pool, aus dem ISINs gezogen werden
+
+    Returns:
+        dict: Trend-Objekt
+    """
+    topic = _WORDS[index % len(_WORDS)]
+    if isin_pool:
+        isins = rng.sample(isin_pool, min(instruments_per_trend, len(isin_pool)))
+    else:
+        isins = [make_isin(rng) for _ in range(instruments_per_trend)]
+    return {
+        "id": f"t{index}",
+        "name": f"{topic} {index}",
+        "description": (
+            f"Der Trend {topic} {index} beschreibt Unternehmen, die von der Entwicklung im "
+            f"Bereich {topic} profitieren. " * 4
+        ),
+        "synonyms": [f"{rng.choice(_WORDS)}{i}" for i in range(8)],
+        "images": [
+            {"dimension": "2to1", "density": 1,
+             "url": f"https://www.trendlink.com/ext/img/trends/{index}/bild-2to1-w1.jpg"},
+        ],
+        "instruments": [
+            {"isin": isin, "weighting": rng.choice(WEIGHTINGS), "nice": rng.random() < 0.2}
+            for isin in isins
+        ],
+        "children": [{"id": f"t{index + 1}"}],
+        "parents": [{"id": f"t{max(0, index - 1)}"}],
+        "trendPaths": [{"type": "main", "path": ["t0", f"t{index}"]}],
+    }
+
+
+def make_catalogue(size, instruments_per_trend=30, seed=42, isin_pool_size=None):
+    """
+    Erzeugt einen Katalog mit `size` Trends.
+
+    Args:
+        size (int): Anzahl Trends
+        instruments_per_trend (int): Anzahl Instrumente je Trend
+        seed (int): Startwert des Zufallsgenerators
+        isin_pool_size (int): Wenn gesetzt, teilen sich die Trends einen ISIN-Pool dieser Größe
+
+    Returns:
+        list: Liste von Trend-Objekten
+    """
+    rng = random.Random(seed)
+    isin_pool = [make_isin(rng) for _ in range(isin_pool_size)] if isin_pool_size else None
+    return [make_trend(i, rng, instruments_per_trend, isin_pool) for i in range(size)]
+
+
+def make_catalogue_bytes(size, **kwargs):
+    """Erzeugt einen Katalog und liefert ihn als JSON-Bytes wie vom Server."""
+    return json.dumps(make_catalogue(size, **kwargs), ensure_ascii=False).encode("utf-8")
+
+
+def iter_chunks(payload, chunk_size=64 * 1024):
+    """Zerlegt Bytes in Blöcke, wie sie response.iter_content() liefern würde."""
+    for offset in range(0, len(payload), chunk_size):
+        yield payload[offset:offset + chunk_size]
+
+
+def make_curated_response(count=5, seed=42):
+    """
+    Erzeugt eine Antwort im Format von `/v2/trends/curated`.
+
+    Args:
+        count (int): Anzahl kuratierter Trends
+        seed (int): Startwert des Zufallsgenerators
+
+    Returns:
+        dict: {"trends": [...]} mit Kategorie, Score, Datum und Quellen je Trend
+    """
+    rng = random.Random(seed)
+    trends = []
+    for index in range(count):
+        trend = make_trend(index, rng, instruments_per_trend=10)
+        trend.update({
+            "category": rng.choice(("Technologie", "Energie", "Gesundheit", "Konsum")),
+            "score": round(rng.uniform(50, 100), 1),
+            "date": f"2024-0{1 + index % 9}-1{index % 10}T08:00:00Z",
+            "weighting": rng.choice(WEIGHTINGS),
+            "sources": [
+                {"name": f"Quelle {i}", "url": f"https://example.com/trend/{index}/{i}"}
+                for i in range(4)
+            ],
+        })
+        trends.append(trend)
+    return {"trends": trends}
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Realistische deutsche Nutzernachrichten für Benchmarks.
+
+Die Mischung entspricht grob dem Verkehr des Chat-Endpunkts: Fragen nach Aktien
+zu einem oder mehreren Trends, allgemeine Trend- und Finanzfragen sowie
+themenfremde Nachrichten, bei denen alle Muster ohne Treffer durchlaufen werden.
+"""
+
+# Anfragen nach Instrumenten eines oder mehrerer Trends
+TREND_MESSAGES = (
+    "Welche Aktien zu Wasserstoff sind gerade interessant?",
+    "Zeig mir die Top 5 Aktien im Bereich Elektroautos",
+    "Was sind die besten Aktien zum Thema Künstliche Intelligenz?",
+    "Ich möchte in Solar und Windkraft investieren, welche Aktien gibt es?",
+    "Vergleiche Aktien zu Elektroautos, Batterie und Halbleiter",
+    "Empfehlenswerte ETFs im Sektor Gesundheit bitte",
+    "Nice 10 Aktien im Trend Cybersecurity",
+    "Welche die interessante Aktien zum Thema Robotik & Automatisierung?",
+    "Gute Investments für Rohstoffe sowie Agrar",
+    "Anlage in Cloud/Fintech - was lohnt sich?",
+)
+
+# Allgemeine Fragen zu Trends und Finanzthemen ohne konkreten Trendnamen
+FINANCE_MESSAGES = (
+    "Was sind die aktuellen Trends an der Börse?",
+    "Wie wirkt sich die Inflation auf meine Rendite aus?",
+    "Lohnt sich ein Sparplan auf einen breit gestreuten ETF?",
+    "Erkläre mir den Unterschied zwischen ISIN und WKN",
+    "Wie diversifiziere ich mein Depot am besten, um das Risiko zu senken?",
+    "Welche Prognose gibt es für die Zinsen im nächsten Jahr?",
+)
+
+# Themenfremde Nachrichten (schlechtester Fall für die Schlagwortprüfung)
+OFF_TOPIC_MESSAGES = (
+    "Hallo, wie geht es dir heute?",
+    "Kannst du mir ein Rezept für Apfelkuchen mit Streuseln empfehlen?",
+    "Wie wird das Wetter am Wochenende in Hamburg?",
+    "Schreib mir bitte ein kurzes Gedicht über den Herbst im Schwarzwald.",
+)
+
+MESSAGES = TREND_MESSAGES + FINANCE_MESSAGES + OFF_TOPIC_MESSAGES
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Chat Jobs Modul
+
+Asynchroner Modus für /chat: Statt die Verbindung bis zum Ende einer langsamen
+Completion offen zu halten, antwortet der Endpunkt sofort mit 202 und einer Job-ID.
+Ein begrenzter Pool pro Prozess arbeitet die Jobs ab; das Ergebnis wird per
+Long-Poll unter /chat/jobs/<job_id> abgeholt und CHAT_JOB_TTL Sekunden aufbewahrt.
+
+Die Job-Datensätze liegen als JSON-Dateien in CHAT_JOB_DIR, damit jeder Gunicorn-Worker
+einer Instanz die Jobs der anderen Worker beantworten kann. Gleiche Anfragen desselben
+Clients werden über eine exklusiv angelegte Markierungsdatei zusammengefasst, solange
+der erste Job läuft oder sein Ergebnis aufbewahrt wird.
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+import logging
+import tempfile
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from deadline import set_deadline, reset_deadline
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Threads pro Prozess, die Chat-Jobs abarbeiten
+CHAT_JOB_WORKERS = int(os.getenv("CHAT_JOB_WORKERS", "4"))
+# Maximale Anzahl wartender und laufender Jobs pro Prozess, darüber wird abgelehnt
+CHAT_JOB_MAX_PENDING = int(os.getenv("CHAT_JOB_MAX_PENDING", "32"))
+# Aufbewahrungsdauer der Ergebnisse in Sekunden
+CHAT_JOB_TTL = float(os.getenv("CHAT_JOB_TTL", "600"))
+# Längste Wartezeit eines Long-Polls in Sekunden (unter dem Timeout des Render-Proxys)
+CHAT_JOB_MAX_WAIT = float(os.getenv("CHAT_JOB_MAX_WAIT", "20"))
+# Frist eines Jobs in Sekunden; ersetzt REQUEST_DEADLINE, da kein Client mehr wartet
+CHAT_JOB_DEADLINE = float(os.getenv("CHAT_JOB_DEADLINE", "120"))
+# Verzeichnis der Job-Datensätze (gemeinsam für alle Worker einer Instanz)
+CHAT_JOB_DIR = os.getenv("CHAT_JOB_DIR") or os.path.join(tempfile.gettempdir(), "trendlink-chat-jobs")
+
+# Abstand, in dem auf Jobs anderer Worker geprüft wird
+_FOREIGN_POLL_INTERVAL = 0.2
+# Abstand der Aufräumläufe im Job-Verzeichnis
+_PURGE_INTERVAL = 60
+
+_JOB_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class QueueFull(Exception):
+    """Die maximale Anzahl offener Jobs des Prozesses ist erreicht."""
+
+
+def dedup_key(client_key, message):
+    """
+    Schlüssel, unter dem gleiche Anfragen desselben Clients zusammengefasst werden.
+
+    Args:
+        client_key (str): Kennung des Clients (API-Key oder IP)
+        message (str): Nachricht des Nutzers
+
+    Returns:
+        str: Hex-Digest
+    """
+    return hashlib.sha256(f"{client_key}\n{message.strip()}".encode("utf-8")).hexdigest()
+
+
+class ChatJobQueue:
+    """
+    Begrenzter Pool für Chat-Jobs mit dateibasiertem Ergebnisspeicher.
+
+    Args:
+        handler (callable): Verarbeitet eine Nachricht und liefert (payload, status_code)
+        directory (str): Verzeichnis der Job-Datensätze
+        workers (int): Threads für die Verarbeitung
+        max_pending (int): Maximale Anzahl offener Jobs dieses Prozesses
+        ttl (float): Aufbewahrungsdauer abgeschlossener Jobs in Sekunden
+        job_deadline (float): Frist eines Jobs in Sekunden
+    """
+
+    def __init__(self, handler, directory=CHAT_JOB_DIR, workers=CHAT_JOB_WORKERS,
+                 max_pending=CHAT_JOB_MAX_PENDING, ttl=CHAT_JOB_TTL, job_deadline=CHAT_JOB_DEADLINE):
+        self.handler = handler
+        self.directory = directory
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.job_deadline = job_deadline
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chat-job")
+        self._lock = threading.Lock()
+        # Job-ID -> Event für Jobs dieses Prozesses, damit Long-Polls nicht abfragen müssen
+        self._events = {}
+        self._last_purge = 0.0
+        self.stats = {"submitted": 0, "deduplicated": 0, "rejected": 0, "completed": 0,
+                      "failed": 0, "purged": 0}
+
+    def _job_path(self, job_id):
+        return os.path.join(self.directory, f"job-{job_id}.json")
+
+    def _dedup_path(self, key):
+        return os.path.join(self.directory, f"dedup-{key}")
+
+    def _write(self, record):
+        """Schreibt einen Job-Datensatz atomar (andere Worker lesen nie halbe Dateien)."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".job-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, self._job_path(record["id"]))
+
+    def _read(self, job_id):
+        try:
+            with open(self._job_path(job_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_expired(self, record, now):
+        return now - (record.get("finished_at") or record["created_at"]) > self.ttl
+
+    def _claim(self, key, job_id):
+        """
+        Legt die Markierung für eine Anfrage exklusiv an.
+
+        Returns:
+            str: None, wenn die Markierung neu ist, sonst die ID des bestehenden Jobs
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._dedup_path(key)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            except FileExistsError:
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        existing_id = f.read().strip()
+                except OSError:
+                    continue
+                record = self._read(existing_id) if _JOB_ID_PATTERN.match(existing_id) else None
+                if record is not None and not self._is_expired(record, time.time()) \
+                        and record["status"] != FAILED:
+                    return existing_id
+                # Verwaiste, abgelaufene oder fehlgeschlagene Markierung ersetzen
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(job_id)
+            return None
+        return None
+
+    def submit(self, message, key):
+        """
+        Nimmt einen Chat-Job an oder liefert den bestehenden Job derselben Anfrage.
+
+        Args:
+            message (str): Nachricht des Nutzers
+            key (str): Schlüssel für die Zusammenfassung gleicher Anfragen (siehe dedup_key)
+
+        Returns:
+            tuple: (job_id, zusammengefasst)
+
+        Raises:
+            QueueFull: Wenn bereits max_pending Jobs dieses Prozesses offen sind
+        """
+        self._maybe_purge()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            if len(self._events) >= self.max_pending:
+                self.stats["rejected"] += 1
+                raise QueueFull(f"Maximal {self.max_pending} offene Chat-Jobs")
+            # Datensatz vor der Markierung schreiben: eine Markierung zeigt nie auf einen fehlenden Job
+            self._write({"id": job_id, "status": PENDING, "created_at": time.time(), "key": key})
+            existing_id = self._claim(key, job_id)
+            if existing_id is not None:
+                os.remove(self._job_path(job_id))
+                self.stats["deduplicated"] += 1
+                return existing_id, True
+            self._events[job_id] = threading.Event()
+            self.stats["submitted"] += 1
+
+        # Der Job läuft im Kontext der annehmenden Anfrage, damit z.B. ihr Trace fortgesetzt wird
+        self._executor.submit(contextvars.copy_context().run, self._run, job_id, message, key)
+        return job_id, False
+
+    def _run(self, job_id, message, key):
+        """Verarbeitet einen Job im Pool mit eigener Frist."""
+        record = self._read(job_id) or {"id": job_id, "created_at": time.time(), "key": key}
+        self._write({**record, "status": RUNNING, "started_at": time.time()})
+
+        token = set_deadline(self.job_deadline)
+        try:
+            payload, status_code = self.handler(message)
+        except Exception as e:
+            logger.error(f"Chat-Job {job_id} fehlgeschlagen: {e}")
+            payload, status_code = {"error": str(e)}, 500
+        finally:
+            reset_deadline(token)
+
+        status = DONE if status_code < 400 else FAILED
+        self._write({**record, "status": status, "finished_at": time.time(),
+                     "status_code": status_code, "result": payload})
+        if status == FAILED:
+            # Ein erneuter Versuch desselben Clients soll einen neuen Job starten
+            self._release_claim(key, job_id)
+
+        with self._lock:
+            self.stats["completed" if status == DONE else "failed"] += 1
+            event = self._events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def _release_claim(self, key, job_id):
+        path = self._dedup_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                if f.read().strip() != job_id:
+                    return
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, job_id):
+        """
+        Liefert den Datensatz eines Jobs.
+
+        Args:
+            job_id (str): ID aus submit()
+
+        Returns:
+            dict: Datensatz mit status und ggf. result/status_code oder None, wenn unbekannt oder abgelaufen
+        """
+        if not isinstance(job_id, str) or not _JOB_ID_PATTERN.match(job_id):
+            return None
+        record = self._read(job_id)
+        if record is None or self._is_expired(record, time.time()):
+            return None
+        return record
+
+    def wait(self, job_id, timeout):
+        """
+        Wartet bis zu `timeout` Sekunden auf das Ende eines Jobs (Long-Poll).
+
+        Args:
+            job_id (str): ID aus submit()
+            timeout (float): Maximale Wartezeit in Sekunden
+
+        Returns:
+            dict: Datensatz wie bei get() oder None, wenn unbekannt oder abgelaufen
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        with self._lock:
+            event = self._events.get(job_id)
+        if event is not None:
+            event.wait(timeout)
+            return self.get(job_id)
+
+        # Job eines anderen Workers: Datei in kurzen Abständen prüfen
+        while True:
+            record = self.get(job_id)
+            if record is None or record["status"] in (DONE, FAILED):
+                return record
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return record
+            time.sleep(min(_FOREIGN_POLL_INTERVAL, left))
+
+    def _maybe_purge(self):
+        now = time.time()
+        if now - self._last_purge < _PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        self.purge(now)
+
+    def purge(self, now=None):
+        """
+        Entfernt abgelaufene Job-Datensätze und Markierungen aus dem Verzeichnis.
+
+        Returns:
+            int: Anzahl entfernter Dateien
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            if not name.startswith(("job-", "dedup-", ".job-")):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+        with self._lock:
+            self.stats["purged"] += removed
+        return removed
+
+    def snapshot(self):
+        """
+        Liefert Kennzahlen der Job-Verarbeitung dieses Prozesses.
+
+        Returns:
+            dict: Offene Jobs, Grenzen und Zähler
+        """
+        with self._lock:
+            return {
+                "open": len(self._events),
+                "max_pending": self.max_pending,
+                "ttl": self.ttl,
+                **self.stats,
+            }
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Deadline Modul
+
+Jede /chat-Anfrage erhält am Eingang eine Frist (REQUEST_DEADLINE). Sie wird über
+eine ContextVar an trendlink_api und openai_client weitergegeben. Jeder Upstream-Aufruf
+erhält als Timeout das Minimum aus
+
+- der verbleibenden Zeit bis zur Frist und
+- einem adaptiven Timeout aus den zuletzt beobachteten Latenzen des Endpunkts
+  (Perzentil mal Faktor, begrenzt durch den bisherigen festen Timeout).
+
+Ist die Frist bereits abgelaufen, wird der Aufruf gar nicht erst gestartet.
+Überschreitungen werden pro Endpunkt gezählt und unter /metrics/deadlines ausgegeben.
+"""
+
+import os
+import time
+import logging
+import functools
+import threading
+import contextvars
+from collections import defaultdict
+
+from latency import get_tracker
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Gesamtbudget einer Anfrage in Sekunden (0 = keine Frist)
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "25"))
+# Perzentil der beobachteten Latenz, aus dem der adaptive Timeout berechnet wird
+ADAPTIVE_TIMEOUT_PERCENTILE = float(os.getenv("ADAPTIVE_TIMEOUT_PERCENTILE", "99"))
+# Faktor auf das Perzentil (Spielraum für Ausreißer)
+ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "2.0"))
+# Mindestanzahl an Beobachtungen, bevor der adaptive Timeout greift
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = int(os.getenv("ADAPTIVE_TIMEOUT_MIN_SAMPLES", "20"))
+# Untergrenze jedes Upstream-Timeouts in Sekunden
+ADAPTIVE_TIMEOUT_FLOOR = float(os.getenv("ADAPTIVE_TIMEOUT_FLOOR", "1.0"))
+
+# Absoluter Zeitpunkt (time.monotonic) der Frist der laufenden Anfrage
+_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+_counter_lock = threading.Lock()
+_counters = defaultdict(lambda: {"calls": 0, "capped_by_deadline": 0, "budget_exhausted": 0})
+_requests = {"total": 0, "over_deadline": 0}
+
+
+class DeadlineExceeded(Exception):
+    """Die Frist der Anfrage ist abgelaufen, bevor ein Upstream-Aufruf starten konnte."""
+
+
+def set_deadline(seconds):
+    """
+    Setzt die Frist der laufenden Anfrage.
+
+    Args:
+        seconds (float): Budget ab jetzt in Sekunden (None oder <= 0 = keine Frist)
+
+    Returns:
+        contextvars.Token: Token für reset_deadline()
+    """
+    deadline = time.monotonic() + seconds if seconds and seconds > 0 else None
+    return _deadline.set(deadline)
+
+
+def reset_deadline(token):
+    """Stellt die vorherige Frist wieder her."""
+    _deadline.reset(token)
+
+
+def remaining():
+    """
+    Verbleibende Zeit bis zur Frist.
+
+    Returns:
+        float: Sekunden (ggf. negativ) oder None, wenn keine Frist gesetzt ist
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def adaptive_timeout(endpoint, default):
+    """
+    Timeout eines Endpunkts aus seinen zuletzt beobachteten Latenzen.
+
+    Args:
+        endpoint (str): Name des Latenz-Trackers, z.B. "trendlink.curated"
+        default (float): Bisheriger fester Timeout; gilt als Obergrenze und bei zu wenigen Daten
+
+    Returns:
+        float: Timeout in Sekunden
+    """
+    tracker = get_tracker(endpoint)
+    if tracker.count() < ADAPTIVE_TIMEOUT_MIN_SAMPLES:
+        return default
+    observed = tracker.percentile(ADAPTIVE_TIMEOUT_PERCENTILE) * ADAPTIVE_TIMEOUT_MULTIPLIER
+    return min(default, max(ADAPTIVE_TIMEOUT_FLOOR, observed))
+
+
+def upstream_timeout(endpoint, default):
+    """
+    Timeout für den nächsten Aufruf eines Endpunkts innerhalb der Frist der Anfrage.
+
+    Args:
+        endpoint (str): Name des Latenz-Trackers
+        default (float): Bisheriger fester Timeout des Endpunkts
+
+    Returns:
+        float: Timeout in Sekunden
+
+    Raises:
+        DeadlineExceeded: Wenn die Frist bereits abgelaufen ist
+    """
+    timeout = adaptive_timeout(endpoint, default)
+    budget = remaining()
+
+    with _counter_lock:
+        counters = _counters[endpoint]
+        counters["calls"] += 1
+        if budget is not None and budget <= 0:
+            counters["budget_exhausted"] += 1
+            raise DeadlineExceeded(f"Frist abgelaufen vor Aufruf von {endpoint}")
+        if budget is not None and budget < timeout:
+            counters["capped_by_deadline"] += 1
+            timeout = budget
+    return timeout
+
+
+def with_deadline(view):
+    """
+    Decorator, der einer Flask-View die Frist REQUEST_DEADLINE setzt und
+    Überschreitungen zählt.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        token = set_deadline(REQUEST_DEADLINE)
+        try:
+            return view(*args, **kwargs)
+        finally:
+            left = remaining()
+            reset_deadline(token)
+            with _counter_lock:
+                _requests["total"] += 1
+                if left is not None and left < 0:
+                    _requests["over_deadline"] += 1
+            if left is not None and left < 0:
+                logger.warning(f"Anfrage hat die Frist um {-left:.2f}s überschritten")
+
+    return wrapper
+
+
+def snapshot():
+    """
+    Liefert die Zähler für Diagnosezwecke.
+
+    Returns:
+        dict: Frist, Anfragen (gesamt/überschritten) und Zähler pro Endpunkt
+    """
+    with _counter_lock:
+        return {
+            "deadline_seconds": REQUEST_DEADLINE,
+            "requests": dict(_requests),
+            "endpoints": {endpoint: dict(counters) for endpoint, counters in _counters.items()},
+        }
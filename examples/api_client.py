@@ -2,48 +2,58 @@
 """
 Ein einfacher API-Client für den Trendlink AI Chatbot.
 Dieses Skript demonstriert, wie man mit dem Chatbot über die API interagieren kann.
+
+Es verwendet den mitgelieferten Client trendlink_client (Verbindungspool, Wiederholung
+bei 429/5xx). Mehrere Fragen auf der Kommandozeile, getrennt durch "--", werden
+parallel gestellt:
+
+    python examples/api_client.py "Was ist der Trend KI?" -- "Wie hoch ist die Inflation?"
 """
 
-import requests
-import json
 import sys
 import os
 
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um trendlink_client zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trendlink_client import ChatClient
+
 # Konfiguration des API-Clients
-API_URL = "http://localhost:5000/chat"
-HEADERS = {
-    "Content-Type": "application/json"
-}
+API_BASE_URL = os.getenv("TRENDLINK_BOT_URL", "http://localhost:5000")
+API_KEY = os.getenv("TRENDLINK_BOT_API_KEY")
 
-def chat_with_bot(message):
+def chat_with_bot(client, message):
     """
     Sendet eine Nachricht an den Chatbot und gibt die Antwort zurück.
     
     Args:
+        client (ChatClient): Der API-Client
         message (str): Die Nachricht an den Chatbot
         
     Returns:
         dict: Die JSON-Antwort des Chatbots
     """
     try:
-        payload = {
-            "message": message
-        }
-        
-        response = requests.post(
-            API_URL,
-            headers=HEADERS,
-            data=json.dumps(payload)
-        )
-        
-        response.raise_for_status()
-        return response.json()
-    
-    except requests.exceptions.RequestException as e:
+        return client.chat(message)
+    except Exception as e:
         print(f"Fehler bei der API-Anfrage: {e}")
         return None
 
-def interactive_chat():
+def print_response(response):
+    """
+    Gibt eine Antwort des Chatbots aus.
+    """
+    if isinstance(response, Exception):
+        print(f"Fehler bei der API-Anfrage: {response}")
+    elif response:
+        print(f"\n{response['response']}")
+        
+        if response.get("has_trend_data"):
+            print("\n[Mit Trendlink-Daten angereichert]")
+    else:
+        print("\nKeine Antwort vom Server erhalten.")
+
+def interactive_chat(client):
     """
     Startet eine interaktive Chat-Sitzung mit dem Chatbot in der Konsole.
     """
@@ -59,39 +69,40 @@ def interactive_chat():
             break
         
         print("\nBot antwortet...")
-        response = chat_with_bot(user_input)
-        
-        if response:
-            print(f"\n{response['response']}")
-            
-            if response.get("trendlink_data_included"):
-                print("\n[Mit Trendlink-Daten angereichert]")
+        print_response(chat_with_bot(client, user_input))
+
+def split_questions(args):
+    """
+    Teilt die Kommandozeilenargumente an "--" in einzelne Fragen auf.
+    """
+    questions, current = [], []
+    for arg in args + ["--"]:
+        if arg == "--":
+            if current:
+                questions.append(" ".join(current))
+            current = []
         else:
-            print("\nKeine Antwort vom Server erhalten.")
+            current.append(arg)
+    return questions
 
 def main():
     """
     Hauptfunktion des Skripts
     """
-    # Prüfen, ob ein Argument übergeben wurde
-    if len(sys.argv) > 1:
-        # Singleshot-Modus: Eine Frage stellen und beenden
-        question = " ".join(sys.argv[1:])
-        print(f"Frage: {question}")
-        print("Antwort wird abgerufen...")
-        
-        response = chat_with_bot(question)
-        
-        if response:
-            print(f"\n{response['response']}")
+    with ChatClient(API_BASE_URL, api_key=API_KEY) as client:
+        # Prüfen, ob ein Argument übergeben wurde
+        if len(sys.argv) > 1:
+            # Singleshot-Modus: Fragen (parallel) stellen und beenden
+            questions = split_questions(sys.argv[1:])
+            print("Antworten werden abgerufen...")
             
-            if response.get("trendlink_data_included"):
-                print("\n[Mit Trendlink-Daten angereichert]")
+            responses = client.chat_many(questions, concurrency=4, return_exceptions=True)
+            for question, response in zip(questions, responses):
+                print(f"\nFrage: {question}")
+                print_response(response)
         else:
-            print("Keine Antwort vom Server erhalten.")
-    else:
-        # Interaktiver Modus
-        interactive_chat()
+            # Interaktiver Modus
+            interactive_chat(client)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
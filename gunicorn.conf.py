@@ -0,0 +1,52 @@
+"""
+Gunicorn-Konfiguration für den Produktionsbetrieb.
+
+Die App wird einmal im Master geladen (preload_app), danach werden schwere Module
+und der Trend-Katalog vorgewärmt und die Objekte für den GC eingefroren, bevor die
+Worker geforkt werden. So starten Worker ohne kalte Caches und teilen sich den
+Speicher copy-on-write.
+
+Start: gunicorn -c gunicorn.conf.py app:app
+"""
+
+import gc
+import os
+import time
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+# Threads pro Worker: offene Push-Verbindungen (/events/curated-trends) belegen je
+# einen Thread, daher muss PUSH_MAX_SUBSCRIBERS deutlich kleiner sein
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+preload_app = True
+
+# Während des Ladens im Master keine GC-Läufe: sie würden nur Objekte verschieben,
+# die ohnehin gleich eingefroren werden
+gc.disable()
+_config_loaded_at = time.perf_counter()
+
+
+def when_ready(server):
+    """Läuft im Master nach dem Preload der App und vor dem Fork der Worker."""
+    import startup
+
+    startup.record_timing("load:app", time.perf_counter() - _config_loaded_at)
+    startup.warm_up()
+    startup.freeze_for_fork()
+    startup.report()
+
+
+def post_fork(server, worker):
+    """Läuft in jedem Worker direkt nach dem Fork."""
+    gc.enable()
+
+    # Speicherdiagnose ab dem Fork, damit /admin/memory/diff das Wachstum des Workers zeigt
+    import memory_diagnostics
+    if memory_diagnostics.MEMORY_TRACE_AT_START:
+        memory_diagnostics.start_tracing()
+
+    # Katalog im Hintergrund aktuell halten (nur Änderungen, siehe trend_sync)
+    from trendlink_api import get_trend_sync
+    get_trend_sync().start()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Instrument Index Modul
+
+Umgekehrter Index von Instrumenten auf die Trends, in denen sie enthalten sind. Die
+Trendlink API führt Instrumente nur über ihre ISIN; für Fragen wie "In welchen Trends
+ist DE0007164600 enthalten?" müsste sonst bei jeder Anfrage die Instrumentliste jedes
+Trends durchsucht werden.
+
+Der Index wird zusammen mit dem Trend-Katalog (trend_catalogue) aufgebaut und bei
+upsert()/remove() inkrementell angepasst. Pro ISIN werden nur Trend-ID und Position in
+der InstrumentTable des Trends gespeichert; Gewichtung und nice-Flag werden beim
+Nachschlagen aus der Tabelle gelesen. WKNs liefert die API nicht, sie sind aber in
+deutschen ISINs enthalten (DE000 + WKN + Prüfziffer) und werden daraus abgeleitet.
+"""
+
+import re
+import logging
+from collections import namedtuple
+
+from trend_model import ISIN_LENGTH
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ISIN (ISO 6166): Ländercode, neun alphanumerische Zeichen, Prüfziffer
+ISIN_PATTERN = re.compile(r'\b([A-Za-z]{2}[A-Za-z0-9]{9}[0-9])\b')
+# WKN: sechs alphanumerische Zeichen, nur zusammen mit dem Stichwort "WKN" erkannt
+WKN_PATTERN = re.compile(r'\bwkn\b[\s:.-]*([A-Za-z0-9]{6})\b', re.IGNORECASE)
+# Präfix deutscher ISINs, die die WKN enthalten
+_WKN_ISIN_PREFIX = "DE000"
+
+ISIN = "isin"
+WKN = "wkn"
+
+Membership = namedtuple("Membership", ["trend", "weighting", "nice"])
+
+
+def wkn_from_isin(isin):
+    """
+    Leitet die WKN aus einer deutschen ISIN ab.
+
+    Args:
+        isin (str): ISIN, z.B. "DE0007164600"
+
+    Returns:
+        str: WKN (z.B. "716460") oder None, wenn die ISIN keine WKN enthält
+    """
+    if isin and len(isin) == ISIN_LENGTH and isin.startswith(_WKN_ISIN_PREFIX):
+        return isin[5:11]
+    return None
+
+
+def extract_identifiers(message):
+    """
+    Findet ISINs und mit "WKN" gekennzeichnete WKNs in einer Nachricht.
+
+    Kandidaten für ISINs müssen mindestens eine Ziffer vor der Prüfziffer enthalten oder
+    in Großbuchstaben geschrieben sein, damit gewöhnliche Wörter nicht als ISIN gelten.
+
+    Args:
+        message (str): Die Nachricht des Nutzers
+
+    Returns:
+        list: Tupel (ISIN oder WKN, Kennung in Großbuchstaben) in der Reihenfolge der Nachricht
+    """
+    found = []
+    for match in WKN_PATTERN.finditer(message):
+        found.append((match.start(1), WKN, match.group(1).upper()))
+    for match in ISIN_PATTERN.finditer(message):
+        candidate = match.group(1)
+        if not (candidate.isupper() or any(char.isdigit() for char in candidate[2:11])):
+            continue
+        found.append((match.start(1), ISIN, candidate.upper()))
+
+    identifiers = []
+    for _, kind, value in sorted(found):
+        if (kind, value) not in identifiers:
+            identifiers.append((kind, value))
+    return identifiers
+
+
+class InstrumentIndex:
+    """
+    Index ISIN -> {Trend-ID: Position des Instruments im Trend} und WKN -> ISIN.
+
+    Nicht threadsicher; TrendCatalogue ruft alle Methoden unter seiner Sperre auf.
+    """
+
+    def __init__(self, trends=()):
+        self._by_isin = {}
+        self._by_wkn = {}
+        for trend in trends:
+            self.add(trend)
+
+    def add(self, trend):
+        """
+        Nimmt alle Instrumente eines Trends in den Index auf.
+
+        Args:
+            trend (Trend): Trend mit ID
+        """
+        if trend.id is None:
+            return
+        instruments = trend.instruments
+        for position in range(len(instruments)):
+            isin = instruments.isin(position)
+            if not isin:
+                continue
+            entries = self._by_isin.get(isin)
+            if entries is None:
+                entries = self._by_isin[isin] = {}
+                wkn = wkn_from_isin(isin)
+                if wkn is not None:
+                    self._by_wkn[wkn] = isin
+            # Bei doppelten Einträgen in einem Trend zählt der erste
+            entries.setdefault(trend.id, position)
+
+    def discard(self, trend):
+        """
+        Entfernt alle Instrumente eines Trends aus dem Index.
+
+        Args:
+            trend (Trend): Zuvor mit add() aufgenommener Trend
+        """
+        if trend is None or trend.id is None:
+            return
+        instruments = trend.instruments
+        for position in range(len(instruments)):
+            isin = instruments.isin(position)
+            entries = self._by_isin.get(isin)
+            if entries is None or entries.pop(trend.id, None) is None or entries:
+                continue
+            del self._by_isin[isin]
+            wkn = wkn_from_isin(isin)
+            if wkn is not None and self._by_wkn.get(wkn) == isin:
+                del self._by_wkn[wkn]
+
+    def resolve(self, kind, value):
+        """
+        Liefert die ISIN zu einer Kennung.
+
+        Args:
+            kind (str): ISIN oder WKN
+            value (str): Kennung in Großbuchstaben
+
+        Returns:
+            str: ISIN oder None, wenn die Kennung im Katalog nicht vorkommt
+        """
+        if kind == WKN:
+            return self._by_wkn.get(value)
+        return value if value in self._by_isin else None
+
+    def positions(self, isin):
+        """
+        Liefert die Trends, die eine ISIN enthalten.
+
+        Args:
+            isin (str): ISIN
+
+        Returns:
+            dict: Trend-ID -> Position des Instruments in der InstrumentTable des Trends
+        """
+        return dict(self._by_isin.get(isin, ()))
+
+    def __len__(self):
+        return len(self._by_isin)
+
+    def wkn_count(self):
+        """Anzahl der aus deutschen ISINs abgeleiteten WKNs."""
+        return len(self._by_wkn)
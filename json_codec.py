@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+JSON Codec Modul
+
+Einheitliche JSON-Kodierung für Upstream-Antworten und API-Antworten. Ist `orjson`
+installiert, wird es verwendet (deutlich schneller beim Parsen großer Kataloge und
+beim Serialisieren der Antworten), sonst das `json`-Modul der Standardbibliothek.
+Beide Wege liefern kompaktes UTF-8-JSON ohne ASCII-Escapes.
+
+Verwendet von:
+
+- trendlink_api (kuratierte Trends) und openai_client (Fallback ohne SDK) zum Parsen
+- trend_push für die SSE-Nachrichten
+- Flask über CodecJSONProvider (jsonify und request.get_json)
+
+Das inkrementelle Lesen von `/v2/trends` (trend_stream) nutzt weiterhin
+json.JSONDecoder.raw_decode, da orjson keine Teilstücke eines Streams dekodieren kann.
+"""
+
+import os
+import json
+import logging
+
+from flask.json.provider import DefaultJSONProvider
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Zu verwendender Codec: "auto" (orjson, falls installiert), "orjson" oder "stdlib"
+JSON_CODEC = os.getenv("JSON_CODEC", "auto").lower()
+
+
+def _load_orjson():
+    """Importiert orjson, sofern erlaubt und installiert."""
+    if JSON_CODEC == "stdlib":
+        return None
+    try:
+        import orjson
+    except ImportError:
+        if JSON_CODEC == "orjson":
+            logger.warning("JSON_CODEC=orjson, aber orjson ist nicht installiert - verwende json")
+        return None
+    return orjson
+
+
+_orjson = _load_orjson()
+
+
+def codec_name():
+    """
+    Name des aktiven Codecs.
+
+    Returns:
+        str: "orjson" oder "json"
+    """
+    return "orjson" if _orjson is not None else "json"
+
+
+def loads(data):
+    """
+    Dekodiert JSON.
+
+    Args:
+        data (bytes | str): JSON-Text, z.B. response.content
+
+    Returns:
+        object: Dekodierte Daten
+
+    Raises:
+        ValueError: Wenn die Daten kein gültiges JSON sind
+    """
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj, default, sort_keys):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default, sort_keys=sort_keys)
+
+
+def dumps_bytes(obj, default=None, sort_keys=False):
+    """
+    Serialisiert kompakt als UTF-8-Bytes.
+
+    Datumswerte und Dataclasses werden wie bei der Standardbibliothek an default
+    übergeben, damit beide Codecs dieselbe Ausgabe erzeugen.
+
+    Args:
+        obj (object): Zu serialisierende Daten
+        default (callable): Wandelt sonst nicht serialisierbare Objekte um
+        sort_keys (bool): Schlüssel sortieren
+
+    Returns:
+        bytes: JSON
+
+    Raises:
+        TypeError: Wenn ein Objekt nicht serialisierbar ist
+    """
+    if _orjson is not None:
+        option = _orjson.OPT_NON_STR_KEYS | _orjson.OPT_PASSTHROUGH_DATETIME | _orjson.OPT_PASSTHROUGH_DATACLASS
+        if sort_keys:
+            option |= _orjson.OPT_SORT_KEYS
+        try:
+            return _orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # z.B. Ganzzahlen über 64 Bit, die nur die Standardbibliothek kodiert
+            pass
+    return _stdlib_dumps(obj, default, sort_keys).encode("utf-8")
+
+
+def dumps(obj, default=None, sort_keys=False):
+    """
+    Serialisiert kompakt als Text.
+
+    Args:
+        obj (object): Zu serialisierende Daten
+        default (callable): Wandelt sonst nicht serialisierbare Objekte um
+        sort_keys (bool): Schlüssel sortieren
+
+    Returns:
+        str: JSON
+    """
+    if _orjson is not None:
+        return dumps_bytes(obj, default, sort_keys).decode("utf-8")
+    return _stdlib_dumps(obj, default, sort_keys)
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    """
+    Flask-JSON-Provider auf Basis von dumps_bytes() und loads().
+
+    Verhält sich wie der Standard-Provider (gleiche default-Umwandlung, sortierte
+    Schlüssel, eingerückte Ausgabe im Debug-Modus), schreibt kompakte Antworten aber
+    direkt als Bytes. Nicht-ASCII-Zeichen werden nicht escaped.
+    """
+
+    def dumps(self, obj, **kwargs):
+        # Nur kompakte Ausgaben laufen über den Codec, alles andere (z.B. indent) über json
+        if set(kwargs) - {"separators"}:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, default=self.default, sort_keys=self.sort_keys)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps_bytes(obj, default=self.default, sort_keys=self.sort_keys) + b"\n"
+        return self._app.response_class(body, mimetype=self.mimetype)
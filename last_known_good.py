@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Last Known Good Modul
+
+Speichert die letzte erfolgreiche Antwort jedes Trendlink-Datensatzes, den die App
+verwendet (kuratierte Trends, Instrumente pro Trend). Schlägt ein Upstream-Aufruf
+fehl, wird sofort der gespeicherte Stand ausgeliefert, solange er nicht älter als
+LKG_MAX_STALENESS Sekunden ist. Das Alter der Daten wird an den Aufrufer
+zurückgegeben, damit es im Prompt und in der Antwort ausgewiesen werden kann.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LKG_ENABLED = os.getenv("LKG_ENABLED", "true").lower() == "true"
+# Maximales Alter gespeicherter Daten in Sekunden, danach wird der Fehler weitergereicht
+LKG_MAX_STALENESS = float(os.getenv("LKG_MAX_STALENESS", "21600"))
+# Maximale Anzahl gespeicherter Datensätze (älteste werden zuerst verdrängt)
+LKG_MAX_ENTRIES = int(os.getenv("LKG_MAX_ENTRIES", "512"))
+
+
+class NoData(str):
+    """
+    Text-Ergebnis ohne Trend-Daten (z.B. "kein Trend gefunden").
+
+    Wird wie ein normaler String an den Aufrufer geliefert, aber nicht als letzter
+    bekannter Stand gespeichert, damit bei einem Ausfall keine Fehlermeldung als
+    gültige Daten ausgeliefert wird.
+    """
+
+
+class LastKnownGoodStore:
+    """
+    Speicher für die letzte erfolgreiche Antwort pro (Datensatz, Schlüssel).
+
+    Args:
+        max_staleness (float): Maximales Alter in Sekunden, bis zu dem Daten ausgeliefert werden
+        max_entries (int): Maximale Anzahl gespeicherter Einträge
+    """
+
+    def __init__(self, max_staleness=LKG_MAX_STALENESS, max_entries=LKG_MAX_ENTRIES):
+        self.max_staleness = max_staleness
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"stored": 0, "served_stale": 0, "too_stale": 0, "missing": 0}
+
+    def put(self, dataset, key, value, now=None):
+        """Speichert eine erfolgreiche Antwort."""
+        with self._lock:
+            self._entries[(dataset, key)] = (value, time.time() if now is None else now)
+            self._entries.move_to_end((dataset, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats["stored"] += 1
+
+    def get(self, dataset, key, now=None):
+        """
+        Liefert die gespeicherte Antwort, sofern sie nicht zu alt ist.
+
+        Returns:
+            tuple: (wert, alter_in_sekunden) oder None
+        """
+        with self._lock:
+            entry = self._entries.get((dataset, key))
+            if entry is None:
+                self.stats["missing"] += 1
+                return None
+            value, stored_at = entry
+            age = (time.time() if now is None else now) - stored_at
+            if age > self.max_staleness:
+                self.stats["too_stale"] += 1
+                return None
+            self.stats["served_stale"] += 1
+            return value, age
+
+    def fetch(self, dataset, key, func, *args, **kwargs):
+        """
+        Ruft func auf und greift bei einem Fehler auf den letzten bekannten Stand zurück.
+
+        Args:
+            dataset (str): Name des Datensatzes, z.B. "trendlink.curated_trends"
+            key (str): Schlüssel innerhalb des Datensatzes, z.B. der Trendname
+            func (callable): Upstream-Aufruf
+            *args, **kwargs: Argumente für func
+
+        Returns:
+            tuple: (wert, alter_in_sekunden) - das Alter ist None bei frischen Daten
+
+        Raises:
+            Exception: Der ursprüngliche Fehler, wenn kein ausreichend aktueller Stand vorliegt
+        """
+        try:
+            value = func(*args, **kwargs)
+        except Exception as e:
+            if not LKG_ENABLED:
+                raise
+            stored = self.get(dataset, key)
+            if stored is None:
+                raise
+            logger.warning(
+                f"Upstream-Fehler für {dataset} ({key}): {e} - liefere gespeicherte Daten "
+                f"(Alter {stored[1]:.0f} s)"
+            )
+            return stored
+
+        if LKG_ENABLED and not isinstance(value, NoData):
+            self.put(dataset, key, value)
+        return value, None
+
+    def snapshot(self):
+        """
+        Liefert Kennzahlen und das Alter der gespeicherten Datensätze.
+
+        Returns:
+            dict: Zähler, Anzahl Einträge und maximales Alter in Sekunden
+        """
+        now = time.time()
+        with self._lock:
+            ages = [now - stored_at for _, stored_at in self._entries.values()]
+            return {
+                "entries": len(ages),
+                "oldest_seconds": round(max(ages), 1) if ages else None,
+                "max_staleness": self.max_staleness,
+                **self.stats,
+            }
+
+
+# Prozessweiter Speicher
+_store = LastKnownGoodStore()
+
+
+def get_store():
+    """
+    Liefert den prozessweiten Last-Known-Good-Speicher.
+
+    Returns:
+        LastKnownGoodStore: Der Speicher
+    """
+    return _store
+
+
+def describe_age(seconds):
+    """
+    Beschreibt ein Datenalter in lesbarer Form für Prompt und Antwort.
+
+    Args:
+        seconds (float): Alter in Sekunden
+
+    Returns:
+        str: z.B. "45 Sekunden", "12 Minuten" oder "3 Stunden"
+    """
+    if seconds < 120:
+        return f"{int(seconds)} Sekunden"
+    if seconds < 2 * 3600:
+        return f"{int(seconds // 60)} Minuten"
+    return f"{int(seconds // 3600)} Stunden"
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Latency Tracking Modul
+
+Dieses Modul sammelt beobachtete Latenzen und Fehler pro Upstream-Endpunkt in
+einem gleitenden Fenster und berechnet daraus Perzentile und Fehlerraten.
+Die Werte dienen als Grundlage für adaptive Entscheidungen (z.B. Hedging).
+"""
+
+import math
+import threading
+from collections import deque
+
+# Standardgröße des gleitenden Fensters (Anzahl Beobachtungen)
+DEFAULT_WINDOW = 200
+
+
+class LatencyTracker:
+    """
+    Thread-sichere Sammlung der letzten Latenzen eines Endpunkts.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+
+    def record(self, seconds, ok=True):
+        """
+        Speichert eine Beobachtung.
+
+        Args:
+            seconds (float): Gemessene Dauer in Sekunden
+            ok (bool): False, wenn der Aufruf fehlgeschlagen ist
+        """
+        with self._lock:
+            if ok:
+                self._latencies.append(seconds)
+            self._outcomes.append(ok)
+
+    def percentile(self, p):
+        """
+        Berechnet das p-te Perzentil der erfolgreichen Latenzen (Nearest-Rank).
+
+        Args:
+            p (float): Perzentil zwischen 0 und 100
+
+        Returns:
+            float: Latenz in Sekunden oder None, wenn noch keine Daten vorliegen
+        """
+        with self._lock:
+            values = sorted(self._latencies)
+        if not values:
+            return None
+        index = min(len(values) - 1, max(0, math.ceil(p / 100.0 * len(values)) - 1))
+        return values[index]
+
+    def count(self):
+        """Anzahl der erfolgreichen Beobachtungen im Fenster."""
+        with self._lock:
+            return len(self._latencies)
+
+    def error_rate(self):
+        """
+        Anteil fehlgeschlagener Aufrufe im Fenster.
+
+        Returns:
+            float: Fehlerrate zwischen 0 und 1 (0, wenn keine Daten vorliegen)
+        """
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def snapshot(self):
+        """
+        Liefert eine kompakte Zusammenfassung für Diagnosezwecke.
+
+        Returns:
+            dict: Anzahl, p50, p95, p99 und Fehlerrate
+        """
+        return {
+            "count": self.count(),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "error_rate": self.error_rate(),
+        }
+
+
+_trackers = {}
+_trackers_lock = threading.Lock()
+
+
+def get_tracker(name):
+    """
+    Liefert den prozessweiten Tracker für einen Endpunkt und legt ihn bei Bedarf an.
+
+    Args:
+        name (str): Name des Endpunkts (z.B. "openai.chat")
+
+    Returns:
+        LatencyTracker: Tracker für den Endpunkt
+    """
+    with _trackers_lock:
+        tracker = _trackers.get(name)
+        if tracker is None:
+            tracker = LatencyTracker()
+            _trackers[name] = tracker
+        return tracker
+
+
+def all_snapshots():
+    """
+    Liefert die Zusammenfassungen aller bekannten Tracker.
+
+    Returns:
+        dict: Endpunktname -> Zusammenfassung
+    """
+    with _trackers_lock:
+        items = list(_trackers.items())
+    return {name: tracker.snapshot() for name, tracker in items}
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Memory Diagnostics Modul
+
+Speicherdiagnose für laufende Gunicorn-Worker ohne Neustart oder Redeploy:
+
+- tracemalloc pro Worker starten und stoppen
+- benannte Snapshots aufnehmen und die wichtigsten Allokationsstellen bzw. den
+  Unterschied zwischen zwei Snapshots ausgeben
+- RSS des Prozesses, GC-Objektzähler nach Typ und die Größe der App-Caches melden
+
+Jeder Worker ist ein eigener Prozess; alle Antworten enthalten daher die PID, damit
+Messungen demselben Worker zugeordnet werden können. Mit MEMORY_TRACE_AT_START
+läuft tracemalloc in jedem Worker ab dem Fork.
+"""
+
+import gc
+import os
+import sys
+import time
+import logging
+import threading
+import tracemalloc
+from collections import Counter, OrderedDict
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# tracemalloc direkt nach dem Fork jedes Workers starten
+MEMORY_TRACE_AT_START = os.getenv("MEMORY_TRACE_AT_START", "false").lower() == "true"
+# Anzahl gespeicherter Frames pro Allokation (mehr Frames = mehr Overhead)
+MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", "10"))
+# Maximale Anzahl aufbewahrter Snapshots pro Worker (älteste werden verworfen)
+MEMORY_MAX_SNAPSHOTS = int(os.getenv("MEMORY_MAX_SNAPSHOTS", "4"))
+
+GROUP_BY = ("lineno", "filename", "traceback")
+
+# Allokationen von tracemalloc selbst und vom Import-System ausblenden
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+_lock = threading.Lock()
+_snapshots = OrderedDict()
+_caches = {}
+
+
+class TracingNotActive(Exception):
+    """tracemalloc läuft in diesem Worker nicht."""
+
+
+class UnknownSnapshot(Exception):
+    """Ein angefragter Snapshot existiert in diesem Worker nicht."""
+
+
+def register_cache(name, describe):
+    """
+    Meldet einen Cache der App für den Speicherbericht an.
+
+    Args:
+        name (str): Name im Bericht, z.B. "last_known_good"
+        describe (callable): Liefert ein Dictionary mit Kennzahlen (z.B. Anzahl Einträge)
+    """
+    _caches[name] = describe
+
+
+def start_tracing(frames=None):
+    """
+    Startet tracemalloc in diesem Worker.
+
+    Args:
+        frames (int): Anzahl gespeicherter Frames pro Allokation (Standard: MEMORY_TRACE_FRAMES)
+
+    Returns:
+        dict: Status wie bei tracing_status()
+    """
+    with _lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames or MEMORY_TRACE_FRAMES)
+            logger.info(f"tracemalloc gestartet (PID {os.getpid()}, {tracemalloc.get_traceback_limit()} Frames)")
+    return tracing_status()
+
+
+def stop_tracing():
+    """
+    Stoppt tracemalloc und verwirft alle Snapshots dieses Workers.
+
+    Returns:
+        dict: Status wie bei tracing_status()
+    """
+    with _lock:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info(f"tracemalloc gestoppt (PID {os.getpid()})")
+        _snapshots.clear()
+    return tracing_status()
+
+
+def tracing_status():
+    """
+    Liefert den tracemalloc-Status dieses Workers.
+
+    Returns:
+        dict: pid, tracing, frames, aktuell/maximal verfolgte Bytes und Snapshot-Namen
+    """
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+    return {
+        "pid": os.getpid(),
+        "tracing": tracing,
+        "frames": tracemalloc.get_traceback_limit() if tracing else None,
+        "traced_bytes": current,
+        "traced_peak_bytes": peak,
+        "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+        "snapshots": list(_snapshots),
+    }
+
+
+def _take_snapshot():
+    if not tracemalloc.is_tracing():
+        raise TracingNotActive("tracemalloc läuft nicht; zuerst starten")
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+def take_snapshot(name=None):
+    """
+    Nimmt einen benannten Snapshot auf und bewahrt ihn für spätere Vergleiche auf.
+
+    Args:
+        name (str): Name des Snapshots (Standard: Zeitstempel)
+
+    Returns:
+        dict: Name, Zeitpunkt und Summe der verfolgten Bytes
+
+    Raises:
+        TracingNotActive: Wenn tracemalloc nicht läuft
+    """
+    snapshot = _take_snapshot()
+    name = name or time.strftime("%H%M%S")
+    with _lock:
+        _snapshots.pop(name, None)
+        _snapshots[name] = (time.time(), snapshot)
+        while len(_snapshots) > MEMORY_MAX_SNAPSHOTS:
+            _snapshots.popitem(last=False)
+    return {
+        "pid": os.getpid(),
+        "name": name,
+        "taken_at": round(time.time(), 3),
+        "traced_bytes": sum(stat.size for stat in snapshot.statistics("filename")),
+    }
+
+
+def _get_snapshot(name):
+    with _lock:
+        entry = _snapshots.get(name)
+    if entry is None:
+        raise UnknownSnapshot(f"Snapshot '{name}' existiert in Worker {os.getpid()} nicht")
+    return entry[1]
+
+
+def _format_stat(stat, group_by):
+    frames = stat.traceback if group_by == "traceback" else stat.traceback[:1]
+    entry = {
+        "size_bytes": stat.size,
+        "count": stat.count,
+        "where": [f"{frame.filename}:{frame.lineno}" for frame in frames],
+    }
+    if hasattr(stat, "size_diff"):
+        entry["size_diff_bytes"] = stat.size_diff
+        entry["count_diff"] = stat.count_diff
+    return entry
+
+
+def top_allocations(limit=20, group_by="lineno"):
+    """
+    Liefert die Stellen mit dem meisten belegten Speicher.
+
+    Args:
+        limit (int): Anzahl der Einträge
+        group_by (str): "lineno", "filename" oder "traceback"
+
+    Returns:
+        dict: pid und Liste der Allokationsstellen (Bytes, Anzahl Blöcke, Ort)
+
+    Raises:
+        TracingNotActive: Wenn tracemalloc nicht läuft
+        ValueError: Bei unbekanntem group_by
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by muss einer von {', '.join(GROUP_BY)} sein")
+    stats = _take_snapshot().statistics(group_by)
+    return {
+        "pid": os.getpid(),
+        "group_by": group_by,
+        "total_bytes": sum(stat.size for stat in stats),
+        "top": [_format_stat(stat, group_by) for stat in stats[:limit]],
+    }
+
+
+def diff_snapshots(base, target=None, limit=20, group_by="lineno"):
+    """
+    Vergleicht zwei Snapshots und liefert die Stellen mit dem größten Zuwachs.
+
+    Args:
+        base (str): Name des älteren Snapshots
+        target (str): Name des neueren Snapshots (Standard: jetzt aufgenommener Snapshot)
+        limit (int): Anzahl der Einträge
+        group_by (str): "lineno", "filename" oder "traceback"
+
+    Returns:
+        dict: pid, Gesamtzuwachs und Liste der Stellen nach Zuwachs sortiert
+
+    Raises:
+        TracingNotActive: Wenn tracemalloc nicht läuft
+        UnknownSnapshot: Wenn ein Snapshot nicht existiert
+        ValueError: Bei unbekanntem group_by
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"group_by muss einer von {', '.join(GROUP_BY)} sein")
+    base_snapshot = _get_snapshot(base)
+    target_snapshot = _get_snapshot(target) if target else _take_snapshot()
+    stats = target_snapshot.compare_to(base_snapshot, group_by)
+    return {
+        "pid": os.getpid(),
+        "base": base,
+        "target": target or "jetzt",
+        "group_by": group_by,
+        "total_diff_bytes": sum(stat.size_diff for stat in stats),
+        "top": [_format_stat(stat, group_by) for stat in stats[:limit]],
+    }
+
+
+def rss_bytes():
+    """
+    Aktueller Resident Set Size des Prozesses.
+
+    Returns:
+        int: Bytes oder None, wenn das System ihn nicht liefert
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Nur der Höchststand ist verfügbar (Linux: KiB, macOS: Bytes)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def object_counts(limit=20):
+    """
+    Zählt die vom GC verfolgten Objekte nach Typ.
+
+    Args:
+        limit (int): Anzahl der häufigsten Typen
+
+    Returns:
+        dict: Gesamtzahl, Zähler der GC-Generationen und die häufigsten Typen
+    """
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+    return {
+        "total": sum(counts.values()),
+        "gc_generations": list(gc.get_count()),
+        "gc_frozen": gc.get_freeze_count(),
+        "top_types": dict(counts.most_common(limit)),
+    }
+
+
+def cache_report():
+    """
+    Liefert die Kennzahlen aller registrierten Caches.
+
+    Returns:
+        dict: Name -> Kennzahlen bzw. Fehlermeldung
+    """
+    report = {}
+    for name, describe in sorted(_caches.items()):
+        try:
+            report[name] = describe()
+        except Exception as e:
+            report[name] = {"error": str(e)}
+    return report
+
+
+def memory_report():
+    """
+    Übersicht über den Speicher dieses Workers.
+
+    Returns:
+        dict: pid, RSS, tracemalloc-Status und Caches
+    """
+    return {
+        "pid": os.getpid(),
+        "rss_bytes": rss_bytes(),
+        "tracemalloc": tracing_status(),
+        "caches": cache_report(),
+    }
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Model Routing Modul
+
+Dieses Modul wählt pro Anfrage das OpenAI-Modell und das Token-Limit aus.
+Einfache Anfragen, die nur injizierte Trend-Daten wiedergeben, werden an ein
+schnelleres, günstigeres Modell geleitet; offene Analysefragen bleiben bei GPT-4,
+solange dessen aktuelles Latenz- und Fehlerbudget eingehalten wird.
+"""
+
+import os
+import logging
+import threading
+from collections import deque, namedtuple
+from datetime import datetime
+
+from latency import get_tracker
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Routing-Richtlinie, überschreibbar über Umgebungsvariablen
+MODEL_ROUTING_ENABLED = os.getenv("MODEL_ROUTING_ENABLED", "true").lower() == "true"
+MODEL_PRIMARY = os.getenv("MODEL_PRIMARY", "gpt-4")
+MODEL_PRIMARY_MAX_TOKENS = int(os.getenv("MODEL_PRIMARY_MAX_TOKENS", "800"))
+MODEL_FAST = os.getenv("MODEL_FAST", "gpt-3.5-turbo")
+MODEL_FAST_MAX_TOKENS = int(os.getenv("MODEL_FAST_MAX_TOKENS", "500"))
+# Anfragetypen, deren Antwort im Wesentlichen die injizierten Daten wiedergibt
+MODEL_FAST_QUERY_TYPES = {
+    query_type.strip()
+    for query_type in os.getenv("MODEL_FAST_QUERY_TYPES", "trend_instruments,curated_trends,instrument_trends").split(",")
+    if query_type.strip()
+}
+# Längere Nutzerfragen gelten als offene Analyse und bleiben beim Hauptmodell
+MODEL_FAST_MAX_QUESTION_CHARS = int(os.getenv("MODEL_FAST_MAX_QUESTION_CHARS", "200"))
+# Sehr große Prompts werden nicht an das schnelle Modell gegeben
+MODEL_FAST_MAX_PROMPT_CHARS = int(os.getenv("MODEL_FAST_MAX_PROMPT_CHARS", "24000"))
+# Live-Budget des Hauptmodells: p95-Latenz in Sekunden und Fehlerrate
+MODEL_PRIMARY_LATENCY_BUDGET = float(os.getenv("MODEL_PRIMARY_LATENCY_BUDGET", "20"))
+MODEL_PRIMARY_ERROR_BUDGET = float(os.getenv("MODEL_PRIMARY_ERROR_BUDGET", "0.25"))
+# Mindestanzahl Beobachtungen, bevor das Budget bewertet wird
+MODEL_BUDGET_MIN_SAMPLES = int(os.getenv("MODEL_BUDGET_MIN_SAMPLES", "20"))
+
+RoutingDecision = namedtuple(
+    "RoutingDecision",
+    ["model", "max_tokens", "reason", "query_type", "prompt_chars", "timestamp"]
+)
+
+# Die letzten Entscheidungen für Diagnosezwecke
+_recent_decisions = deque(maxlen=int(os.getenv("MODEL_ROUTING_HISTORY", "200")))
+_decisions_lock = threading.Lock()
+
+
+def latency_tracker_name(model):
+    """
+    Liefert den Namen des Latenz-Trackers für ein Modell.
+
+    Args:
+        model (str): Modellname
+
+    Returns:
+        str: Trackername, z.B. "openai.chat.gpt-4"
+    """
+    return f"openai.chat.{model}"
+
+
+def _primary_over_budget():
+    """
+    Prüft, ob das Hauptmodell sein Latenz- oder Fehlerbudget überschreitet.
+
+    Returns:
+        str: Grund der Überschreitung oder None
+    """
+    tracker = get_tracker(latency_tracker_name(MODEL_PRIMARY))
+    if tracker.count() < MODEL_BUDGET_MIN_SAMPLES:
+        return None
+
+    p95 = tracker.percentile(95)
+    if p95 is not None and p95 > MODEL_PRIMARY_LATENCY_BUDGET:
+        return f"primary_latency_p95={p95:.2f}s"
+
+    error_rate = tracker.error_rate()
+    if error_rate > MODEL_PRIMARY_ERROR_BUDGET:
+        return f"primary_error_rate={error_rate:.2f}"
+
+    return None
+
+
+def route_request(query_type, user_message, system_prompt):
+    """
+    Wählt Modell und Token-Limit für eine Anfrage.
+
+    Args:
+        query_type (str): Erkannter Anfragetyp (z.B. "trend_instruments", "general_finance")
+        user_message (str): Die Nachricht des Nutzers
+        system_prompt (str): Der vollständige System-Prompt inklusive Trend-Daten
+
+    Returns:
+        RoutingDecision: Gewähltes Modell, max_tokens und Begründung
+    """
+    prompt_chars = len(system_prompt) + len(user_message)
+
+    if not MODEL_ROUTING_ENABLED:
+        model, max_tokens, reason = MODEL_PRIMARY, MODEL_PRIMARY_MAX_TOKENS, "routing_disabled"
+    elif (query_type in MODEL_FAST_QUERY_TYPES
+          and len(user_message) <= MODEL_FAST_MAX_QUESTION_CHARS
+          and prompt_chars <= MODEL_FAST_MAX_PROMPT_CHARS):
+        model, max_tokens, reason = MODEL_FAST, MODEL_FAST_MAX_TOKENS, "data_restatement"
+    else:
+        over_budget = _primary_over_budget()
+        if over_budget and prompt_chars <= MODEL_FAST_MAX_PROMPT_CHARS:
+            model, max_tokens, reason = MODEL_FAST, MODEL_FAST_MAX_TOKENS, over_budget
+        else:
+            model, max_tokens, reason = MODEL_PRIMARY, MODEL_PRIMARY_MAX_TOKENS, "open_ended"
+
+    decision = RoutingDecision(
+        model=model,
+        max_tokens=max_tokens,
+        reason=reason,
+        query_type=query_type,
+        prompt_chars=prompt_chars,
+        timestamp=datetime.now().isoformat()
+    )
+    with _decisions_lock:
+        _recent_decisions.append(decision)
+    logger.info(f"Model-Routing: {model} (max_tokens={max_tokens}, Grund: {reason}, "
+                f"Typ: {query_type}, Prompt: {prompt_chars} Zeichen)")
+    return decision
+
+
+def recent_decisions():
+    """
+    Liefert die zuletzt getroffenen Routing-Entscheidungen.
+
+    Returns:
+        list: Liste von Dictionaries, älteste zuerst
+    """
+    with _decisions_lock:
+        return [decision._asdict() for decision in _recent_decisions]
@@ -8,25 +8,311 @@ Kompatibel mit OpenAI SDK 1.12.0.
 """
 
 import os
+import time
 import logging
-import httpx
-from openai import OpenAI
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from latency import get_tracker
+from model_router import latency_tracker_name
+from deadline import upstream_timeout, remaining
+from usage_accounting import get_accountant, set_query_type, reset_query_type
+import tracing
+import json_codec
+from openai_limiter import get_limiter, estimate_tokens
+
+# Standardmodell und Token-Limit, falls der Aufrufer nichts anderes vorgibt
+DEFAULT_MODEL = "gpt-4"
+DEFAULT_MAX_TOKENS = 800
+
+# Obergrenze des Timeouts eines Completion-Aufrufs in Sekunden; innerhalb einer Anfrage wird
+# er durch die beobachteten Latenzen und die verbleibende Frist weiter verkürzt
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_FALLBACK_TIMEOUT = 30.0
 
 # Logger konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_gpt_response(user_input, system_prompt):
+# Hedging-Konfiguration: Zweite, identische Anfrage, wenn die erste zu lange dauert
+OPENAI_HEDGE_ENABLED = os.getenv("OPENAI_HEDGE_ENABLED", "false").lower() == "true"
+# Perzentil der beobachteten Latenz, nach dem die zweite Anfrage gesendet wird
+OPENAI_HEDGE_PERCENTILE = float(os.getenv("OPENAI_HEDGE_PERCENTILE", "95"))
+# Mindestanzahl an Beobachtungen, bevor überhaupt gehedgt wird
+OPENAI_HEDGE_MIN_SAMPLES = int(os.getenv("OPENAI_HEDGE_MIN_SAMPLES", "20"))
+# Untergrenze für die Verzögerung der zweiten Anfrage in Sekunden
+OPENAI_HEDGE_MIN_DELAY = float(os.getenv("OPENAI_HEDGE_MIN_DELAY", "1.0"))
+# Maximaler Anteil gehedgter Anfragen im gleitenden Fenster (Kostenbegrenzung)
+OPENAI_HEDGE_MAX_RATE = float(os.getenv("OPENAI_HEDGE_MAX_RATE", "0.1"))
+# Größe des Fensters, über das der Hedge-Anteil berechnet wird
+OPENAI_HEDGE_WINDOW = int(os.getenv("OPENAI_HEDGE_WINDOW", "200"))
+
+# Gemeinsamer Thread-Pool für gehedgte Anfragen
+_hedge_executor = ThreadPoolExecutor(max_workers=int(os.getenv("OPENAI_HEDGE_POOL_SIZE", "16")),
+                                     thread_name_prefix="openai-hedge")
+
+# Gleitendes Fenster: True für Anfragen, die gehedgt wurden
+_hedge_history = deque(maxlen=OPENAI_HEDGE_WINDOW)
+_hedge_lock = threading.Lock()
+
+def _hedge_allowed():
     """
-    Sendet eine Anfrage an die OpenAI API und liefert die Antwort des GPT-4-Modells zurück.
+    Prüft, ob das Hedge-Budget eine weitere zweite Anfrage erlaubt.
+    
+    Returns:
+        bool: True, wenn der Hedge-Anteil im Fenster unter OPENAI_HEDGE_MAX_RATE liegt
+    """
+    with _hedge_lock:
+        if not _hedge_history:
+            return OPENAI_HEDGE_MAX_RATE > 0
+        return sum(_hedge_history) / len(_hedge_history) < OPENAI_HEDGE_MAX_RATE
+
+def _completion_latency(model):
+    """Liefert den Latenz-Tracker für Chat-Completions eines Modells."""
+    return get_tracker(latency_tracker_name(model))
+
+def _hedge_delay(model):
+    """
+    Ermittelt, nach wie vielen Sekunden die zweite Anfrage gesendet wird.
+    
+    Args:
+        model (str): Modellname, dessen Latenzhistorie verwendet wird
+        
+    Returns:
+        float: Verzögerung in Sekunden oder None, wenn noch zu wenige Daten vorliegen
+    """
+    tracker = _completion_latency(model)
+    if tracker.count() < OPENAI_HEDGE_MIN_SAMPLES:
+        return None
+    return max(OPENAI_HEDGE_MIN_DELAY, tracker.percentile(OPENAI_HEDGE_PERCENTILE))
+
+class _Attempt:
+    """Zustand eines einzelnen Completion-Aufrufs, damit er abgebrochen werden kann."""
+    
+    __slots__ = ("client", "cancelled")
+    
+    def __init__(self):
+        self.client = None
+        self.cancelled = False
+    
+    def cancel(self):
+        """Schließt die HTTP-Verbindung des Aufrufs (Best Effort)."""
+        self.cancelled = True
+        if self.client is not None:
+            try:
+                self.client.close()
+            except Exception as e:
+                logger.debug(f"Fehler beim Abbrechen einer Hedge-Anfrage: {e}")
+
+def _classify_error(error):
+    """
+    HTTP-Status eines fehlgeschlagenen Aufrufs für die Wiederholungsentscheidung.
+    
+    Args:
+        error (Exception): Vom OpenAI SDK geworfener Fehler
+        
+    Returns:
+        tuple: (status_code, headers, wiederholbar); status_code ist None bei Verbindungsfehlern
+    """
+    from openai import APIStatusError, APIConnectionError
+    if isinstance(error, APIStatusError):
+        return error.status_code, error.response.headers, True
+    # APITimeoutError ist eine Unterklasse von APIConnectionError
+    return None, None, isinstance(error, APIConnectionError)
+
+def _create_completion(api_key, messages, model, max_tokens, attempt=None):
+    """
+    Führt einen Completion-Aufruf aus und misst dessen Latenz.
+    
+    Der Aufruf läuft über den prozessweiten OpenAILimiter: er wartet, bis ein Platz und
+    genügend Rate-Limit-Budget frei sind, und wird nach 429- oder 5xx-Antworten mit
+    Backoff wiederholt, solange die Frist der Anfrage es erlaubt.
+    
+    Args:
+        api_key (str): Der OpenAI API-Schlüssel
+        messages (list): Liste von Nachrichten für die API
+        model (str): Zu verwendendes Modell
+        max_tokens (int): Maximale Anzahl Tokens der Antwort
+        attempt (_Attempt): Optionaler Zustand, über den der Aufruf abgebrochen werden kann
+        
+    Returns:
+        str: Die Textantwort des Modells
+        
+    Raises:
+        DeadlineExceeded: Wenn die Frist vor dem Start eines Versuchs abläuft
+    """
+    attempt = attempt or _Attempt()
+    
+    # Das OpenAI SDK wird erst beim ersten Aufruf importiert (schnellerer Start);
+    # im Produktionsbetrieb lädt startup.warm_up() es bereits im Master vor dem Fork
+    from openai import OpenAI
+    
+    # Wiederholungen übernimmt der Limiter, nicht das SDK: nur er kennt die Frist
+    # und das gemeinsame Budget aller Threads
+    client = OpenAI(api_key=api_key, timeout=OPENAI_TIMEOUT, max_retries=0)
+    attempt.client = client
+    
+    limiter = get_limiter()
+    tokens = estimate_tokens(messages, max_tokens)
+    tracker = _completion_latency(model)
+    retries = 0
+    with tracing.span("openai chat.completions", kind=tracing.CLIENT,
+                      **{"llm.model": model, "llm.max_tokens": max_tokens}) as span:
+        while True:
+            with limiter.slot(tokens, remaining()) as waited:
+                if waited > 0.001:
+                    span.set_attribute("llm.queue_ms", round(waited * 1000, 1))
+                timeout = upstream_timeout(latency_tracker_name(model), OPENAI_TIMEOUT)
+                start = time.monotonic()
+                try:
+                    raw = client.chat.completions.with_raw_response.create(
+                        model=model,
+                        messages=messages,
+                        temperature=0.7,
+                        max_tokens=max_tokens,
+                        timeout=timeout
+                    )
+                    limiter.observe(raw.headers)
+                    response = raw.parse()
+                    break
+                except Exception as e:
+                    error = e
+                    # Abgebrochene Hedge-Aufrufe zählen nicht als Fehler des Endpunkts
+                    if attempt.cancelled:
+                        span.set_attribute("llm.cancelled", True)
+                        raise
+                    elapsed = time.monotonic() - start
+                    tracker.record(elapsed, ok=False)
+                    get_accountant().record(model, elapsed, ok=False)
+                    
+                    status_code, headers, retryable = _classify_error(e)
+                    limiter.observe(headers)
+                    delay = limiter.retry_delay(status_code, retries, headers) if retryable else None
+                    budget = remaining()
+                    if delay is None or (budget is not None and budget <= delay):
+                        raise
+            
+            retries += 1
+            span.set_attribute("llm.retries", retries)
+            logger.warning(f"OpenAI-Aufruf fehlgeschlagen ({status_code or type(error).__name__}), "
+                           f"Wiederholung {retries} in {delay:.2f}s")
+            time.sleep(delay)
+            if attempt.cancelled:
+                raise error
+        
+        usage = getattr(response, "usage", None)
+        span.set_attribute("llm.prompt_tokens", getattr(usage, "prompt_tokens", None))
+        span.set_attribute("llm.completion_tokens", getattr(usage, "completion_tokens", None))
+    elapsed = time.monotonic() - start
+    tracker.record(elapsed)
+    
+    # Token-Verbrauch erfassen; ohne Streaming wird keine Time-to-first-Token gemessen
+    get_accountant().record(
+        model, elapsed,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0),
+        completion_tokens=getattr(usage, "completion_tokens", 0)
+    )
+    
+    # Antwort extrahieren und zurückgeben
+    return response.choices[0].message.content
+
+def _hedged_completion(api_key, messages, model, max_tokens):
+    """
+    Sendet die Anfrage und bei Bedarf eine zweite, identische Anfrage.
+    
+    Liegt nach dem konfigurierten Perzentil der zuletzt beobachteten Latenz noch
+    keine Antwort vor und erlaubt das Hedge-Budget es, wird eine zweite Anfrage
+    gesendet. Die zuerst erfolgreich beendete Anfrage gewinnt, die andere wird
+    abgebrochen.
+    
+    Args:
+        api_key (str): Der OpenAI API-Schlüssel
+        messages (list): Liste von Nachrichten für die API
+        model (str): Zu verwendendes Modell
+        max_tokens (int): Maximale Anzahl Tokens der Antwort
+        
+    Returns:
+        str: Die Textantwort des Modells
+    """
+    delay = _hedge_delay(model)
+    primary_attempt = _Attempt()
+    # Die Aufrufe laufen im Kontext der Anfrage, damit ihre Frist gilt
+    primary = _hedge_executor.submit(contextvars.copy_context().run, _create_completion,
+                                     api_key, messages, model, max_tokens, primary_attempt)
+    
+    if delay is not None:
+        wait([primary], timeout=delay)
+    
+    if delay is None or primary.done() or not _hedge_allowed():
+        with _hedge_lock:
+            _hedge_history.append(False)
+        return primary.result()
+    
+    with _hedge_lock:
+        _hedge_history.append(True)
+    logger.info(f"Keine Antwort nach {delay:.2f}s - sende Hedge-Anfrage an OpenAI")
+    hedge_attempt = _Attempt()
+    hedge = _hedge_executor.submit(contextvars.copy_context().run, _create_completion,
+                                   api_key, messages, model, max_tokens, hedge_attempt)
+    
+    # Jede Anfrage verweist auf den Versuch, der bei ihrem Sieg abgebrochen wird
+    pending = {primary: hedge_attempt, hedge: primary_attempt}
+    error = None
+    while pending:
+        done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        for future in done:
+            other_attempt = pending.pop(future)
+            if future.exception() is None:
+                if pending:
+                    other_attempt.cancel()
+                return future.result()
+            error = future.exception()
+    
+    # Beide Anfragen sind fehlgeschlagen
+    raise error
+
+def _request_completion(api_key, messages, model, max_tokens):
+    """
+    Führt den Completion-Aufruf aus, mit oder ohne Hedging je nach Konfiguration.
+    
+    Args:
+        api_key (str): Der OpenAI API-Schlüssel
+        messages (list): Liste von Nachrichten für die API
+        model (str): Zu verwendendes Modell
+        max_tokens (int): Maximale Anzahl Tokens der Antwort
+        
+    Returns:
+        str: Die Textantwort des Modells
+    """
+    if OPENAI_HEDGE_ENABLED:
+        return _hedged_completion(api_key, messages, model, max_tokens)
+    return _create_completion(api_key, messages, model, max_tokens)
+
+def get_gpt_response(user_input, system_prompt, model=DEFAULT_MODEL, max_tokens=DEFAULT_MAX_TOKENS,
+                     query_type=None):
+    """
+    Sendet eine Anfrage an die OpenAI API und liefert die Antwort des Modells zurück.
     
     Args:
         user_input (str): Die Benutzereingabe, die an das Modell gesendet werden soll
         system_prompt (str): Der Systemkontext, der dem Modell die Rolle und Verhaltensweise vorgibt
+        model (str): Zu verwendendes Modell (Standard: gpt-4)
+        max_tokens (int): Maximale Anzahl Tokens der Antwort (Standard: 800)
+        query_type (str): Art der Anfrage, der Token-Verbrauch und Latenz zugeordnet werden
         
     Returns:
         str: Die Textantwort des Modells oder eine Fehlermeldung
     """
+    token = set_query_type(query_type)
+    try:
+        return _get_gpt_response(user_input, system_prompt, model, max_tokens)
+    finally:
+        reset_query_type(token)
+
+def _get_gpt_response(user_input, system_prompt, model, max_tokens):
+    """Führt get_gpt_response() aus, nachdem der query_type gesetzt wurde."""
     try:
         # API-Key aus Umgebungsvariable holen
         api_key = os.getenv("OPENAI_API_KEY")
@@ -35,9 +321,6 @@ def get_gpt_response(user_input, system_prompt):
             logger.error(error_message)
             return error_message
         
-        # OpenAI Client mit minimaler Konfiguration initialisieren
-        client = OpenAI(api_key=api_key)
-        
         # Nachrichten formatieren
         messages = [
             {"role": "system", "content": system_prompt},
@@ -45,16 +328,8 @@ def get_gpt_response(user_input, system_prompt):
         ]
         
         # API-Anfrage senden
-        logger.info("Sende Anfrage an OpenAI API...")
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=800
-        )
-        
-        # Antwort extrahieren und zurückgeben
-        return response.choices[0].message.content
+        logger.info(f"Sende Anfrage an OpenAI API (Modell: {model})...")
+        return _request_completion(api_key, messages, model, max_tokens)
         
     except Exception as e:
         # Fehlerbehandlung mit detaillierter Diagnose
@@ -67,14 +342,14 @@ def get_gpt_response(user_input, system_prompt):
             try:
                 # Direkter Aufruf ohne OpenAI-Client als Fallback
                 # Diese Methode verwendet keine Proxies oder andere Systemkonfigurationen
-                return fallback_gpt_request(api_key, messages)
+                return fallback_gpt_request(api_key, messages, model, max_tokens)
             except Exception as fallback_error:
                 logger.error(f"Auch alternativer Ansatz fehlgeschlagen: {fallback_error}")
                 error_message += "\n\nAlternativer Ansatz wurde ebenfalls versucht, war aber auch nicht erfolgreich."
         
         return error_message
 
-def fallback_gpt_request(api_key, messages):
+def fallback_gpt_request(api_key, messages, model=DEFAULT_MODEL, max_tokens=DEFAULT_MAX_TOKENS):
     """
     Fallback-Methode, die direkt mit der OpenAI API kommuniziert, wenn der reguläre Client fehlschlägt.
     Diese Methode vermeidet Proxy-Probleme, indem sie einen eigenen HTTP-Client verwendet.
@@ -82,34 +357,53 @@ def fallback_gpt_request(api_key, messages):
     Args:
         api_key (str): Der OpenAI API-Schlüssel
         messages (list): Liste von Nachrichten für die API
+        model (str): Zu verwendendes Modell
+        max_tokens (int): Maximale Anzahl Tokens der Antwort
         
     Returns:
         str: Die Textantwort des Modells
     """
-    import json
+    # httpx wird nur für diesen selten genutzten Fallback benötigt
+    import httpx
     
     # HTTP-Client ohne Proxy-Einstellungen erstellen
-    with httpx.Client(proxies=None, timeout=30.0) as client:
+    timeout = upstream_timeout(latency_tracker_name(model), OPENAI_FALLBACK_TIMEOUT)
+    limiter = get_limiter()
+    with limiter.slot(estimate_tokens(messages, max_tokens), remaining()), \
+            httpx.Client(proxies=None, timeout=timeout) as client, \
+            tracing.span("openai POST /v1/chat/completions", kind=tracing.CLIENT,
+                         **{"llm.model": model, "llm.fallback": True}) as span:
         # Direkten API-Aufruf durchführen
+        start = time.monotonic()
         response = client.post(
             "https://api.openai.com/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
             },
-            json={
-                "model": "gpt-4",
+            content=json_codec.dumps_bytes({
+                "model": model,
                 "messages": messages,
                 "temperature": 0.7,
-                "max_tokens": 800
-            }
+                "max_tokens": max_tokens
+            })
         )
+        span.set_attribute("http.status_code", response.status_code)
+        limiter.observe(response.headers)
         
         # Fehler bei HTTP-Status überprüfen
         response.raise_for_status()
         
         # JSON-Antwort parsen
-        result = response.json()
+        result = json_codec.loads(response.content)
+        usage = result.get("usage") or {}
+        span.set_attribute("llm.prompt_tokens", usage.get("prompt_tokens"))
+        span.set_attribute("llm.completion_tokens", usage.get("completion_tokens"))
+        get_accountant().record(
+            model, time.monotonic() - start,
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0)
+        )
         
         # Inhalt extrahieren
         if "choices" in result and len(result["choices"]) > 0:
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+OpenAI Limiter Modul
+
+Prozessweiter Begrenzer für ausgehende OpenAI-Aufrufe. Ohne ihn feuert bei Lastspitzen
+jeder Thread jedes Workers gleichzeitig GPT-4-Anfragen ab und erhält 429-Antworten.
+
+- Höchstens OPENAI_MAX_CONCURRENCY Aufrufe laufen gleichzeitig, weitere warten in der Schlange.
+- Aus den Antwort-Headern x-ratelimit-remaining-/reset-requests und -tokens wird das
+  Restbudget der Organisation übernommen. Reicht es für den nächsten Aufruf nicht
+  (geschätzte Prompt-Tokens plus max_tokens), wartet der Aufruf bis zum Reset.
+- Nach einer 429-Antwort pausieren alle Aufrufe des Prozesses bis zum Ende von
+  retry-after, statt das Limit gemeinsam weiter zu überschreiten.
+- retry_delay() liefert für Wiederholungen einen exponentiellen Backoff mit Jitter.
+
+Gewartet wird immer nur innerhalb der Frist der Anfrage (deadline.remaining()); wäre
+sie vor dem frühestmöglichen Start abgelaufen, schlägt acquire() sofort mit
+DeadlineExceeded fehl. Die Zustände gelten pro Prozess (Gunicorn-Worker), das Budget aus
+den Headern ist aber das der gesamten Organisation und damit für alle Worker gleich.
+"""
+
+import os
+import re
+import time
+import random
+import logging
+import threading
+from contextlib import contextmanager
+
+from deadline import DeadlineExceeded
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Maximale Anzahl gleichzeitiger OpenAI-Aufrufe pro Worker-Prozess
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "4"))
+# Maximale Anzahl Wiederholungen nach 429- oder 5xx-Antworten
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "4"))
+# Basis des exponentiellen Backoffs in Sekunden
+OPENAI_RETRY_BACKOFF = float(os.getenv("OPENAI_RETRY_BACKOFF", "0.5"))
+# Obergrenze einer einzelnen Wartezeit zwischen zwei Versuchen in Sekunden
+OPENAI_RETRY_MAX_BACKOFF = float(os.getenv("OPENAI_RETRY_MAX_BACKOFF", "8"))
+# Längste retry-after-Vorgabe nach 429, die noch abgewartet wird; längere führen sofort zum Fehler
+OPENAI_RETRY_AFTER_MAX = float(os.getenv("OPENAI_RETRY_AFTER_MAX", "60"))
+
+# Grobe Schätzung für Prompt-Tokens: ein Token entspricht etwa vier Zeichen
+CHARS_PER_TOKEN = 4
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value):
+    """
+    Liest die Dauer aus einem x-ratelimit-reset-*-Header.
+
+    Args:
+        value (str): Dauer wie "1s", "6m0s", "20ms" oder "1h2m3.5s"
+
+    Returns:
+        float: Sekunden oder None, wenn der Wert nicht lesbar ist
+    """
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value.strip())
+    if not parts:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(headers):
+    """
+    Liest die von OpenAI vorgegebene Wartezeit nach einer 429-Antwort.
+
+    Args:
+        headers (Mapping): Antwort-Header
+
+    Returns:
+        float: Sekunden oder None, wenn kein verwertbarer Header vorhanden ist
+    """
+    for name, factor in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * factor)
+        except ValueError:
+            continue
+    return None
+
+
+def estimate_tokens(messages, max_tokens):
+    """
+    Schätzt den Token-Verbrauch eines Aufrufs, so wie OpenAI ihn gegen das Limit rechnet.
+
+    Args:
+        messages (list): Nachrichten der Anfrage
+        max_tokens (int): Maximale Anzahl Tokens der Antwort
+
+    Returns:
+        int: Geschätzte Prompt-Tokens plus max_tokens
+    """
+    chars = sum(len(message.get("content") or "") for message in messages)
+    return chars // CHARS_PER_TOKEN + (max_tokens or 0)
+
+
+class _Budget:
+    """Restbudget einer Limit-Art (Anfragen oder Tokens) laut letzter Antwort."""
+
+    __slots__ = ("limit", "remaining", "reset_at")
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+
+    def update(self, limit, remaining, reset, now):
+        if limit is not None:
+            self.limit = limit
+        if remaining is not None:
+            self.remaining = remaining
+            self.reset_at = now + reset if reset is not None else None
+
+    def wait_for(self, amount, now):
+        """Sekunden, bis amount verfügbar ist (0 = sofort)."""
+        if self.reset_at is not None and now >= self.reset_at:
+            # Fenster abgelaufen: bis zur nächsten Antwort gilt das volle Limit
+            self.remaining = self.limit
+            self.reset_at = None
+        if self.remaining is None or self.remaining >= amount or self.reset_at is None:
+            return 0.0
+        return self.reset_at - now
+
+    def reserve(self, amount):
+        if self.remaining is not None:
+            self.remaining -= amount
+
+    def snapshot(self, now):
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_in": None if self.reset_at is None else round(max(0.0, self.reset_at - now), 3),
+        }
+
+
+def _int_header(headers, name):
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class OpenAILimiter:
+    """
+    Begrenzt gleichzeitige OpenAI-Aufrufe und hält sie unter dem Rate-Limit-Budget.
+
+    Args:
+        max_concurrency (int): Maximale Anzahl gleichzeitiger Aufrufe
+        max_retries (int): Maximale Anzahl Wiederholungen pro Aufruf
+        backoff (float): Basis des exponentiellen Backoffs in Sekunden
+        max_backoff (float): Obergrenze einer einzelnen Wartezeit in Sekunden
+    """
+
+    def __init__(self, max_concurrency=OPENAI_MAX_CONCURRENCY, max_retries=OPENAI_MAX_RETRIES,
+                 backoff=OPENAI_RETRY_BACKOFF, max_backoff=OPENAI_RETRY_MAX_BACKOFF,
+                 retry_after_max=OPENAI_RETRY_AFTER_MAX):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_after_max = retry_after_max
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._waiting = 0
+        self._paused_until = 0.0
+        self._requests = _Budget()
+        self._tokens = _Budget()
+        self._stats = {"calls": 0, "queued": 0, "queue_seconds": 0.0, "rejected": 0,
+                       "rate_limited": 0, "server_errors": 0, "retries": 0}
+
+    def _blocked_for(self, tokens, now):
+        """Sekunden bis zum nächsten möglichen Start; None = warten auf einen freien Platz."""
+        wait = max(0.0, self._paused_until - now,
+                   self._requests.wait_for(1, now), self._tokens.wait_for(tokens, now))
+        if wait > 0:
+            return wait
+        if self._in_flight >= self.max_concurrency:
+            return None
+        return 0.0
+
+    def acquire(self, tokens=0, timeout=None):
+        """
+        Wartet auf einen freien Platz und ausreichendes Budget.
+
+        Args:
+            tokens (int): Geschätzter Token-Verbrauch des Aufrufs
+            timeout (float): Maximale Wartezeit in Sekunden (None = unbegrenzt)
+
+        Returns:
+            float: Gewartete Zeit in Sekunden
+
+        Raises:
+            DeadlineExceeded: Wenn innerhalb von timeout kein Start möglich ist
+        """
+        start = time.monotonic()
+        give_up_at = None if timeout is None else start + timeout
+        with self._cond:
+            self._waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._blocked_for(tokens, now)
+                    if wait == 0:
+                        break
+                    if give_up_at is not None and (now >= give_up_at or
+                                                   (wait is not None and now + wait > give_up_at)):
+                        self._stats["rejected"] += 1
+                        raise DeadlineExceeded("Frist läuft ab, bevor das OpenAI-Limit einen Aufruf erlaubt")
+                    if wait is None and give_up_at is not None:
+                        wait = give_up_at - now
+                    self._cond.wait(wait)
+            finally:
+                self._waiting -= 1
+
+            waited = time.monotonic() - start
+            self._in_flight += 1
+            self._requests.reserve(1)
+            self._tokens.reserve(tokens)
+            self._stats["calls"] += 1
+            if waited > 0.001:
+                self._stats["queued"] += 1
+                self._stats["queue_seconds"] += waited
+        return waited
+
+    def release(self):
+        """Gibt den Platz eines beendeten Aufrufs frei."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, tokens=0, timeout=None):
+        """
+        Kontextmanager um acquire() und release().
+
+        Yields:
+            float: Gewartete Zeit in Sekunden
+        """
+        waited = self.acquire(tokens, timeout)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def observe(self, headers):
+        """
+        Übernimmt das Restbudget aus den x-ratelimit-*-Headern einer Antwort.
+
+        Args:
+            headers (Mapping): Antwort-Header (auch von Fehlerantworten)
+        """
+        if not headers:
+            return
+        now = time.monotonic()
+        with self._cond:
+            for kind, budget in (("requests", self._requests), ("tokens", self._tokens)):
+                budget.update(_int_header(headers, f"x-ratelimit-limit-{kind}"),
+                              _int_header(headers, f"x-ratelimit-remaining-{kind}"),
+                              parse_reset(headers.get(f"x-ratelimit-reset-{kind}")), now)
+            self._cond.notify_all()
+
+    def retry_delay(self, status_code, retries, headers=None):
+        """
+        Wartezeit vor der nächsten Wiederholung eines fehlgeschlagenen Aufrufs.
+
+        Nach einer 429-Antwort gilt die Pause für alle Aufrufe des Prozesses. Eine
+        retry-after-Vorgabe wird nie verkürzt: Ist sie länger als retry_after_max, wird
+        nicht wiederholt (die Pause gilt trotzdem für die übrigen Aufrufe).
+
+        Args:
+            status_code (int): HTTP-Status der Fehlerantwort (None bei Verbindungsfehlern)
+            retries (int): Anzahl bisheriger Wiederholungen dieses Aufrufs
+            headers (Mapping): Header der Fehlerantwort
+
+        Returns:
+            float: Sekunden oder None, wenn nicht wiederholt werden soll
+        """
+        if status_code is not None and status_code != 429 and status_code < 500:
+            return None
+
+        # Full Jitter: verteilt die Wiederholungen gleichzeitig gescheiterter Aufrufe
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** retries)))
+        retry_after = parse_retry_after(headers or {}) if status_code == 429 else None
+        if retry_after is not None:
+            delay = retry_after + random.uniform(0, self.backoff)
+        give_up = retries >= self.max_retries or (retry_after is not None and retry_after > self.retry_after_max)
+        with self._cond:
+            if status_code == 429:
+                self._stats["rate_limited"] += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            elif status_code is not None:
+                self._stats["server_errors"] += 1
+            if give_up:
+                return None
+            self._stats["retries"] += 1
+        return delay
+
+    def snapshot(self):
+        """
+        Liefert Zustand und Zähler für Diagnosezwecke.
+
+        Returns:
+            dict: Konfiguration, laufende/wartende Aufrufe, Budgets und Zähler
+        """
+        now = time.monotonic()
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queue_seconds"] = round(stats["queue_seconds"], 3)
+            return {
+                "max_concurrency": self.max_concurrency,
+                "max_retries": self.max_retries,
+                "retry_after_max": self.retry_after_max,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "paused_for": round(max(0.0, self._paused_until - now), 3),
+                "requests": self._requests.snapshot(now),
+                "tokens": self._tokens.snapshot(now),
+                "stats": stats,
+            }
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+    """
+    Liefert den Begrenzer dieses Prozesses.
+
+    Returns:
+        OpenAILimiter: Prozessweite Instanz
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = OpenAILimiter()
+    return _limiter
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+Portfolio Exposure Modul
+
+Berechnet für ein Portfolio (ISINs bzw. WKNs mit Gewichten) das Exposure gegenüber
+jedem Trend des In-Memory-Katalogs.
+
+Aus den Instrumentlisten aller Trends wird einmal pro Katalog-Version eine dünn besetzte
+Matrix Trends x Instrumente aufgebaut (spaltenweise wie CSC: Zeilenindex, Gewichtungs-
+Faktor und nice-Flag je Eintrag, Spaltenzeiger je ISIN). Eine Auswertung berührt danach
+nur die Einträge der gehaltenen ISINs und kommt ohne Python-Schleife über Trends oder
+Instrumente aus (searchsorted, repeat, bincount):
+
+- exposure: Anteil des Portfoliogewichts, der im Trend enthalten ist
+- weighted_exposure: dasselbe, gewichtet mit der Gewichtung des Instruments im Trend
+- coverage: Anteil der Instrumente des Trends, die im Portfolio gehalten werden
+- overlap: gemeinsames Gewicht je Paar der Trends mit dem höchsten Exposure
+- concentration: Herfindahl-Index der Exposure-Verteilung über die Trends
+
+Da ein Instrument in mehreren Trends enthalten sein kann, addieren sich die Exposures
+nicht zu 1; die Konzentration wird daher über die normierte Verteilung berechnet.
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from trend_model import ISIN_LENGTH
+from instrument_index import extract_identifiers, ISIN, WKN
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Maximale Anzahl Positionen pro Portfolio
+PORTFOLIO_MAX_POSITIONS = int(os.getenv("PORTFOLIO_MAX_POSITIONS", "5000"))
+# Anzahl der Trends mit dem höchsten Exposure in Antwort und Prompt
+PORTFOLIO_TOP_TRENDS = int(os.getenv("PORTFOLIO_TOP_TRENDS", "10"))
+# Höchster Wert für "top" in einer Anfrage
+PORTFOLIO_MAX_TOP = int(os.getenv("PORTFOLIO_MAX_TOP", "100"))
+# Anzahl der Trend-Paare mit der größten Überschneidung
+PORTFOLIO_TOP_OVERLAPS = int(os.getenv("PORTFOLIO_TOP_OVERLAPS", "5"))
+# Anzahl der Trends mit dem höchsten Exposure, unter denen Überschneidungen gesucht werden
+PORTFOLIO_OVERLAP_TRENDS = int(os.getenv("PORTFOLIO_OVERLAP_TRENDS", "10"))
+# Faktoren für weighted_exposure je Gewichtung (high, normal, low)
+PORTFOLIO_WEIGHTING_FACTORS = tuple(
+    float(factor) for factor in os.getenv("PORTFOLIO_WEIGHTING_FACTORS", "1.0,0.6,0.3").split(",")
+)
+
+# Höchstens so viele nicht gefundene Kennungen werden in der Antwort aufgeführt
+_MAX_UNMATCHED_LISTED = 50
+
+_WEIGHT_PATTERN = re.compile(r'(-?\d+(?:[.,]\d+)?)\s*(%?)')
+
+Position = namedtuple("Position", ["kind", "identifier", "weight"])
+
+
+class PortfolioError(ValueError):
+    """Das übergebene Portfolio ist ungültig."""
+
+
+def _parse_weight(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        match = _WEIGHT_PATTERN.fullmatch(value.strip())
+        if not match:
+            raise PortfolioError(f"Ungültiges Gewicht: {value!r}")
+        value = match.group(1).replace(",", ".")
+    try:
+        weight = float(value)
+    except (TypeError, ValueError):
+        raise PortfolioError(f"Ungültiges Gewicht: {value!r}")
+    if not np.isfinite(weight) or weight < 0:
+        raise PortfolioError(f"Ungültiges Gewicht: {value!r}")
+    return weight
+
+
+def _parse_identifier(value):
+    identifiers = extract_identifiers(str(value)) if value is not None else []
+    if not identifiers:
+        # Ohne Stichwort wird eine sechsstellige Kennung als WKN verstanden
+        value = str(value or "").strip().upper()
+        if len(value) == 6 and value.isalnum():
+            return WKN, value
+        raise PortfolioError(f"Keine gültige ISIN oder WKN: {value!r}")
+    return identifiers[0]
+
+
+def parse_portfolio_text(text):
+    """
+    Liest ein eingefügtes Portfolio: eine Position pro Zeile, Kennung und optional ein Gewicht.
+
+    Beispiel:
+        DE0007164600 25%
+        WKN 870747; 10,5
+
+    Args:
+        text (str): Portfolio als Text
+
+    Returns:
+        list: Position-Tupel
+
+    Raises:
+        PortfolioError: Wenn eine Zeile keine Kennung oder ein ungültiges Gewicht enthält
+    """
+    positions = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        identifiers = extract_identifiers(line)
+        if not identifiers:
+            raise PortfolioError(f"Zeile {line_number}: keine ISIN oder WKN gefunden")
+        kind, identifier = identifiers[0]
+        # Gewicht: die erste Zahl nach der Kennung
+        rest = line[line.upper().find(identifier) + len(identifier):]
+        match = _WEIGHT_PATTERN.search(rest)
+        positions.append(Position(kind, identifier, _parse_weight(match.group(0)) if match else None))
+    return positions
+
+
+def parse_positions(data):
+    """
+    Liest die Positionen aus dem Body von POST /portfolio/exposure.
+
+    Args:
+        data: Liste von {"isin" | "wkn": ..., "weight": ...} oder [kennung, gewicht],
+            oder ein Text im Format von parse_portfolio_text()
+
+    Returns:
+        list: Position-Tupel
+
+    Raises:
+        PortfolioError: Bei ungültigem Format oder zu vielen Positionen
+    """
+    if isinstance(data, str):
+        positions = parse_portfolio_text(data)
+    elif isinstance(data, list):
+        positions = []
+        for entry in data:
+            if isinstance(entry, dict):
+                if entry.get("wkn") is not None:
+                    kind, identifier = WKN, str(entry["wkn"]).strip().upper()
+                else:
+                    kind, identifier = _parse_identifier(entry.get("isin"))
+                weight = _parse_weight(entry.get("weight"))
+            elif isinstance(entry, (list, tuple)) and 1 <= len(entry) <= 2:
+                kind, identifier = _parse_identifier(entry[0])
+                weight = _parse_weight(entry[1]) if len(entry) == 2 else None
+            else:
+                kind, identifier = _parse_identifier(entry)
+                weight = None
+            positions.append(Position(kind, identifier, weight))
+    else:
+        raise PortfolioError("Portfolio fehlt: Liste von Positionen oder Text erwartet")
+
+    if not positions:
+        raise PortfolioError("Das Portfolio enthält keine Positionen")
+    if len(positions) > PORTFOLIO_MAX_POSITIONS:
+        raise PortfolioError(f"Zu viele Positionen (maximal {PORTFOLIO_MAX_POSITIONS})")
+    return positions
+
+
+def parse_top(value):
+    """
+    Prüft die angefragte Anzahl Trends.
+
+    Args:
+        value: Wert aus dem Request-Body oder None für PORTFOLIO_TOP_TRENDS
+
+    Returns:
+        int: Anzahl zwischen 1 und PORTFOLIO_MAX_TOP
+
+    Raises:
+        PortfolioError: Wenn der Wert keine Zahl in diesem Bereich ist
+    """
+    if value is None:
+        return min(PORTFOLIO_TOP_TRENDS, PORTFOLIO_MAX_TOP)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise PortfolioError(f"Ungültiger Wert für top: {value!r}")
+    try:
+        top = int(value)
+    except ValueError:
+        raise PortfolioError(f"Ungültiger Wert für top: {value!r}")
+    if not 1 <= top <= PORTFOLIO_MAX_TOP:
+        raise PortfolioError(f"top muss zwischen 1 und {PORTFOLIO_MAX_TOP} liegen")
+    return top
+
+
+def normalize_weights(positions):
+    """
+    Normiert die Gewichte auf die Summe 1.
+
+    Ohne Gewichte sind alle Positionen gleich gewichtet; fehlen nur einzelne Gewichte,
+    ist das Portfolio ungültig.
+
+    Returns:
+        numpy.ndarray: Gewichte in der Reihenfolge der Positionen
+
+    Raises:
+        PortfolioError: Wenn Gewichte fehlen oder ihre Summe 0 ist
+    """
+    weights = [position.weight for position in positions]
+    if all(weight is None for weight in weights):
+        return np.full(len(positions), 1.0 / len(positions))
+    if any(weight is None for weight in weights):
+        raise PortfolioError("Entweder alle oder keine Positionen mit Gewicht angeben")
+    weights = np.asarray(weights, dtype=np.float64)
+    total = weights.sum()
+    if total <= 0:
+        raise PortfolioError("Die Summe der Gewichte muss größer als 0 sein")
+    return weights / total
+
+
+class TrendMatrix:
+    """
+    Dünn besetzte Matrix Trends x Instrumente eines Katalogstands, spaltenweise gespeichert.
+
+    Args:
+        trends (list): trend_model.Trend-Objekte in Katalog-Reihenfolge
+        version (int): Version des Katalogs, aus dem die Trends stammen
+        weighting_factors (tuple): Faktoren für high, normal und low
+    """
+
+    def __init__(self, trends, version=None, weighting_factors=PORTFOLIO_WEIGHTING_FACTORS):
+        start = time.monotonic()
+        self.version = version
+        self.trend_ids = [trend.id for trend in trends]
+        self.trend_names = [trend.name for trend in trends]
+
+        isin_parts, code_parts, nice_parts, sizes = [], [], [], []
+        for trend in trends:
+            isins, codes, nice_bits = trend.instruments.packed_columns()
+            count = len(trend.instruments)
+            isin_parts.append(np.frombuffer(isins, dtype=f"S{ISIN_LENGTH}"))
+            code_parts.append(np.frombuffer(codes, dtype=np.uint8))
+            nice_parts.append(np.unpackbits(np.frombuffer(nice_bits, dtype=np.uint8), bitorder="little")[:count])
+            sizes.append(count)
+
+        self.trend_sizes = np.asarray(sizes, dtype=np.int64)
+        isins = np.concatenate(isin_parts) if isin_parts else np.empty(0, dtype=f"S{ISIN_LENGTH}")
+        codes = np.concatenate(code_parts) if code_parts else np.empty(0, dtype=np.uint8)
+        nice = np.concatenate(nice_parts) if nice_parts else np.empty(0, dtype=np.uint8)
+        rows = np.repeat(np.arange(len(sizes), dtype=np.int64), self.trend_sizes)
+
+        # Platzhalter für ISINs in Sonderformat (siehe InstrumentTable) auslassen
+        valid = isins != b" " * ISIN_LENGTH
+        isins, codes, nice, rows = isins[valid], codes[valid], nice[valid], rows[valid]
+
+        # Spalten: sortierte eindeutige ISINs; Einträge nach Spalte sortiert (CSC)
+        self.isins, columns = np.unique(isins, return_inverse=True)
+        columns = columns.reshape(-1)
+        order = np.argsort(columns, kind="stable")
+
+        # Mehrfach gelistete ISINs eines Trends nur einmal zählen (erster Eintrag gilt); nach der
+        # stabilen Sortierung liegen sie innerhalb ihrer Spalte direkt hintereinander
+        columns, rows = columns[order], rows[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (columns[1:] != columns[:-1]) | (rows[1:] != rows[:-1])
+        self.trend_sizes -= np.bincount(rows[~first], minlength=len(sizes))
+        order, columns = order[first], columns[first]
+
+        self.rows = rows[first]
+        self.factors = np.asarray(weighting_factors, dtype=np.float64)[codes[order]]
+        self.nice = nice[order].astype(np.float64)
+        self.indptr = np.zeros(len(self.isins) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=len(self.isins)), out=self.indptr[1:])
+        self.build_seconds = time.monotonic() - start
+
+    @property
+    def shape(self):
+        """(Anzahl Trends, Anzahl eindeutiger ISINs)"""
+        return len(self.trend_ids), len(self.isins)
+
+    @property
+    def nnz(self):
+        """Anzahl der Einträge (Instrument-Trend-Zuordnungen)."""
+        return len(self.rows)
+
+    def column_indices(self, isins):
+        """
+        Sucht die Spalten einer Liste von ISINs (vektorisiert per Binärsuche).
+
+        Args:
+            isins (list): ISINs in Großbuchstaben
+
+        Returns:
+            numpy.ndarray: Spaltenindex je ISIN, -1 für ISINs ohne Trend
+        """
+        wanted = np.asarray([isin.encode("ascii", "replace") for isin in isins], dtype=f"S{ISIN_LENGTH}")
+        if not len(self.isins):
+            return np.full(len(wanted), -1, dtype=np.int64)
+        index = np.minimum(np.searchsorted(self.isins, wanted), len(self.isins) - 1)
+        return np.where(self.isins[index] == wanted, index, -1)
+
+    def analyze(self, isins, weights, top=PORTFOLIO_TOP_TRENDS, top_overlaps=PORTFOLIO_TOP_OVERLAPS):
+        """
+        Berechnet Exposure, Coverage, Überschneidungen und Konzentration eines Portfolios.
+
+        Args:
+            isins (list): ISINs der Positionen
+            weights (numpy.ndarray): Normierte Gewichte der Positionen
+            top (int): Anzahl der ausgegebenen Trends
+            top_overlaps (int): Anzahl der ausgegebenen Trend-Paare
+
+        Returns:
+            dict: matched_weight, unmatched (Positionsindizes), trends, overlap, concentration
+        """
+        columns = self.column_indices(isins)
+        found = columns >= 0
+        unmatched = np.flatnonzero(~found)
+
+        # Mehrfach genannte ISINs zusammenfassen
+        held, inverse = np.unique(columns[found], return_inverse=True)
+        held_weights = np.bincount(inverse.reshape(-1), weights=weights[found], minlength=len(held))
+
+        # Einträge aller gehaltenen Spalten einsammeln (ohne Schleife über die Spalten)
+        starts = self.indptr[held]
+        counts = self.indptr[held + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        entries = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+        rows = self.rows[entries]
+        entry_weights = np.repeat(held_weights, counts)
+
+        trend_count = len(self.trend_ids)
+        exposure = np.bincount(rows, weights=entry_weights, minlength=trend_count)
+        weighted = np.bincount(rows, weights=entry_weights * self.factors[entries], minlength=trend_count)
+        holdings = np.bincount(rows, minlength=trend_count)
+        nice_holdings = np.bincount(rows, weights=self.nice[entries], minlength=trend_count)
+
+        exposed = np.flatnonzero(exposure > 0)
+        ranked = exposed[np.lexsort((exposed, -exposure[exposed]))]
+        top_rows = ranked[:top]
+
+        trends = [{
+            "id": self.trend_ids[row],
+            "name": self.trend_names[row],
+            "exposure": round(float(exposure[row]), 4),
+            "weighted_exposure": round(float(weighted[row]), 4),
+            "holdings": int(holdings[row]),
+            "nice_holdings": int(nice_holdings[row]),
+            "coverage": round(float(holdings[row] / self.trend_sizes[row]), 4),
+        } for row in top_rows]
+
+        return {
+            "matched_weight": round(float(weights[found].sum()), 4),
+            "unmatched": unmatched,
+            "trends_exposed": int(len(exposed)),
+            "trends": trends,
+            "overlap": self._overlap(ranked[:PORTFOLIO_OVERLAP_TRENDS], rows, counts, held_weights, exposure,
+                                     top_overlaps),
+            "concentration": self._concentration(exposure[exposed], exposure[top_rows]),
+        }
+
+    def _overlap(self, top_rows, rows, counts, held_weights, exposure, limit):
+        """Gemeinsames Gewicht je Trend-Paar unter den Trends mit dem höchsten Exposure."""
+        if len(top_rows) < 2 or limit <= 0:
+            return []
+        # Inzidenzmatrix Top-Trends x gehaltene ISINs, gewichtet: shared = H * w * H^T
+        slot = np.full(len(self.trend_ids), -1, dtype=np.int64)
+        slot[top_rows] = np.arange(len(top_rows))
+        holding = np.repeat(np.arange(len(counts)), counts)
+        selected = slot[rows] >= 0
+        incidence = np.zeros((len(top_rows), len(counts)))
+        incidence[slot[rows[selected]], holding[selected]] = 1.0
+        shared = (incidence * held_weights) @ incidence.T
+
+        first, second = np.triu_indices(len(top_rows), k=1)
+        values = shared[first, second]
+        order = np.argsort(-values, kind="stable")[:limit]
+        pairs = []
+        for index in order:
+            if values[index] <= 0:
+                break
+            a, b = top_rows[first[index]], top_rows[second[index]]
+            pairs.append({
+                "trends": [self.trend_ids[a], self.trend_ids[b]],
+                "names": [self.trend_names[a], self.trend_names[b]],
+                "shared_weight": round(float(values[index]), 4),
+                "overlap_ratio": round(float(values[index] / min(exposure[a], exposure[b])), 4),
+            })
+        return pairs
+
+    @staticmethod
+    def _concentration(exposures, top_exposures):
+        """Herfindahl-Index und effektive Anzahl Trends der normierten Exposure-Verteilung."""
+        total = exposures.sum()
+        if total <= 0:
+            return {"hhi": None, "effective_trends": None, "top_share": None}
+        shares = exposures / total
+        hhi = float(np.square(shares).sum())
+        return {
+            "hhi": round(hhi, 4),
+            "effective_trends": round(1.0 / hhi, 2),
+            "top_share": round(float(top_exposures.sum() / total), 4),
+        }
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+_matrix_catalogue = None
+
+
+def get_matrix(catalogue):
+    """
+    Liefert die Matrix zum aktuellen Stand des Katalogs; sie wird nur nach einer
+    Änderung des Katalogs (neue Version) neu aufgebaut.
+
+    Args:
+        catalogue (TrendCatalogue): Geladener Katalog
+
+    Returns:
+        TrendMatrix: Matrix der aktuellen Katalog-Version
+    """
+    global _matrix, _matrix_catalogue
+    matrix = _matrix
+    if matrix is not None and _matrix_catalogue is catalogue and matrix.version == catalogue.version:
+        return matrix
+    with _matrix_lock:
+        if _matrix is None or _matrix_catalogue is not catalogue or _matrix.version != catalogue.version:
+            # Version vor den Trends lesen: ändert sich der Katalog dazwischen, wird neu gebaut
+            version = catalogue.version
+            _matrix = TrendMatrix(catalogue.trends(), version)
+            _matrix_catalogue = catalogue
+            logger.info(f"Trend-Matrix aufgebaut: {_matrix.shape[0]} Trends x {_matrix.shape[1]} ISINs, "
+                        f"{_matrix.nnz} Einträge in {_matrix.build_seconds * 1000:.0f} ms (Version {version})")
+        return _matrix
+
+
+def analyze_portfolio(catalogue, positions, top=PORTFOLIO_TOP_TRENDS):
+    """
+    Berechnet das Trend-Exposure eines Portfolios gegen den Katalog.
+
+    Args:
+        catalogue (TrendCatalogue): Geladener Katalog
+        positions (list): Position-Tupel aus parse_positions()
+        top (int): Anzahl der ausgegebenen Trends
+
+    Returns:
+        dict: Ergebnis für die API-Antwort
+
+    Raises:
+        PortfolioError: Bei ungültigen Gewichten
+    """
+    weights = normalize_weights(positions)
+    # WKNs über den ISIN-Index des Katalogs auflösen
+    isins = [
+        (catalogue.find_instrument(WKN, position.identifier)[0] or "") if position.kind == WKN
+        else position.identifier
+        for position in positions
+    ]
+    matrix = get_matrix(catalogue)
+    result = matrix.analyze(isins, weights, top=top)
+
+    unmatched = result.pop("unmatched")
+    labels = [position.identifier if position.kind == ISIN else f"WKN {position.identifier}"
+              for position in positions]
+    return {
+        "catalogue_version": matrix.version,
+        "positions": len(positions),
+        "matched_positions": len(positions) - len(unmatched),
+        "unmatched": [labels[index] for index in unmatched[:_MAX_UNMATCHED_LISTED]],
+        **result,
+    }
+
+
+def format_exposure_summary(result):
+    """
+    Fasst ein Ergebnis von analyze_portfolio() kompakt für den System-Prompt zusammen.
+
+    Args:
+        result (dict): Ergebnis von analyze_portfolio()
+
+    Returns:
+        str: Formatierter String
+    """
+    output = "=== TREND-EXPOSURE DES PORTFOLIOS ===\n\n"
+    output += (f"Positionen: {result['positions']}, davon {result['matched_positions']} in Trends enthalten "
+               f"({result['matched_weight'] * 100:.1f} % des Portfoliogewichts)\n")
+    concentration = result["concentration"]
+    if concentration["hhi"] is not None:
+        output += (f"Konzentration: HHI {concentration['hhi']:.3f}, entspricht {concentration['effective_trends']:.1f} "
+                   f"gleich gewichteten Trends; die Top-{len(result['trends'])} vereinen "
+                   f"{concentration['top_share'] * 100:.1f} % des Exposures "
+                   f"({result['trends_exposed']} Trends insgesamt)\n")
+
+    if result["trends"]:
+        output += "\nTrends mit dem höchsten Exposure:\n"
+        for i, trend in enumerate(result["trends"], 1):
+            output += (f"{i}. {trend['name']}: {trend['exposure'] * 100:.1f} % des Portfolios "
+                       f"(nach Gewichtung im Trend {trend['weighted_exposure'] * 100:.1f} %), "
+                       f"{trend['holdings']} Positionen, davon {trend['nice_holdings']} nice, "
+                       f"{trend['coverage'] * 100:.1f} % der Instrumente des Trends\n")
+
+    if result["overlap"]:
+        output += "\nGrößte Überschneidungen (gemeinsames Portfoliogewicht):\n"
+        for pair in result["overlap"]:
+            output += (f"- {pair['names'][0]} & {pair['names'][1]}: {pair['shared_weight'] * 100:.1f} % "
+                       f"({pair['overlap_ratio'] * 100:.0f} % des kleineren Exposures)\n")
+    return output
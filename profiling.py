@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Profiling Modul
+
+Opt-in-Profiling einzelner Anfragen. Ein Request wird profiliert, wenn er einen
+gültig signierten `X-Profile-Request`-Header trägt oder per Zufallsstichprobe
+(PROFILE_SAMPLE_RATE) ausgewählt wird. Das Ergebnis wird im Collapsed-Stack-Format
+("a;b;c <mikrosekunden>") abgelegt und kann direkt mit flamegraph.pl, speedscope
+oder inferno dargestellt werden.
+
+Ist weder PROFILE_SECRET noch PROFILE_SAMPLE_RATE gesetzt, gibt der Decorator die
+View-Funktion unverändert zurück; es entsteht also keinerlei Overhead.
+
+Signatur des Headers: "<unix_timestamp>:<hex(HMAC-SHA256(PROFILE_SECRET, unix_timestamp))>"
+"""
+
+import os
+import sys
+import hmac
+import time
+import uuid
+import random
+import hashlib
+import logging
+import functools
+from collections import defaultdict
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROFILE_SECRET = os.getenv("PROFILE_SECRET", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# Maximale Abweichung des Zeitstempels im Header in Sekunden (Schutz vor Wiederverwendung)
+PROFILE_MAX_CLOCK_SKEW = int(os.getenv("PROFILE_MAX_CLOCK_SKEW", "300"))
+
+PROFILE_HEADER = "X-Profile-Request"
+
+
+def profiling_enabled():
+    """True, wenn Profiling über Signatur oder Stichprobe aktiviert werden kann."""
+    return bool(PROFILE_SECRET) or PROFILE_SAMPLE_RATE > 0
+
+
+def sign_profile_request(secret, timestamp=None):
+    """
+    Erzeugt einen gültigen Wert für den X-Profile-Request-Header.
+
+    Args:
+        secret (str): Gemeinsames Geheimnis (PROFILE_SECRET)
+        timestamp (int): Optionaler Unix-Zeitstempel (Standard: jetzt)
+
+    Returns:
+        str: Header-Wert "<timestamp>:<signatur>"
+    """
+    timestamp = str(int(time.time()) if timestamp is None else int(timestamp))
+    signature = hmac.new(secret.encode("utf-8"), timestamp.encode("ascii"), hashlib.sha256).hexdigest()
+    return f"{timestamp}:{signature}"
+
+
+def verify_profile_request(header_value, secret=None, now=None):
+    """
+    Prüft einen X-Profile-Request-Header.
+
+    Args:
+        header_value (str): Wert des Headers
+        secret (str): Geheimnis (Standard: PROFILE_SECRET)
+        now (float): Optionaler aktueller Zeitpunkt, vor allem für Tests
+
+    Returns:
+        bool: True, wenn Signatur und Zeitstempel gültig sind
+    """
+    secret = PROFILE_SECRET if secret is None else secret
+    if not secret or not header_value or ":" not in header_value:
+        return False
+
+    timestamp, _, signature = header_value.partition(":")
+    try:
+        age = abs((time.time() if now is None else now) - int(timestamp))
+    except ValueError:
+        return False
+    if age > PROFILE_MAX_CLOCK_SKEW:
+        return False
+
+    expected = sign_profile_request(secret, timestamp).partition(":")[2]
+    return hmac.compare_digest(expected, signature)
+
+
+def _code_label(code):
+    """Bezeichnung eines Python-Frames im Flamegraph."""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _builtin_label(func):
+    """Bezeichnung einer C-Funktion (z.B. re.Pattern.search) im Flamegraph."""
+    module = getattr(func, "__module__", None) or getattr(type(getattr(func, "__self__", None)), "__module__", "")
+    name = getattr(func, "__qualname__", None) or getattr(func, "__name__", repr(func))
+    return f"{module}.{name}" if module else name
+
+
+class StackProfiler:
+    """
+    Deterministischer Profiler auf Basis von sys.setprofile für den aktuellen Thread.
+
+    Für jeden Aufrufstapel wird die Eigenzeit (ohne Unteraufrufe) summiert, inklusive
+    C-Funktionen wie Regex-Suche oder JSON-Parsing.
+    """
+
+    def __init__(self):
+        self.stacks = defaultdict(float)
+        self._keys = []
+        self._last = None
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter()
+        if self._keys:
+            self.stacks[self._keys[-1]] += now - self._last
+
+        if event == "call":
+            self._push(_code_label(frame.f_code))
+        elif event == "c_call":
+            self._push(_builtin_label(arg))
+        elif self._keys:
+            # return, c_return, c_exception
+            self._keys.pop()
+
+        self._last = time.perf_counter()
+
+    def _push(self, label):
+        prefix = self._keys[-1] + ";" if self._keys else ""
+        self._keys.append(prefix + label)
+
+    def run(self, func, *args, **kwargs):
+        """
+        Führt `func` profiliert aus.
+
+        Returns:
+            Der Rückgabewert von `func`
+        """
+        self._keys = []
+        self._last = time.perf_counter()
+        sys.setprofile(self._callback)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+
+    def collapsed(self):
+        """
+        Liefert das Ergebnis im Collapsed-Stack-Format.
+
+        Returns:
+            str: Eine Zeile pro Stapel: "frame;frame;frame <mikrosekunden>"
+        """
+        lines = []
+        for stack, seconds in sorted(self.stacks.items()):
+            micros = int(seconds * 1_000_000)
+            if micros > 0:
+                lines.append(f"{stack} {micros}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory, name):
+        """
+        Schreibt das Ergebnis als .folded-Datei.
+
+        Args:
+            directory (str): Zielverzeichnis
+            name (str): Dateiname ohne Endung
+
+        Returns:
+            str: Pfad der geschriebenen Datei
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        return path
+
+
+def _should_profile(request):
+    """Entscheidet, ob die aktuelle Anfrage profiliert wird."""
+    if PROFILE_SECRET and verify_profile_request(request.headers.get(PROFILE_HEADER)):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profiled(view):
+    """
+    Decorator für Flask-Views, der ausgewählte Anfragen profiliert.
+
+    Der Pfad der Ergebnisdatei wird im Response-Header X-Profile-File zurückgegeben.
+    Ist Profiling nicht konfiguriert, wird die View unverändert zurückgegeben.
+    """
+    if not profiling_enabled():
+        return view
+
+    from flask import request, make_response
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _should_profile(request):
+            return view(*args, **kwargs)
+
+        profiler = StackProfiler()
+        start = time.perf_counter()
+        result = profiler.run(view, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{view.__name__}-{uuid.uuid4().hex[:8]}"
+        try:
+            path = profiler.write(PROFILE_DIR, name)
+        except OSError as e:
+            logger.error(f"Profil konnte nicht geschrieben werden: {e}")
+            return result
+        logger.info(f"Anfrage profiliert ({elapsed * 1000:.0f} ms): {path}")
+
+        response = make_response(result)
+        response.headers["X-Profile-File"] = os.path.basename(path)
+        return response
+
+    return wrapper
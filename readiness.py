@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Readiness Modul
+
+Tiefe Readiness-Prüfung für GET /ready. Im Gegensatz zu /health (lebt der Prozess?)
+meldet /ready erst dann Bereitschaft, wenn der Worker Anfragen sinnvoll beantworten
+kann:
+
+- der Trend-Katalog ist geladen (warme Caches)
+- der Zustand der Upstream-Verbindungspools
+- das Ergebnis der letzten Upstream-Prüfung gegen die Trendlink API
+
+Das Ergebnis wird READINESS_CACHE_TTL Sekunden zwischengespeichert, die Upstream-Prüfung
+läuft höchstens alle READINESS_PROBE_INTERVAL Sekunden in einem Hintergrund-Thread. Eine
+Probe von Render oder dem Starthelfer löst also nie selbst einen Aufruf der API aus.
+Ist der Katalog noch nicht geladen, wird er im selben Hintergrund-Thread nachgeladen.
+
+Ein Ausfall der Trendlink API macht den Worker standardmäßig nicht unbereit (Status
+"degraded"): mit warmem Katalog kann er weiter antworten, und ein Neustart durch den
+Health Check würde nur kalte Instanzen erzeugen.
+"""
+
+import os
+import time
+import logging
+import threading
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Dauer in Sekunden, für die ein berechnetes Readiness-Ergebnis wiederverwendet wird
+READINESS_CACHE_TTL = float(os.getenv("READINESS_CACHE_TTL", "5"))
+# Mindestabstand in Sekunden zwischen zwei Upstream-Prüfungen
+READINESS_PROBE_INTERVAL = float(os.getenv("READINESS_PROBE_INTERVAL", "60"))
+# Timeout der Upstream-Prüfung in Sekunden
+READINESS_PROBE_TIMEOUT = float(os.getenv("READINESS_PROBE_TIMEOUT", "3"))
+# Bereit erst mit geladenem Trend-Katalog
+READINESS_REQUIRE_CATALOGUE = os.getenv("READINESS_REQUIRE_CATALOGUE", "true").lower() == "true"
+# Bereit nur, wenn die letzte Upstream-Prüfung erfolgreich war
+READINESS_REQUIRE_UPSTREAM = os.getenv("READINESS_REQUIRE_UPSTREAM", "false").lower() == "true"
+
+READY = "ready"
+DEGRADED = "degraded"
+NOT_READY = "not_ready"
+
+
+class ReadinessCheck:
+    """
+    Berechnet und cacht den Readiness-Status eines Workers.
+
+    Args:
+        catalogue (callable): Liefert den Trend-Katalog (TrendCatalogue)
+        probe (callable): Upstream-Prüfung, liefert ein Dictionary mit "ok"
+        warm (callable): Lädt den Trend-Katalog
+        pools (callable): Liefert den Zustand der Verbindungspools
+        cache_ttl (float): Gültigkeit eines Ergebnisses in Sekunden
+        probe_interval (float): Mindestabstand zwischen Upstream-Prüfungen in Sekunden
+        require_catalogue (bool): Bereit erst mit geladenem Katalog
+        require_upstream (bool): Bereit nur mit erfolgreicher Upstream-Prüfung
+    """
+
+    def __init__(self, catalogue, probe, warm, pools, cache_ttl=READINESS_CACHE_TTL,
+                 probe_interval=READINESS_PROBE_INTERVAL, require_catalogue=READINESS_REQUIRE_CATALOGUE,
+                 require_upstream=READINESS_REQUIRE_UPSTREAM):
+        self._catalogue = catalogue
+        self._probe = probe
+        self._warm = warm
+        self._pools = pools
+        self.cache_ttl = cache_ttl
+        self.probe_interval = probe_interval
+        self.require_catalogue = require_catalogue
+        self.require_upstream = require_upstream
+        self._lock = threading.Lock()
+        self._cached = None
+        self._cached_at = 0.0
+        self._upstream = None
+        self._upstream_at = None
+        self._refreshing = False
+
+    def refresh(self):
+        """
+        Lädt bei Bedarf den Katalog nach und prüft den Upstream (blockierend).
+
+        Returns:
+            dict: Ergebnis der Upstream-Prüfung
+        """
+        try:
+            if self.require_catalogue and not self._catalogue().is_loaded():
+                try:
+                    self._warm()
+                except Exception as e:
+                    logger.warning(f"Trend-Katalog konnte nicht nachgeladen werden: {e}")
+            result = dict(self._probe())
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        if not result.get("ok"):
+            logger.warning(f"Upstream-Prüfung fehlgeschlagen: {result.get('error')}")
+
+        with self._lock:
+            self._upstream = result
+            self._upstream_at = time.monotonic()
+            self._refreshing = False
+            self._cached = None
+        return result
+
+    def _refresh_in_background(self):
+        with self._lock:
+            due = self._upstream_at is None or time.monotonic() - self._upstream_at >= self.probe_interval
+            if self._refreshing or not due:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="readiness-probe", daemon=True).start()
+
+    def check(self):
+        """
+        Liefert den Readiness-Status, höchstens alle cache_ttl Sekunden neu berechnet.
+
+        Returns:
+            dict: ready, status, pid und die einzelnen Prüfungen
+        """
+        with self._lock:
+            if self._cached is not None and time.monotonic() - self._cached_at < self.cache_ttl:
+                return self._cached
+
+        self._refresh_in_background()
+        result = self._evaluate()
+        with self._lock:
+            self._cached = result
+            self._cached_at = time.monotonic()
+        return result
+
+    def _evaluate(self):
+        catalogue = self._catalogue()
+        stats = catalogue.stats()
+        catalogue_ok = catalogue.is_loaded() or not self.require_catalogue
+
+        with self._lock:
+            upstream = dict(self._upstream) if self._upstream is not None else {"ok": None, "pending": True}
+            if self._upstream_at is not None:
+                upstream["age_seconds"] = round(time.monotonic() - self._upstream_at, 1)
+        upstream_ok = upstream.get("ok") is True
+
+        ready = catalogue_ok and (upstream_ok or not self.require_upstream)
+        if not ready:
+            status = NOT_READY
+        elif upstream.get("ok") is False:
+            status = DEGRADED
+        else:
+            status = READY
+
+        return {
+            "ready": ready,
+            "status": status,
+            "pid": os.getpid(),
+            "checked_at": round(time.time(), 3),
+            "checks": {
+                "catalogue": {
+                    "ok": catalogue_ok,
+                    "loaded": catalogue.is_loaded(),
+                    "trends": stats["trends"],
+                    "version": stats["version"],
+                    "age_seconds": None if stats["age_seconds"] is None else round(stats["age_seconds"], 1),
+                },
+                "upstream": upstream,
+                "pools": self._pools(),
+            },
+        }
@@ -6,11 +6,16 @@ Prüft Voraussetzungen und startet dann die Anwendung.
 
 import os
 import sys
+import argparse
 import subprocess
 import platform
 import webbrowser
+import importlib.util
 from pathlib import Path
-from time import sleep
+from time import sleep, monotonic
+
+# Abstand der Abfragen von /ready beim Start in Sekunden
+READY_POLL_INTERVAL = 0.5
 
 # Farben für Terminal-Ausgaben
 class Colors:
@@ -87,36 +92,94 @@ def get_available_port(preferred_port=5000):
     
     return None
 
-def start_flask_app(port):
-    """Startet die Flask-Anwendung und öffnet den Browser."""
-    print_color(f"\nStarte Trendlink AI Chatbot auf Port {port}...", Colors.BLUE)
+def build_server_command(workers):
+    """
+    Wählt den Server: Gunicorn mit mehreren Workern (wie auf Render), falls installiert
+    und vom Betriebssystem unterstützt, sonst den Flask-Entwicklungsserver.
+    
+    Returns:
+        tuple: (Befehl als Liste, Beschreibung)
+    """
+    if platform.system().lower() != "windows" and importlib.util.find_spec("gunicorn") is not None:
+        return ([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+                f"Gunicorn mit {workers} Workern")
+    return [sys.executable, "app.py"], "Flask-Entwicklungsserver (ein Prozess; für mehrere Worker gunicorn installieren)"
+
+def wait_until_ready(process, port, timeout):
+    """
+    Fragt /ready ab, bis der Chatbot bereit ist, der Prozess endet oder die Zeit abläuft.
+    
+    Args:
+        process (subprocess.Popen): Gestarteter Serverprozess
+        port (int): Port des Servers
+        timeout (float): Maximale Wartezeit in Sekunden
+        
+    Returns:
+        bool: True, wenn /ready mit 200 geantwortet hat
+    """
+    import requests
+    
+    url = f"http://localhost:{port}/ready"
+    deadline = monotonic() + timeout
+    last_status = None
+    while monotonic() < deadline:
+        if process.poll() is not None:
+            print_color(f"FEHLER: Der Server wurde mit Code {process.returncode} beendet.", Colors.RED)
+            return False
+        try:
+            response = requests.get(url, timeout=2)
+            result = response.json()
+            if response.status_code == 200:
+                if result.get("status") == "degraded":
+                    print_color("WARNUNG: Trendlink API nicht erreichbar - Antworten nutzen den geladenen Katalog.", Colors.YELLOW)
+                return True
+            catalogue = result.get("checks", {}).get("catalogue", {})
+            status = f"Katalog geladen: {'ja' if catalogue.get('loaded') else 'nein'}"
+        except (requests.exceptions.RequestException, ValueError):
+            status = "Server startet"
+        if status != last_status:
+            print_color(f"  ... {status}", Colors.BLUE)
+            last_status = status
+        sleep(READY_POLL_INTERVAL)
+    print_color(f"FEHLER: Chatbot nach {timeout:.0f} Sekunden nicht bereit ({url}).", Colors.RED)
+    return False
+
+def start_flask_app(port, workers=2, ready_timeout=60, open_browser=True):
+    """Startet die Anwendung, wartet auf /ready und öffnet den Browser."""
+    command, description = build_server_command(workers)
+    print_color(f"\nStarte Trendlink AI Chatbot auf Port {port} ({description})...", Colors.BLUE)
     
     # Umgebungsvariablen für den Unterprocess setzen
     env = os.environ.copy()
     env["FLASK_APP"] = "app.py"
     env["FLASK_ENV"] = "development"
     env["PORT"] = str(port)
+    env["WEB_CONCURRENCY"] = str(workers)
     
-    # Flask-Anwendung im Hintergrund starten
-    system = platform.system().lower()
-    if system == "windows":
+    # Anwendung im Hintergrund starten
+    if platform.system().lower() == "windows":
         process = subprocess.Popen(
-            ["python", "app.py"],
+            command,
             env=env,
             creationflags=subprocess.CREATE_NEW_CONSOLE
         )
     else:
         process = subprocess.Popen(
-            ["python", "app.py"],
+            command,
             env=env
         )
     
-    # Kurz warten, damit die Anwendung starten kann
-    print_color("Warte auf Start des Chatbots...", Colors.BLUE)
-    sleep(2)
+    # Auf Bereitschaft warten statt einer festen Pause: erst wenn /ready 200 liefert,
+    # ist der Trend-Katalog geladen
+    print_color("Warte auf Bereitschaft des Chatbots (/ready)...", Colors.BLUE)
+    if not wait_until_ready(process, port, ready_timeout):
+        if process.poll() is None:
+            process.terminate()
+        return False
     
     # Browser öffnen
-    webbrowser.open(f"http://localhost:{port}")
+    if open_browser:
+        webbrowser.open(f"http://localhost:{port}")
     
     print_color("\n✓ Trendlink AI Chatbot läuft jetzt!", Colors.GREEN)
     print_color(f"  Öffnen Sie http://localhost:{port} in Ihrem Browser\n", Colors.BLUE)
@@ -129,9 +192,22 @@ def start_flask_app(port):
         print_color("\nBeende Trendlink AI Chatbot...", Colors.YELLOW)
         process.terminate()
         print_color("Auf Wiedersehen!", Colors.GREEN)
+    return True
+
+def parse_args():
+    """Liest die Kommandozeilenoptionen."""
+    parser = argparse.ArgumentParser(description="Starthilfe für den Trendlink AI Chatbot")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")),
+                        help="Anzahl der Gunicorn-Worker (Standard: WEB_CONCURRENCY oder 2)")
+    parser.add_argument("--ready-timeout", type=float, default=60,
+                        help="Maximale Wartezeit auf /ready in Sekunden (Standard: 60)")
+    parser.add_argument("--no-browser", action="store_true", help="Browser nicht öffnen")
+    return parser.parse_args()
 
 def main():
     """Hauptfunktion zur Überprüfung und zum Start des Chatbots."""
+    args = parse_args()
+    
     print_color("\n=== Trendlink AI Chatbot Starthilfe ===\n", Colors.BOLD + Colors.BLUE)
     
     # Arbeitsverzeichnis prüfen
@@ -155,9 +231,7 @@ def main():
         return False
     
     # Anwendung starten
-    start_flask_app(port)
-    
-    return True
+    return start_flask_app(port, args.workers, args.ready_timeout, not args.no_browser)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(0 if main() else 1) 
\ No newline at end of file
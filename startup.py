@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Startup Modul
+
+Hilfsfunktionen für einen schnellen Produktionsstart unter Gunicorn:
+
+1. Selten benötigte Abhängigkeiten werden erst bei Bedarf importiert. Schwere Module,
+   die jeder Worker braucht, lädt warm_up() einmal im Master.
+2. warm_up() lädt den Trend-Katalog einmal im Master vor dem Fork.
+3. freeze_for_fork() schiebt alle bis dahin erzeugten Objekte in die permanente
+   Generation des Garbage Collectors, damit die Worker die Speicherseiten
+   copy-on-write teilen können, statt sie beim ersten GC-Lauf zu kopieren.
+
+Die Hooks werden in gunicorn.conf.py aufgerufen.
+"""
+
+import gc
+import os
+import time
+import logging
+import importlib
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Module, die im Master vorgeladen werden, weil jeder Worker sie beim ersten Chat braucht
+PRELOAD_MODULES = tuple(
+    module.strip()
+    for module in os.getenv("STARTUP_PRELOAD_MODULES", "openai").split(",")
+    if module.strip()
+)
+# Trend-Katalog beim Start laden
+STARTUP_WARM_CATALOGUE = os.getenv("STARTUP_WARM_CATALOGUE", "true").lower() == "true"
+
+# Gemessene Zeiten des letzten Starts in Sekunden
+startup_timings = {}
+
+
+def record_timing(name, seconds):
+    """
+    Speichert eine Startzeit-Messung.
+
+    Args:
+        name (str): Bezeichnung des Schritts
+        seconds (float): Dauer in Sekunden
+    """
+    startup_timings[name] = seconds
+
+
+def timed_import(module_name):
+    """
+    Importiert ein Modul und misst die Dauer.
+
+    Args:
+        module_name (str): Name des Moduls
+
+    Returns:
+        float: Dauer des Imports in Sekunden (0, wenn bereits importiert)
+    """
+    start = time.perf_counter()
+    importlib.import_module(module_name)
+    return time.perf_counter() - start
+
+
+def warm_up():
+    """
+    Lädt schwere Module und den Trend-Katalog vor, bevor die Worker geforkt werden.
+
+    Fehler beim Laden des Katalogs verhindern den Start nicht; die Worker suchen
+    dann wie bisher live im Trend-Katalog der API.
+
+    Returns:
+        dict: Gemessene Zeiten pro Schritt in Sekunden
+    """
+    for module_name in PRELOAD_MODULES:
+        try:
+            record_timing(f"import:{module_name}", timed_import(module_name))
+        except ImportError as e:
+            logger.warning(f"Modul {module_name} konnte nicht vorgeladen werden: {e}")
+
+    if STARTUP_WARM_CATALOGUE:
+        # Erst hier importieren, damit startup.py selbst leichtgewichtig bleibt
+        from trendlink_api import load_trend_catalogue
+
+        start = time.perf_counter()
+        try:
+            catalogue = load_trend_catalogue()
+            record_timing("warm:trend_catalogue", time.perf_counter() - start)
+            logger.info(f"Trend-Katalog vorgeladen: {len(catalogue)} Trends")
+        except Exception as e:
+            record_timing("warm:trend_catalogue_failed", time.perf_counter() - start)
+            logger.warning(f"Trend-Katalog konnte beim Start nicht geladen werden: {e}")
+
+    return dict(startup_timings)
+
+
+def freeze_for_fork():
+    """
+    Bereitet den Master auf den Fork vor: Garbage sammeln und alle überlebenden
+    Objekte einfrieren, damit sie in den Workern nicht mehr angefasst werden.
+    """
+    start = time.perf_counter()
+    gc.collect()
+    gc.freeze()
+    record_timing("gc:freeze", time.perf_counter() - start)
+    logger.info(f"GC eingefroren: {gc.get_freeze_count()} Objekte werden von den Workern geteilt")
+
+
+def report():
+    """Schreibt die gesammelten Startzeiten ins Log."""
+    summary = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in startup_timings.items())
+    logger.info(f"Startzeiten: {summary}")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Testskript für das admission Modul.
+"""
+
+import unittest
+import os
+import sys
+import json
+import threading
+import time
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from admission import AdmissionController, AdmissionRejected, TokenBucket
+
+class TestTokenBucket(unittest.TestCase):
+    """Test-Suite für den TokenBucket."""
+    
+    def test_burst_and_refill(self):
+        """Burst wird verbraucht und mit der Rate nachgefüllt"""
+        bucket = TokenBucket(rate=2.0, capacity=2, now=0.0)
+        self.assertTrue(bucket.try_acquire(now=0.0)[0])
+        self.assertTrue(bucket.try_acquire(now=0.0)[0])
+        
+        allowed, retry_after = bucket.try_acquire(now=0.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 0.5)
+        
+        # Nach 0,5 Sekunden ist wieder ein Token verfügbar
+        self.assertTrue(bucket.try_acquire(now=0.5)[0])
+
+class TestAdmissionController(unittest.TestCase):
+    """Test-Suite für den AdmissionController."""
+    
+    def test_rate_limit_per_client(self):
+        """Jeder Client hat sein eigenes Kontingent"""
+        controller = AdmissionController(rate=0.001, burst=1, max_concurrent=10)
+        controller.acquire("ip:a")
+        controller.release()
+        
+        with self.assertRaises(AdmissionRejected) as ctx:
+            controller.acquire("ip:a")
+        self.assertEqual(ctx.exception.reason, "rate_limited")
+        self.assertGreater(ctx.exception.retry_after, 0)
+        
+        # Ein anderer Client ist nicht betroffen
+        controller.acquire("ip:b")
+        controller.release()
+    
+    def test_queue_full_rejects_immediately(self):
+        """Ist die Warteschlange voll, wird sofort abgelehnt"""
+        controller = AdmissionController(rate=100, burst=100, max_concurrent=1,
+                                         queue_size=0, queue_timeout=5)
+        controller.acquire("ip:a")
+        
+        start = time.monotonic()
+        with self.assertRaises(AdmissionRejected) as ctx:
+            controller.acquire("ip:b")
+        self.assertEqual(ctx.exception.reason, "queue_full")
+        self.assertLess(time.monotonic() - start, 1.0)
+        controller.release()
+    
+    def test_queue_timeout(self):
+        """Wartende Anfragen geben nach dem Timeout auf"""
+        controller = AdmissionController(rate=100, burst=100, max_concurrent=1,
+                                         queue_size=1, queue_timeout=0.05)
+        controller.acquire("ip:a")
+        
+        with self.assertRaises(AdmissionRejected) as ctx:
+            controller.acquire("ip:b")
+        self.assertEqual(ctx.exception.reason, "queue_timeout")
+        
+        controller.release()
+        self.assertEqual(controller.snapshot()["active"], 0)
+        self.assertEqual(controller.snapshot()["waiting"], 0)
+    
+    def test_priority_order(self):
+        """Bei Freigabe wird die Anfrage mit der höchsten Priorität bedient"""
+        controller = AdmissionController(rate=100, burst=100, max_concurrent=1,
+                                         queue_size=10, queue_timeout=5)
+        controller.acquire("ip:holder")
+        
+        order = []
+        
+        def worker(name, priority):
+            controller.acquire(f"ip:{name}", priority)
+            order.append(name)
+            controller.release()
+        
+        low = threading.Thread(target=worker, args=("low", 2))
+        low.start()
+        while controller.snapshot()["waiting"] < 1:
+            time.sleep(0.001)
+        high = threading.Thread(target=worker, args=("high", 0))
+        high.start()
+        while controller.snapshot()["waiting"] < 2:
+            time.sleep(0.001)
+        
+        controller.release()
+        low.join()
+        high.join()
+        
+        self.assertEqual(order, ["high", "low"])
+        self.assertEqual(controller.snapshot()["active"], 0)
+
+class TestAdmissionEndpoint(unittest.TestCase):
+    """Test des 429-Verhaltens am /chat-Endpunkt."""
+    
+    def test_chat_returns_429_with_retry_after(self):
+        """Der Endpunkt antwortet mit 429 und Retry-After, wenn das Limit erreicht ist"""
+        import app as app_module
+        
+        original = app_module.admission_controller
+        app_module.admission_controller = AdmissionController(rate=0.001, burst=0)
+        try:
+            client = app_module.app.test_client()
+            response = client.post(
+                '/chat',
+                data=json.dumps({"message": "Was macht der Markt?"}),
+                content_type='application/json'
+            )
+        finally:
+            app_module.admission_controller = original
+        
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response.headers)
+        self.assertEqual(json.loads(response.data)["reason"], "rate_limited")
+
+    def test_unknown_api_key_uses_ip_identity(self):
+        """Nur konfigurierte API-Keys erhalten einen eigenen Bucket"""
+        import app as app_module
+        
+        with mock.patch.object(app_module, "ADMISSION_API_KEYS", {"known", "vip"}), \
+                mock.patch.object(app_module, "ADMISSION_PRIORITY_KEYS", {"vip"}):
+            identities = []
+            for key in ("known", "vip", "random-123", None):
+                headers = {"X-API-Key": key} if key else {}
+                with app_module.app.test_request_context(headers=headers, environ_base={"REMOTE_ADDR": "10.0.0.7"}):
+                    identities.append(app_module._client_identity())
+        
+        self.assertEqual(identities, [("key:known", 1), ("key:vip", 0), ("ip:10.0.0.7", 2), ("ip:10.0.0.7", 2)])
+
+if __name__ == '__main__':
+    unittest.main()
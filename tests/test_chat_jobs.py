@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Testskript für den asynchronen Job-Modus von /chat.
+"""
+
+import unittest
+import json
+import os
+import sys
+import time
+import tempfile
+import threading
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from app import app
+from chat_jobs import ChatJobQueue, QueueFull, dedup_key, DONE, FAILED
+from deadline import remaining
+
+class TestChatJobQueue(unittest.TestCase):
+    """Test-Suite für ChatJobQueue."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.release = threading.Event()
+        self.release.set()
+        self.calls = []
+
+        def handler(message):
+            self.release.wait(2)
+            self.calls.append((message, remaining()))
+            if message == "fehler":
+                return {"error": "kaputt"}, 500
+            return {"response": f"Antwort auf {message}"}, 200
+
+        self.queue = ChatJobQueue(handler, directory=self.directory, workers=2,
+                                  max_pending=2, ttl=60, job_deadline=90)
+
+    def test_job_result_is_available_after_wait(self):
+        """Das Ergebnis wird per Long-Poll abgeholt; der Job läuft mit eigener Frist"""
+        job_id, deduplicated = self.queue.submit("Hallo", "k1")
+        record = self.queue.wait(job_id, 2)
+        self.assertFalse(deduplicated)
+        self.assertEqual(record["status"], DONE)
+        self.assertEqual(record["result"], {"response": "Antwort auf Hallo"})
+        self.assertGreater(self.calls[0][1], 80)
+
+    def test_duplicate_submissions_share_a_job(self):
+        """Gleiche Anfragen liefern dieselbe Job-ID, solange der Job läuft oder aufbewahrt wird"""
+        self.release.clear()
+        first_id, _ = self.queue.submit("Hallo", "k1")
+        second_id, deduplicated = self.queue.submit("Hallo", "k1")
+        self.assertEqual(first_id, second_id)
+        self.assertTrue(deduplicated)
+        self.release.set()
+        self.queue.wait(first_id, 2)
+        self.assertEqual(self.queue.submit("Hallo", "k1"), (first_id, True))
+        self.assertEqual(len(self.calls), 1)
+
+    def test_dedup_key(self):
+        """Der Schlüssel ignoriert umgebende Leerzeichen und trennt verschiedene Clients"""
+        self.assertEqual(dedup_key("ip:1.2.3.4", "  Hallo\n"), dedup_key("ip:1.2.3.4", "Hallo"))
+        self.assertNotEqual(dedup_key("ip:1.2.3.4", "Hallo"), dedup_key("ip:5.6.7.8", "Hallo"))
+        self.assertNotEqual(dedup_key("ip:1.2.3.4", "Hallo"), dedup_key("ip:1.2.3.4", "Hallo Welt"))
+
+    def test_failed_job_is_not_deduplicated(self):
+        """Nach einem Fehler startet eine erneute Anfrage einen neuen Job"""
+        job_id, _ = self.queue.submit("fehler", "k2")
+        self.assertEqual(self.queue.wait(job_id, 2)["status"], FAILED)
+        retry_id, deduplicated = self.queue.submit("fehler", "k2")
+        self.assertNotEqual(job_id, retry_id)
+        self.assertFalse(deduplicated)
+
+    def test_queue_is_bounded(self):
+        """Mehr als max_pending offene Jobs werden abgelehnt"""
+        self.release.clear()
+        self.queue.submit("a", "ka")
+        self.queue.submit("b", "kb")
+        with self.assertRaises(QueueFull):
+            self.queue.submit("c", "kc")
+        self.release.set()
+
+    def test_jobs_are_visible_to_other_workers(self):
+        """Ein zweiter Prozess mit demselben Verzeichnis sieht Status und Ergebnis"""
+        other_worker = ChatJobQueue(lambda message: ({}, 200), directory=self.directory)
+        self.release.clear()
+        job_id, _ = self.queue.submit("Hallo", "k1")
+        self.assertIn(other_worker.get(job_id)["status"], ("pending", "running"))
+        self.release.set()
+        self.assertEqual(other_worker.wait(job_id, 2)["status"], DONE)
+        self.assertEqual(other_worker.submit("Hallo", "k1"), (job_id, True))
+
+    def test_results_expire(self):
+        """Abgelaufene Ergebnisse sind nicht mehr abrufbar und werden entfernt"""
+        job_id, _ = self.queue.submit("Hallo", "k1")
+        self.queue.wait(job_id, 2)
+        with mock.patch("chat_jobs.time.time", return_value=time.time() + 120):
+            self.assertIsNone(self.queue.get(job_id))
+            self.assertEqual(self.queue.purge(), 2)
+        self.assertIsNone(self.queue.get("../../etc/passwd"))
+
+class TestChatJobEndpoints(unittest.TestCase):
+    """Test-Suite für /chat mit async-Flag und /chat/jobs/<job_id>."""
+
+    def setUp(self):
+        self.queue = ChatJobQueue(app_module.process_chat_message, directory=tempfile.mkdtemp())
+        patcher = mock.patch.object(app_module, "chat_jobs", self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = app.test_client()
+
+    def test_async_chat_returns_202_and_result_via_long_poll(self):
+        """POST /chat mit async antwortet sofort mit 202, das Ergebnis kommt per Long-Poll"""
+        with mock.patch.object(app_module, "get_gpt_response", return_value="Antwort"), \
+                mock.patch.object(app_module, "ADMISSION_ENABLED", False):
+            response = self.client.post("/chat", json={"message": "Wie hoch ist die Inflation?",
+                                                       "async": True})
+            self.assertEqual(response.status_code, 202)
+            job = json.loads(response.data)
+            self.assertEqual(response.headers["Location"], job["status_url"])
+
+            result = self.client.get(f"{job['status_url']}?wait=5")
+
+        data = json.loads(result.data)
+        self.assertEqual(result.status_code, 200)
+        self.assertEqual(data["status"], "done")
+        self.assertEqual(data["result"]["response"], "Antwort")
+        self.assertEqual(data["result"]["query_type"], "general_finance")
+
+    def test_prefer_header_and_deduplication(self):
+        """Prefer: respond-async aktiviert den Job-Modus; Wiederholungen erhalten dieselbe ID"""
+        with mock.patch.object(app_module, "ADMISSION_ENABLED", False):
+            first = self.client.post("/chat", json={"message": "Hallo"},
+                                     headers={"Prefer": "respond-async"})
+            second = self.client.post("/chat", json={"message": "Hallo"},
+                                      headers={"Prefer": "respond-async"})
+        self.assertEqual(json.loads(first.data)["job_id"], json.loads(second.data)["job_id"])
+        self.assertTrue(json.loads(second.data)["deduplicated"])
+
+    def test_async_non_object_body_returns_400(self):
+        """Im Job-Modus über den Prefer-Header wird ein Body ohne JSON-Objekt mit 400 abgelehnt"""
+        with mock.patch.object(app_module, "ADMISSION_ENABLED", False):
+            for body in (["Hallo"], "Hallo"):
+                response = self.client.post("/chat", json=body, headers={"Prefer": "respond-async"})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(json.loads(response.data), {"error": "No message provided"})
+
+    def test_unknown_job_returns_404(self):
+        """Unbekannte Jobs liefern 404"""
+        response = self.client.get("/chat/jobs/" + "0" * 32)
+        self.assertEqual(response.status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
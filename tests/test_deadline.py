@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Testskript für das deadline Modul.
+"""
+
+import unittest
+import os
+import sys
+import time
+import contextvars
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import deadline
+import trendlink_api
+from deadline import (DeadlineExceeded, adaptive_timeout, remaining, reset_deadline,
+                      set_deadline, upstream_timeout, with_deadline)
+from latency import LatencyTracker
+
+class TestDeadline(unittest.TestCase):
+    """Test-Suite für Anfrage-Fristen und adaptive Timeouts."""
+
+    def setUp(self):
+        self.tracker = LatencyTracker()
+        patcher = mock.patch.object(deadline, "get_tracker", lambda endpoint: self.tracker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_in_context(self, func, *args):
+        """Führt func in einem eigenen Kontext aus, damit Fristen nicht durchsickern."""
+        return contextvars.copy_context().run(func, *args)
+
+    def test_default_timeout_without_history(self):
+        """Ohne ausreichende Latenzhistorie gilt der bisherige feste Timeout"""
+        self.assertEqual(adaptive_timeout("test", 10), 10)
+
+    def test_adaptive_timeout_from_percentile(self):
+        """Mit Historie wird der Timeout aus Perzentil mal Faktor berechnet"""
+        for _ in range(30):
+            self.tracker.record(1.5)
+        with mock.patch.object(deadline, "ADAPTIVE_TIMEOUT_MULTIPLIER", 2.0):
+            self.assertEqual(adaptive_timeout("test", 10), 3.0)
+            self.assertEqual(adaptive_timeout("test", 2), 2)
+
+    def test_timeout_capped_by_remaining_budget(self):
+        """Der Timeout ist nie größer als die verbleibende Zeit bis zur Frist"""
+        def call():
+            set_deadline(2.0)
+            return upstream_timeout("test.capped", 10)
+        timeout = self.run_in_context(call)
+        self.assertLessEqual(timeout, 2.0)
+        self.assertGreater(timeout, 1.5)
+        self.assertEqual(deadline.snapshot()["endpoints"]["test.capped"]["capped_by_deadline"], 1)
+
+    def test_exhausted_budget_raises(self):
+        """Nach Ablauf der Frist wird kein Upstream-Aufruf mehr gestartet"""
+        def call():
+            set_deadline(0.001)
+            time.sleep(0.01)
+            upstream_timeout("test.exhausted", 10)
+        with self.assertRaises(DeadlineExceeded):
+            self.run_in_context(call)
+        self.assertEqual(deadline.snapshot()["endpoints"]["test.exhausted"]["budget_exhausted"], 1)
+
+    def test_no_deadline_outside_requests(self):
+        """Außerhalb einer Anfrage gibt es keine Frist"""
+        self.assertIsNone(remaining())
+        self.assertEqual(upstream_timeout("test.background", 10), 10)
+
+    def test_decorator_counts_overruns(self):
+        """Überschreitet eine Anfrage ihre Frist, wird das gezählt"""
+        before = deadline.snapshot()["requests"]["over_deadline"]
+        with mock.patch.object(deadline, "REQUEST_DEADLINE", 0.01):
+            with_deadline(lambda: time.sleep(0.02))()
+        self.assertEqual(deadline.snapshot()["requests"]["over_deadline"], before + 1)
+        self.assertIsNone(remaining())
+
+    @mock.patch('trendlink_api.requests.Session.get')
+    @mock.patch('trendlink_api.os.getenv')
+    def test_trendlink_uses_remaining_budget(self, mock_getenv, mock_requests_get):
+        """trendlink_api übergibt die verbleibende Zeit als Timeout"""
+        mock_getenv.return_value = "fake_api_token"
+        mock_response = mock.Mock()
+        mock_response.content = mock_response.text = '{"trends": []}'
+        mock_response.json.return_value = {"trends": []}
+        mock_requests_get.return_value = mock_response
+
+        def call():
+            token = set_deadline(3.0)
+            try:
+                trendlink_api.fetch_curated_trends(limit=1)
+            finally:
+                reset_deadline(token)
+        self.run_in_context(call)
+
+        self.assertLessEqual(mock_requests_get.call_args.kwargs["timeout"], 3.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Testskript für den ISIN/WKN-Index des Trend-Katalogs.
+"""
+
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+import trendlink_api
+from app import app
+from instrument_index import extract_identifiers, wkn_from_isin, ISIN, WKN
+from last_known_good import LastKnownGoodStore
+from trend_catalogue import TrendCatalogue
+from trend_model import Trend
+
+SAP = "DE0007164600"
+CATALOGUE = [
+    {"id": "t1", "name": "Cloud Computing", "instruments": [
+        {"isin": "US5949181045", "weighting": "high", "nice": True},
+        {"isin": SAP, "weighting": "normal", "nice": False}]},
+    {"id": "t2", "name": "Künstliche Intelligenz", "instruments": [
+        {"isin": SAP, "weighting": "high", "nice": True}]},
+    {"id": "t3", "name": "Industrie 4.0", "instruments": [
+        {"isin": SAP, "weighting": "low", "nice": False}]},
+]
+
+def load_catalogue():
+    catalogue = TrendCatalogue()
+    catalogue.load(Trend.from_dict(trend) for trend in CATALOGUE)
+    return catalogue
+
+class TestIdentifierExtraction(unittest.TestCase):
+    """Test-Suite für die Erkennung von ISINs und WKNs."""
+
+    def test_extract_identifiers(self):
+        """ISINs (auch klein geschrieben) und WKNs mit Stichwort werden erkannt"""
+        self.assertEqual(extract_identifiers(f"In welchen Trends ist ISIN {SAP} enthalten?"), [(ISIN, SAP)])
+        self.assertEqual(extract_identifiers("und us5949181045, WKN: 870747 sowie de0007164600"),
+                         [(ISIN, "US5949181045"), (WKN, "870747"), (ISIN, SAP)])
+        self.assertEqual(extract_identifiers("Wie entwickelt sich die Halbleiterbranche2?"), [])
+        self.assertEqual(extract_identifiers("Unterschied zwischen ISIN und WKN"), [])
+
+    def test_wkn_from_isin(self):
+        """Nur deutsche ISINs mit DE000-Präfix enthalten eine WKN"""
+        self.assertEqual(wkn_from_isin(SAP), "716460")
+        self.assertEqual(wkn_from_isin("DE000A1EWWW0"), "A1EWWW")
+        self.assertIsNone(wkn_from_isin("US5949181045"))
+
+class TestCatalogueInstrumentIndex(unittest.TestCase):
+    """Test-Suite für TrendCatalogue.find_instrument."""
+
+    def test_lookup_by_isin_and_wkn(self):
+        """Die Trends eines Instruments kommen nice zuerst, dann nach Gewichtung"""
+        catalogue = load_catalogue()
+        isin, memberships = catalogue.find_instrument(ISIN, SAP)
+        self.assertEqual(isin, SAP)
+        self.assertEqual([(m.trend.id, m.weighting, m.nice) for m in memberships],
+                         [("t2", "high", True), ("t1", "normal", False), ("t3", "low", False)])
+        self.assertEqual(catalogue.find_instrument(WKN, "716460")[0], SAP)
+        self.assertEqual(catalogue.find_instrument(ISIN, "FR0000120271"), (None, []))
+        self.assertEqual((catalogue.stats()["isins"], catalogue.stats()["wkns"]), (2, 1))
+
+    def test_index_follows_upsert_and_remove(self):
+        """upsert() und remove() passen den Index an, ohne ihn neu aufzubauen"""
+        catalogue = load_catalogue()
+        catalogue.upsert([Trend.from_dict({"id": "t2", "name": "Künstliche Intelligenz", "instruments": [
+            {"isin": "US67066G1040", "weighting": "high", "nice": True}]})])
+        self.assertEqual([m.trend.id for m in catalogue.find_instrument(ISIN, SAP)[1]], ["t1", "t3"])
+        self.assertEqual(catalogue.find_instrument(ISIN, "US67066G1040")[1][0].trend.id, "t2")
+
+        catalogue.remove(["t1", "t3"])
+        self.assertEqual(catalogue.find_instrument(WKN, "716460"), (None, []))
+        self.assertIsNone(catalogue.find_instrument(ISIN, "US5949181045")[0])
+
+class TestInstrumentQuestions(unittest.TestCase):
+    """Test-Suite für ISIN-Fragen im Chat."""
+
+    def test_stale_catalogue_refreshes_in_background(self):
+        """Ein veralteter Katalog wird sofort verwendet und im Hintergrund abgeglichen"""
+        catalogue = load_catalogue()
+        catalogue.loaded_at -= trendlink_api.TRENDLINK_CATALOGUE_MAX_AGE + 1
+        trend_sync = mock.Mock()
+        with mock.patch("trendlink_api.get_catalogue", return_value=catalogue), \
+                mock.patch("trendlink_api.get_trend_sync", return_value=trend_sync), \
+                mock.patch("trendlink_api.sync_trend_catalogue") as sync:
+            isin, memberships = trendlink_api.find_instrument_trends(ISIN, SAP)
+        sync.assert_not_called()
+        trend_sync.refresh_in_background.assert_called_once_with(trendlink_api.TRENDLINK_CATALOGUE_MAX_AGE)
+        self.assertEqual(len(memberships), 3)
+
+    def test_format_and_limit(self):
+        """get_instrument_trends formatiert Trends, Gewichtung und nice-Flag"""
+        catalogue = load_catalogue()
+        with mock.patch("trendlink_api.get_catalogue", return_value=catalogue), \
+                mock.patch("trendlink_api.sync_trend_catalogue") as sync:
+            text = trendlink_api.get_instrument_trends(SAP, top=2)
+            missing = trendlink_api.get_instrument_trends("WKN 123456")
+        sync.assert_not_called()
+        self.assertIn("ISIN DE0007164600 (WKN 716460)", text)
+        self.assertIn("1. ★ Künstliche Intelligenz", text)
+        self.assertIn("(Top 2 von 3 Trends)", text)
+        self.assertNotIn("Industrie 4.0", text)
+        self.assertIn("WKN 123456", missing)
+
+    def test_chat_injects_instrument_trends(self):
+        """Eine ISIN-Frage wird über den Index beantwortet statt über die kuratierten Trends"""
+        catalogue = load_catalogue()
+        with mock.patch("trendlink_api.get_catalogue", return_value=catalogue), \
+                mock.patch.object(app_module, "get_last_known_good", return_value=LastKnownGoodStore()), \
+                mock.patch.object(app_module, "get_curated_trends") as curated, \
+                mock.patch.object(app_module, "get_gpt_response", return_value="Antwort") as gpt, \
+                mock.patch.object(app_module, "ADMISSION_ENABLED", False):
+            response = app.test_client().post("/chat", json={
+                "message": f"In welchen Trends ist {SAP} enthalten?"})
+
+        data = response.get_json()
+        self.assertEqual(data["query_type"], "instrument_trends")
+        self.assertTrue(data["has_trend_data"])
+        curated.assert_not_called()
+        system_prompt = gpt.call_args[0][1]
+        self.assertIn("Künstliche Intelligenz", system_prompt)
+        self.assertIn("Gewichtung im Trend: high", system_prompt)
+
+if __name__ == "__main__":
+    unittest.main()
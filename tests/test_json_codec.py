@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Testskript für den JSON-Codec und den Flask-JSON-Provider.
+"""
+
+import unittest
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from unittest import mock
+
+from flask import request
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json_codec
+from app import app
+from json_codec import CodecJSONProvider
+
+SAMPLE = {"name": "Künstliche Intelligenz", "score": 87.5, "nice": True, "instruments": [
+    {"isin": "DE0007164600", "weighting": "high"}], 2: None}
+
+class TestJsonCodec(unittest.TestCase):
+    """Test-Suite für json_codec, mit orjson (falls installiert) und der Standardbibliothek."""
+
+    def codecs(self):
+        yield json_codec._orjson
+        yield None
+
+    def test_round_trip(self):
+        """Beide Codecs erzeugen kompaktes UTF-8-JSON und lesen Bytes wie Text"""
+        for codec in self.codecs():
+            with self.subTest(codec=codec), mock.patch.object(json_codec, "_orjson", codec):
+                encoded = json_codec.dumps_bytes(SAMPLE)
+                self.assertIn("Künstliche".encode("utf-8"), encoded)
+                self.assertNotIn(b", ", encoded)
+                self.assertEqual(json_codec.loads(encoded), json.loads(encoded))
+                self.assertEqual(json_codec.loads(encoded.decode("utf-8"))["2"], None)
+                self.assertEqual(json_codec.dumps(SAMPLE), encoded.decode("utf-8"))
+
+    def test_same_output_for_both_codecs(self):
+        """Sortierte Ausgabe und default-Umwandlung sind bei beiden Codecs gleich"""
+        data = {"b": datetime(2024, 1, 2, tzinfo=timezone.utc), "a": [1, 2.5, "ä"], "big": 2 ** 70}
+        outputs = set()
+        for codec in self.codecs():
+            with mock.patch.object(json_codec, "_orjson", codec):
+                outputs.add(json_codec.dumps_bytes(data, default=str, sort_keys=True))
+        self.assertEqual(len(outputs), 1)
+
+    def test_invalid_json_raises_value_error(self):
+        """Ungültige Daten lösen bei beiden Codecs ValueError aus"""
+        for codec in self.codecs():
+            with self.subTest(codec=codec), mock.patch.object(json_codec, "_orjson", codec):
+                with self.assertRaises(ValueError):
+                    json_codec.loads(b'{"trends": [')
+
+class TestCodecJSONProvider(unittest.TestCase):
+    """Test-Suite für CodecJSONProvider."""
+
+    def test_app_uses_codec_provider(self):
+        """jsonify und get_json laufen über den Codec, Datumswerte wie beim Standard-Provider"""
+        self.assertIsInstance(app.json, CodecJSONProvider)
+        with app.app_context():
+            response = app.json.response({"zeit": datetime(2024, 1, 2, tzinfo=timezone.utc), "text": "Ölpreis"})
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertTrue(response.data.endswith(b"\n"))
+        self.assertEqual(json.loads(response.data),
+                         {"text": "Ölpreis", "zeit": "Tue, 02 Jan 2024 00:00:00 GMT"})
+
+        with app.test_request_context(method="POST", data='{"message": "Hallo"}',
+                                      content_type="application/json"):
+            self.assertEqual(request.get_json(), {"message": "Hallo"})
+
+    def test_debug_output_is_indented(self):
+        """Mit compact=False (bzw. im Debug-Modus) bleibt die eingerückte Ausgabe des Standard-Providers erhalten"""
+        with mock.patch.object(app.json, "compact", False), app.app_context():
+            response = app.json.response({"a": 1})
+        self.assertIn(b'\n  "a": 1', response.data)
+
+if __name__ == "__main__":
+    unittest.main()
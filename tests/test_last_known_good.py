@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Testskript für das last_known_good Modul.
+"""
+
+import unittest
+import os
+import sys
+import json
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from app import app
+from last_known_good import LastKnownGoodStore, NoData, describe_age
+
+def failing(*args, **kwargs):
+    raise Exception("Verbindung abgelehnt")
+
+class TestLastKnownGood(unittest.TestCase):
+    """Test-Suite für den Last-Known-Good-Speicher."""
+
+    def test_fresh_data_is_stored(self):
+        """Erfolgreiche Antworten werden ohne Alter zurückgegeben und gespeichert"""
+        store = LastKnownGoodStore()
+        self.assertEqual(store.fetch("curated", "5", lambda: "Daten"), ("Daten", None))
+        self.assertEqual(store.snapshot()["entries"], 1)
+
+    def test_stored_data_is_served_on_failure(self):
+        """Bei einem Fehler wird der gespeicherte Stand mit seinem Alter geliefert"""
+        store = LastKnownGoodStore(max_staleness=600)
+        with mock.patch("last_known_good.time.time", return_value=1000.0):
+            store.fetch("curated", "5", lambda: "Daten")
+        with mock.patch("last_known_good.time.time", return_value=1090.0):
+            self.assertEqual(store.fetch("curated", "5", failing), ("Daten", 90.0))
+        with mock.patch("last_known_good.time.time", return_value=2000.0):
+            with self.assertRaises(Exception):
+                store.fetch("curated", "5", failing)
+        self.assertEqual(store.stats["served_stale"], 1)
+        self.assertEqual(store.stats["too_stale"], 1)
+
+    def test_no_data_results_are_not_stored(self):
+        """Ergebnisse ohne Trend-Daten werden geliefert, ersetzen aber nicht den gespeicherten Stand"""
+        store = LastKnownGoodStore()
+        store.fetch("instruments", "solar", lambda: "Daten zu Solar")
+        not_found = NoData("Leider wurde kein Trend zum Thema 'solar' gefunden.")
+        self.assertEqual(store.fetch("instruments", "solar", lambda: not_found), (not_found, None))
+        self.assertEqual(store.fetch("instruments", "solar", failing)[0], "Daten zu Solar")
+
+        store.fetch("instruments", "wind", lambda: NoData("Keine Daten"))
+        with self.assertRaises(Exception):
+            store.fetch("instruments", "wind", failing)
+
+    def test_failure_without_stored_data_is_raised(self):
+        """Ohne gespeicherten Stand wird der ursprüngliche Fehler weitergereicht"""
+        with self.assertRaisesRegex(Exception, "Verbindung abgelehnt"):
+            LastKnownGoodStore().fetch("curated", "5", failing)
+
+    def test_oldest_entries_are_evicted(self):
+        """Die Anzahl der Einträge ist begrenzt"""
+        store = LastKnownGoodStore(max_entries=2)
+        for name in ("a", "b", "c"):
+            store.put("instruments", name, name)
+        self.assertIsNone(store.get("instruments", "a"))
+        self.assertEqual(store.get("instruments", "c")[0], "c")
+
+    def test_describe_age(self):
+        """Das Alter wird in passender Einheit beschrieben"""
+        self.assertEqual(describe_age(45), "45 Sekunden")
+        self.assertEqual(describe_age(12 * 60), "12 Minuten")
+        self.assertEqual(describe_age(5 * 3600), "5 Stunden")
+
+    def test_chat_reports_degraded_data(self):
+        """Bei einem Trendlink-Ausfall nennt /chat das Alter der Daten in Prompt und Antwort"""
+        store = LastKnownGoodStore()
+        store.put("trendlink.curated_trends", "5", "Gespeicherte Trends", now=0)
+        with mock.patch.object(app_module, "get_last_known_good", return_value=store), \
+                mock.patch.object(app_module, "get_curated_trends", side_effect=failing), \
+                mock.patch.object(app_module, "get_gpt_response", return_value="Antwort") as gpt, \
+                mock.patch.object(app_module, "ADMISSION_ENABLED", False), \
+                mock.patch("last_known_good.time.time", return_value=300.0):
+            response = app.test_client().post("/chat", json={"message": "Was sind aktuelle Trends am Markt?"})
+
+        data = json.loads(response.data)
+        self.assertTrue(data["degraded"])
+        self.assertEqual(data["data_age_seconds"], 300.0)
+        system_prompt = gpt.call_args[0][1]
+        self.assertIn("vor 5 Minuten", system_prompt)
+        self.assertIn("Gespeicherte Trends", system_prompt)
+
+if __name__ == "__main__":
+    unittest.main()
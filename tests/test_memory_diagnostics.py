@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Speicherdiagnose unter /admin/memory.
+"""
+
+import unittest
+import json
+import os
+import sys
+import tracemalloc
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+import memory_diagnostics
+from app import app
+from profiling import sign_profile_request
+
+SECRET = "admin-geheimnis"
+
+class TestMemoryDiagnostics(unittest.TestCase):
+    """Test-Suite für die Admin-Endpunkte der Speicherdiagnose."""
+
+    def setUp(self):
+        patcher = mock.patch.object(app_module, "ADMIN_SECRET", SECRET)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(memory_diagnostics.stop_tracing)
+        self.client = app.test_client()
+        self.headers = {"X-Admin-Request": sign_profile_request(SECRET)}
+
+    def test_requires_valid_signature(self):
+        """Ohne gültige Signatur 403, ohne ADMIN_SECRET 404"""
+        self.assertEqual(self.client.get("/admin/memory").status_code, 403)
+        bad = {"X-Admin-Request": sign_profile_request("falsch")}
+        self.assertEqual(self.client.get("/admin/memory", headers=bad).status_code, 403)
+        with mock.patch.object(app_module, "ADMIN_SECRET", ""):
+            self.assertEqual(self.client.get("/admin/memory", headers=self.headers).status_code, 404)
+
+    def test_report_contains_rss_and_caches(self):
+        """Der Bericht nennt PID, RSS, Caches und auf Wunsch Objektzähler"""
+        response = self.client.get("/admin/memory?objects=1", headers=self.headers)
+        data = json.loads(response.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["pid"], os.getpid())
+        self.assertGreater(data["rss_bytes"], 0)
+        self.assertIn("trends", data["caches"]["trend_catalogue"])
+        self.assertIn("entries", data["caches"]["last_known_good"])
+        self.assertIn("dict", data["objects"]["top_types"])
+
+    def test_snapshot_diff_shows_growth(self):
+        """Zwischen zwei Snapshots erscheint eine neue Allokation als Zuwachs"""
+        self.assertEqual(self.client.post("/admin/memory/snapshots", headers=self.headers).status_code, 409)
+
+        response = self.client.post("/admin/memory/tracing?frames=5", headers=self.headers)
+        self.assertTrue(json.loads(response.data)["tracing"])
+        self.client.post("/admin/memory/snapshots?name=vorher", headers=self.headers)
+        self.grown = [bytearray(1024) for _ in range(2000)]
+        self.client.post("/admin/memory/snapshots?name=nachher", headers=self.headers)
+
+        response = self.client.get("/admin/memory/diff?base=vorher&target=nachher&limit=5",
+                                   headers=self.headers)
+        data = json.loads(response.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(data["total_diff_bytes"], 2000 * 1024)
+        self.assertIn("test_memory_diagnostics.py", data["top"][0]["where"][0])
+
+        top = json.loads(self.client.get("/admin/memory/top?limit=3", headers=self.headers).data)
+        self.assertEqual(len(top["top"]), 3)
+        missing = self.client.get("/admin/memory/diff?base=gibtsnicht", headers=self.headers)
+        self.assertEqual(missing.status_code, 404)
+
+        response = self.client.delete("/admin/memory/tracing", headers=self.headers)
+        self.assertFalse(json.loads(response.data)["tracing"])
+        self.assertFalse(tracemalloc.is_tracing())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Testskript für das model_router Modul.
+"""
+
+import unittest
+import os
+import sys
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import model_router
+from latency import LatencyTracker
+
+class TestModelRouter(unittest.TestCase):
+    """Test-Suite für das Model-Routing."""
+    
+    def test_data_restatement_uses_fast_model(self):
+        """Kurze Fragen zu injizierten Trend-Daten gehen an das schnelle Modell"""
+        decision = model_router.route_request(
+            "trend_instruments", "Top Aktien zu Elektroautos?", "System-Prompt mit Daten"
+        )
+        self.assertEqual(decision.model, model_router.MODEL_FAST)
+        self.assertEqual(decision.max_tokens, model_router.MODEL_FAST_MAX_TOKENS)
+        self.assertEqual(decision.reason, "data_restatement")
+    
+    def test_open_ended_uses_primary_model(self):
+        """Allgemeine Finanzfragen bleiben beim Hauptmodell"""
+        decision = model_router.route_request(
+            "general_finance", "Wie bewerte ich das Risiko meines Portfolios?", "System-Prompt"
+        )
+        self.assertEqual(decision.model, model_router.MODEL_PRIMARY)
+        self.assertEqual(decision.reason, "open_ended")
+    
+    def test_long_question_uses_primary_model(self):
+        """Lange Fragen gelten trotz Trend-Daten als offene Analyse"""
+        question = "Aktien zu Elektroautos " + "und bitte ausführlich analysieren " * 10
+        decision = model_router.route_request("trend_instruments", question, "System-Prompt")
+        self.assertEqual(decision.model, model_router.MODEL_PRIMARY)
+    
+    def test_primary_over_latency_budget(self):
+        """Überschreitet das Hauptmodell sein Latenzbudget, wird auf das schnelle Modell ausgewichen"""
+        slow_tracker = LatencyTracker()
+        for _ in range(model_router.MODEL_BUDGET_MIN_SAMPLES):
+            slow_tracker.record(model_router.MODEL_PRIMARY_LATENCY_BUDGET * 2)
+        
+        with mock.patch.object(model_router, "get_tracker", return_value=slow_tracker):
+            decision = model_router.route_request("general_finance", "Wie steht der Markt?", "Prompt")
+        
+        self.assertEqual(decision.model, model_router.MODEL_FAST)
+        self.assertTrue(decision.reason.startswith("primary_latency_p95"))
+    
+    def test_decisions_are_recorded(self):
+        """Jede Entscheidung wird in der Historie festgehalten"""
+        model_router.route_request("curated_trends", "Neue Trends?", "Prompt")
+        last = model_router.recent_decisions()[-1]
+        self.assertEqual(last["query_type"], "curated_trends")
+        self.assertIn("model", last)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Testskript für Fragen zu mehreren Trends.
+"""
+
+import unittest
+import json
+import os
+import sys
+import time
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from app import app, extract_trend_requests, fetch_trend_instruments_concurrently
+from last_known_good import LastKnownGoodStore
+
+class TestMultiTrend(unittest.TestCase):
+    """Test-Suite für die Erkennung und den parallelen Abruf mehrerer Trends."""
+
+    def test_extract_several_trend_names(self):
+        """Mehrere Trendnamen werden an und, sowie, oder und Kommas getrennt"""
+        self.assertEqual(extract_trend_requests("Vergleiche Aktien zu Elektroautos und Wasserstoff"),
+                         (True, ["elektroautos", "wasserstoff"]))
+        self.assertEqual(extract_trend_requests("Aktien zu Solar, Windkraft sowie Wasserstoff oder Solar"),
+                         (True, ["solar", "windkraft", "wasserstoff"]))
+        self.assertEqual(extract_trend_requests("Aktien zu Wasserstoff"), (True, ["wasserstoff"]))
+        self.assertEqual(extract_trend_requests("Wie hoch ist die Inflation?"), (False, []))
+
+    def test_number_of_trends_is_limited(self):
+        """Es werden höchstens TREND_MAX_PER_QUESTION Trends abgefragt"""
+        with mock.patch.object(app_module, "TREND_MAX_PER_QUESTION", 2):
+            _, trend_names = extract_trend_requests("Aktien zu Solar, Wind, Wasserstoff")
+        self.assertEqual(trend_names, ["solar", "wind"])
+
+    def test_fetches_run_concurrently(self):
+        """Die Gesamtdauer entspricht etwa dem langsamsten Einzelabruf"""
+        def slow_fetch(trend_name):
+            time.sleep(0.2)
+            return f"Daten zu {trend_name}"
+
+        with mock.patch.object(app_module, "get_trend_instruments", side_effect=slow_fetch):
+            start = time.perf_counter()
+            results = fetch_trend_instruments_concurrently(["solar", "wind", "wasserstoff"])
+            elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 0.45)
+        self.assertEqual([result[0] for result in results], ["solar", "wind", "wasserstoff"])
+        self.assertEqual(results[1][1], "Daten zu wind")
+
+    def test_chat_merges_contexts_and_keeps_partial_results(self):
+        """Der Prompt enthält alle gefundenen Trends, ein Fehler betrifft nur seinen Trend"""
+        def fetch(trend_name):
+            if trend_name == "wasserstoff":
+                raise Exception("Zeitüberschreitung")
+            return f"Daten zu {trend_name}"
+
+        with mock.patch.object(app_module, "get_trend_instruments", side_effect=fetch), \
+                mock.patch.object(app_module, "get_last_known_good", return_value=LastKnownGoodStore()), \
+                mock.patch.object(app_module, "get_gpt_response", return_value="Antwort") as gpt, \
+                mock.patch.object(app_module, "ADMISSION_ENABLED", False):
+            response = app.test_client().post(
+                "/chat", json={"message": "Vergleiche Aktien zu Elektroautos und Wasserstoff"}
+            )
+
+        data = json.loads(response.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["query_type"], "trend_instruments")
+        system_prompt = gpt.call_args[0][1]
+        self.assertIn("Top-Aktien im Trend 'elektroautos'", system_prompt)
+        self.assertIn("Daten zu elektroautos", system_prompt)
+        self.assertIn("Informationen zum Trend 'wasserstoff' abzurufen", system_prompt)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Testskript für das openai_client Modul.
+"""
+
+import unittest
+import os
+import sys
+import time
+import threading
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai_client
+from latency import LatencyTracker
+
+class TestHedgedCompletion(unittest.TestCase):
+    """Test-Suite für gehedgte OpenAI-Anfragen."""
+    
+    def setUp(self):
+        """Test-Setup: Latenzhistorie mit schnellen Antworten füllen"""
+        self.tracker = LatencyTracker()
+        for _ in range(30):
+            self.tracker.record(0.05)
+        patches = [
+            mock.patch.object(openai_client, "_completion_latency", lambda model: self.tracker),
+            mock.patch.object(openai_client, "_hedge_history", openai_client.deque(maxlen=100)),
+            mock.patch.object(openai_client, "OPENAI_HEDGE_MIN_DELAY", 0.01),
+            mock.patch.object(openai_client, "OPENAI_HEDGE_MIN_SAMPLES", 10),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_hedge_wins_when_primary_is_slow(self):
+        """Die zweite Anfrage gewinnt, wenn die erste hängt, und die erste wird abgebrochen"""
+        calls = []
+        release_primary = threading.Event()
+        
+        def fake_completion(api_key, messages, model, max_tokens, attempt=None):
+            calls.append(attempt)
+            if len(calls) == 1:
+                release_primary.wait(2)
+                return "langsam"
+            return "schnell"
+        
+        with mock.patch.object(openai_client, "_create_completion", side_effect=fake_completion), \
+                mock.patch.object(openai_client, "OPENAI_HEDGE_MAX_RATE", 1.0):
+            result = openai_client._hedged_completion("key", [], "gpt-4", 800)
+        release_primary.set()
+        
+        self.assertEqual(result, "schnell")
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(calls[0].cancelled)
+    
+    def test_no_hedge_when_budget_exhausted(self):
+        """Ist das Hedge-Budget erschöpft, wird keine zweite Anfrage gesendet"""
+        calls = []
+        
+        def fake_completion(api_key, messages, model, max_tokens, attempt=None):
+            calls.append(attempt)
+            time.sleep(0.1)
+            return "antwort"
+        
+        with mock.patch.object(openai_client, "_create_completion", side_effect=fake_completion), \
+                mock.patch.object(openai_client, "OPENAI_HEDGE_MAX_RATE", 0.0):
+            result = openai_client._hedged_completion("key", [], "gpt-4", 800)
+        
+        self.assertEqual(result, "antwort")
+        self.assertEqual(len(calls), 1)
+    
+    def test_no_hedge_without_enough_samples(self):
+        """Ohne ausreichende Latenzhistorie wird nicht gehedgt"""
+        empty_tracker = LatencyTracker()
+        calls = []
+        
+        def fake_completion(api_key, messages, model, max_tokens, attempt=None):
+            calls.append(attempt)
+            time.sleep(0.05)
+            return "antwort"
+        
+        with mock.patch.object(openai_client, "_completion_latency", lambda model: self.tracker), \
+                mock.patch.object(openai_client, "_create_completion", side_effect=fake_completion), \
+                mock.patch.object(openai_client, "OPENAI_HEDGE_MAX_RATE", 1.0):
+            result = openai_client._hedged_completion("key", [], "gpt-4", 800)
+        
+        self.assertEqual(result, "antwort")
+        self.assertEqual(len(calls), 1)
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test-Suite für den LatencyTracker."""
+    
+    def test_percentile_and_error_rate(self):
+        """Perzentile werden nach Nearest-Rank berechnet, Fehler separat gezählt"""
+        tracker = LatencyTracker()
+        self.assertIsNone(tracker.percentile(95))
+        
+        for value in range(1, 101):
+            tracker.record(value / 100.0)
+        tracker.record(5.0, ok=False)
+        
+        self.assertAlmostEqual(tracker.percentile(50), 0.5)
+        self.assertAlmostEqual(tracker.percentile(95), 0.95)
+        self.assertAlmostEqual(tracker.error_rate(), 1 / 101)
+
+if __name__ == '__main__':
+    unittest.main()
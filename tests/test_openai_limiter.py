@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Testskript für den ausgehenden OpenAI-Limiter.
+"""
+
+import unittest
+import os
+import sys
+import time
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+import openai
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai_client
+from deadline import DeadlineExceeded, set_deadline, reset_deadline
+from openai_limiter import OpenAILimiter, parse_reset, estimate_tokens
+from usage_accounting import UsageAccountant
+
+def api_error(status_code, headers=None):
+    """Erzeugt einen Fehler, wie ihn das OpenAI SDK für eine HTTP-Antwort wirft."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    error_class = {429: openai.RateLimitError, 400: openai.BadRequestError}.get(status_code,
+                                                                               openai.InternalServerError)
+    return error_class("Fehler", response=response, body=None)
+
+def raw_response(content="Antwort", headers=None):
+    """Simuliert die Rückgabe von with_raw_response.create()."""
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+    )
+    return SimpleNamespace(headers=headers or {}, parse=lambda: response)
+
+class TestOpenAILimiter(unittest.TestCase):
+    """Test-Suite für OpenAILimiter."""
+
+    def test_parse_reset(self):
+        """Die Dauerangaben der x-ratelimit-reset-*-Header werden gelesen"""
+        self.assertEqual(parse_reset("1s"), 1.0)
+        self.assertEqual(parse_reset("6m0s"), 360.0)
+        self.assertAlmostEqual(parse_reset("20ms"), 0.02)
+        self.assertAlmostEqual(parse_reset("1h2m3.5s"), 3723.5)
+        self.assertIsNone(parse_reset(None))
+        self.assertIsNone(parse_reset("bald"))
+
+    def test_estimate_tokens(self):
+        """Die Schätzung umfasst Prompt-Zeichen und max_tokens"""
+        messages = [{"role": "system", "content": "x" * 400}, {"role": "user", "content": "y" * 40}]
+        self.assertEqual(estimate_tokens(messages, 800), 910)
+
+    def test_concurrency_limit_queues_calls(self):
+        """Über max_concurrency hinaus wartet ein Aufruf, bis ein Platz frei wird"""
+        limiter = OpenAILimiter(max_concurrency=1)
+        limiter.acquire()
+        with self.assertRaises(DeadlineExceeded):
+            limiter.acquire(timeout=0.05)
+
+        threading.Timer(0.05, limiter.release).start()
+        waited = limiter.acquire(timeout=2)
+        self.assertGreaterEqual(waited, 0.04)
+        self.assertEqual(limiter.snapshot()["stats"]["queued"], 1)
+
+    def test_exhausted_token_budget_waits_for_reset(self):
+        """Reicht das Token-Budget nicht, wartet der Aufruf bis zum Reset"""
+        limiter = OpenAILimiter(max_concurrency=10)
+        limiter.observe({"x-ratelimit-limit-tokens": "10000", "x-ratelimit-remaining-tokens": "100",
+                         "x-ratelimit-reset-tokens": "80ms"})
+        self.assertLess(limiter.acquire(tokens=50), 0.01)
+
+        # Nur noch 50 Tokens übrig: ein Aufruf mit 800 Tokens muss auf den Reset warten
+        waited = limiter.acquire(tokens=800, timeout=2)
+        self.assertGreaterEqual(waited, 0.05)
+        self.assertEqual(limiter.snapshot()["tokens"]["remaining"], 10000 - 800)
+
+    def test_budget_wait_beyond_deadline_fails_fast(self):
+        """Liegt der Reset nach der Frist, schlägt acquire() sofort fehl"""
+        limiter = OpenAILimiter()
+        limiter.observe({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "30s"})
+        start = time.monotonic()
+        with self.assertRaises(DeadlineExceeded):
+            limiter.acquire(timeout=5)
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_retry_delay(self):
+        """429 und 5xx werden wiederholt, 4xx nicht; retry-after pausiert alle Aufrufe"""
+        limiter = OpenAILimiter(max_retries=2, backoff=0.01, max_backoff=1)
+        self.assertIsNone(limiter.retry_delay(400, 0))
+        self.assertIsNone(limiter.retry_delay(500, 2))
+        self.assertLessEqual(limiter.retry_delay(503, 1), 0.02)
+        self.assertLessEqual(limiter.retry_delay(None, 0), 0.01)
+
+        delay = limiter.retry_delay(429, 0, {"retry-after-ms": "200"})
+        self.assertGreaterEqual(delay, 0.2)
+        self.assertGreater(limiter.snapshot()["paused_for"], 0)
+        self.assertEqual(limiter.snapshot()["stats"]["rate_limited"], 1)
+
+    def test_retry_after_is_not_shortened(self):
+        """Ein retry-after über max_backoff wird voll abgewartet, über retry_after_max gar nicht"""
+        limiter = OpenAILimiter(max_retries=2, backoff=0.01, max_backoff=1, retry_after_max=30)
+        delay = limiter.retry_delay(429, 0, {"retry-after": "20"})
+        self.assertGreaterEqual(delay, 20)
+
+        self.assertIsNone(limiter.retry_delay(429, 0, {"retry-after": "45"}))
+        self.assertGreater(limiter.snapshot()["paused_for"], 40)
+        self.assertEqual(limiter.snapshot()["stats"]["rate_limited"], 2)
+        self.assertEqual(limiter.snapshot()["stats"]["retries"], 1)
+
+class TestCompletionRetries(unittest.TestCase):
+    """Test-Suite für Wiederholungen in _create_completion."""
+
+    def setUp(self):
+        self.limiter = OpenAILimiter(max_concurrency=2, max_retries=3, backoff=0.01, max_backoff=0.05)
+        self.client = mock.Mock()
+        for patcher in (mock.patch.object(openai_client, "get_limiter", return_value=self.limiter),
+                        mock.patch.object(openai_client, "get_accountant",
+                                          return_value=UsageAccountant(log_path="")),
+                        mock.patch.object(openai_client, "OPENAI_HEDGE_ENABLED", False),
+                        mock.patch("openai.OpenAI", return_value=self.client),
+                        mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_rate_limited_call_is_retried(self):
+        """Nach 429 und 503 wird wiederholt; der Nutzer erhält die Antwort statt eines Fehlers"""
+        create = self.client.chat.completions.with_raw_response.create
+        create.side_effect = [
+            api_error(429, {"retry-after-ms": "10", "x-ratelimit-remaining-requests": "0",
+                            "x-ratelimit-reset-requests": "20ms"}),
+            api_error(503),
+            raw_response(headers={"x-ratelimit-remaining-requests": "99"}),
+        ]
+        self.assertEqual(openai_client.get_gpt_response("Frage", "System"), "Antwort")
+        self.assertEqual(create.call_count, 3)
+        snapshot = self.limiter.snapshot()
+        self.assertEqual((snapshot["stats"]["retries"], snapshot["in_flight"]), (2, 0))
+        self.assertEqual(snapshot["requests"]["remaining"], 99)
+
+    def test_client_errors_are_not_retried(self):
+        """Ein 400-Fehler wird nicht wiederholt"""
+        create = self.client.chat.completions.with_raw_response.create
+        create.side_effect = api_error(400)
+        result = openai_client.get_gpt_response("Frage", "System")
+        self.assertTrue(result.startswith("Fehler bei der Kommunikation mit OpenAI"))
+        self.assertEqual(create.call_count, 1)
+
+    def test_retries_stop_at_deadline(self):
+        """Reicht die Frist nicht für die Wartezeit, wird nicht mehr wiederholt"""
+        create = self.client.chat.completions.with_raw_response.create
+        create.side_effect = api_error(429, {"retry-after": "5"})
+        self.limiter.max_backoff = 10
+        token = set_deadline(1)
+        try:
+            start = time.monotonic()
+            with self.assertRaises(openai.RateLimitError):
+                openai_client._create_completion("key", [], "gpt-4", 100)
+        finally:
+            reset_deadline(token)
+        self.assertEqual(create.call_count, 1)
+        self.assertLess(time.monotonic() - start, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Trend-Exposure-Auswertung von Portfolios.
+"""
+
+import unittest
+import os
+import sys
+import random
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+import portfolio_exposure
+from app import app
+from benchmarks.catalogue import make_catalogue
+from instrument_index import ISIN, WKN
+from portfolio_exposure import (Position, PortfolioError, parse_positions, parse_portfolio_text,
+                                analyze_portfolio, get_matrix, format_exposure_summary,
+                                PORTFOLIO_WEIGHTING_FACTORS)
+from trend_catalogue import TrendCatalogue
+from trend_model import Trend, WEIGHTINGS
+
+SAP = "DE0007164600"
+MSFT = "US5949181045"
+NVDA = "US67066G1040"
+CATALOGUE = [
+    {"id": "t1", "name": "Cloud Computing", "instruments": [
+        {"isin": MSFT, "weighting": "high", "nice": True},
+        {"isin": SAP, "weighting": "normal", "nice": False}]},
+    {"id": "t2", "name": "Künstliche Intelligenz", "instruments": [
+        {"isin": SAP, "weighting": "high", "nice": True},
+        {"isin": NVDA, "weighting": "high", "nice": True},
+        {"isin": "FR0000120271", "weighting": "low", "nice": False}]},
+    {"id": "t3", "name": "Industrie 4.0", "instruments": [
+        {"isin": SAP, "weighting": "low", "nice": False}]},
+]
+
+def load_catalogue(trends=CATALOGUE):
+    catalogue = TrendCatalogue()
+    catalogue.load(Trend.from_dict(trend) for trend in trends)
+    return catalogue
+
+def reference_exposure(trends, weights):
+    """Exposure je Trend per Schleife über alle Instrumente."""
+    factors = dict(zip(WEIGHTINGS, PORTFOLIO_WEIGHTING_FACTORS))
+    result = {}
+    for trend in trends:
+        seen = {}
+        for instrument in trend["instruments"]:
+            seen.setdefault(instrument["isin"], instrument)
+        exposure = sum(weights.get(isin, 0.0) for isin in seen)
+        weighted = sum(weights.get(isin, 0.0) * factors[i["weighting"]] for isin, i in seen.items())
+        if exposure > 0:
+            result[trend["id"]] = (exposure, weighted)
+    return result
+
+class TestPortfolioParsing(unittest.TestCase):
+    """Test-Suite für das Einlesen von Portfolios."""
+
+    def test_parse_text(self):
+        """Eingefügter Text: Kennung und optional ein Gewicht pro Zeile"""
+        positions = parse_portfolio_text(f"{SAP} 25%\n\nWKN 870747; 10,5\nus5949181045")
+        self.assertEqual(positions, [Position(ISIN, SAP, 25.0), Position(WKN, "870747", 10.5),
+                                     Position(ISIN, MSFT, None)])
+        with self.assertRaises(PortfolioError):
+            parse_portfolio_text("Apple 10%")
+
+    def test_parse_list(self):
+        """Liste aus Objekten oder Paaren; Gewichte dürfen nicht negativ sein"""
+        positions = parse_positions([{"isin": SAP, "weight": 2}, {"wkn": "870747", "weight": "1"}, [MSFT, 1]])
+        self.assertEqual([(p.kind, p.identifier, p.weight) for p in positions],
+                         [(ISIN, SAP, 2.0), (WKN, "870747", 1.0), (ISIN, MSFT, 1.0)])
+        for invalid in (None, [], [{"isin": SAP, "weight": -1}], [{"isin": "Apple"}]):
+            with self.assertRaises(PortfolioError):
+                parse_positions(invalid)
+        with mock.patch.object(portfolio_exposure, "PORTFOLIO_MAX_POSITIONS", 1), \
+                self.assertRaises(PortfolioError):
+            parse_positions([SAP, MSFT])
+
+class TestPortfolioExposure(unittest.TestCase):
+    """Test-Suite für Exposure, Überschneidung und Konzentration."""
+
+    def test_exposure_overlap_and_concentration(self):
+        """SAP ist in drei Trends enthalten, Microsoft nur in Cloud Computing"""
+        catalogue = load_catalogue()
+        positions = parse_positions([{"isin": SAP, "weight": 60}, {"wkn": "716460", "weight": 20},
+                                     {"isin": MSFT, "weight": 10}, {"isin": "CH0038863350", "weight": 10}])
+        result = analyze_portfolio(catalogue, positions)
+
+        self.assertEqual((result["positions"], result["matched_positions"]), (4, 3))
+        self.assertEqual(result["matched_weight"], 0.9)
+        self.assertEqual(result["unmatched"], ["CH0038863350"])
+        trends = {trend["id"]: trend for trend in result["trends"]}
+        self.assertEqual([trend["id"] for trend in result["trends"]], ["t1", "t2", "t3"])
+        self.assertEqual(trends["t1"]["exposure"], 0.9)
+        self.assertEqual(trends["t1"]["weighted_exposure"], 0.58)
+        self.assertEqual((trends["t1"]["holdings"], trends["t1"]["nice_holdings"]), (2, 1))
+        self.assertEqual(trends["t2"]["coverage"], 0.3333)
+        self.assertEqual(trends["t3"]["weighted_exposure"], 0.24)
+
+        self.assertEqual(result["overlap"][0]["trends"], ["t1", "t2"])
+        self.assertEqual(result["overlap"][0]["shared_weight"], 0.8)
+        self.assertEqual(result["overlap"][0]["overlap_ratio"], 1.0)
+        self.assertEqual(result["concentration"]["hhi"], round((0.9 ** 2 + 2 * 0.8 ** 2) / 2.5 ** 2, 4))
+
+        summary = format_exposure_summary(result)
+        self.assertIn("Cloud Computing: 90.0 % des Portfolios", summary)
+        self.assertIn("Cloud Computing & Künstliche Intelligenz: 80.0 %", summary)
+
+    def test_matches_reference_on_random_catalogue(self):
+        """Die vektorisierte Auswertung stimmt mit einer Schleife über alle Trends überein"""
+        trends = make_catalogue(300, instruments_per_trend=20, isin_pool_size=800)
+        catalogue = load_catalogue(trends)
+        rng = random.Random(7)
+        pool = sorted({i["isin"] for trend in trends for i in trend["instruments"]})
+        held = rng.sample(pool, 60) + ["XS0000000000"]
+        raw = {isin: rng.uniform(1, 10) for isin in held}
+        total = sum(raw.values())
+
+        result = analyze_portfolio(catalogue, [Position(ISIN, isin, raw[isin]) for isin in held], top=1000)
+        expected = reference_exposure(trends, {isin: weight / total for isin, weight in raw.items()})
+        self.assertEqual(result["trends_exposed"], len(expected))
+        for trend in result["trends"]:
+            exposure, weighted = expected[trend["id"]]
+            self.assertAlmostEqual(trend["exposure"], exposure, places=3)
+            self.assertAlmostEqual(trend["weighted_exposure"], weighted, places=3)
+        exposures = [trend["exposure"] for trend in result["trends"]]
+        self.assertEqual(exposures, sorted(exposures, reverse=True))
+
+    def test_duplicate_isin_counted_once(self):
+        """Eine doppelt gelistete ISIN zählt pro Trend nur einmal, mit dem ersten Eintrag"""
+        trends = [{"id": "t1", "name": "Cloud Computing", "instruments": [
+            {"isin": MSFT, "weighting": "high", "nice": True},
+            {"isin": SAP, "weighting": "normal", "nice": False},
+            {"isin": MSFT, "weighting": "low", "nice": False}]}]
+        matrix = get_matrix(load_catalogue(trends))
+        self.assertEqual(matrix.nnz, 2)
+        result = analyze_portfolio(load_catalogue(trends), parse_positions([MSFT]))
+        trend = result["trends"][0]
+        self.assertEqual((trend["exposure"], trend["holdings"], trend["nice_holdings"]), (1.0, 1, 1))
+        self.assertEqual(trend["weighted_exposure"], PORTFOLIO_WEIGHTING_FACTORS[0])
+        self.assertEqual(trend["coverage"], 0.5)
+
+    def test_overlap_limited_to_top_trends(self):
+        """Überschneidungen werden nur unter PORTFOLIO_OVERLAP_TRENDS Trends gesucht, unabhängig von top"""
+        catalogue = load_catalogue()
+        positions = parse_positions([SAP, MSFT])
+        with mock.patch.object(portfolio_exposure, "PORTFOLIO_OVERLAP_TRENDS", 2):
+            result = analyze_portfolio(catalogue, positions, top=3)
+        self.assertEqual(len(result["trends"]), 3)
+        self.assertEqual([pair["trends"] for pair in result["overlap"]], [["t1", "t2"]])
+
+    def test_matrix_cached_per_catalogue_version(self):
+        """Die Matrix wird erst nach einer Änderung des Katalogs neu aufgebaut"""
+        catalogue = load_catalogue()
+        matrix = get_matrix(catalogue)
+        self.assertIs(get_matrix(catalogue), matrix)
+        self.assertEqual(matrix.shape, (3, 4))
+
+        catalogue.upsert([Trend.from_dict({"id": "t4", "name": "Chips", "instruments": [
+            {"isin": NVDA, "weighting": "high", "nice": True}]})])
+        rebuilt = get_matrix(catalogue)
+        self.assertIsNot(rebuilt, matrix)
+        self.assertEqual(rebuilt.version, catalogue.version)
+        self.assertIsNot(get_matrix(load_catalogue()), rebuilt)
+
+class TestPortfolioEndpoint(unittest.TestCase):
+    """Test-Suite für POST /portfolio/exposure."""
+
+    def post(self, body):
+        catalogue = load_catalogue()
+        with mock.patch.object(app_module, "ensure_fresh_catalogue", return_value=catalogue), \
+                mock.patch.object(app_module, "get_gpt_response", return_value="Antwort") as gpt, \
+                mock.patch.object(app_module, "ADMISSION_ENABLED", False):
+            response = app.test_client().post("/portfolio/exposure", json=body)
+        return response, gpt
+
+    def test_invalid_portfolio(self):
+        """Ungültige Portfolios werden mit 400 abgelehnt"""
+        for body in ({}, [SAP, MSFT], {"portfolio": "keine Kennung"}, {"positions": [SAP], "top": 0},
+                     {"positions": [SAP], "top": 10 ** 9}, {"positions": [SAP], "top": "viele"},
+                     {"positions": [{"isin": SAP, "weight": 1}, {"isin": MSFT}]}):
+            response, gpt = self.post(body)
+            self.assertEqual(response.status_code, 400, body)
+
+    def test_exposure_with_question(self):
+        """Mit einer Frage wird die Zusammenfassung in den System-Prompt eingefügt"""
+        response, gpt = self.post({"portfolio": f"{SAP} 50\n{MSFT} 50", "top": 2,
+                                   "question": "Wie konzentriert ist mein Portfolio?"})
+        data = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([trend["id"] for trend in data["trends"]], ["t1", "t2"])
+        self.assertEqual(data["response"], "Antwort")
+        self.assertIn("TREND-EXPOSURE DES PORTFOLIOS", gpt.call_args[0][1])
+        self.assertEqual(gpt.call_args[1]["query_type"], "portfolio_exposure")
+        self.assertIn("X-Trace-Id", response.headers)
+
+        response, gpt = self.post({"positions": [SAP]})
+        self.assertNotIn("response", response.get_json())
+        gpt.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Testskript für das profiling Modul.
+"""
+
+import unittest
+import os
+import sys
+import re
+import tempfile
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+
+import profiling
+from profiling import StackProfiler, profiled, sign_profile_request, verify_profile_request
+
+class TestProfiling(unittest.TestCase):
+    """Test-Suite für das Opt-in-Profiling."""
+    
+    def test_signature_verification(self):
+        """Nur korrekt signierte und aktuelle Header werden akzeptiert"""
+        header = sign_profile_request("geheim", timestamp=1000)
+        self.assertTrue(verify_profile_request(header, secret="geheim", now=1010))
+        self.assertFalse(verify_profile_request(header, secret="anders", now=1010))
+        self.assertFalse(verify_profile_request(header, secret="geheim", now=1000 + 3600))
+        self.assertFalse(verify_profile_request("kaputt", secret="geheim", now=1000))
+    
+    def test_disabled_returns_view_unchanged(self):
+        """Ohne Konfiguration wird die View nicht umhüllt"""
+        def view():
+            return "ok"
+        with mock.patch.object(profiling, "PROFILE_SECRET", ""), \
+                mock.patch.object(profiling, "PROFILE_SAMPLE_RATE", 0.0):
+            self.assertIs(profiled(view), view)
+    
+    def test_collapsed_stacks_include_nested_and_c_calls(self):
+        """Der Profiler erfasst verschachtelte Python- und C-Aufrufe"""
+        pattern = re.compile(r"a+b")
+        
+        def inner():
+            return pattern.search("x" * 10000 + "aab")
+        
+        def outer():
+            return [inner() for _ in range(20)]
+        
+        profiler = StackProfiler()
+        result = profiler.run(outer)
+        self.assertEqual(len(result), 20)
+        
+        output = profiler.collapsed()
+        self.assertRegex(output, r"outer \(.*\);.*inner \(.*\);re\.Pattern\.search \d+")
+        for line in output.strip().splitlines():
+            self.assertRegex(line, r"^.+ \d+$")
+    
+    def test_signed_request_writes_profile(self):
+        """Eine signierte Anfrage wird profiliert und als .folded-Datei abgelegt"""
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(profiling, "PROFILE_SECRET", "geheim"), \
+                mock.patch.object(profiling, "PROFILE_SAMPLE_RATE", 0.0), \
+                mock.patch.object(profiling, "PROFILE_DIR", directory):
+            test_app = Flask(__name__)
+            
+            @test_app.route("/slow")
+            @profiled
+            def slow():
+                return jsonify({"sum": sum(range(1000))})
+            
+            client = test_app.test_client()
+            unsigned = client.get("/slow")
+            signed = client.get("/slow", headers={"X-Profile-Request": sign_profile_request("geheim")})
+            
+            self.assertNotIn("X-Profile-File", unsigned.headers)
+            self.assertEqual(signed.status_code, 200)
+            profile_file = signed.headers["X-Profile-File"]
+            with open(os.path.join(directory, profile_file), encoding="utf-8") as f:
+                self.assertIn("slow (", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
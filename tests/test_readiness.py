@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Readiness-Prüfung (/ready) und die gemeinsame Upstream-Session.
+"""
+
+import unittest
+import json
+import os
+import sys
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+import upstream_http
+from app import app
+from readiness import ReadinessCheck, READY, DEGRADED, NOT_READY
+from trend_catalogue import TrendCatalogue
+from trend_model import Trend
+
+class TestReadinessCheck(unittest.TestCase):
+    """Test-Suite für ReadinessCheck."""
+
+    def setUp(self):
+        self.catalogue = TrendCatalogue()
+        self.probe_results = [{"ok": True, "status_code": 200}]
+        self.probe_calls = 0
+        self.warm_calls = 0
+
+        def probe():
+            self.probe_calls += 1
+            return self.probe_results[-1]
+
+        def warm():
+            self.warm_calls += 1
+            self.catalogue.load([Trend.from_dict({"id": "1", "name": "KI", "instruments": []})])
+
+        self.check = ReadinessCheck(lambda: self.catalogue, probe, warm,
+                                    lambda: {"pools": {}}, cache_ttl=60, probe_interval=60)
+        # Die Upstream-Prüfung läuft in den Tests synchron über refresh()
+        patcher = mock.patch.object(self.check, "_refresh_in_background")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cold_catalogue_is_not_ready(self):
+        """Ohne geladenen Katalog ist der Worker nicht bereit"""
+        result = self.check.check()
+        self.assertFalse(result["ready"])
+        self.assertEqual(result["status"], NOT_READY)
+        self.assertTrue(result["checks"]["upstream"]["pending"])
+
+    def test_refresh_warms_catalogue_and_probes(self):
+        """refresh() lädt den Katalog nach; danach ist der Worker bereit"""
+        self.check.refresh()
+        result = self.check.check()
+        self.assertEqual(self.warm_calls, 1)
+        self.assertTrue(result["ready"])
+        self.assertEqual(result["status"], READY)
+        self.assertEqual(result["checks"]["catalogue"]["trends"], 1)
+
+    def test_result_is_cached(self):
+        """Innerhalb von cache_ttl wird das Ergebnis wiederverwendet, ohne Upstream-Aufruf"""
+        self.check.refresh()
+        first = self.check.check()
+        for _ in range(5):
+            self.assertIs(self.check.check(), first)
+        self.assertEqual(self.probe_calls, 1)
+
+    def test_upstream_failure_degrades(self):
+        """Ein Upstream-Ausfall mit warmem Katalog ist degraded, außer er ist verpflichtend"""
+        self.probe_results.append({"ok": False, "error": "ConnectTimeout"})
+        self.check.refresh()
+        result = self.check.check()
+        self.assertTrue(result["ready"])
+        self.assertEqual(result["status"], DEGRADED)
+
+        self.check.require_upstream = True
+        self.check.refresh()
+        self.assertFalse(self.check.check()["ready"])
+
+    def test_background_refresh_respects_interval(self):
+        """Die Upstream-Prüfung wird höchstens alle probe_interval Sekunden gestartet"""
+        check = ReadinessCheck(lambda: self.catalogue, lambda: {"ok": True}, lambda: None,
+                               lambda: {}, cache_ttl=0, probe_interval=60)
+        with mock.patch("readiness.threading.Thread") as thread:
+            check.check()
+            check.check()
+            self.assertEqual(thread.call_count, 1)
+            check.refresh()
+            check.check()
+            self.assertEqual(thread.call_count, 1)
+
+class TestReadyEndpoint(unittest.TestCase):
+    """Test-Suite für GET /ready."""
+
+    def test_status_codes(self):
+        """Bereit: 200, sonst 503 mit den Einzelprüfungen"""
+        client = app.test_client()
+        with mock.patch.object(app_module.readiness_check, "check",
+                               return_value={"ready": False, "status": NOT_READY, "checks": {}}):
+            self.assertEqual(client.get("/ready").status_code, 503)
+        with mock.patch.object(app_module.readiness_check, "check",
+                               return_value={"ready": True, "status": READY, "checks": {}}):
+            response = client.get("/ready")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)["status"], READY)
+
+class TestUpstreamSession(unittest.TestCase):
+    """Test-Suite für die gemeinsame Upstream-Session."""
+
+    def test_session_is_shared_per_process(self):
+        """Innerhalb eines Prozesses dieselbe Session, nach einem Fork eine neue"""
+        session = upstream_http.get_session()
+        self.assertIs(upstream_http.get_session(), session)
+        self.assertTrue(upstream_http.pool_stats()["session"])
+        with mock.patch("upstream_http.os.getpid", return_value=-1):
+            self.assertFalse(upstream_http.pool_stats()["session"])
+            self.assertIsNot(upstream_http.get_session(), session)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Trace-Spans der Chat-Pipeline.
+"""
+
+import unittest
+import json
+import os
+import sys
+import time
+import tempfile
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+import tracing
+from app import app
+from profiling import sign_profile_request
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+SAMPLED = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+def slow_gpt_response(*args, **kwargs):
+    """Simuliert einen langsamen OpenAI-Aufruf mit eigenem Span."""
+    with tracing.span("openai chat.completions", kind=tracing.CLIENT):
+        time.sleep(0.05)
+    return "Antwort"
+
+class TestTraceparent(unittest.TestCase):
+    """Test-Suite für das Parsen von traceparent."""
+
+    def test_parse_traceparent(self):
+        """Gültige Header werden gelesen, ungültige verworfen"""
+        self.assertEqual(tracing.parse_traceparent(SAMPLED), (TRACE_ID, "00f067aa0ba902b7", True))
+        self.assertFalse(tracing.parse_traceparent(SAMPLED[:-2] + "00")[2])
+        for value in (None, "", "00-abc-def-01", f"00-{'0' * 32}-00f067aa0ba902b7-01",
+                      f"ff-{TRACE_ID}-00f067aa0ba902b7-01", f"00-{TRACE_ID}-00f067aa0ba902b7-zz"):
+            self.assertIsNone(tracing.parse_traceparent(value))
+
+    def test_unsampled_spans_are_noops(self):
+        """Ohne gesampelten Trace liefert span() einen NoopSpan"""
+        with tracing.span("egal") as span:
+            span.set_attribute("a", 1)
+        self.assertIsInstance(span, tracing.NoopSpan)
+
+class TestChatTracing(unittest.TestCase):
+    """Test-Suite für Traces von /chat."""
+
+    def setUp(self):
+        self.export_path = os.path.join(tempfile.mkdtemp(), "traces.jsonl")
+        for patcher in (mock.patch.object(tracing, "TRACE_EXPORT_PATH", self.export_path),
+                        mock.patch.object(app_module, "ADMISSION_ENABLED", False),
+                        mock.patch.object(app_module, "get_gpt_response", side_effect=slow_gpt_response)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = app.test_client()
+
+    def exported(self):
+        with open(self.export_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_sampled_trace_shows_slow_stage(self):
+        """Ein gesampelter Trace enthält alle Stufen; der OpenAI-Aufruf ist die langsamste"""
+        response = self.client.post("/chat", json={"message": "Wie hoch ist die Inflation?"},
+                                    headers={"traceparent": SAMPLED})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["X-Trace-Id"], TRACE_ID)
+        self.assertTrue(response.headers["traceparent"].endswith("-01"))
+
+        request = self.exported()[-1]
+        spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        by_name = {span["name"]: span for span in spans}
+        self.assertEqual(set(by_name), {"POST /chat", "chat.classify", "chat.build_prompt",
+                                        "chat.route", "chat.generate", "openai chat.completions"})
+        self.assertEqual(by_name["POST /chat"]["parentSpanId"], "00f067aa0ba902b7")
+        self.assertEqual(by_name["openai chat.completions"]["parentSpanId"], by_name["chat.generate"]["spanId"])
+        self.assertTrue(all(span["traceId"] == TRACE_ID for span in spans))
+
+        summary = tracing.recent_traces(limit=1)[0]
+        stages = {span["name"]: span["duration_ms"] for span in summary["spans"]}
+        slowest = max((name for name in stages if name.startswith("chat.")), key=stages.get)
+        self.assertEqual(slowest, "chat.generate")
+        self.assertGreaterEqual(stages["openai chat.completions"], 50)
+
+    def test_parallel_trend_fetches_are_children_of_prompt(self):
+        """Parallele Trendlink-Abrufe erscheinen als Kinder des Prompt-Spans"""
+        with mock.patch.object(app_module, "get_trend_instruments", return_value="Daten"):
+            self.client.post("/chat", json={"message": "Welche Aktien zu Elektroautos und Wasserstoff?"},
+                             headers={"traceparent": SAMPLED})
+        spans = self.exported()[-1]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        prompt = next(span for span in spans if span["name"] == "chat.build_prompt")
+        fetches = [span for span in spans if span["name"] == "trendlink.trend_instruments"]
+        self.assertEqual(len(fetches), 2)
+        self.assertTrue(all(span["parentSpanId"] == prompt["spanId"] for span in fetches))
+
+    def test_unsampled_request_still_gets_trace_id(self):
+        """Nicht gesampelte Anfragen tragen eine Trace-ID, exportieren aber nichts"""
+        response = self.client.post("/chat", json={"message": "Wie hoch ist die Inflation?"})
+        self.assertEqual(len(response.headers["X-Trace-Id"]), 32)
+        self.assertTrue(response.headers["traceparent"].endswith("-00"))
+        self.assertFalse(os.path.exists(self.export_path))
+
+    def test_head_sampling_rate(self):
+        """Mit TRACE_SAMPLE_RATE=1 wird ohne eingehenden Header gesampelt"""
+        with mock.patch.object(tracing, "TRACE_SAMPLE_RATE", 1.0):
+            response = self.client.post("/chat", json={"message": "Wie hoch ist die Inflation?"})
+        self.assertTrue(response.headers["traceparent"].endswith("-01"))
+        trace_id = response.headers["X-Trace-Id"]
+        self.assertEqual(self.client.get(f"/metrics/traces?trace_id={trace_id}").status_code, 404)
+        with mock.patch.object(app_module, "ADMIN_SECRET", "geheim"):
+            self.assertEqual(self.client.get("/metrics/traces").status_code, 403)
+            response = self.client.get(f"/metrics/traces?trace_id={trace_id}",
+                                       headers={"X-Admin-Request": sign_profile_request("geheim")})
+        self.assertEqual(json.loads(response.data)["traces"][0]["name"], "POST /chat")
+
+if __name__ == "__main__":
+    unittest.main()
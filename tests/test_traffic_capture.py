@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Testskript für die Module traffic_capture und traffic_replay.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify
+
+import traffic_capture
+from traffic_capture import captured, captured_call, read_records, sanitize_message, set_intent
+from traffic_replay import ReplayMiss, UpstreamStandIn, summarize
+
+class TestTrafficCapture(unittest.TestCase):
+    """Test-Suite für Aufzeichnung und Replay."""
+
+    def test_sanitize_masks_personal_data_but_keeps_isin(self):
+        """E-Mail, IBAN und Telefonnummer werden maskiert, ISINs bleiben erhalten"""
+        message = ("Ich bin max@example.com, IBAN DE89 3704 0044 0532 0130 00, "
+                   "Tel. +49 170 1234567. Was ist mit US0378331005?")
+        sanitized = sanitize_message(message)
+        self.assertNotIn("max@example.com", sanitized)
+        self.assertNotIn("3704", sanitized)
+        self.assertNotIn("1234567", sanitized)
+        self.assertIn("<email>", sanitized)
+        self.assertIn("<iban>", sanitized)
+        self.assertIn("<telefon>", sanitized)
+        self.assertIn("US0378331005", sanitized)
+
+    def test_captured_call_without_capture_is_passthrough(self):
+        """Außerhalb einer Aufzeichnung wird die Funktion nur aufgerufen"""
+        self.assertEqual(captured_call("test", "key", lambda x: x * 2, 21), 42)
+
+    def test_capture_and_replay_round_trip(self):
+        """Aufgezeichnete Anfragen lassen sich lesen und als Stand-in abspielen"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chat.jsonl.gz")
+            app = Flask(__name__)
+
+            def view():
+                set_intent(query_type="trend_instruments", trend_name="wasserstoff")
+                data = captured_call("trendlink.trend_instruments", "wasserstoff",
+                                     lambda name: f"Daten zu {name}", "wasserstoff")
+                return jsonify({"response": data})
+
+            with mock.patch.object(traffic_capture, "CAPTURE_FILE", path), \
+                    mock.patch.object(traffic_capture, "CAPTURE_SAMPLE_RATE", 1.0):
+                wrapped = captured(view)
+                with app.test_request_context("/chat", method="POST",
+                                              json={"message": "Wasserstoff? max@example.com"}):
+                    response = wrapped()
+            self.assertEqual(response.status_code, 200)
+
+            records = list(read_records(path))
+
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record["message"], "Wasserstoff? <email>")
+        self.assertEqual(record["intent"]["query_type"], "trend_instruments")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["upstream"][0]["result"], "Daten zu wasserstoff")
+
+        stand_in = UpstreamStandIn(records, time_scale=0)
+        self.assertEqual(stand_in.respond("trendlink.trend_instruments", "wasserstoff"),
+                         "Daten zu wasserstoff")
+        with self.assertRaises(ReplayMiss):
+            stand_in.respond("trendlink.trend_instruments", "solar")
+        self.assertEqual(stand_in.misses, 1)
+
+    def test_non_object_body_is_not_captured(self):
+        """Listen- oder String-Bodies werden ohne Aufzeichnung an die View weitergereicht"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "chat.jsonl")
+            app = Flask(__name__)
+
+            def view():
+                return jsonify({"error": "No message provided"}), 400
+
+            with mock.patch.object(traffic_capture, "CAPTURE_FILE", path), \
+                    mock.patch.object(traffic_capture, "CAPTURE_SAMPLE_RATE", 1.0):
+                wrapped = captured(view)
+                for body in (["Wasserstoff?"], "Wasserstoff?"):
+                    with app.test_request_context("/chat", method="POST", json=body):
+                        response = app.make_response(wrapped())
+                    self.assertEqual(response.status_code, 400)
+            self.assertFalse(os.path.exists(path))
+
+    def test_summarize_per_query_type(self):
+        """Die Auswertung liefert Perzentile pro query_type und gesamt"""
+        results = [("curated_trends", 200, 0.1), ("curated_trends", 200, 0.3),
+                   ("general_finance", 500, 1.0)]
+        summary = summarize(results, wall_time=1.0)
+        self.assertEqual(summary["all"]["requests"], 3)
+        self.assertEqual(summary["general_finance"]["errors"], 1)
+        self.assertEqual(summary["curated_trends"]["p50_ms"], 100.0)
+        self.assertEqual(summary["curated_trends"]["p99_ms"], 300.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Testskript für das trend_catalogue Modul.
+"""
+
+import unittest
+import os
+import sys
+import json
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import trendlink_api
+from trend_catalogue import TrendCatalogue
+from trend_model import Trend
+
+CATALOGUE = [
+    {"id": "t1", "name": "Osteuropa", "description": "Länder im Osten", "synonyms": ["Polen"],
+     "instruments": [{"isin": "US90353T1007", "weighting": "normal", "nice": True}]},
+    {"id": "t2", "name": "Elektroautos", "description": "E-Mobilität", "synonyms": [],
+     "instruments": [{"isin": "DE000A161408", "weighting": "high", "nice": False}]},
+]
+
+class TestTrendCatalogue(unittest.TestCase):
+    """Test-Suite für den In-Memory-Trend-Katalog."""
+    
+    def test_search_and_lookup(self):
+        """Suche und ID-Lookup im geladenen Katalog"""
+        catalogue = TrendCatalogue()
+        self.assertFalse(catalogue.is_fresh(60))
+        catalogue.load(Trend.from_dict(trend) for trend in CATALOGUE)
+        
+        self.assertTrue(catalogue.is_fresh(60))
+        self.assertEqual(catalogue.search("elektroauto").id, "t2")
+        self.assertEqual(catalogue.search("polen").id, "t1")
+        self.assertIsNone(catalogue.search("wasserstoff"))
+        self.assertEqual(catalogue.get("t1").name, "Osteuropa")
+        self.assertEqual(catalogue.stats()["instruments"], 2)
+    
+    @mock.patch('trendlink_api.requests.Session.get')
+    @mock.patch('trendlink_api.os.getenv')
+    def test_load_and_use_catalogue(self, mock_getenv, mock_requests_get):
+        """Nach dem Laden beantwortet get_trend_instruments Suchen ohne HTTP-Aufruf"""
+        mock_getenv.return_value = "fake_api_token"
+        mock_response = mock.Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.iter_content.return_value = iter([json.dumps(CATALOGUE).encode("utf-8")])
+        mock_requests_get.return_value = mock_response
+        
+        catalogue = TrendCatalogue()
+        with mock.patch('trendlink_api.get_catalogue', return_value=catalogue):
+            trendlink_api.load_trend_catalogue()
+            self.assertEqual(len(catalogue), 2)
+            mock_requests_get.reset_mock()
+            
+            result = trendlink_api.get_trend_instruments("Elektroautos")
+        
+        mock_requests_get.assert_not_called()
+        self.assertIn("=== TREND: Elektroautos ===", result)
+    
+    @mock.patch('trendlink_api.os.getenv', return_value="fake_api_token")
+    def test_instrument_pages_follow_cursor(self, mock_getenv):
+        """Die Instrumente eines Trends lassen sich per Cursor seitenweise abrufen"""
+        trend = dict(CATALOGUE[1], instruments=[
+            {"isin": f"DE000A16140{i}", "weighting": "low" if i % 2 else "high", "nice": i == 3}
+            for i in range(5)
+        ])
+        catalogue = TrendCatalogue()
+        catalogue.load([Trend.from_dict(trend)])
+        
+        with mock.patch('trendlink_api.get_catalogue', return_value=catalogue):
+            first = trendlink_api.get_trend_instrument_page("Elektroautos", limit=2)
+            second = trendlink_api.get_trend_instrument_page(limit=2, cursor=first["next_cursor"])
+            last = trendlink_api.get_trend_instrument_page(limit=2, cursor=second["next_cursor"])
+            with self.assertRaises(ValueError):
+                trendlink_api.get_trend_instrument_page(limit=2, cursor="kaputt")
+        
+        self.assertEqual(first["total"], 5)
+        self.assertEqual([i["isin"] for i in first["instruments"]], ["DE000A161403", "DE000A161400"])
+        self.assertEqual([i["rank"] for i in second["instruments"]], [3, 4])
+        self.assertEqual([i["isin"] for i in last["instruments"]], ["DE000A161401"])
+        self.assertIsNone(last["next_cursor"])
+
+if __name__ == '__main__':
+    unittest.main()
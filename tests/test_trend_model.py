@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Testskript für das trend_model Modul.
+"""
+
+import unittest
+import os
+import sys
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trend_model import Trend, InstrumentTable, as_trend
+from trend_stream import compile_search
+from trendlink_api import format_trend_with_instruments
+
+class TestTrendModel(unittest.TestCase):
+    """Test-Suite für die kompakte Trend-Darstellung."""
+    
+    def setUp(self):
+        """Test-Setup mit einem Trend im API-Format"""
+        self.trend_dict = {
+            "id": "t1",
+            "name": "Osteuropa",
+            "description": "Länder im östlichen Europa",
+            "synonyms": ["Emerging Markets", "Polen"],
+            "instruments": [
+                {"isin": "US90353T1007", "weighting": "normal", "nice": True},
+                {"isin": "DE000A161408", "weighting": "low", "nice": False},
+                {"isin": "US09523Q2003", "weighting": "high", "nice": False},
+                {"isin": "KURZ", "weighting": "sehr hoch", "nice": True},
+            ]
+        }
+    
+    def test_instrument_table_round_trip(self):
+        """ISINs, Gewichtungen und Flags überstehen die kompakte Speicherung"""
+        table = InstrumentTable(self.trend_dict["instruments"])
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.to_dicts(), self.trend_dict["instruments"])
+        self.assertEqual(table[2].isin, "US09523Q2003")
+        self.assertEqual(table.weighting_code(2), 0)
+        self.assertTrue(table.is_nice(-1))
+    
+    def test_nice_bits_beyond_first_byte(self):
+        """Das nice-Flag funktioniert auch jenseits der ersten 8 Instrumente"""
+        table = InstrumentTable()
+        for index in range(20):
+            table.append(f"DE000A1{index:05d}", "normal", index % 3 == 0)
+        self.assertEqual([table.is_nice(i) for i in range(20)], [i % 3 == 0 for i in range(20)])
+    
+    def test_categorical_strings_are_interned(self):
+        """Synonyme und Kategorien werden interniert"""
+        first = Trend.from_dict({"category": "".join(["Tech", "nologie"]), "synonyms": ["".join(["Po", "len"])]})
+        second = Trend.from_dict({"category": "".join(["Techno", "logie"]), "synonyms": ["".join(["Pol", "en"])]})
+        self.assertIs(first.category, second.category)
+        self.assertIs(first.synonyms[0], second.synonyms[0])
+    
+    def test_matches(self):
+        """Die Suche prüft Name, Beschreibung und Synonyme"""
+        trend = as_trend(self.trend_dict)
+        self.assertTrue(trend.matches(*compile_search("osteuropa")))
+        self.assertTrue(trend.matches(*compile_search("pole")))
+        self.assertFalse(trend.matches(*compile_search("wasserstoff")))
+    
+    def test_top_instruments_rank_nice_before_weighting(self):
+        """Die Top-k-Auswahl bevorzugt nice, dann die Gewichtung, dann die API-Reihenfolge"""
+        table = InstrumentTable(self.trend_dict["instruments"])
+        self.assertEqual([i.isin for i in table.top(3)], ["US90353T1007", "KURZ", "US09523Q2003"])
+        self.assertEqual([i.isin for i in table.top(3, offset=2)], ["US09523Q2003", "DE000A161408"])
+        self.assertEqual(table.top(2, offset=4), [])
+    
+    def test_formatter_applies_limit(self):
+        """Mit limit enthält die Ausgabe nur die Top-k-Instrumente und nennt die Gesamtzahl"""
+        output = format_trend_with_instruments(self.trend_dict, limit=2)
+        self.assertIn("2. ★ Instrument mit ISIN KURZ", output)
+        self.assertNotIn("DE000A161408", output)
+        self.assertIn("Top 2 von 4 Instrumenten", output)
+    
+    def test_formatter_output_is_identical(self):
+        """Der Formatter liefert für Dictionary und kompakten Trend dieselbe Ausgabe"""
+        from_dict = format_trend_with_instruments(self.trend_dict)
+        from_model = format_trend_with_instruments(Trend.from_dict(self.trend_dict))
+        self.assertEqual(from_dict, from_model)
+        self.assertIn("1. ★ Instrument mit ISIN US90353T1007", from_model)
+        self.assertIn("Gewichtung: sehr hoch", from_model)
+
+if __name__ == '__main__':
+    unittest.main()
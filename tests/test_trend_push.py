@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Testskript für das trend_push Modul.
+"""
+
+import unittest
+import os
+import sys
+import json
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module
+from app import app
+from trend_push import CuratedTrendBroadcaster, TooManySubscribers, diff_trends, format_sse
+
+TRENDS = [
+    {"id": "a", "name": "KI im Gesundheitswesen", "score": 95, "description": "Lang ..."},
+    {"id": "b", "name": "Nachhaltiger E-Commerce", "score": 87, "description": "Lang ..."},
+]
+
+def parse_event(message):
+    """Zerlegt eine SSE-Nachricht in (event, data)."""
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+class TestTrendPush(unittest.TestCase):
+    """Test-Suite für den Push-Kanal der kuratierten Trends."""
+
+    def setUp(self):
+        self.data = {"trends": [dict(trend) for trend in TRENDS]}
+        self.broadcaster = CuratedTrendBroadcaster(lambda: self.data, max_subscribers=2)
+        # Den Poller-Thread nicht starten; die Tests rufen poll() direkt auf
+        patcher = mock.patch("trend_push.threading.Thread")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_diff_trends(self):
+        """Der Diff enthält nur neue, geänderte und entfernte Trends"""
+        old = [{"id": "a", "score": 1}, {"id": "b", "score": 2}]
+        new = [{"id": "b", "score": 3}, {"id": "c", "score": 4}]
+        self.assertEqual(diff_trends(old, new), {
+            "added": [{"id": "c", "score": 4}],
+            "changed": [{"id": "b", "score": 3}],
+            "removed": ["a"],
+            "order": ["b", "c"],
+        })
+        self.assertIsNone(diff_trends(old, list(old)))
+
+    def test_one_fetch_fans_out_to_all_subscribers(self):
+        """Eine Abfrage wird an alle Clients verteilt, neue Clients erhalten einen Snapshot"""
+        first = self.broadcaster.subscribe()
+        self.broadcaster.poll()
+        second = self.broadcaster.subscribe()
+
+        for subscriber in (first, second):
+            event, data = parse_event(subscriber.events.get_nowait())
+            self.assertEqual(event, "snapshot")
+            self.assertEqual([trend["id"] for trend in data["trends"]], ["a", "b"])
+            self.assertNotIn("description", data["trends"][0])
+
+        self.data["trends"][1]["score"] = 90
+        self.broadcaster.poll()
+        for subscriber in (first, second):
+            event, data = parse_event(subscriber.events.get_nowait())
+            self.assertEqual(event, "diff")
+            self.assertEqual(data["changed"], [{"id": "b", "name": "Nachhaltiger E-Commerce", "score": 90}])
+        self.assertEqual(self.broadcaster.stats["polls"], 2)
+
+    def test_unchanged_poll_sends_nothing(self):
+        """Ohne Änderung wird nichts verteilt"""
+        subscriber = self.broadcaster.subscribe()
+        self.broadcaster.poll()
+        subscriber.events.get_nowait()
+        self.assertIsNone(self.broadcaster.poll())
+        self.assertTrue(subscriber.events.empty())
+
+    def test_subscriber_limit(self):
+        """Über max_subscribers hinaus werden Clients abgelehnt"""
+        self.broadcaster.subscribe()
+        subscriber = self.broadcaster.subscribe()
+        with self.assertRaises(TooManySubscribers):
+            self.broadcaster.subscribe()
+        self.broadcaster.unsubscribe(subscriber)
+        self.broadcaster.subscribe()
+
+    def test_stream_sends_heartbeats_and_unsubscribes(self):
+        """Ohne Ereignisse werden Heartbeats gesendet; beim Schließen wird abgemeldet"""
+        subscriber = self.broadcaster.subscribe()
+        stream = self.broadcaster.stream(subscriber, heartbeat_interval=0.01)
+        self.assertTrue(next(stream).startswith("retry:"))
+        self.assertEqual(next(stream), ": heartbeat\n\n")
+        stream.close()
+        self.assertEqual(self.broadcaster.subscriber_count(), 0)
+
+    def test_endpoint_rejects_when_full(self):
+        """Der Endpunkt antwortet mit 503, wenn keine Plätze frei sind"""
+        with mock.patch.object(app_module, "curated_trend_broadcaster", self.broadcaster):
+            self.broadcaster.subscribe()
+            self.broadcaster.subscribe()
+            response = app.test_client().get("/events/curated-trends")
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+    def test_format_sse(self):
+        """Ereignisse werden im SSE-Format kodiert"""
+        self.assertEqual(format_sse("diff", {"a": 1}, 3), 'id: 3\nevent: diff\ndata: {"a":1}\n\n')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Testskript für das trend_stream Modul.
+"""
+
+import unittest
+import os
+import sys
+import json
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trend_stream import iter_json_array, iter_trends, find_trend, EmptyStreamError
+from trendlink_api import get_trend_instruments, get_trend_instrument_page
+
+def chunked(payload, size):
+    """Zerlegt Bytes in Blöcke der angegebenen Größe."""
+    return [payload[i:i + size] for i in range(0, len(payload), size)]
+
+class TestTrendStream(unittest.TestCase):
+    """Test-Suite für das inkrementelle Parsen des Trend-Katalogs."""
+    
+    def setUp(self):
+        """Test-Setup mit einem kleinen Katalog"""
+        self.catalogue = [
+            {
+                "id": "t1",
+                "name": "Osteuropa",
+                "description": "Länder im östlichen Europa",
+                "synonyms": ["Emerging Markets", "Polen"],
+                "images": [{"dimension": "2to1", "density": 1, "url": "https://example.com/a.jpg"}],
+                "instruments": [{"isin": "US90353T1007", "weighting": "normal", "nice": True}]
+            },
+            {
+                "id": "t2",
+                "name": "Elektroautos",
+                "description": "Elektrisch angetriebene Fahrzeuge",
+                "synonyms": ["E-Mobilität"],
+                "instruments": [{"isin": "DE000A161408", "weighting": "high", "nice": False}]
+            },
+            {
+                "id": "t3",
+                "name": "Wasserstoff",
+                "description": "Wasserstoff als Energieträger",
+                "synonyms": [],
+                "instruments": []
+            }
+        ]
+        self.payload = json.dumps(self.catalogue, ensure_ascii=False, indent=2).encode("utf-8")
+    
+    def test_parses_with_tiny_chunks(self):
+        """Auch byteweise zerlegte Daten (inkl. geteilter Umlaute) werden korrekt gelesen"""
+        elements = list(iter_json_array(chunked(self.payload, 1)))
+        self.assertEqual(elements, self.catalogue)
+    
+    def test_projection_drops_unneeded_fields(self):
+        """Nur die Index-Felder bleiben erhalten"""
+        trends = list(iter_trends(chunked(self.payload, 64)))
+        self.assertNotIn("images", trends[0])
+        self.assertEqual(trends[0]["name"], "Osteuropa")
+        self.assertEqual(trends[0]["instruments"][0]["isin"], "US90353T1007")
+    
+    def test_find_trend_stops_early(self):
+        """Die Suche liest nach dem Treffer keine weiteren Blöcke"""
+        chunks = chunked(self.payload, 32)
+        consumed = []
+        
+        def generator():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+        
+        trend, scanned = find_trend(generator(), "Elektroauto")
+        self.assertEqual(trend["id"], "t2")
+        self.assertEqual(scanned, 2)
+        self.assertLess(len(consumed), len(chunks))
+    
+    def test_find_trend_by_synonym(self):
+        """Synonyme werden wie bisher durchsucht"""
+        trend, _ = find_trend(chunked(self.payload, 16), "polen")
+        self.assertEqual(trend["id"], "t1")
+    
+    def test_empty_and_invalid_streams(self):
+        """Leere Streams und Nicht-Arrays werden erkannt"""
+        with self.assertRaises(EmptyStreamError):
+            list(iter_json_array([b"", b"  "]))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"trends": []}']))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[{"id": "t1"}, {"id": ']))
+    
+    @mock.patch('trendlink_api.requests.Session.get')
+    @mock.patch('trendlink_api.os.getenv')
+    def test_get_trend_instruments_streams_response(self, mock_getenv, mock_requests_get):
+        """get_trend_instruments liest die Antwort als Stream und schließt sie danach"""
+        mock_getenv.return_value = "fake_api_token"
+        mock_response = mock.Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.iter_content.return_value = iter(chunked(self.payload, 128))
+        mock_requests_get.return_value = mock_response
+        
+        result = get_trend_instruments("Elektroautos")
+        
+        _, kwargs = mock_requests_get.call_args
+        self.assertTrue(kwargs["stream"])
+        self.assertIn("instruments", kwargs["params"]["field"])
+        self.assertEqual(kwargs["params"]["nice5"], "true")
+        mock_response.close.assert_called_once()
+        self.assertIn("=== TREND: Elektroautos ===", result)
+        self.assertIn("DE000A161408", result)
+    
+    @mock.patch('trendlink_api.requests.Session.get')
+    @mock.patch('trendlink_api.os.getenv')
+    def test_nice5_only_for_small_top(self, mock_getenv, mock_requests_get):
+        """Nur bis NICE5_LIMIT Instrumenten wird die Liste serverseitig gekürzt"""
+        mock_getenv.return_value = "fake_api_token"
+        mock_response = mock.Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.iter_content.side_effect = lambda **kwargs: iter(chunked(self.payload, 128))
+        mock_requests_get.return_value = mock_response
+        
+        get_trend_instruments("Elektroautos", nice_top=10)
+        self.assertNotIn("nice5", mock_requests_get.call_args[1]["params"])
+        get_trend_instrument_page("Elektroautos", limit=2)
+        self.assertNotIn("nice5", mock_requests_get.call_args[1]["params"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Testskript für das trend_sync Modul.
+"""
+
+import unittest
+import os
+import sys
+import json
+import copy
+import threading
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trend_catalogue import TrendCatalogue
+from trend_sync import TrendSync, content_hash
+
+CATALOGUE = [
+    {"id": "t1", "name": "Osteuropa", "description": "Länder im Osten", "synonyms": ["Polen"],
+     "instruments": [{"isin": "US90353T1007", "weighting": "normal", "nice": True}]},
+    {"id": "t2", "name": "Elektroautos", "description": "E-Mobilität", "synonyms": [],
+     "instruments": [{"isin": "DE000A161408", "weighting": "high", "nice": False}]},
+    {"id": "t3", "name": "Wasserstoff", "description": "Brennstoffzellen", "synonyms": [],
+     "instruments": []},
+]
+
+class FakeApi:
+    """Liefert den aktuellen Katalog als Stream und merkt sich die Parameter."""
+
+    def __init__(self, trends):
+        self.trends = trends
+        self.calls = []
+
+    def open_stream(self, params):
+        self.calls.append(params)
+        response = mock.Mock()
+        response.iter_content.return_value = iter([json.dumps(self.trends).encode("utf-8")])
+        return response
+
+class TestTrendSync(unittest.TestCase):
+    """Test-Suite für den inkrementellen Abgleich des Trend-Katalogs."""
+
+    def setUp(self):
+        self.api = FakeApi(copy.deepcopy(CATALOGUE))
+        self.catalogue = TrendCatalogue()
+        self.sync = TrendSync(self.catalogue, self.api.open_stream, since_param="", full_every=12)
+
+    def test_content_hash(self):
+        """Gleicher Quelltext ergibt denselben Hash, geänderter einen anderen"""
+        self.assertEqual(content_hash('{"a":1}'), content_hash('{"a":1}'))
+        self.assertNotEqual(content_hash('{"a":1}'), content_hash('{"a":2}'))
+        self.assertEqual(len(content_hash("{}")), 16)
+
+    def test_first_sync_loads_catalogue(self):
+        """Der erste Abgleich lädt den Katalog vollständig"""
+        result = self.sync.sync()
+        self.assertEqual(result.mode, "load")
+        self.assertEqual(len(self.catalogue), 3)
+
+    def test_only_changes_are_applied(self):
+        """Unveränderte Trends bleiben dieselben Objekte, geänderte werden ersetzt"""
+        self.sync.sync()
+        unchanged = self.catalogue.get("t1")
+        version = self.catalogue.version
+
+        self.api.trends[1]["name"] = "Elektromobilität"
+        del self.api.trends[2]
+        self.api.trends.append({"id": "t4", "name": "Solar", "instruments": []})
+        result = self.sync.sync()
+
+        self.assertEqual((result.mode, result.added, result.changed, result.removed), ("full", 1, 1, 1))
+        self.assertIs(self.catalogue.get("t1"), unchanged)
+        self.assertEqual(self.catalogue.search("elektromobilität").id, "t2")
+        self.assertIsNone(self.catalogue.get("t3"))
+        self.assertIsNone(self.catalogue.search("wasserstoff"))
+        self.assertEqual([trend.id for trend in self.catalogue.trends()], ["t1", "t2", "t4"])
+        self.assertGreater(self.catalogue.version, version)
+
+    def test_interrupted_stream_keeps_hashes(self):
+        """Bricht der Stream ab, wird nichts übernommen und der nächste Abgleich holt alles nach"""
+        self.sync.sync()
+        self.api.trends[0]["name"] = "Mittelosteuropa"
+        payload = json.dumps(self.api.trends).encode("utf-8")
+
+        def broken_stream(params):
+            def chunks():
+                yield payload[:len(payload) // 2]
+                raise ConnectionError("Verbindung abgebrochen")
+            response = mock.Mock()
+            response.iter_content.return_value = chunks()
+            return response
+
+        self.sync.open_stream = broken_stream
+        with self.assertRaises(ConnectionError):
+            self.sync.sync()
+        self.assertEqual(self.catalogue.get("t1").name, "Osteuropa")
+        self.assertEqual(len(self.catalogue), 3)
+
+        self.sync.open_stream = self.api.open_stream
+        result = self.sync.sync()
+        self.assertEqual((result.changed, result.removed), (1, 0))
+        self.assertEqual(self.catalogue.get("t1").name, "Mittelosteuropa")
+
+    def test_concurrent_stale_syncs_run_once(self):
+        """Mit max_age prüfen wartende Aufrufe nach der Sperre erneut und gleichen nicht doppelt ab"""
+        threads = [threading.Thread(target=self.sync.sync, kwargs={"max_age": 3600}) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.api.calls), 1)
+        self.assertIsNone(self.sync.sync(max_age=3600))
+
+    def test_background_refresh_is_single_flight(self):
+        """Solange ein Hintergrund-Abgleich läuft, wird kein weiterer gestartet"""
+        self.sync.sync()
+        release = threading.Event()
+        open_stream = self.api.open_stream
+
+        def slow_stream(params):
+            release.wait(2)
+            return open_stream(params)
+
+        self.sync.open_stream = slow_stream
+        self.assertTrue(self.sync.refresh_in_background(max_age=0))
+        self.assertFalse(self.sync.refresh_in_background(max_age=0))
+        release.set()
+        self.sync._refresh_thread.join(2)
+        self.assertEqual(len(self.api.calls), 2)
+
+    def test_no_changes_keep_version(self):
+        """Ohne Änderungen bleibt die Katalog-Version gleich"""
+        self.sync.sync()
+        version = self.catalogue.version
+        result = self.sync.sync()
+        self.assertEqual((result.added, result.changed, result.removed), (0, 0, 0))
+        self.assertEqual(self.catalogue.version, version)
+
+    def test_since_parameter_is_used_when_configured(self):
+        """Mit konfiguriertem Parameter werden nur Änderungen abgefragt, regelmäßig aber vollständig"""
+        sync = TrendSync(self.catalogue, self.api.open_stream, since_param="updated_since", full_every=3)
+        sync.sync()
+        self.api.trends = [dict(CATALOGUE[0], name="Osteuropa neu")]
+        result = sync.sync()
+
+        self.assertEqual(result.mode, "since")
+        self.assertIn("updated_since", self.api.calls[-1])
+        self.assertEqual(result.changed, 1)
+        self.assertEqual(len(self.catalogue), 3)
+
+        sync.sync()
+        result = sync.sync()
+        self.assertEqual(result.mode, "full")
+        self.assertEqual(result.removed, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -50,7 +50,7 @@ class TestTrendlinkAPI(unittest.TestCase):
             ]
         }
     
-    @mock.patch('trendlink_api.requests.get')
+    @mock.patch('trendlink_api.requests.Session.get')
     @mock.patch('trendlink_api.os.getenv')
     def test_get_curated_trends(self, mock_getenv, mock_requests_get):
         """Test der get_curated_trends Funktion mit Mock-Daten"""
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Testskript für den Python-Client trendlink_client.
+"""
+
+import unittest
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+import httpx
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trendlink_client import ChatClient, AsyncChatClient, TrendlinkClientError, JobTimeout
+from trendlink_client._retry import RetryPolicy, parse_retry_after
+from trendlink_client._sse import SSEParser
+
+def echo_handler(request):
+    """Antwortet auf /chat mit der gesendeten Nachricht."""
+    message = json.loads(request.content)["message"]
+    return httpx.Response(200, json={"response": f"Antwort auf {message}", "has_trend_data": False})
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test-Suite für Retry-After und Backoff."""
+
+    def test_parse_retry_after(self):
+        """Sekunden und HTTP-Datum werden erkannt, Unsinn ergibt None"""
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("Thu, 01 Jan 1970 00:00:10 GMT", now=4), 6.0)
+        self.assertIsNone(parse_retry_after("bald"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_delay(self):
+        """Backoff ist begrenzt, zu lange Retry-After-Werte beenden die Wiederholung"""
+        policy = RetryPolicy(max_retries=2, backoff=1, max_backoff=3, max_retry_after=10)
+        self.assertLessEqual(policy.delay(1), 2)
+        self.assertEqual(policy.delay(0, "4"), 4)
+        self.assertIsNone(policy.delay(0, "60"))
+        self.assertIsNone(policy.delay(2))
+
+class TestChatClient(unittest.TestCase):
+    """Test-Suite für den synchronen Client."""
+
+    def make_client(self, handler, **kwargs):
+        client = ChatClient("http://bot.test", transport=httpx.MockTransport(handler), **kwargs)
+        self.sleeps = []
+        client._sleep = self.sleeps.append
+        self.addCleanup(client.close)
+        return client
+
+    def test_retries_honor_retry_after(self):
+        """429 und 503 werden wiederholt, die Wartezeit folgt dem Retry-After-Header"""
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "2"}, json={"error": "voll"}),
+            httpx.Response(503, headers={"Retry-After": "1"}, json={"error": "überlastet"}),
+        ]
+
+        def handler(request):
+            return responses.pop(0) if responses else echo_handler(request)
+
+        client = self.make_client(handler, api_key="abc")
+        self.assertEqual(client.chat("Hallo")["response"], "Antwort auf Hallo")
+        self.assertEqual(self.sleeps, [2.0, 1.0])
+
+    def test_gives_up_after_max_retries(self):
+        """Nach max_retries wird der letzte Fehler als TrendlinkClientError geworfen"""
+        client = self.make_client(lambda request: httpx.Response(502, json={"error": "Gateway"}),
+                                  max_retries=2, backoff=0.01)
+        with self.assertRaises(TrendlinkClientError) as context:
+            client.chat("Hallo")
+        self.assertEqual(context.exception.status_code, 502)
+        self.assertEqual(len(self.sleeps), 2)
+
+    def test_client_errors_are_not_retried(self):
+        """400 wird sofort gemeldet; der API-Key wird mitgesendet"""
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("X-API-Key"))
+            return httpx.Response(400, json={"error": "No message provided"})
+
+        client = self.make_client(handler, api_key="abc")
+        with self.assertRaises(TrendlinkClientError):
+            client.chat("")
+        self.assertEqual(seen, ["abc"])
+
+    def test_chat_many_keeps_order_and_bounds_concurrency(self):
+        """Antworten kommen in Eingabereihenfolge, nie mehr als concurrency laufen gleichzeitig"""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def handler(request):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.01)
+            with lock:
+                state["active"] -= 1
+            if json.loads(request.content)["message"] == "m3":
+                return httpx.Response(400, json={"error": "kaputt"})
+            return echo_handler(request)
+
+        client = self.make_client(handler)
+        messages = [f"m{i}" for i in range(20)]
+        results = client.chat_many(messages, concurrency=3, return_exceptions=True)
+
+        self.assertEqual(results[0]["response"], "Antwort auf m0")
+        self.assertEqual(results[19]["response"], "Antwort auf m19")
+        self.assertIsInstance(results[3], TrendlinkClientError)
+        self.assertLessEqual(state["peak"], 3)
+        with self.assertRaises(TrendlinkClientError):
+            client.chat_many(messages, concurrency=3)
+
+    def test_job_mode_long_polls_until_done(self):
+        """submit() liefert die Job-ID, wait_for_job() pollt bis zum Ergebnis"""
+        polls = []
+
+        def handler(request):
+            if request.method == "POST":
+                self.assertTrue(json.loads(request.content)["async"])
+                return httpx.Response(202, json={"job_id": "j1", "status_url": "/chat/jobs/j1"})
+            polls.append(request.url.params["wait"])
+            if len(polls) < 2:
+                return httpx.Response(202, json={"job_id": "j1", "status": "running"})
+            return httpx.Response(200, json={"job_id": "j1", "status": "done", "status_code": 200,
+                                             "result": {"response": "fertig"}})
+
+        client = self.make_client(handler)
+        job_id = client.submit("Hallo")
+        self.assertEqual(client.wait_for_job(job_id, timeout=5), {"response": "fertig"})
+        self.assertEqual(len(polls), 2)
+
+        client = self.make_client(lambda request: httpx.Response(202, json={"status": "running"}))
+        with self.assertRaises(JobTimeout):
+            client.wait_for_job("j1", timeout=0)
+
+    def test_stream_curated_trends(self):
+        """SSE-Ereignisse werden inkrementell gelesen und JSON-dekodiert"""
+        body = (b"retry: 5000\n\n"
+                b"id: 1\nevent: snapshot\ndata: {\"trends\": []}\n\n"
+                b": heartbeat\n\n"
+                b"id: 2\nevent: diff\ndata: {\"added\": [\"KI\"]}\n\n")
+
+        def handler(request):
+            return httpx.Response(200, headers={"Content-Type": "text/event-stream"},
+                                  stream=httpx.ByteStream(body))
+
+        events = list(self.make_client(handler).stream_curated_trends())
+        self.assertEqual([event.event for event in events], ["snapshot", "diff"])
+        self.assertEqual(events[1].data, {"added": ["KI"]})
+        self.assertEqual(events[1].id, "2")
+
+class TestSSEParser(unittest.TestCase):
+    """Test-Suite für den SSE-Parser."""
+
+    def test_multiline_data(self):
+        """Mehrere data-Zeilen werden mit Zeilenumbruch verbunden"""
+        parser = SSEParser()
+        for line in ("data: eins", "data: zwei"):
+            self.assertIsNone(parser.feed(line))
+        event = parser.feed("")
+        self.assertEqual((event.event, event.data), ("message", "eins\nzwei"))
+
+class TestAsyncChatClient(unittest.TestCase):
+    """Test-Suite für den asynchronen Client."""
+
+    def test_chat_many_with_retry(self):
+        """Parallele Anfragen mit Wiederholung bei 429, Reihenfolge bleibt erhalten"""
+        state = {"active": 0, "peak": 0, "rejected": False}
+
+        async def handler(request):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.005)
+            state["active"] -= 1
+            if not state["rejected"]:
+                state["rejected"] = True
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return echo_handler(request)
+
+        async def run():
+            async with AsyncChatClient("http://bot.test",
+                                       transport=httpx.MockTransport(handler)) as client:
+                return await client.chat_many((f"m{i}" for i in range(12)), concurrency=4)
+
+        results = asyncio.run(run())
+        self.assertEqual([r["response"] for r in results], [f"Antwort auf m{i}" for i in range(12)])
+        self.assertLessEqual(state["peak"], 4)
+
+    def test_error_propagates(self):
+        """Ohne return_exceptions wird der erste Fehler geworfen"""
+        async def run():
+            transport = httpx.MockTransport(lambda request: httpx.Response(404, json={"error": "weg"}))
+            async with AsyncChatClient("http://bot.test", transport=transport) as client:
+                await client.chat_many(["a", "b"], concurrency=2)
+
+        with self.assertRaises(TrendlinkClientError):
+            asyncio.run(run())
+
+if __name__ == "__main__":
+    unittest.main()
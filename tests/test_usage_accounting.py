@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Testskript für das usage_accounting Modul.
+"""
+
+import unittest
+import os
+import sys
+import json
+import tempfile
+from types import SimpleNamespace
+from unittest import mock
+
+# Pfad zum übergeordneten Verzeichnis hinzufügen, um das Hauptmodul zu importieren
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai_client
+from usage_accounting import UsageAccountant, estimate_cost
+
+class TestUsageAccounting(unittest.TestCase):
+    """Test-Suite für die Erfassung von Token-Verbrauch und Latenz."""
+
+    def test_aggregation_per_query_type(self):
+        """Tokens, Fehler und Latenzen werden pro query_type summiert"""
+        accountant = UsageAccountant(log_path="")
+        accountant.record("gpt-4", 2.0, 1000, 200, query_type="general_finance")
+        accountant.record("gpt-4", 4.0, 3000, 400, query_type="general_finance")
+        accountant.record("gpt-3.5-turbo", 0.5, 800, 100, query_type="curated_trends")
+        accountant.record("gpt-4", 10.0, ok=False, query_type="general_finance")
+
+        snapshot = accountant.snapshot()
+        general = snapshot["query_types"]["general_finance"]
+        self.assertEqual(general["calls"], 3)
+        self.assertEqual(general["errors"], 1)
+        self.assertEqual(general["prompt_tokens"], 4000)
+        self.assertEqual(general["avg_completion_tokens"], 300.0)
+        self.assertEqual(general["latency_p50"], 2.0)
+        self.assertIsNone(general["ttft_p95"])
+        self.assertEqual(snapshot["query_types"]["curated_trends"]["models"], {"gpt-3.5-turbo": 1})
+        self.assertEqual(len(snapshot["recent"]), 4)
+
+    def test_estimate_cost(self):
+        """Die Kosten werden aus der Preistabelle geschätzt"""
+        self.assertAlmostEqual(estimate_cost("gpt-4", 1000, 1000), 0.09)
+        self.assertIsNone(estimate_cost("unbekannt", 1000, 1000))
+
+    def test_rolling_log(self):
+        """Jeder Aufruf wird als JSON-Zeile ins Log geschrieben"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "usage", "openai.jsonl")
+            accountant = UsageAccountant(log_path=path)
+            accountant.record("gpt-4", 1.25, 10, 5, query_type="trend_instruments")
+            accountant.record("gpt-4", 2.5, 10, 5, ttft=0.4, query_type="trend_instruments")
+            for handler in accountant._log.handlers:
+                handler.flush()
+            with open(path, encoding="utf-8") as f:
+                record, streamed = json.loads(f.readline()), json.loads(f.readline())
+            for handler in list(accountant._log.handlers):
+                handler.close()
+                accountant._log.removeHandler(handler)
+        self.assertEqual(record["query_type"], "trend_instruments")
+        self.assertEqual(record["completion_tokens"], 5)
+        self.assertIsNone(record["ttft"])
+        self.assertEqual(streamed["ttft"], 0.4)
+        self.assertEqual(accountant.snapshot()["query_types"]["trend_instruments"]["ttft_p50"], 0.4)
+
+    def test_completion_usage_is_recorded(self):
+        """get_gpt_response erfasst den usage-Block unter dem übergebenen query_type"""
+        accountant = UsageAccountant(log_path="")
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="Antwort"))],
+            usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30),
+        )
+        client = mock.Mock()
+        client.chat.completions.with_raw_response.create.return_value = SimpleNamespace(
+            headers={}, parse=lambda: response)
+
+        with mock.patch("openai.OpenAI", return_value=client), \
+                mock.patch.object(openai_client, "get_accountant", return_value=accountant), \
+                mock.patch.object(openai_client, "OPENAI_HEDGE_ENABLED", False), \
+                mock.patch.dict(os.environ, {"OPENAI_API_KEY": "key"}):
+            result = openai_client.get_gpt_response("Frage", "System", model="gpt-4",
+                                                    query_type="curated_trends")
+
+        self.assertEqual(result, "Antwort")
+        stats = accountant.snapshot()["query_types"]["curated_trends"]
+        self.assertEqual((stats["prompt_tokens"], stats["completion_tokens"]), (120, 30))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Tracing Modul
+
+Leichtgewichtige Trace-Spans für die Chat-Pipeline (Klassifikation, Trendlink-Abrufe,
+Prompt-Aufbau, OpenAI-Aufrufe). Jede Anfrage erhält eine Trace-ID nach W3C Trace Context;
+ein eingehender `traceparent`-Header wird übernommen, die Antwort trägt `traceparent` und
+`X-Trace-Id`, damit sich eine einzelne langsame Anfrage im Log und im Trace wiederfinden
+lässt.
+
+Head Sampling: Die Entscheidung fällt einmal am Anfang des Traces (TRACE_SAMPLE_RATE oder
+das sampled-Flag eines eingehenden traceparent). Nicht gesampelte Anfragen erzeugen keine
+Span-Objekte, sodass das Tracing auch im Produktionsbetrieb eingeschaltet bleiben kann.
+
+Gesampelte Traces werden nach Ende des Wurzel-Spans als eine Zeile im OTLP/JSON-Format
+(ExportTraceServiceRequest) in ein rotierendes Log geschrieben (TRACE_EXPORT_PATH). Die
+Datei kann z.B. mit dem otlpjsonfile-Receiver des OpenTelemetry Collectors eingelesen
+werden. Die letzten Traces jedes Workers liefert zusätzlich /metrics/traces.
+"""
+
+import os
+import json
+import time
+import random
+import functools
+import logging
+import logging.handlers
+import threading
+import contextvars
+from collections import deque
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Anteil der Anfragen, die ohne eingehenden traceparent gesampelt werden (0 = aus)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+# Ziel des OTLP/JSON-Exports (leer = nur im Speicher unter /metrics/traces)
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+TRACE_EXPORT_MAX_BYTES = int(os.getenv("TRACE_EXPORT_MAX_BYTES", str(10 * 1024 * 1024)))
+TRACE_EXPORT_BACKUPS = int(os.getenv("TRACE_EXPORT_BACKUPS", "5"))
+# Anzahl der zuletzt abgeschlossenen Traces pro Worker für /metrics/traces
+TRACE_RECENT = int(os.getenv("TRACE_RECENT", "50"))
+# Servicename im Resource-Attribut service.name
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "trendlink-bot")
+
+TRACEPARENT_HEADER = "traceparent"
+TRACE_ID_HEADER = "X-Trace-Id"
+
+# Span-Arten nach OTLP (SpanKind)
+INTERNAL = 1
+SERVER = 2
+CLIENT = 3
+
+# Statuscodes nach OTLP
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_trace = contextvars.ContextVar("trace", default=None)
+_span = contextvars.ContextVar("span", default=None)
+
+_recent = deque(maxlen=TRACE_RECENT)
+_recent_lock = threading.Lock()
+_exporter_lock = threading.Lock()
+
+
+def _new_trace_id():
+    return "%032x" % random.getrandbits(128)
+
+
+def _new_span_id():
+    return "%016x" % random.getrandbits(64)
+
+
+def parse_traceparent(value):
+    """
+    Liest einen W3C-traceparent-Header ("00-<trace_id>-<parent_id>-<flags>").
+
+    Args:
+        value (str): Wert des Headers
+
+    Returns:
+        tuple: (trace_id, parent_span_id, sampled) oder None, wenn der Wert ungültig ist
+    """
+    if not value:
+        return None
+    parts = value.strip().lower().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    _, trace_id, parent_id, flags = parts[:4]
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if len(trace_id) != 32 or len(parent_id) != 16 or len(flags) != 2:
+        return None
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, sampled
+
+
+class Trace:
+    """Zustand eines Traces innerhalb eines Prozesses: ID, Sampling-Entscheidung und Spans."""
+
+    def __init__(self, trace_id, sampled):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.root = None
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+
+class Span:
+    """
+    Ein Abschnitt eines Traces mit Start, Ende, Attributen und Status.
+
+    Nur gesampelte Traces erzeugen Span-Objekte; sonst liefert span() einen NoopSpan.
+    """
+
+    def __init__(self, trace, name, kind, parent_id, attributes):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = _new_span_id()
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = None
+        self.status_message = None
+
+    def set_attribute(self, key, value):
+        """Setzt ein Attribut; None wird ignoriert."""
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_error(self, error):
+        """Markiert den Span als fehlgeschlagen."""
+        self.status = STATUS_ERROR
+        self.status_message = str(error)[:200]
+        self.attributes["error.type"] = type(error).__name__
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.trace.add(self)
+
+    @property
+    def duration_ms(self):
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e6
+
+    def to_otlp(self):
+        """Span im OTLP/JSON-Format."""
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status or STATUS_OK},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class NoopSpan:
+    """Platzhalter für nicht gesampelte Traces; alle Aufrufe sind wirkungslos."""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_error(self, error):
+        pass
+
+
+_NOOP = NoopSpan()
+
+
+def _otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def current_span():
+    """
+    Liefert den aktiven Span (oder einen NoopSpan), um Attribute nachzutragen,
+    z.B. ob ein Cache getroffen wurde.
+    """
+    return _span.get() or _NOOP
+
+
+def current_trace_id():
+    """Trace-ID der laufenden Anfrage oder None."""
+    trace = _trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+def current_traceparent():
+    """
+    traceparent der laufenden Anfrage (aktiver Span als Parent), um einen Trace in einem
+    anderen Thread oder Prozess fortzusetzen; None außerhalb eines Traces.
+    """
+    trace = _trace.get()
+    if trace is None:
+        return None
+    span = _span.get()
+    parent_id = span.span_id if span is not None else _new_span_id()
+    return f"00-{trace.trace_id}-{parent_id}-{'01' if trace.sampled else '00'}"
+
+
+class _SpanScope:
+    """Kontextmanager für einen Span; setzt ihn als aktiven Span und beendet ihn beim Verlassen."""
+
+    def __init__(self, span):
+        self.span = span
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_span.set(self.span))
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and self.span.status is None:
+            self.span.set_error(exc)
+        self.span.end()
+        _span.reset(self._tokens.pop())
+        return False
+
+
+class _NoopScope:
+    def __enter__(self):
+        return _NOOP
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+def span(name, kind=INTERNAL, **attributes):
+    """
+    Öffnet einen Kind-Span des aktiven Spans.
+
+    Läuft kein gesampelter Trace, kostet der Aufruf nur einen ContextVar-Zugriff.
+
+        with tracing.span("chat.classify") as s:
+            s.set_attribute("query.type", "off_topic")
+
+    Args:
+        name (str): Name des Spans
+        kind (int): INTERNAL, SERVER oder CLIENT
+        **attributes: Start-Attribute
+
+    Returns:
+        Kontextmanager, der den Span (oder einen NoopSpan) liefert
+    """
+    trace = _trace.get()
+    if trace is None or not trace.sampled:
+        return _NOOP_SCOPE
+    parent = _span.get()
+    return _SpanScope(Span(trace, name, kind, parent.span_id if parent else None, attributes))
+
+
+class _RootScope:
+    """Kontextmanager für den Wurzel-Span; exportiert den Trace nach dem Ende."""
+
+    def __init__(self, name, kind, traceparent, sample_rate, attributes):
+        parsed = parse_traceparent(traceparent)
+        if parsed is not None:
+            trace_id, self.parent_id, sampled = parsed
+        else:
+            trace_id, self.parent_id = _new_trace_id(), None
+            sampled = sample_rate > 0 and random.random() < sample_rate
+        self.trace = Trace(trace_id, sampled)
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.span = None
+        self._trace_token = None
+        self._scope = None
+
+    def __enter__(self):
+        self._trace_token = _trace.set(self.trace)
+        if not self.trace.sampled:
+            return _NOOP
+        self.span = Span(self.trace, self.name, self.kind, self.parent_id, self.attributes)
+        self.trace.root = self.span
+        self._scope = _SpanScope(self.span)
+        return self._scope.__enter__()
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if self._scope is not None:
+                self._scope.__exit__(exc_type, exc, tb)
+                export(self.trace)
+        finally:
+            _trace.reset(self._trace_token)
+        return False
+
+    def traceparent(self):
+        """traceparent-Header für die Antwort (Span-ID des Wurzel-Spans, falls gesampelt)."""
+        span_id = self.span.span_id if self.span is not None else (self.parent_id or _new_span_id())
+        return f"00-{self.trace.trace_id}-{span_id}-{'01' if self.trace.sampled else '00'}"
+
+
+def root_span(name, kind=SERVER, traceparent=None, sample_rate=None, **attributes):
+    """
+    Beginnt einen Trace mit Wurzel-Span und trifft die Sampling-Entscheidung.
+
+    Args:
+        name (str): Name des Wurzel-Spans, z.B. "POST /chat"
+        kind (int): SERVER für eingehende Anfragen, INTERNAL für Hintergrund-Jobs
+        traceparent (str): Optionaler eingehender W3C-traceparent
+        sample_rate (float): Sampling-Rate (Standard: TRACE_SAMPLE_RATE)
+        **attributes: Start-Attribute des Wurzel-Spans
+
+    Returns:
+        _RootScope: Kontextmanager; traceparent() liefert den Header für die Antwort
+    """
+    rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    return _RootScope(name, kind, traceparent, rate, attributes)
+
+
+def _get_exporter(path):
+    """Richtet das rotierende OTLP/JSON-Log ein (None, wenn kein Pfad gesetzt ist)."""
+    if not path:
+        return None
+    exporter = logging.getLogger(f"{__name__}.export.{path}")
+    if exporter.handlers:
+        return exporter
+    with _exporter_lock:
+        if not exporter.handlers:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            exporter.propagate = False
+            exporter.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=TRACE_EXPORT_MAX_BYTES, backupCount=TRACE_EXPORT_BACKUPS,
+                encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            exporter.addHandler(handler)
+    return exporter
+
+
+def to_otlp(trace):
+    """
+    Wandelt einen Trace in ein OTLP/JSON ExportTraceServiceRequest um.
+
+    Returns:
+        dict: {"resourceSpans": [...]}
+    """
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                _otlp_attribute("service.name", TRACE_SERVICE_NAME),
+                _otlp_attribute("process.pid", os.getpid()),
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [span.to_otlp() for span in trace.spans],
+            }],
+        }]
+    }
+
+
+def summarize(trace):
+    """
+    Kurzfassung eines Traces: Gesamtdauer und Dauer jedes Spans in Startreihenfolge.
+
+    Returns:
+        dict: trace_id, duration_ms und spans (Name, Dauer, Parent, Attribute)
+    """
+    spans = sorted(trace.spans, key=lambda span: span.start_ns)
+    root = trace.root or spans[0]
+    return {
+        "trace_id": trace.trace_id,
+        "name": root.name,
+        "duration_ms": round(root.duration_ms, 2),
+        "spans": [{
+            "name": span.name,
+            "span_id": span.span_id,
+            "parent_id": span.parent_id,
+            "offset_ms": round((span.start_ns - root.start_ns) / 1e6, 2),
+            "duration_ms": round(span.duration_ms, 2),
+            "error": span.status == STATUS_ERROR,
+            "attributes": span.attributes,
+        } for span in spans],
+    }
+
+
+def export(trace):
+    """Schreibt einen abgeschlossenen, gesampelten Trace ins Log und in die Liste der letzten Traces."""
+    if not trace.sampled or not trace.spans:
+        return
+    with _recent_lock:
+        _recent.append(trace)
+    exporter = _get_exporter(TRACE_EXPORT_PATH)
+    if exporter is None:
+        return
+    try:
+        exporter.info(json.dumps(to_otlp(trace), separators=(",", ":"), ensure_ascii=False))
+    except Exception as e:
+        logger.warning(f"Trace {trace.trace_id} konnte nicht exportiert werden: {e}")
+
+
+def recent_traces(limit=20, min_duration_ms=0.0):
+    """
+    Liefert die zuletzt abgeschlossenen Traces dieses Workers, die langsamsten zuerst.
+
+    Args:
+        limit (int): Maximale Anzahl
+        min_duration_ms (float): Nur Traces ab dieser Dauer
+
+    Returns:
+        list: Kurzfassungen wie bei summarize()
+    """
+    with _recent_lock:
+        traces = list(_recent)
+    summaries = [summarize(trace) for trace in traces]
+    summaries = [s for s in summaries if s["duration_ms"] >= min_duration_ms]
+    summaries.sort(key=lambda s: s["duration_ms"], reverse=True)
+    return summaries[:limit]
+
+
+def traced(view):
+    """
+    Decorator für Flask-Views: beginnt einen Trace pro Anfrage (eingehender traceparent
+    wird übernommen) und gibt traceparent und X-Trace-Id in der Antwort zurück.
+    Nicht gesampelte Anfragen erhalten ebenfalls eine Trace-ID, aber keine Spans.
+    """
+    from flask import request, make_response
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        scope = root_span(f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+                          kind=SERVER, traceparent=request.headers.get(TRACEPARENT_HEADER),
+                          **{"http.method": request.method, "http.target": request.path})
+        with scope as root:
+            response = make_response(view(*args, **kwargs))
+            root.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500 and isinstance(root, Span):
+                root.status = STATUS_ERROR
+        response.headers[TRACEPARENT_HEADER] = scope.traceparent()
+        response.headers[TRACE_ID_HEADER] = scope.trace.trace_id
+        return response
+
+    return wrapper
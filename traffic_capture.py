@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Traffic Capture Modul
+
+Zeichnet echte /chat-Anfragen für Performance-Regressionstests auf. Pro Anfrage
+wird eine JSON-Zeile geschrieben mit:
+
+- der bereinigten Nutzernachricht (E-Mail-Adressen, IBANs und Telefonnummern maskiert)
+- der erkannten Absicht (query_type, Trendname)
+- den Antworten und Laufzeiten aller Trendlink- und OpenAI-Aufrufe
+- Statuscode und Gesamtdauer der Anfrage
+
+Aktiviert wird die Aufzeichnung über CAPTURE_FILE (Endung .gz für gzip-Kompression).
+Das Werkzeug traffic_replay.py spielt die Aufzeichnung später gegen lokale
+Stand-ins mit den aufgezeichneten Latenzen ab.
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import random
+import logging
+import threading
+import functools
+import contextvars
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CAPTURE_FILE = os.getenv("CAPTURE_FILE", "")
+CAPTURE_SAMPLE_RATE = float(os.getenv("CAPTURE_SAMPLE_RATE", "1.0"))
+
+# Version des Aufzeichnungsformats
+CAPTURE_FORMAT_VERSION = 1
+
+# Muster für personenbezogene Daten, die nicht im Log landen dürfen
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_IBAN_PATTERN = re.compile(r"\b[A-Z]{2}\d{2}(?:\s?[A-Z0-9]{4}){3,7}(?:\s?[A-Z0-9]{1,3})?\b")
+_PHONE_PATTERN = re.compile(r"(?<![\w])\+?\d[\d\s/()-]{6,}\d(?![\w])")
+
+_current_capture = contextvars.ContextVar("current_capture", default=None)
+_write_lock = threading.Lock()
+
+
+def capture_enabled():
+    """True, wenn eine Aufzeichnungsdatei konfiguriert ist."""
+    return bool(CAPTURE_FILE)
+
+
+def sanitize_message(message):
+    """
+    Entfernt personenbezogene Daten aus einer Nutzernachricht.
+
+    ISINs und WKNs bleiben erhalten, da sie für die Erkennung der Absicht nötig sind.
+
+    Args:
+        message (str): Originalnachricht
+
+    Returns:
+        str: Bereinigte Nachricht
+    """
+    message = _EMAIL_PATTERN.sub("<email>", message)
+    message = _IBAN_PATTERN.sub("<iban>", message)
+    message = _PHONE_PATTERN.sub("<telefon>", message)
+    return message
+
+
+class Capture:
+    """Aufzeichnung einer einzelnen Anfrage."""
+
+    __slots__ = ("message", "intent", "upstream", "started")
+
+    def __init__(self, message):
+        self.message = sanitize_message(message)
+        self.intent = {}
+        self.upstream = []
+        self.started = time.perf_counter()
+
+    def to_record(self, status):
+        return {
+            "v": CAPTURE_FORMAT_VERSION,
+            "ts": time.time(),
+            "message": self.message,
+            "intent": self.intent,
+            "status": status,
+            "duration": round(time.perf_counter() - self.started, 6),
+            "upstream": self.upstream,
+        }
+
+
+def set_intent(**intent):
+    """
+    Hält die erkannte Absicht der laufenden Anfrage fest (ohne Wirkung, wenn nicht aufgezeichnet wird).
+
+    Args:
+        **intent: Beliebige Schlüssel, z.B. query_type="trend_instruments", trend_name="wasserstoff"
+    """
+    capture = _current_capture.get()
+    if capture is not None:
+        capture.intent.update({
+            name: sanitize_message(value) if isinstance(value, str) else value
+            for name, value in intent.items()
+        })
+
+
+def captured_call(kind, key, func, *args, **kwargs):
+    """
+    Ruft eine Upstream-Funktion auf und zeichnet Ergebnis und Laufzeit auf.
+
+    Schlüssel und Text-Ergebnisse werden wie die Nachricht bereinigt.
+
+    Args:
+        kind (str): Art des Aufrufs, z.B. "trendlink.trend_instruments" oder "openai.chat"
+        key (str): Schlüssel, über den die Antwort beim Replay gefunden wird
+        func (callable): Aufzurufende Funktion
+        *args, **kwargs: Argumente für func
+
+    Returns:
+        Rückgabewert von func (Ausnahmen werden aufgezeichnet und weitergereicht)
+    """
+    capture = _current_capture.get()
+    if capture is None:
+        return func(*args, **kwargs)
+
+    key = sanitize_message(str(key))
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        capture.upstream.append({
+            "kind": kind, "key": key, "duration": round(time.perf_counter() - start, 6),
+            "result": None, "error": sanitize_message(str(e)),
+        })
+        raise
+    capture.upstream.append({
+        "kind": kind, "key": key, "duration": round(time.perf_counter() - start, 6),
+        "result": sanitize_message(result) if isinstance(result, str) else result, "error": None,
+    })
+    return result
+
+
+def _write_record(record, path=None):
+    """Hängt einen Datensatz an die Aufzeichnungsdatei an."""
+    path = path or CAPTURE_FILE
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    opener = gzip.open if path.endswith(".gz") else open
+    with _write_lock:
+        with opener(path, "at", encoding="utf-8") as f:
+            f.write(line)
+
+
+def read_records(path):
+    """
+    Liest eine Aufzeichnungsdatei.
+
+    Args:
+        path (str): Pfad zur Datei (.jsonl oder .jsonl.gz)
+
+    Yields:
+        dict: Ein Datensatz pro Anfrage
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def captured(view):
+    """
+    Decorator für den /chat-Endpunkt, der Anfragen aufzeichnet.
+
+    Ist CAPTURE_FILE nicht gesetzt, wird die View unverändert zurückgegeben.
+    """
+    if not capture_enabled():
+        return view
+
+    from flask import request, make_response
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        # Nur JSON-Objekte aufzeichnen; alles andere lehnt die View selbst mit 400 ab
+        data = request.get_json(silent=True)
+        message = data.get("message") if isinstance(data, dict) else None
+        if not isinstance(message, str) or random.random() >= CAPTURE_SAMPLE_RATE:
+            return view(*args, **kwargs)
+
+        capture = Capture(message)
+        token = _current_capture.set(capture)
+        try:
+            response = make_response(view(*args, **kwargs))
+        finally:
+            _current_capture.reset(token)
+
+        try:
+            _write_record(capture.to_record(response.status_code))
+        except OSError as e:
+            logger.error(f"Aufzeichnung konnte nicht geschrieben werden: {e}")
+        return response
+
+    return wrapper
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Traffic Replay
+
+Spielt eine mit traffic_capture aufgezeichnete Datei gegen die App ab. Trendlink und
+OpenAI werden durch lokale Stand-ins ersetzt, die die aufgezeichneten Antworten mit
+den aufgezeichneten Latenzen liefern. So lassen sich Änderungen am Anfragepfad
+reproduzierbar vergleichen.
+
+Beispiele:
+    python traffic_replay.py captures/chat.jsonl.gz --concurrency 8 --json baseline.json
+    python traffic_replay.py captures/chat.jsonl.gz --concurrency 8 --compare baseline.json
+"""
+
+import sys
+import json
+import math
+import time
+import argparse
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from traffic_capture import read_records, sanitize_message
+
+# Aufgezeichnete Aufrufarten und die Funktionen in app.py, die sie ersetzen
+STAND_IN_TARGETS = {
+    "trendlink.trend_instruments": "get_trend_instruments",
+    "trendlink.instrument_trends": "get_instrument_trends",
+    "trendlink.curated_trends": "get_curated_trends",
+    "openai.chat": "get_gpt_response",
+}
+
+
+class ReplayMiss(Exception):
+    """Für einen Aufruf gibt es keine Aufzeichnung."""
+
+
+class UpstreamStandIn:
+    """
+    Liefert aufgezeichnete Upstream-Antworten anstelle echter API-Aufrufe.
+
+    Gibt es mehrere Aufzeichnungen zum selben Schlüssel, werden sie reihum verwendet.
+    """
+
+    def __init__(self, records, time_scale=1.0):
+        self.time_scale = time_scale
+        self._responses = defaultdict(list)
+        self._positions = defaultdict(int)
+        self._lock = threading.Lock()
+        self.misses = 0
+        for record in records:
+            for call in record.get("upstream", ()):
+                self._responses[(call["kind"], call["key"])].append(call)
+
+    def respond(self, kind, key):
+        """
+        Liefert die aufgezeichnete Antwort nach der aufgezeichneten Laufzeit.
+
+        Raises:
+            ReplayMiss: Wenn es zum Schlüssel keine Aufzeichnung gibt
+            RuntimeError: Wenn der aufgezeichnete Aufruf fehlgeschlagen ist
+        """
+        lookup = (kind, sanitize_message(str(key)))
+        with self._lock:
+            calls = self._responses.get(lookup)
+            if not calls:
+                self.misses += 1
+                raise ReplayMiss(f"Keine Aufzeichnung für {kind}: {key!r}")
+            call = calls[self._positions[lookup] % len(calls)]
+            self._positions[lookup] += 1
+
+        time.sleep(call["duration"] * self.time_scale)
+        if call.get("error"):
+            raise RuntimeError(call["error"])
+        return call["result"]
+
+    def install(self, app_module):
+        """Ersetzt die Upstream-Funktionen im app-Modul durch Stand-ins."""
+        app_module.get_trend_instruments = (
+            lambda trend_name, **kwargs: self.respond("trendlink.trend_instruments", trend_name))
+        app_module.get_instrument_trends = (
+            lambda identifier, **kwargs: self.respond("trendlink.instrument_trends", identifier))
+        app_module.get_curated_trends = (
+            lambda limit=5, **kwargs: self.respond("trendlink.curated_trends", limit))
+        app_module.get_gpt_response = (
+            lambda user_input, system_prompt, **kwargs: self.respond("openai.chat", user_input))
+
+
+def percentile(values, p):
+    """Perzentil nach dem Nearest-Rank-Verfahren (None bei leerer Liste)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(results, wall_time):
+    """
+    Fasst die Ergebnisse pro query_type und gesamt zusammen.
+
+    Args:
+        results (list): Tupel (query_type, status, sekunden)
+        wall_time (float): Gesamtdauer des Replays in Sekunden
+
+    Returns:
+        dict: Kennzahlen pro query_type und unter "all"
+    """
+    groups = defaultdict(list)
+    for query_type, status, seconds in results:
+        groups[query_type].append((status, seconds))
+        groups["all"].append((status, seconds))
+
+    summary = {}
+    for query_type, entries in sorted(groups.items()):
+        latencies = [seconds for _, seconds in entries]
+        summary[query_type] = {
+            "requests": len(entries),
+            "errors": sum(1 for status, _ in entries if status >= 500),
+            "throughput": round(len(entries) / wall_time, 2) if wall_time > 0 else None,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        }
+    return summary
+
+
+def replay(records, concurrency=4, time_scale=1.0):
+    """
+    Spielt die Aufzeichnungen gegen den Flask-Testclient ab.
+
+    Args:
+        records (list): Datensätze aus traffic_capture.read_records()
+        concurrency (int): Anzahl paralleler Anfragen
+        time_scale (float): Faktor für die aufgezeichneten Upstream-Latenzen
+
+    Returns:
+        dict: Zusammenfassung (siehe summarize) plus Anzahl fehlender Aufzeichnungen
+    """
+    import app as app_module
+
+    stand_in = UpstreamStandIn(records, time_scale=time_scale)
+    stand_in.install(app_module)
+    app_module.ADMISSION_ENABLED = False
+    client = app_module.app.test_client()
+
+    def send(record):
+        query_type = record.get("intent", {}).get("query_type", "unknown")
+        start = time.perf_counter()
+        response = client.post("/chat", json={"message": record["message"]})
+        return query_type, response.status_code, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, records))
+    wall_time = time.perf_counter() - start
+
+    return {"summary": summarize(results, wall_time), "misses": stand_in.misses}
+
+
+def print_report(report, baseline=None):
+    """Gibt die Kennzahlen als Tabelle aus, optional mit Abweichung zur Baseline."""
+    header = f"{'query_type':<22}{'req':>6}{'err':>5}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for query_type, stats in report["summary"].items():
+        line = (f"{query_type:<22}{stats['requests']:>6}{stats['errors']:>5}"
+                f"{stats['throughput']:>9}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+        print(line)
+        base = (baseline or {}).get("summary", {}).get(query_type)
+        if base:
+            deltas = []
+            for key in ("p50_ms", "p95_ms", "p99_ms"):
+                if base[key]:
+                    deltas.append(f"{key} {100 * (stats[key] - base[key]) / base[key]:+.1f}%")
+            print(f"{'':<22}vs. Baseline: " + ", ".join(deltas))
+    if report["misses"]:
+        print(f"\nWarnung: {report['misses']} Upstream-Aufrufe ohne Aufzeichnung")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aufgezeichneten /chat-Traffic abspielen")
+    parser.add_argument("capture_file", help="Aufzeichnung (.jsonl oder .jsonl.gz)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallele Anfragen (Standard: 4)")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="Faktor für aufgezeichnete Upstream-Latenzen (Standard: 1.0)")
+    parser.add_argument("--json", dest="json_out", help="Ergebnis als JSON speichern")
+    parser.add_argument("--compare", help="Mit einem früher gespeicherten Ergebnis vergleichen")
+    args = parser.parse_args(argv)
+
+    records = list(read_records(args.capture_file))
+    if not records:
+        print("Die Aufzeichnung enthält keine Anfragen.")
+        return 1
+
+    report = replay(records, concurrency=args.concurrency, time_scale=args.time_scale)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
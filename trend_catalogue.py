@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Trend Catalogue Modul
+
+Prozessweiter In-Memory-Katalog aller Trends in kompakter Darstellung
+(siehe trend_model). Ist der Katalog geladen, können Trend-Suchen ohne
+Upstream-Aufruf beantwortet werden. Im Produktionsbetrieb wird er einmal
+im Gunicorn-Master vor dem Fork geladen und von allen Workern geteilt.
+
+Nach dem ersten Laden hält trend_sync den Katalog aktuell, indem nur geänderte
+Trends per upsert() bzw. remove() eingespielt werden; die Indizes werden dabei
+an Ort und Stelle angepasst statt neu aufgebaut. Das gilt auch für den umgekehrten
+Index von ISIN bzw. WKN auf die enthaltenden Trends (instrument_index).
+"""
+
+import time
+import logging
+import threading
+
+from trend_stream import compile_search
+from instrument_index import InstrumentIndex, Membership
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TrendCatalogue:
+    """
+    Katalog der Trends in der Reihenfolge der API mit Index über die Trend-ID
+    und umgekehrtem Index über die ISINs der Instrumente.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._trends = []
+        self._by_id = {}
+        # Trend-ID -> Position in _trends
+        self._positions = {}
+        self._instruments = InstrumentIndex()
+        self.loaded_at = None
+        self.version = 0
+
+    def load(self, trends):
+        """
+        Ersetzt den Inhalt des Katalogs vollständig.
+
+        Args:
+            trends (list): Liste von trend_model.Trend-Objekten in API-Reihenfolge
+        """
+        trends = list(trends)
+        by_id = {trend.id: trend for trend in trends if trend.id is not None}
+        positions = {trend.id: index for index, trend in enumerate(trends) if trend.id is not None}
+        instruments = InstrumentIndex(by_id.values())
+        with self._lock:
+            self._trends = trends
+            self._by_id = by_id
+            self._positions = positions
+            self._instruments = instruments
+            self.loaded_at = time.time()
+            self.version += 1
+        logger.info(f"Trend-Katalog geladen: {len(trends)} Trends (Version {self.version})")
+
+    def upsert(self, trends):
+        """
+        Ersetzt geänderte Trends an ihrer bisherigen Position und hängt neue Trends an.
+
+        Args:
+            trends (iterable): trend_model.Trend-Objekte mit ID
+
+        Returns:
+            int: Anzahl eingespielter Trends
+        """
+        count = 0
+        with self._lock:
+            for trend in trends:
+                position = self._positions.get(trend.id)
+                if position is None:
+                    self._positions[trend.id] = len(self._trends)
+                    self._trends.append(trend)
+                else:
+                    self._trends[position] = trend
+                self._instruments.discard(self._by_id.get(trend.id))
+                self._instruments.add(trend)
+                self._by_id[trend.id] = trend
+                count += 1
+            if count:
+                self.version += 1
+        return count
+
+    def remove(self, trend_ids):
+        """
+        Entfernt Trends anhand ihrer IDs.
+
+        Args:
+            trend_ids (iterable): IDs der zu entfernenden Trends
+
+        Returns:
+            int: Anzahl entfernter Trends
+        """
+        with self._lock:
+            removed = {trend_id for trend_id in trend_ids if trend_id in self._by_id}
+            if not removed:
+                return 0
+            # Die Liste wird ersetzt statt verändert, damit laufende Suchen eine
+            # konsistente Momentaufnahme behalten
+            self._trends = [trend for trend in self._trends if trend.id not in removed]
+            for trend_id in removed:
+                self._instruments.discard(self._by_id.pop(trend_id))
+            self._positions = {
+                trend.id: index for index, trend in enumerate(self._trends) if trend.id is not None
+            }
+            self.version += 1
+        return len(removed)
+
+    def touch(self):
+        """Markiert den Katalog nach einem erfolgreichen Abgleich als aktuell."""
+        self.loaded_at = time.time()
+
+    def __len__(self):
+        return len(self._trends)
+
+    def is_loaded(self):
+        """True, wenn der Katalog mindestens einmal geladen wurde."""
+        return self.loaded_at is not None
+
+    def age(self):
+        """
+        Alter des Katalogs in Sekunden.
+
+        Returns:
+            float: Sekunden seit dem letzten Laden oder None, wenn nie geladen
+        """
+        if self.loaded_at is None:
+            return None
+        return time.time() - self.loaded_at
+
+    def is_fresh(self, max_age):
+        """
+        Prüft, ob der Katalog geladen und nicht älter als `max_age` Sekunden ist.
+
+        Args:
+            max_age (float): Maximales Alter in Sekunden
+
+        Returns:
+            bool: True, wenn der Katalog verwendet werden kann
+        """
+        age = self.age()
+        return age is not None and age <= max_age
+
+    def get(self, trend_id):
+        """Liefert einen Trend anhand seiner ID oder None."""
+        return self._by_id.get(trend_id)
+
+    def trends(self):
+        """Liefert eine Momentaufnahme aller Trends in API-Reihenfolge."""
+        with self._lock:
+            return list(self._trends)
+
+    def search(self, trend_name):
+        """
+        Sucht den ersten Trend, dessen Name, Beschreibung oder Synonyme passen.
+
+        Die Trefferlogik entspricht der Suche im Antwort-Stream (trend_stream.find_trend).
+
+        Args:
+            trend_name (str): Name des Trends oder Suchbegriff
+
+        Returns:
+            Trend: Gefundener Trend oder None
+        """
+        search_term_lower, search_pattern = compile_search(trend_name)
+        for trend in self._trends:
+            if trend.matches(search_term_lower, search_pattern):
+                return trend
+        return None
+
+    def find_instrument(self, kind, value):
+        """
+        Liefert die Trends, in denen ein Instrument enthalten ist (O(1) über den ISIN-Index).
+
+        Args:
+            kind (str): instrument_index.ISIN oder instrument_index.WKN
+            value (str): Kennung in Großbuchstaben
+
+        Returns:
+            tuple: (ISIN oder None, Liste von Membership) - nice-Instrumente zuerst, dann
+                nach Gewichtung und Position des Trends im Katalog
+        """
+        with self._lock:
+            isin = self._instruments.resolve(kind, value)
+            if isin is None:
+                return None, []
+            memberships = []
+            for trend_id, position in self._instruments.positions(isin).items():
+                trend = self._by_id[trend_id]
+                instruments = trend.instruments
+                memberships.append((
+                    instruments.rank_key(position)[:2] + (self._positions.get(trend_id, 0),),
+                    Membership(trend, instruments.weighting(position), instruments.is_nice(position)),
+                ))
+        memberships.sort(key=lambda item: item[0])
+        return isin, [membership for _, membership in memberships]
+
+    def stats(self):
+        """
+        Liefert Kennzahlen des Katalogs für Diagnosezwecke.
+
+        Returns:
+            dict: Anzahl Trends, Instrumente und eindeutiger ISINs/WKNs, Version und Alter
+        """
+        trends = self._trends
+        return {
+            "trends": len(trends),
+            "instruments": sum(len(trend.instruments) for trend in trends),
+            "isins": len(self._instruments),
+            "wkns": self._instruments.wkn_count(),
+            "version": self.version,
+            "age_seconds": self.age(),
+        }
+
+
+# Prozessweiter Katalog
+_catalogue = TrendCatalogue()
+
+
+def get_catalogue():
+    """
+    Liefert den prozessweiten Trend-Katalog.
+
+    Returns:
+        TrendCatalogue: Der Katalog (ggf. noch nicht geladen)
+    """
+    return _catalogue
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Trend Model Modul
+
+Kompakte In-Memory-Darstellung von Trends und ihren Instrumenten.
+
+Statt verschachtelter Dictionaries aus dem JSON werden Trends als `__slots__`-Objekte
+gehalten. Die Instrumente eines Trends liegen spaltenweise in einer InstrumentTable:
+ISINs als feste 12-Byte-Einträge in einem bytearray, Gewichtungen als 1-Byte-Codes
+und das nice-Flag als einzelnes Bit. Wiederkehrende kategoriale Strings (Kategorien,
+Synonyme) werden interniert und daher nur einmal pro Prozess gespeichert.
+"""
+
+import sys
+import heapq
+from array import array
+from collections import namedtuple
+
+# Feste Länge einer ISIN (ISO 6166)
+ISIN_LENGTH = 12
+
+# Bekannte Gewichtungen laut API-Dokumentation; der Index ist der gespeicherte Code
+WEIGHTINGS = ("high", "normal", "low")
+_WEIGHTING_CODES = {weighting: code for code, weighting in enumerate(WEIGHTINGS)}
+_DEFAULT_WEIGHTING = "normal"
+
+Instrument = namedtuple("Instrument", ["isin", "weighting", "nice"])
+
+
+def intern_string(value):
+    """
+    Interniert einen String, damit gleiche Werte nur einmal im Speicher liegen.
+
+    Args:
+        value: Beliebiger Wert; nur Strings werden interniert
+
+    Returns:
+        Der internierte String bzw. der unveränderte Wert
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+class InstrumentTable:
+    """
+    Spaltenweise Tabelle der Instrumente eines Trends.
+
+    Die Reihenfolge der API-Antwort bleibt erhalten. ISINs, die nicht genau 12 ASCII-Zeichen
+    lang sind, und unbekannte Gewichtungen werden in kleinen Ausnahme-Tabellen abgelegt.
+    """
+
+    __slots__ = ("_isins", "_weightings", "_nice_bits", "_count", "_extra")
+
+    def __init__(self, instruments=()):
+        self._isins = bytearray()
+        self._weightings = array("B")
+        self._nice_bits = bytearray()
+        self._count = 0
+        # Seltene Sonderfälle: Index -> (isin oder None, gewichtung oder None)
+        self._extra = None
+
+        for instrument in instruments:
+            self.append(
+                instrument.get("isin"),
+                instrument.get("weighting", _DEFAULT_WEIGHTING),
+                instrument.get("nice", False)
+            )
+
+    def append(self, isin, weighting=_DEFAULT_WEIGHTING, nice=False):
+        """
+        Fügt ein Instrument am Ende hinzu.
+
+        Args:
+            isin (str): ISIN des Instruments
+            weighting (str): Gewichtung ("high", "normal" oder "low")
+            nice (bool): Thematisch besonders relevantes Instrument
+        """
+        index = self._count
+        extra_isin = None
+        extra_weighting = None
+
+        encoded = isin.encode("ascii", "replace") if isinstance(isin, str) else b""
+        packed = len(encoded) == ISIN_LENGTH and isin.isascii()
+        if packed:
+            self._isins += encoded
+        else:
+            self._isins += b" " * ISIN_LENGTH
+            extra_isin = isin
+
+        code = _WEIGHTING_CODES.get(weighting)
+        if code is None:
+            code = _WEIGHTING_CODES[_DEFAULT_WEIGHTING]
+            extra_weighting = intern_string(weighting)
+        self._weightings.append(code)
+
+        if index % 8 == 0:
+            self._nice_bits.append(0)
+        if nice:
+            self._nice_bits[index >> 3] |= 1 << (index & 7)
+
+        if not packed or extra_weighting is not None:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[index] = (extra_isin, extra_weighting)
+
+        self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def _check_index(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Instrument-Index außerhalb des gültigen Bereichs")
+        return index
+
+    def isin(self, index):
+        """Liefert die ISIN des Instruments an Position `index` (None, falls unbekannt)."""
+        index = self._check_index(index)
+        if self._extra and index in self._extra:
+            return self._extra[index][0]
+        offset = index * ISIN_LENGTH
+        return self._isins[offset:offset + ISIN_LENGTH].decode("ascii")
+
+    def weighting(self, index):
+        """Liefert die Gewichtung des Instruments an Position `index`."""
+        index = self._check_index(index)
+        if self._extra and index in self._extra and self._extra[index][1] is not None:
+            return self._extra[index][1]
+        return WEIGHTINGS[self._weightings[index]]
+
+    def weighting_code(self, index):
+        """Liefert den Gewichtungs-Code (0 = high, 1 = normal, 2 = low)."""
+        return self._weightings[self._check_index(index)]
+
+    def is_nice(self, index):
+        """Liefert das nice-Flag des Instruments an Position `index`."""
+        index = self._check_index(index)
+        return bool(self._nice_bits[index >> 3] & (1 << (index & 7)))
+
+    def __getitem__(self, index):
+        return Instrument(self.isin(index), self.weighting(index), self.is_nice(index))
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def rank_key(self, index):
+        """
+        Sortierschlüssel eines Instruments: zuerst nice, dann Gewichtung, dann API-Reihenfolge.
+
+        Args:
+            index (int): Position des Instruments
+
+        Returns:
+            tuple: Kleinere Schlüssel stehen weiter vorne
+        """
+        return (not self.is_nice(index), self._weightings[index], index)
+
+    def top(self, k, offset=0):
+        """
+        Liefert die wichtigsten Instrumente ohne die ganze Tabelle zu sortieren.
+
+        Die Auswahl läuft über einen Heap der Größe offset + k (O(n log k)); mit offset
+        lassen sich weitere Seiten derselben Rangfolge abrufen.
+
+        Args:
+            k (int): Anzahl der Instrumente
+            offset (int): Anzahl der bereits gelieferten Instrumente der Rangfolge
+
+        Returns:
+            list: Instrument-Tupel in Rangfolge
+        """
+        if k <= 0 or offset >= self._count:
+            return []
+        indices = heapq.nsmallest(offset + k, range(self._count), key=self.rank_key)
+        return [self[index] for index in indices[offset:]]
+
+    def packed_columns(self):
+        """
+        Liefert die gepackten Spalten für vektorisierte Auswertungen (z.B. numpy.frombuffer).
+
+        Sonderfälle aus der Ausnahme-Tabelle sind nicht enthalten: ISINs, die nicht genau
+        12 ASCII-Zeichen lang sind, stehen als Leerzeichen in den ISIN-Bytes, unbekannte
+        Gewichtungen als Code für "normal".
+
+        Returns:
+            tuple: (ISIN-Bytes mit je 12 Byte pro Instrument, Gewichtungs-Codes als Bytes,
+                nice-Bits, niedrigstes Bit zuerst)
+        """
+        return bytes(self._isins), self._weightings.tobytes(), bytes(self._nice_bits)
+
+    def to_dicts(self):
+        """
+        Wandelt die Tabelle zurück in das Listenformat der API.
+
+        Returns:
+            list: Liste von Dictionaries mit isin, weighting und nice
+        """
+        return [
+            {"isin": instrument.isin, "weighting": instrument.weighting, "nice": instrument.nice}
+            for instrument in self
+        ]
+
+
+class Trend:
+    """
+    Kompakter Trend mit den Feldern, die Suche und Formatierung benötigen.
+
+    Felder, die die API nicht geliefert hat, sind None.
+    """
+
+    __slots__ = ("id", "name", "description", "synonyms", "instruments",
+                 "category", "score", "date", "sources", "weighting")
+
+    def __init__(self, id=None, name=None, description=None, synonyms=(), instruments=None,
+                 category=None, score=None, date=None, sources=(), weighting=None):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.synonyms = tuple(intern_string(synonym) for synonym in synonyms)
+        self.instruments = instruments if instruments is not None else InstrumentTable()
+        self.category = intern_string(category)
+        self.score = score
+        self.date = date
+        self.sources = tuple(sources)
+        self.weighting = intern_string(weighting)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Erzeugt einen Trend aus einem Trend-Objekt der API.
+
+        Args:
+            data (dict): Trend-Objekt aus der Trendlink API
+
+        Returns:
+            Trend: Kompakte Darstellung
+        """
+        sources = tuple(
+            (intern_string(source.get("name", "Unbekannte Quelle")), source.get("url", "#"))
+            for source in data.get("sources") or ()
+        )
+        return cls(
+            id=data.get("id"),
+            name=data.get("name"),
+            description=data.get("description"),
+            synonyms=data.get("synonyms") or (),
+            instruments=InstrumentTable(data.get("instruments") or ()),
+            category=data.get("category"),
+            score=data.get("score"),
+            date=data.get("date"),
+            sources=sources,
+            weighting=data.get("weighting"),
+        )
+
+    def matches(self, search_term_lower, search_pattern):
+        """
+        Prüft, ob der Trend zum Suchbegriff passt (Name, Beschreibung oder Synonyme).
+
+        Args:
+            search_term_lower (str): Suchbegriff in Kleinbuchstaben
+            search_pattern (re.Pattern): Regulärer Ausdruck aus trend_stream.compile_search()
+
+        Returns:
+            bool: True bei einem Treffer
+        """
+        if self.name and search_term_lower in self.name.lower():
+            return True
+        if self.description and search_pattern.search(self.description.lower()):
+            return True
+        return any(search_pattern.search(synonym.lower()) for synonym in self.synonyms)
+
+    def __repr__(self):
+        return f"Trend(id={self.id!r}, name={self.name!r}, instruments={len(self.instruments)})"
+
+
+def as_trend(trend):
+    """
+    Liefert einen Trend in kompakter Darstellung, unabhängig vom Eingabeformat.
+
+    Args:
+        trend (Trend oder dict): Trend-Objekt
+
+    Returns:
+        Trend: Kompakte Darstellung
+    """
+    if isinstance(trend, Trend):
+        return trend
+    return Trend.from_dict(trend)
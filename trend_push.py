@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Trend Push Modul
+
+Verteilt Änderungen der kuratierten Trends per Server-Sent Events (SSE) an
+verbundene Clients. Ein einzelner Poller-Thread pro Prozess fragt
+/v2/trends/curated ab, solange mindestens ein Client verbunden ist, und
+schickt bei Änderungen einen kompakten Diff an alle Abonnenten. Neue Clients
+erhalten zuerst den aktuellen Stand als Snapshot.
+
+Ereignisse:
+    snapshot  {"version": n, "trends": [...]}
+    diff      {"version": n, "added": [...], "changed": [...], "removed": [ids], "order": [ids]}
+
+Zwischen den Ereignissen wird regelmäßig ein SSE-Kommentar als Heartbeat
+gesendet, damit Proxies die Verbindung nicht schließen.
+"""
+
+import os
+import queue
+import logging
+import threading
+
+import json_codec
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Abstand der Abfragen der kuratierten Trends in Sekunden
+PUSH_POLL_INTERVAL = float(os.getenv("PUSH_POLL_INTERVAL", "60"))
+# Abstand der Heartbeats in Sekunden
+PUSH_HEARTBEAT_INTERVAL = float(os.getenv("PUSH_HEARTBEAT_INTERVAL", "15"))
+# Maximale Anzahl gleichzeitig verbundener Clients pro Prozess
+PUSH_MAX_SUBSCRIBERS = int(os.getenv("PUSH_MAX_SUBSCRIBERS", "4"))
+# Anzahl der kuratierten Trends, die verteilt werden
+PUSH_TREND_LIMIT = int(os.getenv("PUSH_TREND_LIMIT", "10"))
+# Wartezeit in Millisekunden, nach der ein Browser die Verbindung neu aufbaut
+PUSH_RETRY_MS = 5000
+# Gepufferte Ereignisse pro Client, bevor er einen neuen Snapshot erhält
+PUSH_QUEUE_SIZE = 16
+
+# Felder, die pro Trend übertragen werden (ohne lange Beschreibungen und Quellen)
+COMPACT_FIELDS = ("id", "name", "category", "score", "date", "weighting")
+
+
+class TooManySubscribers(Exception):
+    """Die maximale Anzahl verbundener Clients ist erreicht."""
+
+
+def compact_trend(trend):
+    """
+    Reduziert einen kuratierten Trend auf die Felder für die Push-Übertragung.
+
+    Args:
+        trend (dict): Trend-Objekt aus /v2/trends/curated
+
+    Returns:
+        dict: Trend mit den Feldern aus COMPACT_FIELDS
+    """
+    return {field: trend[field] for field in COMPACT_FIELDS if field in trend}
+
+
+def diff_trends(old, new):
+    """
+    Berechnet den Unterschied zweier Listen kompakter Trends.
+
+    Args:
+        old (list): Bisheriger Stand
+        new (list): Neuer Stand
+
+    Returns:
+        dict: added, changed, removed und ggf. order - oder None, wenn nichts geändert ist
+    """
+    old_by_id = {trend.get("id"): trend for trend in old}
+    new_ids = [trend.get("id") for trend in new]
+    new_id_set = set(new_ids)
+
+    added = [trend for trend in new if trend.get("id") not in old_by_id]
+    changed = [trend for trend in new
+               if trend.get("id") in old_by_id and old_by_id[trend.get("id")] != trend]
+    removed = [trend_id for trend_id in old_by_id if trend_id not in new_id_set]
+
+    diff = {}
+    if added:
+        diff["added"] = added
+    if changed:
+        diff["changed"] = changed
+    if removed:
+        diff["removed"] = removed
+    if new_ids != [trend.get("id") for trend in old]:
+        diff["order"] = new_ids
+    return diff or None
+
+
+def format_sse(event, data, event_id=None):
+    """
+    Formatiert ein Ereignis im Server-Sent-Events-Format.
+
+    Args:
+        event (str): Name des Ereignisses
+        data (dict): JSON-serialisierbare Nutzdaten
+        event_id (int): Optionale Ereignis-ID
+
+    Returns:
+        str: SSE-Nachricht inklusive abschließender Leerzeile
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json_codec.dumps(data))
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscriber:
+    """Verbundener Client mit eigener, begrenzter Ereignis-Warteschlange."""
+
+    def __init__(self):
+        self.events = queue.Queue(maxsize=PUSH_QUEUE_SIZE)
+
+
+class CuratedTrendBroadcaster:
+    """
+    Fragt die kuratierten Trends ab und verteilt Änderungen an alle Abonnenten.
+
+    Args:
+        fetch (callable): Liefert die aktuelle API-Antwort ({"trends": [...]})
+        poll_interval (float): Abstand der Abfragen in Sekunden
+        max_subscribers (int): Maximale Anzahl verbundener Clients
+    """
+
+    def __init__(self, fetch, poll_interval=PUSH_POLL_INTERVAL, max_subscribers=PUSH_MAX_SUBSCRIBERS):
+        self.fetch = fetch
+        self.poll_interval = poll_interval
+        self.max_subscribers = max_subscribers
+        self.trends = None
+        self.version = 0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.stats = {"polls": 0, "poll_errors": 0, "diffs": 0, "rejected": 0, "resyncs": 0}
+
+    def subscriber_count(self):
+        """Anzahl der aktuell verbundenen Clients."""
+        return len(self._subscribers)
+
+    def subscribe(self):
+        """
+        Meldet einen Client an und startet bei Bedarf den Poller.
+
+        Returns:
+            Subscriber: Neuer Abonnent; der aktuelle Stand liegt bereits als Snapshot in der Warteschlange
+
+        Raises:
+            TooManySubscribers: Wenn bereits max_subscribers Clients verbunden sind
+        """
+        subscriber = Subscriber()
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self.stats["rejected"] += 1
+                raise TooManySubscribers(f"Maximal {self.max_subscribers} verbundene Clients")
+            self._subscribers.add(subscriber)
+            if self.trends is not None:
+                subscriber.events.put_nowait(self._snapshot_event())
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="trend-push", daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Meldet einen Client ab; ohne Clients beendet sich der Poller."""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers:
+                self._wakeup.set()
+
+    def _snapshot_event(self):
+        return format_sse("snapshot", {"version": self.version, "trends": self.trends}, self.version)
+
+    def poll(self):
+        """
+        Fragt die kuratierten Trends einmal ab und verteilt eine Änderung.
+
+        Returns:
+            dict: Der verteilte Diff oder None, wenn sich nichts geändert hat
+        """
+        self.stats["polls"] += 1
+        try:
+            data = self.fetch()
+        except Exception as e:
+            self.stats["poll_errors"] += 1
+            logger.error(f"Abruf der kuratierten Trends für Push fehlgeschlagen: {e}")
+            return None
+        if not isinstance(data, dict):
+            # Leere Antwort: bisherigen Stand behalten statt alle Trends als entfernt zu melden
+            self.stats["poll_errors"] += 1
+            return None
+
+        trends = [compact_trend(trend) for trend in data.get("trends", []) if isinstance(trend, dict)]
+        with self._lock:
+            if self.trends is None:
+                self.trends = trends
+                self.version += 1
+                self._broadcast(self._snapshot_event())
+                return None
+
+            diff = diff_trends(self.trends, trends)
+            if diff is None:
+                return None
+            self.trends = trends
+            self.version += 1
+            self.stats["diffs"] += 1
+            self._broadcast(format_sse("diff", {"version": self.version, **diff}, self.version))
+        logger.info(f"Kuratierte Trends geändert (Version {self.version}), "
+                    f"an {len(self._subscribers)} Clients verteilt")
+        return diff
+
+    def _broadcast(self, message):
+        """Stellt eine Nachricht allen Abonnenten zu (Aufrufer hält den Lock)."""
+        for subscriber in self._subscribers:
+            try:
+                subscriber.events.put_nowait(message)
+            except queue.Full:
+                # Zu langsamer Client: Rückstand verwerfen und mit einem Snapshot neu aufsetzen
+                self.stats["resyncs"] += 1
+                while not subscriber.events.empty():
+                    try:
+                        subscriber.events.get_nowait()
+                    except queue.Empty:
+                        break
+                subscriber.events.put_nowait(self._snapshot_event())
+
+    def _run(self):
+        """Poller-Schleife; läuft, solange Clients verbunden sind."""
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    self._wakeup.clear()
+                    return
+            self.poll()
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def stream(self, subscriber, heartbeat_interval=PUSH_HEARTBEAT_INTERVAL):
+        """
+        Liefert die SSE-Nachrichten für einen Client inklusive Heartbeats.
+
+        Der Client wird abgemeldet, sobald der Generator geschlossen wird.
+
+        Yields:
+            str: SSE-Nachricht oder Heartbeat-Kommentar
+        """
+        try:
+            # Wartezeit des Browsers vor einem erneuten Verbindungsaufbau
+            yield f"retry: {PUSH_RETRY_MS}\n\n"
+            while True:
+                try:
+                    yield subscriber.events.get(timeout=heartbeat_interval)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def snapshot(self):
+        """
+        Liefert Kennzahlen des Broadcasters für Diagnosezwecke.
+
+        Returns:
+            dict: Anzahl Clients, aktuelle Version und Zähler
+        """
+        return {
+            "subscribers": self.subscriber_count(),
+            "max_subscribers": self.max_subscribers,
+            "version": self.version,
+            **self.stats,
+        }
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Trend Stream Modul
+
+Dieses Modul liest den Trend-Katalog der Trendlink API (`/v2/trends`) inkrementell
+aus dem Antwort-Stream. Statt das gesamte JSON-Array auf einmal zu parsen, wird
+jeweils nur ein Trend dekodiert, auf die für die Suche benötigten Felder reduziert
+und wieder freigegeben. Bei der Suche nach einem einzelnen Trend kann das Lesen
+abgebrochen werden, sobald ein Treffer gefunden wurde.
+"""
+
+import re
+import json
+import codecs
+import logging
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Felder eines Trends, die für Suche und Formatierung benötigt werden
+INDEX_FIELDS = ("id", "name", "description", "synonyms", "instruments")
+
+# Standardgröße der gelesenen Blöcke in Bytes
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Ab dieser Anzahl bereits verarbeiteter Zeichen wird der Puffer gekürzt
+_BUFFER_TRIM_THRESHOLD = 64 * 1024
+
+_WHITESPACE = re.compile(r'[\s,]*')
+
+
+class EmptyStreamError(ValueError):
+    """Wird ausgelöst, wenn der Stream keinerlei Daten enthält."""
+
+
+def iter_json_array(chunks, with_source=False):
+    """
+    Liefert die Elemente eines JSON-Arrays einzeln, während die Daten eintreffen.
+
+    Args:
+        chunks (iterable): Iterierbare Folge von Bytes-Blöcken (z.B. response.iter_content())
+        with_source (bool): Zusätzlich den JSON-Quelltext jedes Elements liefern
+
+    Yields:
+        object: Das jeweils nächste dekodierte Array-Element bzw. (element, quelltext)
+
+    Raises:
+        EmptyStreamError: Wenn der Stream leer ist
+        ValueError: Wenn die Daten kein gültiges JSON-Array sind
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunk_iter = iter(chunks)
+    buffer = ""
+    pos = 0
+    exhausted = False
+    started = False
+
+    def read_more():
+        nonlocal buffer, exhausted
+        for chunk in chunk_iter:
+            if chunk:
+                buffer += utf8.decode(chunk)
+                return True
+        buffer += utf8.decode(b"", final=True)
+        exhausted = True
+        return False
+
+    while True:
+        # Trennzeichen und Leerraum überspringen
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos >= len(buffer):
+            if exhausted:
+                if not started:
+                    raise EmptyStreamError("Leere Antwort erhalten")
+                raise ValueError("Unerwartetes Ende der JSON-Daten")
+            read_more()
+            continue
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Die Antwort ist kein JSON-Array")
+            started = True
+            pos += 1
+            continue
+
+        if buffer[pos] == "]":
+            return
+
+        try:
+            element, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if exhausted:
+                raise ValueError("Ungültiges JSON-Element im Trend-Katalog")
+            read_more()
+            continue
+
+        # Ein Element am Pufferende könnte unvollständig sein (z.B. eine Zahl)
+        if end >= len(buffer) and not exhausted:
+            read_more()
+            continue
+
+        source = buffer[pos:end] if with_source else None
+        pos = end
+        if pos > _BUFFER_TRIM_THRESHOLD:
+            buffer = buffer[pos:]
+            pos = 0
+
+        yield (element, source) if with_source else element
+
+
+def project_trend(trend):
+    """
+    Reduziert einen Trend auf die Felder, die für Suche und Formatierung benötigt werden.
+
+    Args:
+        trend (dict): Vollständiges Trend-Objekt aus der API
+
+    Returns:
+        dict: Trend mit den Feldern aus INDEX_FIELDS
+    """
+    return {field: trend[field] for field in INDEX_FIELDS if field in trend}
+
+
+def iter_trends(chunks, with_source=False):
+    """
+    Liefert die Trends des Katalogs einzeln und auf die Index-Felder reduziert.
+
+    Args:
+        chunks (iterable): Iterierbare Folge von Bytes-Blöcken
+        with_source (bool): Zusätzlich den JSON-Quelltext jedes Trends liefern
+
+    Yields:
+        dict: Reduziertes Trend-Objekt bzw. (trend, quelltext)
+    """
+    if not with_source:
+        for element in iter_json_array(chunks):
+            if isinstance(element, dict):
+                yield project_trend(element)
+        return
+
+    for element, source in iter_json_array(chunks, with_source=True):
+        if isinstance(element, dict):
+            yield project_trend(element), source
+
+
+def compile_search(trend_name):
+    """
+    Bereitet die Suche nach einem Trendnamen vor.
+
+    Args:
+        trend_name (str): Name des Trends oder Suchbegriff (z.B. "Elektroautos")
+
+    Returns:
+        tuple: (suchbegriff_klein, regulärer_ausdruck)
+    """
+    search_term_lower = trend_name.lower()
+    # Regulärer Ausdruck für flexiblere Suche (ignoriert Pluralformen, etc.)
+    search_pattern = re.compile(r'\b' + re.escape(search_term_lower) + r'[a-zäöüß]*\b')
+    return search_term_lower, search_pattern
+
+
+def trend_matches(trend, search_term_lower, search_pattern):
+    """
+    Prüft, ob ein Trend zum Suchbegriff passt (Name, Beschreibung oder Synonyme).
+
+    Args:
+        trend (dict): Trend-Objekt
+        search_term_lower (str): Suchbegriff in Kleinbuchstaben
+        search_pattern (re.Pattern): Regulärer Ausdruck aus compile_search()
+
+    Returns:
+        bool: True bei einem Treffer
+    """
+    # Prüfe Namen
+    if search_term_lower in trend.get('name', '').lower():
+        return True
+
+    # Prüfe Beschreibung
+    if 'description' in trend and search_pattern.search(trend.get('description', '').lower()):
+        return True
+
+    # Prüfe Synonyme
+    for synonym in trend.get('synonyms', []):
+        if search_pattern.search(synonym.lower()):
+            return True
+
+    return False
+
+
+def find_trend(chunks, trend_name):
+    """
+    Sucht einen Trend im Katalog-Stream und bricht beim ersten Treffer ab.
+
+    Args:
+        chunks (iterable): Iterierbare Folge von Bytes-Blöcken
+        trend_name (str): Name des Trends oder Suchbegriff
+
+    Returns:
+        tuple: (gefundener_trend oder None, anzahl_geprüfter_trends)
+    """
+    search_term_lower, search_pattern = compile_search(trend_name)
+    scanned = 0
+    for trend in iter_trends(chunks):
+        scanned += 1
+        if trend_matches(trend, search_term_lower, search_pattern):
+            return trend, scanned
+    return None, scanned
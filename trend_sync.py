@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Trend Sync Modul
+
+Hält den In-Memory-Katalog (trend_catalogue) aktuell, ohne ihn bei jeder
+Aktualisierung neu aufzubauen. Für jeden Trend wird ein Hash seines Inhalts
+gespeichert; beim Abgleich werden nur neue und geänderte Trends in
+trend_model.Trend-Objekte umgewandelt und eingespielt, fehlende Trends werden
+entfernt.
+
+Der Hash wird über den JSON-Quelltext jedes Trends aus dem Stream berechnet, so dass
+unveränderte Trends weder neu serialisiert noch in Objekte umgewandelt werden.
+
+Die Trendlink API (v2.5) bietet keinen Parameter für "seit Zeitpunkt X geändert",
+daher wird standardmäßig der Katalog gestreamt und per Hash verglichen. Unterstützt
+eine spätere API-Version einen solchen Parameter, kann er über
+TRENDLINK_SYNC_SINCE_PARAM eingetragen werden. Dann werden nur geänderte Trends
+übertragen; gelöschte Trends erkennt nur der vollständige Abgleich, der deshalb
+weiterhin alle TRENDLINK_SYNC_FULL_EVERY Durchläufe erfolgt.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from trend_model import Trend
+from trend_stream import iter_trends, DEFAULT_CHUNK_SIZE
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Abstand der Hintergrund-Abgleiche in Sekunden (0 = kein Hintergrund-Abgleich);
+# kleiner als TRENDLINK_CATALOGUE_MAX_AGE, damit der Katalog im Betrieb nicht veraltet
+TRENDLINK_SYNC_INTERVAL = float(os.getenv("TRENDLINK_SYNC_INTERVAL", "900"))
+# Name des Query-Parameters für inkrementelle Abfragen (leer = nicht unterstützt)
+TRENDLINK_SYNC_SINCE_PARAM = os.getenv("TRENDLINK_SYNC_SINCE_PARAM", "")
+# Jeder n-te Abgleich ist vollständig, um gelöschte Trends zu erkennen
+TRENDLINK_SYNC_FULL_EVERY = int(os.getenv("TRENDLINK_SYNC_FULL_EVERY", "12"))
+
+SyncResult = namedtuple("SyncResult", ["mode", "scanned", "added", "changed", "removed", "duration"])
+
+
+def content_hash(source):
+    """
+    Berechnet einen Hash über den Inhalt eines Trends.
+
+    Args:
+        source (str): JSON-Quelltext des Trends aus dem Antwort-Stream
+
+    Returns:
+        bytes: 16-Byte-Digest
+    """
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).digest()
+
+
+class TrendSync:
+    """
+    Gleicht den Trend-Katalog mit der API ab und spielt nur Änderungen ein.
+
+    Args:
+        catalogue (TrendCatalogue): Zu pflegender Katalog
+        open_stream (callable): Öffnet /v2/trends mit zusätzlichen Query-Parametern und
+            liefert eine Antwort mit iter_content() und close()
+        since_param (str): Query-Parameter für inkrementelle Abfragen oder leer
+        full_every (int): Jeder n-te Abgleich ist vollständig
+    """
+
+    def __init__(self, catalogue, open_stream, since_param=None, full_every=None):
+        self.catalogue = catalogue
+        self.open_stream = open_stream
+        self.since_param = TRENDLINK_SYNC_SINCE_PARAM if since_param is None else since_param
+        self.full_every = max(1, TRENDLINK_SYNC_FULL_EVERY if full_every is None else full_every)
+        self.last_result = None
+        self.last_synced_at = None
+        self._hashes = {}
+        self._runs = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+
+    def _read(self, params):
+        """
+        Liest den Katalog-Stream mit den angegebenen Parametern.
+
+        Liefert die Trends einzeln als (Trend-Dictionary, JSON-Quelltext), damit nie der
+        ganze Katalog als Dictionaries im Speicher liegt.
+        """
+        response = self.open_stream(params)
+        try:
+            yield from iter_trends(response.iter_content(chunk_size=DEFAULT_CHUNK_SIZE), with_source=True)
+        finally:
+            response.close()
+
+    def sync(self, full=False, max_age=None):
+        """
+        Führt einen Abgleich durch.
+
+        Ist der Katalog noch nicht geladen, wird er vollständig geladen. Andernfalls
+        werden nur neue und geänderte Trends eingespielt.
+
+        Args:
+            full (bool): Vollständigen Abgleich erzwingen, auch wenn inkrementell möglich wäre
+            max_age (float): Falls angegeben, wird nach Erhalt der Sperre erneut geprüft und
+                nicht abgeglichen, wenn der Katalog inzwischen aktuell ist. Gleichzeitige
+                Anfragen mit veraltetem Katalog lösen so nur einen Abgleich aus.
+
+        Returns:
+            SyncResult: Art des Abgleichs und Anzahl der Änderungen oder None, wenn der
+            Katalog bereits aktuell war
+        """
+        with self._lock:
+            if max_age is not None and self.catalogue.is_fresh(max_age):
+                return None
+            start = time.perf_counter()
+            started_at = datetime.now(timezone.utc)
+
+            if not self.catalogue.is_loaded():
+                result = self._load(start)
+            elif (not full and self.since_param and self.last_synced_at is not None
+                    and self._runs % self.full_every != 0):
+                result = self._sync_since(start)
+            else:
+                result = self._sync_full(start)
+
+            self._runs += 1
+            self.last_synced_at = started_at
+            self.last_result = result
+            self.catalogue.touch()
+
+        logger.info(
+            f"Trend-Abgleich ({result.mode}): {result.scanned} geprüft, {result.added} neu, "
+            f"{result.changed} geändert, {result.removed} entfernt in {result.duration * 1000:.0f} ms"
+        )
+        return result
+
+    def _load(self, start):
+        hashes = {}
+        scanned = 0
+
+        def convert():
+            nonlocal scanned
+            for trend, source in self._read({}):
+                scanned += 1
+                if trend.get("id") is not None:
+                    hashes[trend.get("id")] = content_hash(source)
+                yield Trend.from_dict(trend)
+
+        self.catalogue.load(convert())
+        self._hashes = hashes
+        return SyncResult("load", scanned, scanned, 0, 0, time.perf_counter() - start)
+
+    def _diff(self, trends, seen=None):
+        """
+        Ermittelt neue und geänderte Trends und aktualisiert die gespeicherten Hashes.
+
+        Args:
+            trends (iterable): (Trend-Dictionary, JSON-Quelltext) aus _read()
+            seen (set): Nimmt die IDs aller gelesenen Trends auf, falls angegeben
+
+        Returns:
+            tuple: (Anzahl gelesen, neu, geändert)
+        """
+        upserts = []
+        # Hashes erst nach dem Einspielen übernehmen: bricht der Stream ab, bleiben sie unverändert
+        digests = {}
+        added = 0
+        scanned = 0
+        for trend, source in trends:
+            scanned += 1
+            trend_id = trend.get("id")
+            if seen is not None:
+                seen.add(trend_id)
+            if trend_id is None:
+                continue
+            digest = content_hash(source)
+            previous = digests.get(trend_id, self._hashes.get(trend_id))
+            if previous == digest:
+                continue
+            if previous is None:
+                added += 1
+            digests[trend_id] = digest
+            upserts.append(Trend.from_dict(trend))
+        self.catalogue.upsert(upserts)
+        self._hashes.update(digests)
+        return scanned, added, len(upserts) - added
+
+    def _sync_full(self, start):
+        seen = set()
+        scanned, added, changed = self._diff(self._read({}), seen)
+
+        missing = [trend_id for trend_id in self._hashes if trend_id not in seen]
+        for trend_id in missing:
+            del self._hashes[trend_id]
+        removed = self.catalogue.remove(missing)
+
+        return SyncResult("full", scanned, added, changed, removed, time.perf_counter() - start)
+
+    def _sync_since(self, start):
+        scanned, added, changed = self._diff(self._read({self.since_param: self.last_synced_at.isoformat()}))
+        return SyncResult("since", scanned, added, changed, 0, time.perf_counter() - start)
+
+    def refresh_in_background(self, max_age):
+        """
+        Startet einen einzelnen Abgleich im Hintergrund, falls nicht schon einer läuft.
+
+        Args:
+            max_age (float): Maximales Alter, ab dem abgeglichen wird (siehe sync())
+
+        Returns:
+            bool: True, wenn ein Abgleich gestartet wurde
+        """
+        with self._refresh_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+
+            def run():
+                try:
+                    self.sync(max_age=max_age)
+                except Exception as e:
+                    logger.error(f"Trend-Abgleich im Hintergrund fehlgeschlagen: {e}")
+
+            self._refresh_thread = threading.Thread(target=run, name="trend-refresh", daemon=True)
+            self._refresh_thread.start()
+            return True
+
+    def stats(self):
+        """
+        Liefert Kennzahlen des Abgleichs für Diagnosezwecke.
+
+        Returns:
+            dict: Anzahl gespeicherter Inhalts-Hashes, Läufe und letzter Abgleich
+        """
+        return {
+            "tracked_trends": len(self._hashes),
+            "runs": self._runs,
+            "last_synced_at": self.last_synced_at.isoformat() if self.last_synced_at else None,
+        }
+
+    def start(self, interval=None):
+        """
+        Startet den Abgleich in einem Hintergrund-Thread.
+
+        Args:
+            interval (float): Abstand in Sekunden (Standard: TRENDLINK_SYNC_INTERVAL)
+
+        Returns:
+            bool: True, wenn ein Thread gestartet wurde
+        """
+        interval = TRENDLINK_SYNC_INTERVAL if interval is None else interval
+        if interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return False
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sync()
+                except Exception as e:
+                    logger.error(f"Trend-Abgleich fehlgeschlagen: {e}")
+
+        self._thread = threading.Thread(target=run, name="trend-sync", daemon=True)
+        self._thread.start()
+        logger.info(f"Hintergrund-Abgleich des Trend-Katalogs alle {interval:.0f} s gestartet")
+        return True
@@ -7,15 +7,51 @@ Es ermöglicht die einfache Integration von Trendlink-Daten in andere Anwendunge
 """
 
 import os
+import json
+import time
+import base64
+import binascii
 import requests
 from datetime import datetime
 import logging
-import re
+
+from trend_model import as_trend
+from trend_stream import find_trend, EmptyStreamError, INDEX_FIELDS, DEFAULT_CHUNK_SIZE
+from trend_catalogue import get_catalogue
+from instrument_index import ISIN, WKN, wkn_from_isin
+from trend_sync import TrendSync
+from last_known_good import NoData
+from latency import get_tracker
+from deadline import upstream_timeout
+from upstream_http import get_session
+import tracing
+import json_codec
 
 # Logger konfigurieren
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximales Alter des In-Memory-Katalogs in Sekunden, bevor wieder live gesucht wird
+TRENDLINK_CATALOGUE_MAX_AGE = float(os.getenv("TRENDLINK_CATALOGUE_MAX_AGE", "3600"))
+
+# Obergrenzen der Timeouts in Sekunden; innerhalb einer Anfrage werden sie durch die
+# beobachteten Latenzen und die verbleibende Frist weiter verkürzt (siehe deadline)
+TRENDLINK_TIMEOUT = float(os.getenv("TRENDLINK_TIMEOUT", "10"))
+TRENDLINK_VALIDATE_TIMEOUT = 5
+
+# Anzahl der Instrumente pro Trend, die in den Prompt übernommen werden
+TRENDLINK_NICE_TOP = int(os.getenv("TRENDLINK_NICE_TOP", "5"))
+# Mit nice5=true liefert die API höchstens so viele Instrumente pro Trend
+NICE5_LIMIT = 5
+# Größte Seitengröße bei der seitenweisen Abfrage von Instrumenten
+TRENDLINK_INSTRUMENT_PAGE_MAX = 50
+# Maximale Anzahl Trends pro Instrument, die in den Prompt übernommen werden
+TRENDLINK_INSTRUMENT_TRENDS_TOP = int(os.getenv("TRENDLINK_INSTRUMENT_TRENDS_TOP", "15"))
+
+# Namen der Latenz-Tracker pro Endpunkt
+CURATED_ENDPOINT = "trendlink.curated"
+TRENDS_ENDPOINT = "trendlink.trends"
+
 def get_curated_trends(limit=5):
     """
     Ruft die neuesten kuratierten Trends von der Trendlink API ab.
@@ -26,6 +62,26 @@ def get_curated_trends(limit=5):
     Returns:
         str: Formatierter String mit den Trend-Informationen
         
+    Raises:
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    trend_data = fetch_curated_trends(limit)
+    if trend_data is None:
+        return NoData("Keine Daten von der API erhalten")
+    
+    # Formatieren der Daten
+    return format_trend_data(trend_data)
+
+def fetch_curated_trends(limit=5):
+    """
+    Ruft die neuesten kuratierten Trends von der Trendlink API als JSON ab.
+    
+    Args:
+        limit (int): Anzahl der abzurufenden Trends (Standard: 5)
+        
+    Returns:
+        dict: JSON-Antwort der API oder None bei leerer Antwort
+        
     Raises:
         Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
     """
@@ -60,12 +116,21 @@ def get_curated_trends(limit=5):
         
         # API-Anfrage senden - wichtig: params wird separat übergeben, nicht in der URL
         logger.info(f"Sende Anfrage mit Parametern: {params}")
-        response = requests.get(
-            url=api_url,
-            headers=headers,
-            params=params,
-            timeout=10
-        )
+        timeout = upstream_timeout(CURATED_ENDPOINT, TRENDLINK_TIMEOUT)
+        start = time.monotonic()
+        with tracing.span("trendlink GET /v2/trends/curated", kind=tracing.CLIENT) as span:
+            try:
+                response = get_session().get(
+                    url=api_url,
+                    headers=headers,
+                    params=params,
+                    timeout=timeout
+                )
+            except requests.exceptions.RequestException:
+                get_tracker(CURATED_ENDPOINT).record(time.monotonic() - start, ok=False)
+                raise
+            span.set_attribute("http.status_code", response.status_code)
+        get_tracker(CURATED_ENDPOINT).record(time.monotonic() - start, ok=response.ok)
         
         # Tatsächlich gesendete URL im Log anzeigen
         logger.info(f"Tatsächlich gesendete URL: {response.url}")
@@ -80,13 +145,13 @@ def get_curated_trends(limit=5):
         # Prüfen, ob Antwort vorhanden
         if not response.content:
             logger.warning("Leere Antwort von der API erhalten")
-            return "Keine Daten von der API erhalten"
+            return None
         
         # Antwort-Debug für sehr niedrige Log-Level
         logger.debug(f"Antwort-Inhalt: {response.text[:500]}...")
         
         # JSON-Antwort parsen
-        trend_data = response.json()
+        trend_data = json_codec.loads(response.content)
         
         # Kurze Zusammenfassung der Daten für Debug-Zwecke
         if isinstance(trend_data, dict) and "trends" in trend_data:
@@ -96,8 +161,7 @@ def get_curated_trends(limit=5):
             logger.warning(f"Unerwartetes Antwortformat: {type(trend_data)}")
             logger.warning(f"Antwort-Inhalt: {trend_data}")
         
-        # Formatieren der Daten
-        return format_trend_data(trend_data)
+        return trend_data
         
     except requests.exceptions.RequestException as e:
         error_msg = f"Fehler bei der Trendlink API-Anfrage: {str(e)}"
@@ -109,37 +173,34 @@ def get_curated_trends(limit=5):
         logger.error(error_msg)
         raise Exception(error_msg)
 
-def get_trend_instruments(trend_name, nice_top=5):
+def _open_trends_stream(api_token, extra_params=None):
     """
-    Sucht nach einem Trend mit dem angegebenen Namen und ruft die wichtigsten Instrumente ab.
+    Öffnet den Trend-Katalog (/v2/trends) als Stream.
     
     Args:
-        trend_name (str): Name des Trends oder Suchbegriff (z.B. "Elektroautos")
-        nice_top (int): Anzahl der Top-Instrumente, die abgerufen werden sollen
+        api_token (str): Trendlink API-Token
+        extra_params (dict): Optionale zusätzliche Query-Parameter
         
     Returns:
-        str: Formatierter String mit den Trend-Informationen und Top-Instrumenten
+        requests.Response: Geöffnete Antwort; der Aufrufer muss sie schließen
         
     Raises:
-        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+        requests.exceptions.RequestException: Bei HTTP- oder Verbindungsfehlern
     """
     # API-Endpunkt für Trends
     api_url = "https://api-preview.trendlink.com/v2/trends"
     
-    # API-Token aus Umgebungsvariable holen
-    api_token = os.getenv("TRENDLINK_API_TOKEN")
-    
-    if not api_token:
-        error_msg = "TRENDLINK_API_TOKEN ist nicht in den Umgebungsvariablen definiert"
-        logger.error(error_msg)
-        raise ValueError(error_msg)
-    
     # Abfrageparameter definieren - Token als eigener Parameter
+    # Ohne nice5: vollständige Instrumentlisten, die Top-k-Auswahl erfolgt serverseitig
+    # (InstrumentTable.top); Aufrufer, die nur wenige Instrumente brauchen, setzen nice5
+    # über extra_params
     params = {
         "token": api_token,
-        "nice5": "true",       # Top 5 Instrumente abrufen
-        "lang": "de"           # Deutsche Sprache
+        "lang": "de",          # Deutsche Sprache
+        "field": list(INDEX_FIELDS)  # Nur die für die Suche benötigten Felder übertragen
     }
+    if extra_params:
+        params.update(extra_params)
     
     # Standard-Headers
     headers = {
@@ -147,82 +208,174 @@ def get_trend_instruments(trend_name, nice_top=5):
         "Accept": "application/json"
     }
     
+    # URL mit Parametern für Debugging ausgeben
+    debug_url = f"{api_url}?token={api_token}&lang=de"
+    if extra_params:
+        debug_url += "".join(f"&{key}={value}" for key, value in extra_params.items())
+    logger.info(f"Trendlink API-Anfrage wird vorbereitet: {debug_url}")
+    
+    # API-Anfrage senden - der Katalog wird als Stream gelesen und nicht vollständig geladen
+    logger.info(f"Sende Anfrage mit Parametern: {params}")
+    timeout = upstream_timeout(TRENDS_ENDPOINT, TRENDLINK_TIMEOUT)
+    start = time.monotonic()
+    # Der Span misst die Zeit bis zu den Antwort-Headern; der Stream wird danach gelesen
+    with tracing.span("trendlink GET /v2/trends", kind=tracing.CLIENT,
+                      **{"trendlink.incremental": bool(extra_params)}) as span:
+        try:
+            response = get_session().get(
+                url=api_url,
+                headers=headers,
+                params=params,
+                timeout=timeout,
+                stream=True
+            )
+        except requests.exceptions.RequestException:
+            get_tracker(TRENDS_ENDPOINT).record(time.monotonic() - start, ok=False)
+            raise
+        span.set_attribute("http.status_code", response.status_code)
+    # Gemessen wird die Zeit bis zu den Antwort-Headern; der Stream wird danach gelesen
+    get_tracker(TRENDS_ENDPOINT).record(time.monotonic() - start, ok=response.ok)
+    
     try:
-        # URL mit Parametern für Debugging ausgeben
-        debug_url = f"{api_url}?token={api_token}&nice5=true&lang=de"
-        logger.info(f"Trendlink API-Anfrage wird vorbereitet: {debug_url}")
-        
-        # API-Anfrage senden - wichtig: params wird separat übergeben, nicht in der URL
-        logger.info(f"Sende Anfrage mit Parametern: {params}")
-        response = requests.get(
-            url=api_url,
-            headers=headers,
-            params=params,
-            timeout=10
-        )
-        
         # Tatsächlich gesendete URL im Log anzeigen
         logger.info(f"Tatsächlich gesendete URL: {response.url}")
         logger.info(f"Request-Headers: {response.request.headers}")
         
         # Fehlerbehandlung
         response.raise_for_status()
+    except Exception:
+        response.close()
+        raise
+    
+    logger.info(f"Antwort-Status: {response.status_code}")
+    return response
+
+def _get_api_token():
+    """
+    Liest den API-Token aus der Umgebungsvariable.
+    
+    Raises:
+        ValueError: Wenn TRENDLINK_API_TOKEN nicht gesetzt ist
+    """
+    api_token = os.getenv("TRENDLINK_API_TOKEN")
+    
+    if not api_token:
+        error_msg = "TRENDLINK_API_TOKEN ist nicht in den Umgebungsvariablen definiert"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    
+    return api_token
+
+_trend_sync = None
+
+def get_trend_sync():
+    """
+    Liefert den Abgleich für den prozessweiten Trend-Katalog.
+    
+    Returns:
+        TrendSync: Abgleich, der /v2/trends mit dem konfigurierten Token streamt
+    """
+    global _trend_sync
+    catalogue = get_catalogue()
+    if _trend_sync is None or _trend_sync.catalogue is not catalogue:
+        _trend_sync = TrendSync(
+            catalogue,
+            lambda extra_params: _open_trends_stream(_get_api_token(), extra_params)
+        )
+    return _trend_sync
+
+def sync_trend_catalogue(full=False, max_age=None):
+    """
+    Gleicht den In-Memory-Katalog mit der API ab und spielt nur Änderungen ein.
+    
+    Ist der Katalog noch nicht geladen, wird er vollständig geladen.
+    
+    Args:
+        full (bool): Vollständigen Abgleich erzwingen
+        max_age (float): Nicht abgleichen, wenn der Katalog inzwischen aktuell ist (siehe TrendSync.sync)
         
-        # Statuscode und Antwortgröße protokollieren
-        logger.info(f"Antwort-Status: {response.status_code}, Antwortgröße: {len(response.content)} Bytes")
-        
-        # Prüfen, ob Antwort vorhanden
-        if not response.content:
-            logger.warning("Leere Antwort von der API erhalten")
-            return f"Keine Daten zum Thema '{trend_name}' von der API erhalten"
-        
-        # Antwort-Debug für sehr niedrige Log-Level
-        logger.debug(f"Antwort-Inhalt: {response.text[:500]}...")
-        
-        # JSON-Antwort parsen
-        trends_data = response.json()
-        
-        # Kurze Zusammenfassung der Daten für Debug-Zwecke
-        if isinstance(trends_data, list):
-            trend_count = len(trends_data)
-            logger.info(f"Trends gefunden: {trend_count}")
-        else:
-            logger.warning(f"Unerwartetes Antwortformat: {type(trends_data)}")
-            logger.warning(f"Antwort-Inhalt: {trends_data}")
-        
-        # Suche nach dem angegebenen Trend
-        target_trend = None
-        search_term_lower = trend_name.lower()
-        
-        # Regulärer Ausdruck für flexiblere Suche (ignoriert Pluralformen, etc.)
-        search_pattern = re.compile(r'\b' + re.escape(search_term_lower) + r'[a-zäöüß]*\b')
+    Returns:
+        trend_sync.SyncResult: Art des Abgleichs und Anzahl der Änderungen oder None
         
-        for trend in trends_data:
-            # Prüfe Namen und Synonyme
-            if search_term_lower in trend.get('name', '').lower():
-                target_trend = trend
-                break
-            
-            # Prüfe Beschreibung
-            if 'description' in trend and search_pattern.search(trend.get('description', '').lower()):
-                target_trend = trend
-                break
-                
-            # Prüfe Synonyme
-            for synonym in trend.get('synonyms', []):
-                if search_pattern.search(synonym.lower()):
-                    target_trend = trend
-                    break
-            
-            if target_trend:
-                break
+    Raises:
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    _get_api_token()
+    
+    try:
+        return get_trend_sync().sync(full=full, max_age=max_age)
+    except requests.exceptions.RequestException as e:
+        error_msg = f"Fehler bei der Trendlink API-Anfrage: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+    except (ValueError, KeyError) as e:
+        error_msg = f"Fehler beim Verarbeiten der Trendlink-Daten: {str(e)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+def load_trend_catalogue():
+    """
+    Lädt den Trend-Katalog in den prozessweiten In-Memory-Katalog bzw. gleicht ihn ab,
+    falls er bereits geladen ist.
+    
+    Returns:
+        TrendCatalogue: Der geladene Katalog
         
-        if not target_trend:
-            return f"Leider wurde kein Trend zum Thema '{trend_name}' gefunden."
+    Raises:
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    sync_trend_catalogue(full=True)
+    return get_catalogue()
+
+def find_trend_by_name(trend_name, top=None):
+    """
+    Sucht einen Trend im In-Memory-Katalog oder, falls dieser nicht aktuell ist, im
+    Antwort-Stream der API.
+    
+    Args:
+        trend_name (str): Name des Trends oder Suchbegriff
+        top (int): Anzahl der benötigten Top-Instrumente; bis NICE5_LIMIT fordert die
+            Stream-Suche nur die nice5-Auswahl an, None lädt die vollständige Liste
         
-        # Formatiere den gefundenen Trend und seine Instrumente
-        return format_trend_with_instruments(target_trend)
+    Returns:
+        Trend oder dict: Gefundener Trend oder None
         
+    Raises:
+        EmptyStreamError: Wenn die API eine leere Antwort liefert
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    # API-Token aus Umgebungsvariable holen
+    api_token = _get_api_token()
+    
+    # Geladenen Katalog verwenden, falls vorhanden und aktuell
+    catalogue = get_catalogue()
+    if catalogue.is_fresh(TRENDLINK_CATALOGUE_MAX_AGE):
+        target_trend = catalogue.search(trend_name)
+        logger.info(f"Trend-Suche im In-Memory-Katalog, Treffer: {target_trend is not None}")
+        tracing.current_span().set_attribute("cache.hit", True)
+        return target_trend
+    
+    # Katalog nicht geladen oder veraltet: Suche im Stream der API
+    tracing.current_span().set_attribute("cache.hit", False)
+    try:
+        # Werden nur wenige Instrumente benötigt, kürzt die API die Listen bereits serverseitig
+        extra_params = {"nice5": "true"} if top is not None and top <= NICE5_LIMIT else None
+        response = _open_trends_stream(api_token, extra_params)
+        try:
+            # Inkrementell nach dem angegebenen Trend suchen und beim ersten Treffer abbrechen
+            target_trend, scanned = find_trend(
+                response.iter_content(chunk_size=DEFAULT_CHUNK_SIZE), trend_name
+            )
+        finally:
+            # Verbindung freigeben, auch wenn der Stream nicht vollständig gelesen wurde
+            response.close()
+        
+        logger.info(f"Trends geprüft: {scanned}, Treffer: {target_trend is not None}")
+        return target_trend
+        
+    except EmptyStreamError:
+        raise
+    
     except requests.exceptions.RequestException as e:
         error_msg = f"Fehler bei der Trendlink API-Anfrage: {str(e)}"
         logger.error(error_msg)
@@ -233,18 +386,221 @@ def get_trend_instruments(trend_name, nice_top=5):
         logger.error(error_msg)
         raise Exception(error_msg)
 
-def format_trend_with_instruments(trend):
+def get_trend_instruments(trend_name, nice_top=TRENDLINK_NICE_TOP):
+    """
+    Sucht nach einem Trend mit dem angegebenen Namen und ruft die wichtigsten Instrumente ab.
+    
+    Ist der In-Memory-Katalog geladen und aktuell, wird dort gesucht; andernfalls wird
+    der Katalog der API als Stream durchsucht.
+    
+    Args:
+        trend_name (str): Name des Trends oder Suchbegriff (z.B. "Elektroautos")
+        nice_top (int): Anzahl der Top-Instrumente (nice vor Gewichtung), die übernommen werden
+        
+    Returns:
+        str: Formatierter String mit den Trend-Informationen und Top-Instrumenten
+        
+    Raises:
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    try:
+        target_trend = find_trend_by_name(trend_name, top=nice_top)
+    except EmptyStreamError:
+        logger.warning("Leere Antwort von der API erhalten")
+        return NoData(f"Keine Daten zum Thema '{trend_name}' von der API erhalten")
+    
+    if not target_trend:
+        return NoData(f"Leider wurde kein Trend zum Thema '{trend_name}' gefunden.")
+    
+    # Formatiere den gefundenen Trend und seine Top-Instrumente
+    return format_trend_with_instruments(target_trend, limit=nice_top)
+
+def ensure_fresh_catalogue():
+    """
+    Liefert den In-Memory-Katalog.
+    
+    Ist er älter als TRENDLINK_CATALOGUE_MAX_AGE, wird der geladene Stand ausgeliefert und
+    ein einzelner Abgleich im Hintergrund gestartet. Nur wenn noch nichts geladen ist,
+    wartet die Anfrage auf den Abgleich; gleichzeitige Anfragen teilen sich dabei einen.
+    
+    Returns:
+        TrendCatalogue: Aktueller Katalog
+        
+    Raises:
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    catalogue = get_catalogue()
+    fresh = catalogue.is_fresh(TRENDLINK_CATALOGUE_MAX_AGE)
+    tracing.current_span().set_attribute("cache.hit", fresh)
+    if fresh:
+        return catalogue
+    if catalogue.is_loaded():
+        get_trend_sync().refresh_in_background(TRENDLINK_CATALOGUE_MAX_AGE)
+    else:
+        sync_trend_catalogue(max_age=TRENDLINK_CATALOGUE_MAX_AGE)
+    return catalogue
+
+def find_instrument_trends(kind, value):
+    """
+    Sucht die Trends, die ein Instrument enthalten, im ISIN-Index des Katalogs.
+    
+    Der Index existiert nur im In-Memory-Katalog. Ist dieser noch nicht geladen, wird er
+    zuerst geladen; ein veralteter Katalog wird im Hintergrund abgeglichen.
+    
+    Args:
+        kind (str): instrument_index.ISIN oder instrument_index.WKN
+        value (str): Kennung in Großbuchstaben
+        
+    Returns:
+        tuple: (ISIN oder None, Liste von instrument_index.Membership)
+        
+    Raises:
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    return ensure_fresh_catalogue().find_instrument(kind, value)
+
+def get_instrument_trends(identifier, top=TRENDLINK_INSTRUMENT_TRENDS_TOP):
+    """
+    Liefert die Trends, in denen eine ISIN oder WKN enthalten ist, als lesbaren String.
+    
+    Args:
+        identifier (str): ISIN (z.B. "DE0007164600") oder WKN mit Präfix (z.B. "WKN 716460")
+        top (int): Maximale Anzahl aufgeführter Trends (nice vor Gewichtung)
+        
+    Returns:
+        str: Formatierter String mit Trends, Gewichtung und nice-Flag
+        
+    Raises:
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    kind, value = (WKN, identifier[4:]) if identifier.startswith("WKN ") else (ISIN, identifier)
+    isin, memberships = find_instrument_trends(kind, value)
+    if isin is None:
+        if kind == WKN:
+            return NoData(f"Zur WKN {value} ist kein Instrument in einem Trend der Trendlink-Datenbank enthalten.")
+        return NoData(f"Die ISIN {value} ist in keinem Trend der Trendlink-Datenbank enthalten.")
+    return format_instrument_trends(isin, memberships, limit=top)
+
+def format_instrument_trends(isin, memberships, limit=None):
+    """
+    Formatiert die Trends eines Instruments als lesbaren String.
+    
+    Args:
+        isin (str): ISIN des Instruments
+        memberships (list): instrument_index.Membership in Rangfolge
+        limit (int): Nur die ersten Trends übernehmen; None übernimmt alle
+        
+    Returns:
+        str: Formatierter String
+    """
+    wkn = wkn_from_isin(isin)
+    label = f"ISIN {isin}" + (f" (WKN {wkn})" if wkn else "")
+    formatted_output = f"=== INSTRUMENT: {label} ===\n\n"
+    formatted_output += f"Enthalten in {len(memberships)} Trend(s):\n"
+    
+    shown = memberships[:limit] if limit is not None else memberships
+    for i, membership in enumerate(shown, 1):
+        trend = membership.trend
+        name = trend.name if trend.name is not None else "Unbekannter Trend"
+        nice_marker = "★ " if membership.nice else ""
+        formatted_output += f"{i}. {nice_marker}{name}\n"
+        formatted_output += f"   Gewichtung im Trend: {membership.weighting}\n"
+        if membership.nice:
+            formatted_output += "   Besonders relevantes Instrument des Trends (nice)\n"
+    
+    if len(memberships) > len(shown):
+        formatted_output += f"\n(Top {len(shown)} von {len(memberships)} Trends)\n"
+    return formatted_output
+
+def _encode_cursor(trend, offset):
+    """Kodiert Trend und Position der nächsten Seite als undurchsichtigen Cursor."""
+    raw = json.dumps({"id": trend.id, "name": trend.name, "offset": offset}, ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor):
+    """
+    Liest einen Cursor aus _encode_cursor().
+    
+    Raises:
+        ValueError: Wenn der Cursor ungültig ist
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw.decode("utf-8"))
+        offset = int(data["offset"])
+        name = data["name"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Ungültiger Cursor")
+    if offset < 0 or not isinstance(name, str):
+        raise ValueError("Ungültiger Cursor")
+    return data.get("id"), name, offset
+
+def get_trend_instrument_page(trend_name=None, limit=TRENDLINK_NICE_TOP, cursor=None):
+    """
+    Liefert eine Seite der Instrumente eines Trends in derselben Rangfolge wie im Prompt.
+    
+    Args:
+        trend_name (str): Name des Trends oder Suchbegriff (für die erste Seite)
+        limit (int): Anzahl der Instrumente pro Seite (höchstens TRENDLINK_INSTRUMENT_PAGE_MAX)
+        cursor (str): next_cursor der vorherigen Seite; ersetzt trend_name
+        
+    Returns:
+        dict: trend (id, name), total, instruments und next_cursor (None auf der letzten Seite)
+            oder None, wenn kein Trend gefunden wurde
+        
+    Raises:
+        ValueError: Bei ungültigem Cursor oder ungültiger Seitengröße
+        Exception: Bei Fehlern in der API-Kommunikation oder Datenverarbeitung
+    """
+    if not 1 <= limit <= TRENDLINK_INSTRUMENT_PAGE_MAX:
+        raise ValueError(f"limit muss zwischen 1 und {TRENDLINK_INSTRUMENT_PAGE_MAX} liegen")
+    
+    trend_id, offset = None, 0
+    if cursor:
+        trend_id, trend_name, offset = _decode_cursor(cursor)
+    if not trend_name:
+        raise ValueError("Kein Trend angegeben")
+    
+    try:
+        trend = find_trend_by_name(trend_name)
+    except EmptyStreamError:
+        trend = None
+    if trend is None:
+        return None
+    trend = as_trend(trend)
+    if cursor and trend.id != trend_id:
+        # Der Katalog hat sich seit der vorherigen Seite geändert
+        raise ValueError("Cursor gehört zu einem nicht mehr vorhandenen Trend")
+    
+    total = len(trend.instruments)
+    instruments = trend.instruments.top(limit, offset)
+    next_offset = offset + len(instruments)
+    return {
+        "trend": {"id": trend.id, "name": trend.name},
+        "total": total,
+        "instruments": [
+            {"rank": offset + i, "isin": instrument.isin,
+             "weighting": instrument.weighting, "nice": instrument.nice}
+            for i, instrument in enumerate(instruments, 1)
+        ],
+        "next_cursor": _encode_cursor(trend, next_offset) if next_offset < total else None,
+    }
+
+def format_trend_with_instruments(trend, limit=None):
     """
     Formatiert einen einzelnen Trend mit seinen Instrumenten als lesbaren String.
     
     Args:
-        trend (dict): Trend-Daten aus der Trendlink API
+        trend (Trend oder dict): Trend-Daten aus der Trendlink API
+        limit (int): Nur die wichtigsten Instrumente übernehmen (nice vor Gewichtung);
+            None übernimmt alle in API-Reihenfolge
         
     Returns:
         str: Formatierter String mit den Trend- und Instrument-Informationen
     """
-    name = trend.get('name', 'Unbekannter Trend')
-    description = trend.get('description', 'Keine Beschreibung verfügbar')
+    trend = as_trend(trend)
+    name = trend.name if trend.name is not None else 'Unbekannter Trend'
+    description = trend.description if trend.description is not None else 'Keine Beschreibung verfügbar'
     
     # Formatiere die Ausgabe
     formatted_output = f"=== TREND: {name} ===\n\n"
@@ -253,14 +609,15 @@ def format_trend_with_instruments(trend):
     # Top-Instrumente formatieren
     formatted_output += "=== TOP INSTRUMENTE IM TREND ===\n"
     
-    instruments = trend.get('instruments', [])
-    if not instruments:
+    total = len(trend.instruments)
+    instruments = trend.instruments.top(limit) if limit is not None else trend.instruments
+    if not len(instruments):
         formatted_output += "Keine Instrumente verfügbar für diesen Trend.\n"
     else:
         for i, instrument in enumerate(instruments, 1):
-            isin = instrument.get('isin', 'Unbekannte ISIN')
-            weighting = instrument.get('weighting', 'normal')
-            is_nice = instrument.get('nice', False)
+            isin = instrument.isin if instrument.isin is not None else 'Unbekannte ISIN'
+            weighting = instrument.weighting
+            is_nice = instrument.nice
             
             # Speichere den Namen des Instruments (müsste in einer realen Anwendung aus 
             # einer anderen API-Anfrage kommen oder aus einer lokalen Datenbank)
@@ -275,6 +632,9 @@ def format_trend_with_instruments(trend):
             
             if i < len(instruments):
                 formatted_output += "\n"
+        
+        if total > len(instruments):
+            formatted_output += f"\n(Top {len(instruments)} von {total} Instrumenten im Trend)\n"
     
     return formatted_output
 
@@ -283,19 +643,18 @@ def format_trend_data(trend_data):
     Formatiert die Trendlink API-Antwort als lesbaren String.
     
     Args:
-        trend_data (dict): JSON-Antwort von der Trendlink API
+        trend_data (dict): JSON-Antwort von der Trendlink API; die Einträge unter "trends"
+            können Dictionaries oder kompakte Trend-Objekte sein
         
     Returns:
         str: Formatierter String mit den Trend-Informationen
     """
     # Prüfen, ob Daten vorhanden sind
     if not trend_data or "trends" not in trend_data or not trend_data["trends"]:
-        return "Keine Trend-Daten verfügbar"
-    
-    trends = trend_data.get("trends", [])
+        return NoData("Keine Trend-Daten verfügbar")
     
     # Limitiere auf Top 5 Trends
-    trends = trends[:5]
+    trends = [as_trend(trend) for trend in trend_data.get("trends", [])[:5]]
     
     # Überschrift
     formatted_output = "=== AKTUELLE KURATIERTE TRENDS ===\n\n"
@@ -303,22 +662,22 @@ def format_trend_data(trend_data):
     # Jeden Trend formatieren
     for i, trend in enumerate(trends, 1):
         # Basisdaten
-        name = trend.get("name", "Unbekannter Trend")
-        score = trend.get("score", "N/A")
-        category = trend.get("category", "Allgemein")
+        name = trend.name if trend.name is not None else "Unbekannter Trend"
+        score = trend.score if trend.score is not None else "N/A"
+        category = trend.category if trend.category is not None else "Allgemein"
         
         # Datum formatieren, falls vorhanden
-        if "date" in trend and trend["date"]:
+        if trend.date:
             try:
-                date_obj = datetime.fromisoformat(trend["date"].replace("Z", "+00:00"))
+                date_obj = datetime.fromisoformat(trend.date.replace("Z", "+00:00"))
                 date_str = date_obj.strftime("%d.%m.%Y")
-            except (ValueError, TypeError):
-                date_str = trend.get("date", "Unbekanntes Datum")
+            except (ValueError, TypeError, AttributeError):
+                date_str = trend.date
         else:
             date_str = "Unbekanntes Datum"
         
         # Beschreibung
-        description = trend.get("description", "Keine Beschreibung verfügbar")
+        description = trend.description if trend.description is not None else "Keine Beschreibung verfügbar"
         
         # Trend-Eintrag formatieren
         formatted_output += f"{i}. {name} ({category})\n"
@@ -329,11 +688,9 @@ def format_trend_data(trend_data):
         formatted_output += f"   Beschreibung: {description}\n"
         
         # Quellen, falls vorhanden
-        if "sources" in trend and trend["sources"]:
+        if trend.sources:
             formatted_output += "   Quellen:\n"
-            for source in trend["sources"][:3]:  # Maximal 3 Quellen anzeigen
-                source_name = source.get("name", "Unbekannte Quelle")
-                source_url = source.get("url", "#")
+            for source_name, source_url in trend.sources[:3]:  # Maximal 3 Quellen anzeigen
                 formatted_output += f"   - {source_name}: {source_url}\n"
         
         # Trennlinie zwischen Trends
@@ -361,7 +718,7 @@ def validate_api_token():
     
     try:
         logger.info(f"Führe Test-Anfrage durch: {api_url} mit token={api_token}")
-        response = requests.get(url=api_url, params=params, timeout=5)
+        response = get_session().get(url=api_url, params=params, timeout=TRENDLINK_VALIDATE_TIMEOUT)
         
         logger.info(f"Test-Anfrage URL: {response.url}")
         logger.info(f"Test-Anfrage Status: {response.status_code}")
@@ -374,6 +731,39 @@ def validate_api_token():
     except Exception as e:
         return f"API-Token-Test fehlgeschlagen mit Fehler: {str(e)}"
 
+def probe_upstream(timeout=TRENDLINK_VALIDATE_TIMEOUT):
+    """
+    Prüft mit einer minimalen Anfrage (ein kuratierter Trend), ob die Trendlink API
+    über den Verbindungspool erreichbar ist. Für die Readiness-Prüfung.
+
+    Args:
+        timeout (float): Timeout der Anfrage in Sekunden
+
+    Returns:
+        dict: ok, status_code, latency_ms und gegebenenfalls error
+    """
+    try:
+        params = {"token": _get_api_token(), "limit": 1}
+    except ValueError as e:
+        return {"ok": False, "status_code": None, "latency_ms": None, "error": str(e)}
+
+    start = time.monotonic()
+    try:
+        response = get_session().get(
+            url="https://api-preview.trendlink.com/v2/trends/curated",
+            params=params,
+            timeout=timeout
+        )
+    except requests.exceptions.RequestException as e:
+        return {"ok": False, "status_code": None,
+                "latency_ms": round((time.monotonic() - start) * 1000, 1),
+                "error": type(e).__name__}
+    result = {"ok": response.ok, "status_code": response.status_code,
+              "latency_ms": round((time.monotonic() - start) * 1000, 1)}
+    if not response.ok:
+        result["error"] = f"HTTP {response.status_code}"
+    return result
+
 if __name__ == "__main__":
     """
     Wenn das Skript direkt ausgeführt wird, die kuratierten Trends abrufen und ausgeben.
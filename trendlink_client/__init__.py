@@ -0,0 +1,27 @@
+"""
+Python-Client für die API des Trendlink AI Chatbots.
+
+    from trendlink_client import ChatClient
+
+    with ChatClient("http://localhost:5000") as client:
+        antworten = client.chat_many(["Was ist der Trend KI?", "Wie hoch ist die Inflation?"])
+
+Enthält einen synchronen (ChatClient) und einen asynchronen Client (AsyncChatClient)
+mit Verbindungspool, begrenzter Parallelität, Wiederholung bei 429/5xx unter Beachtung
+von Retry-After, Job-Modus mit Long-Poll und Abo der Server-Sent Events.
+"""
+
+from trendlink_client._base import TrendlinkClientError, JobTimeout
+from trendlink_client._retry import RetryPolicy
+from trendlink_client._sse import Event
+from trendlink_client.sync_client import ChatClient
+from trendlink_client.async_client import AsyncChatClient
+
+__all__ = [
+    "ChatClient",
+    "AsyncChatClient",
+    "TrendlinkClientError",
+    "JobTimeout",
+    "RetryPolicy",
+    "Event",
+]
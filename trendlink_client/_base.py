@@ -0,0 +1,105 @@
+"""
+Gemeinsame Bausteine des synchronen und des asynchronen Clients.
+"""
+
+import httpx
+
+from trendlink_client._retry import RetryPolicy
+
+DEFAULT_BASE_URL = "http://localhost:5000"
+JOB_TERMINAL_STATES = ("done", "failed")
+
+
+class TrendlinkClientError(Exception):
+    """
+    Der Server hat mit einem Fehlerstatus geantwortet (nach allen Wiederholungen).
+
+    Attributes:
+        status_code (int): HTTP-Statuscode
+        body: Dekodierter JSON-Body oder Rohtext der Antwort
+    """
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.body = body
+        message = body.get("error") if isinstance(body, dict) else body
+        super().__init__(f"HTTP {status_code}: {message}")
+
+
+class JobTimeout(Exception):
+    """Ein Chat-Job war innerhalb der angegebenen Zeit nicht abgeschlossen."""
+
+
+def decode_body(response):
+    """Liefert den JSON-Body einer Antwort oder ihren Text, wenn er kein JSON ist."""
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def raise_for_status(response):
+    """
+    Wirft TrendlinkClientError bei Statuscodes ab 400.
+
+    Raises:
+        TrendlinkClientError: Bei einem Fehlerstatus
+    """
+    if response.status_code >= 400:
+        raise TrendlinkClientError(response.status_code, decode_body(response))
+
+
+class ClientConfig:
+    """
+    Einstellungen, die beide Clients teilen.
+
+    Args:
+        base_url (str): Basis-URL des Chatbots, z.B. "https://trendlink-bot.onrender.com"
+        api_key (str): Optionaler API-Key (Header X-API-Key, bestimmt Fairness und Priorität
+            der Admission Control)
+        timeout (float): Timeout pro HTTP-Anfrage in Sekunden
+        max_retries (int): Wiederholungen bei 429, 5xx und Verbindungsfehlern
+        backoff (float): Basis der exponentiellen Wartezeit in Sekunden
+        max_backoff (float): Obergrenze der exponentiellen Wartezeit
+        max_connections (int): Größe des Verbindungspools
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, api_key=None, timeout=30.0, max_retries=3,
+                 backoff=0.5, max_backoff=30.0, max_connections=10):
+        self.base_url = base_url.rstrip("/")
+        self.headers = {"Accept": "application/json"}
+        if api_key:
+            self.headers["X-API-Key"] = api_key
+        self.timeout = timeout
+        self.retry = RetryPolicy(max_retries=max_retries, backoff=backoff, max_backoff=max_backoff)
+        self.max_connections = max_connections
+
+    def client_options(self, transport=None):
+        """Argumente für httpx.Client bzw. httpx.AsyncClient."""
+        options = {
+            "base_url": self.base_url,
+            "headers": self.headers,
+            "timeout": self.timeout,
+            "limits": httpx.Limits(max_connections=self.max_connections,
+                                   max_keepalive_connections=self.max_connections),
+        }
+        if transport is not None:
+            options["transport"] = transport
+        return options
+
+
+def job_payload(message):
+    """Body für POST /chat im Job-Modus."""
+    return {"message": message, "async": True}
+
+
+def job_result(record):
+    """
+    Wandelt einen abgeschlossenen Job in das Ergebnis von /chat um.
+
+    Raises:
+        TrendlinkClientError: Wenn der Job mit einem Fehlerstatus beendet wurde
+    """
+    if record.get("status_code", 200) >= 400:
+        raise TrendlinkClientError(record["status_code"], record.get("result"))
+    return record["result"]
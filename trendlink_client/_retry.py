@@ -0,0 +1,81 @@
+"""
+Wiederholungsstrategie für den Trendlink-Chatbot-Client.
+
+Wiederholt werden 429 und 5xx sowie Verbindungs- und Timeout-Fehler. Liefert der
+Server einen Retry-After-Header, wird genau so lange gewartet; sonst exponentiell
+mit vollem Jitter.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value, now=None):
+    """
+    Liest einen Retry-After-Header (Sekunden oder HTTP-Datum).
+
+    Args:
+        value (str): Wert des Headers
+        now (float): Aktueller Unix-Zeitpunkt, vor allem für Tests
+
+    Returns:
+        float: Wartezeit in Sekunden oder None, wenn der Wert fehlt oder ungültig ist
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - (time.time() if now is None else now))
+
+
+class RetryPolicy:
+    """
+    Entscheidet, ob und wie lange vor einem erneuten Versuch gewartet wird.
+
+    Args:
+        max_retries (int): Maximale Anzahl Wiederholungen pro Anfrage
+        backoff (float): Basis der exponentiellen Wartezeit in Sekunden
+        max_backoff (float): Obergrenze der exponentiellen Wartezeit
+        max_retry_after (float): Längste Wartezeit, die ein Retry-After-Header auslösen darf;
+            verlangt der Server mehr, wird nicht wiederholt
+    """
+
+    def __init__(self, max_retries=3, backoff=0.5, max_backoff=30.0, max_retry_after=120.0):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+    def should_retry_status(self, status_code):
+        """True, wenn eine Antwort mit diesem Statuscode wiederholt werden darf."""
+        return status_code in RETRY_STATUS_CODES
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Wartezeit vor dem nächsten Versuch.
+
+        Args:
+            attempt (int): Anzahl bisheriger Fehlversuche (ab 0)
+            retry_after (str): Wert des Retry-After-Headers, falls vorhanden
+
+        Returns:
+            float: Sekunden oder None, wenn nicht mehr wiederholt werden soll
+        """
+        if attempt >= self.max_retries:
+            return None
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return requested if requested <= self.max_retry_after else None
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
@@ -0,0 +1,59 @@
+"""
+Parser für Server-Sent Events (/events/curated-trends).
+"""
+
+import json
+from collections import namedtuple
+
+Event = namedtuple("Event", ["event", "data", "id"])
+
+
+class SSEParser:
+    """
+    Setzt Ereignisse Zeile für Zeile zusammen (siehe WHATWG HTML, Abschnitt Server-Sent Events).
+
+    JSON-Nutzdaten werden dekodiert; Kommentare (Heartbeats) und retry-Felder werden ignoriert.
+    """
+
+    def __init__(self):
+        self._event = None
+        self._data = []
+        self._id = None
+        self.last_event_id = None
+
+    def feed(self, line):
+        """
+        Verarbeitet eine Zeile ohne Zeilenumbruch.
+
+        Returns:
+            Event: Vollständiges Ereignis bei einer Leerzeile, sonst None
+        """
+        if line == "":
+            return self._dispatch()
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "event":
+            self._event = value
+        elif field == "data":
+            self._data.append(value)
+        elif field == "id":
+            self._id = value
+        return None
+
+    def _dispatch(self):
+        if not self._data:
+            self._event = None
+            return None
+        raw = "\n".join(self._data)
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = raw
+        event = Event(self._event or "message", data, self._id)
+        if self._id is not None:
+            self.last_event_id = self._id
+        self._event, self._data, self._id = None, [], None
+        return event
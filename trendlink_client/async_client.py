@@ -0,0 +1,179 @@
+"""
+Asynchroner Client (asyncio) für die Chatbot-API.
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from trendlink_client._base import (
+    DEFAULT_BASE_URL, ClientConfig, JobTimeout, job_payload, job_result, raise_for_status
+)
+from trendlink_client._sse import SSEParser
+from trendlink_client.sync_client import MAX_POLL_WAIT
+
+
+class AsyncChatClient:
+    """
+    Asynchroner Client für den Trendlink AI Chatbot auf Basis von httpx.AsyncClient.
+
+    Gleiche Schnittstelle wie ChatClient, alle Methoden sind Coroutinen bzw.
+    asynchrone Generatoren.
+
+    Args:
+        base_url (str): Basis-URL des Chatbots
+        api_key (str): Optionaler API-Key (Header X-API-Key)
+        timeout (float): Timeout pro HTTP-Anfrage in Sekunden
+        max_retries (int): Wiederholungen bei 429, 5xx und Verbindungsfehlern
+        backoff (float): Basis der exponentiellen Wartezeit in Sekunden
+        max_backoff (float): Obergrenze der exponentiellen Wartezeit
+        max_connections (int): Größe des Verbindungspools
+        transport (httpx.AsyncBaseTransport): Optionaler Transport, z.B. httpx.MockTransport in Tests
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, api_key=None, timeout=30.0, max_retries=3,
+                 backoff=0.5, max_backoff=30.0, max_connections=10, transport=None):
+        self._config = ClientConfig(base_url, api_key, timeout, max_retries, backoff,
+                                    max_backoff, max_connections)
+        self._http = httpx.AsyncClient(**self._config.client_options(transport))
+        self._sleep = asyncio.sleep
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Schließt alle Verbindungen des Pools."""
+        await self._http.aclose()
+
+    async def _request(self, method, path, **kwargs):
+        retry = self._config.retry
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.request(method, path, **kwargs)
+            except httpx.TransportError:
+                delay = retry.delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                if not retry.should_retry_status(response.status_code):
+                    return response
+                delay = retry.delay(attempt, response.headers.get("Retry-After"))
+                if delay is None:
+                    return response
+            attempt += 1
+            await self._sleep(delay)
+
+    async def chat(self, message):
+        """
+        Sendet eine Nachricht an /chat und wartet auf die Antwort.
+
+        Returns:
+            dict: JSON-Antwort mit response, query_type, has_trend_data usw.
+
+        Raises:
+            TrendlinkClientError: Bei einem Fehlerstatus nach allen Wiederholungen
+            httpx.TransportError: Wenn der Server nicht erreichbar bleibt
+        """
+        response = await self._request("POST", "/chat", json={"message": message})
+        raise_for_status(response)
+        return response.json()
+
+    async def chat_many(self, messages, concurrency=8, return_exceptions=False):
+        """
+        Sendet viele Nachrichten mit höchstens `concurrency` gleichzeitigen Anfragen.
+
+        Es laufen genau `concurrency` Worker-Tasks, die sich die Nachrichten nacheinander
+        aus dem Iterable holen; auch sehr lange Listen erzeugen so keine Task pro Nachricht.
+
+        Args:
+            messages (iterable): Nachrichten
+            concurrency (int): Maximale Anzahl gleichzeitiger Anfragen
+            return_exceptions (bool): Fehler als Ergebnis liefern statt sie zu werfen
+
+        Returns:
+            list: Antworten (oder Exceptions) in der Reihenfolge der Nachrichten
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency muss mindestens 1 sein")
+        source = enumerate(messages)
+        results = {}
+
+        async def worker():
+            for index, message in source:
+                try:
+                    results[index] = await self.chat(message)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results[index] = e
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [results[index] for index in range(len(results))]
+
+    async def submit(self, message):
+        """
+        Nimmt eine Nachricht im Job-Modus an (POST /chat mit "async": true).
+
+        Returns:
+            str: Job-ID
+        """
+        response = await self._request("POST", "/chat", json=job_payload(message))
+        raise_for_status(response)
+        return response.json()["job_id"]
+
+    async def wait_for_job(self, job_id, timeout=120.0):
+        """
+        Wartet per Long-Poll auf das Ergebnis eines Chat-Jobs.
+
+        Returns:
+            dict: Antwort wie bei chat()
+
+        Raises:
+            JobTimeout: Wenn der Job nach timeout Sekunden noch läuft
+            TrendlinkClientError: Wenn der Job unbekannt ist oder mit Fehlerstatus endete
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = min(MAX_POLL_WAIT, max(0.0, deadline - time.monotonic()))
+            response = await self._request("GET", f"/chat/jobs/{job_id}",
+                                           params={"wait": f"{wait:.1f}"},
+                                           timeout=self._config.timeout + wait)
+            raise_for_status(response)
+            if response.status_code == 200:
+                return job_result(response.json())
+            if time.monotonic() >= deadline:
+                raise JobTimeout(f"Job {job_id} nach {timeout} Sekunden nicht abgeschlossen")
+
+    async def stream_curated_trends(self):
+        """
+        Abonniert die Änderungen der kuratierten Trends (Server-Sent Events).
+
+        Yields:
+            Event: (event, data, id) mit "snapshot" zuerst und danach "diff"-Ereignissen
+
+        Raises:
+            TrendlinkClientError: Wenn der Server das Abo ablehnt (z.B. 503)
+        """
+        timeout = httpx.Timeout(self._config.timeout, read=None)
+        async with self._http.stream("GET", "/events/curated-trends", timeout=timeout,
+                                     headers={"Accept": "text/event-stream"}) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                raise_for_status(response)
+            parser = SSEParser()
+            async for line in response.aiter_lines():
+                event = parser.feed(line)
+                if event is not None:
+                    yield event
@@ -0,0 +1,201 @@
+"""
+Synchroner Client für die Chatbot-API mit Verbindungspool.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from trendlink_client._base import (
+    DEFAULT_BASE_URL, ClientConfig, JobTimeout, job_payload, job_result, raise_for_status
+)
+from trendlink_client._sse import SSEParser
+
+# Der Server begrenzt ?wait= auf CHAT_JOB_MAX_WAIT (Standard 20 Sekunden)
+MAX_POLL_WAIT = 20.0
+
+
+class ChatClient:
+    """
+    Synchroner Client für den Trendlink AI Chatbot.
+
+    Alle Anfragen laufen über einen gemeinsamen httpx.Client, dessen Verbindungen
+    (Keep-Alive) über Threads hinweg wiederverwendet werden. 429 und 5xx werden unter
+    Beachtung von Retry-After wiederholt.
+
+    Args:
+        base_url (str): Basis-URL des Chatbots
+        api_key (str): Optionaler API-Key (Header X-API-Key)
+        timeout (float): Timeout pro HTTP-Anfrage in Sekunden
+        max_retries (int): Wiederholungen bei 429, 5xx und Verbindungsfehlern
+        backoff (float): Basis der exponentiellen Wartezeit in Sekunden
+        max_backoff (float): Obergrenze der exponentiellen Wartezeit
+        max_connections (int): Größe des Verbindungspools
+        transport (httpx.BaseTransport): Optionaler Transport, z.B. httpx.MockTransport in Tests
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, api_key=None, timeout=30.0, max_retries=3,
+                 backoff=0.5, max_backoff=30.0, max_connections=10, transport=None):
+        self._config = ClientConfig(base_url, api_key, timeout, max_retries, backoff,
+                                    max_backoff, max_connections)
+        self._http = httpx.Client(**self._config.client_options(transport))
+        self._sleep = time.sleep
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Schließt alle Verbindungen des Pools."""
+        self._http.close()
+
+    def _request(self, method, path, **kwargs):
+        retry = self._config.retry
+        attempt = 0
+        while True:
+            try:
+                response = self._http.request(method, path, **kwargs)
+            except httpx.TransportError:
+                delay = retry.delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                if not retry.should_retry_status(response.status_code):
+                    return response
+                delay = retry.delay(attempt, response.headers.get("Retry-After"))
+                if delay is None:
+                    return response
+            attempt += 1
+            self._sleep(delay)
+
+    def chat(self, message):
+        """
+        Sendet eine Nachricht an /chat und wartet auf die Antwort.
+
+        Args:
+            message (str): Die Nachricht an den Chatbot
+
+        Returns:
+            dict: JSON-Antwort mit response, query_type, has_trend_data usw.
+
+        Raises:
+            TrendlinkClientError: Bei einem Fehlerstatus nach allen Wiederholungen
+            httpx.TransportError: Wenn der Server nicht erreichbar bleibt
+        """
+        response = self._request("POST", "/chat", json={"message": message})
+        raise_for_status(response)
+        return response.json()
+
+    def iter_chat(self, messages, concurrency=8, return_exceptions=False):
+        """
+        Sendet viele Nachrichten mit höchstens `concurrency` gleichzeitigen Anfragen.
+
+        Die Nachrichten werden erst bei Bedarf aus dem Iterable gelesen; es sind nie mehr
+        als 2 * concurrency Anfragen gleichzeitig angenommen. Die Antworten erscheinen in
+        der Reihenfolge der Nachrichten.
+
+        Args:
+            messages (iterable): Nachrichten
+            concurrency (int): Maximale Anzahl gleichzeitiger Anfragen
+            return_exceptions (bool): Fehler als Ergebnis liefern statt sie zu werfen
+
+        Yields:
+            dict: Antwort (oder Exception bei return_exceptions) pro Nachricht
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency muss mindestens 1 sein")
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="trendlink-client") as pool:
+            pending = deque()
+            for message in messages:
+                pending.append(pool.submit(self.chat, message))
+                if len(pending) >= 2 * concurrency:
+                    yield self._result(pending.popleft(), return_exceptions)
+            while pending:
+                yield self._result(pending.popleft(), return_exceptions)
+
+    @staticmethod
+    def _result(future, return_exceptions):
+        if not return_exceptions:
+            return future.result()
+        try:
+            return future.result()
+        except Exception as e:
+            return e
+
+    def chat_many(self, messages, concurrency=8, return_exceptions=False):
+        """
+        Wie iter_chat, liefert aber alle Antworten als Liste.
+
+        Returns:
+            list: Antworten in der Reihenfolge der Nachrichten
+        """
+        return list(self.iter_chat(messages, concurrency, return_exceptions))
+
+    def submit(self, message):
+        """
+        Nimmt eine Nachricht im Job-Modus an (POST /chat mit "async": true).
+
+        Returns:
+            str: Job-ID; identische Anfragen erhalten die ID des laufenden Jobs
+
+        Raises:
+            TrendlinkClientError: Bei einem Fehlerstatus nach allen Wiederholungen
+        """
+        response = self._request("POST", "/chat", json=job_payload(message))
+        raise_for_status(response)
+        return response.json()["job_id"]
+
+    def wait_for_job(self, job_id, timeout=120.0):
+        """
+        Wartet per Long-Poll auf das Ergebnis eines Chat-Jobs.
+
+        Args:
+            job_id (str): Job-ID aus submit()
+            timeout (float): Maximale Wartezeit in Sekunden
+
+        Returns:
+            dict: Antwort wie bei chat()
+
+        Raises:
+            JobTimeout: Wenn der Job nach timeout Sekunden noch läuft
+            TrendlinkClientError: Wenn der Job unbekannt ist oder mit Fehlerstatus endete
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = min(MAX_POLL_WAIT, max(0.0, deadline - time.monotonic()))
+            response = self._request("GET", f"/chat/jobs/{job_id}", params={"wait": f"{wait:.1f}"},
+                                     timeout=self._config.timeout + wait)
+            raise_for_status(response)
+            if response.status_code == 200:
+                return job_result(response.json())
+            if time.monotonic() >= deadline:
+                raise JobTimeout(f"Job {job_id} nach {timeout} Sekunden nicht abgeschlossen")
+
+    def stream_curated_trends(self):
+        """
+        Abonniert die Änderungen der kuratierten Trends (Server-Sent Events).
+
+        Die Ereignisse werden gelesen, sobald sie eintreffen; der Generator endet, wenn der
+        Server die Verbindung schließt.
+
+        Yields:
+            Event: (event, data, id) mit "snapshot" zuerst und danach "diff"-Ereignissen
+
+        Raises:
+            TrendlinkClientError: Wenn der Server das Abo ablehnt (z.B. 503)
+        """
+        timeout = httpx.Timeout(self._config.timeout, read=None)
+        with self._http.stream("GET", "/events/curated-trends", timeout=timeout,
+                               headers={"Accept": "text/event-stream"}) as response:
+            if response.status_code >= 400:
+                response.read()
+                raise_for_status(response)
+            parser = SSEParser()
+            for line in response.iter_lines():
+                event = parser.feed(line)
+                if event is not None:
+                    yield event
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Upstream HTTP Modul
+
+Gemeinsame requests.Session mit Verbindungspool für alle Aufrufe der Trendlink API.
+Bisher öffnete jeder requests.get-Aufruf eine neue TCP- und TLS-Verbindung; über die
+Session werden Verbindungen per Keep-Alive wiederverwendet.
+
+Die Session gehört dem Prozess, der sie erzeugt hat: nach einem Fork (Gunicorn lädt den
+Katalog im Master vor) legt jeder Worker beim ersten Aufruf eine eigene Session an, damit
+sich Master und Worker keine Sockets teilen.
+"""
+
+import os
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Anzahl der Hosts, für die ein eigener Pool gehalten wird
+UPSTREAM_POOL_HOSTS = int(os.getenv("UPSTREAM_POOL_HOSTS", "4"))
+# Maximale Anzahl offener Verbindungen pro Host (sollte GUNICORN_THREADS nicht unterschreiten)
+UPSTREAM_POOL_SIZE = int(os.getenv("UPSTREAM_POOL_SIZE", "10"))
+
+_lock = threading.Lock()
+_session = None
+_session_pid = None
+
+
+def _create_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=UPSTREAM_POOL_HOSTS, pool_maxsize=UPSTREAM_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Liefert die Session dieses Prozesses und legt sie bei Bedarf (auch nach einem Fork) an.
+
+    Returns:
+        requests.Session: Session mit Verbindungspool
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = _create_session()
+                _session_pid = pid
+                logger.info(f"Upstream-Session angelegt (PID {pid}, {UPSTREAM_POOL_SIZE} Verbindungen pro Host)")
+    return _session
+
+
+def pool_stats():
+    """
+    Liefert den Zustand der Verbindungspools dieses Prozesses.
+
+    Returns:
+        dict: pid und pro Host erzeugte Verbindungen, gesendete Anfragen, freie
+            Verbindungen im Pool und Poolgröße
+    """
+    session = _session if _session_pid == os.getpid() else None
+    if session is None:
+        return {"pid": os.getpid(), "session": False, "pools": {}}
+
+    pools = {}
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        manager = adapter.poolmanager
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            pools[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections_created": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle": idle,
+                "maxsize": pool.pool.maxsize if pool.pool else 0,
+            }
+    return {"pid": os.getpid(), "session": True, "pools": pools}
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Usage Accounting Modul
+
+Erfasst für jeden OpenAI-Aufruf Modell, Prompt- und Completion-Tokens, Latenz und
+Time-to-first-Token und aggregiert die Werte pro query_type (z.B. "curated_trends").
+Die Kennzahlen werden über /metrics/openai ausgegeben; zusätzlich kann jeder Aufruf
+als JSON-Zeile in ein rotierendes lokales Log geschrieben werden (OPENAI_USAGE_LOG).
+
+Die Completions werden nicht gestreamt, daher wird die Time-to-first-Token derzeit
+nicht gemessen: "ttft" ist null und die Aufrufe fließen nicht in ttft_p50/ttft_p95 ein.
+Das Feld ist für einen späteren Streaming-Modus vorgesehen.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+import contextvars
+import logging.handlers
+from collections import defaultdict, deque
+
+from latency import LatencyTracker
+
+# Logger konfigurieren
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pfad des rotierenden Nutzungs-Logs (leer = kein Log)
+OPENAI_USAGE_LOG = os.getenv("OPENAI_USAGE_LOG", "")
+OPENAI_USAGE_LOG_MAX_BYTES = int(os.getenv("OPENAI_USAGE_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+OPENAI_USAGE_LOG_BACKUPS = int(os.getenv("OPENAI_USAGE_LOG_BACKUPS", "5"))
+# Anzahl der letzten Aufrufe, die über den Endpunkt abrufbar sind
+OPENAI_USAGE_RECENT = int(os.getenv("OPENAI_USAGE_RECENT", "50"))
+
+# Preise in USD pro 1000 Tokens als "modell:prompt:completion", kommagetrennt
+OPENAI_PRICES = os.getenv("OPENAI_PRICES", "gpt-4:0.03:0.06,gpt-3.5-turbo:0.0005:0.0015")
+
+
+def _parse_prices(value):
+    """Liest die Preistabelle aus OPENAI_PRICES."""
+    prices = {}
+    for entry in value.split(","):
+        parts = entry.strip().split(":")
+        if len(parts) != 3:
+            continue
+        try:
+            prices[parts[0]] = (float(parts[1]), float(parts[2]))
+        except ValueError:
+            logger.warning(f"Ungültiger Eintrag in OPENAI_PRICES: {entry}")
+    return prices
+
+
+_prices = _parse_prices(OPENAI_PRICES)
+
+# query_type der laufenden Anfrage; wird von get_gpt_response gesetzt
+_query_type = contextvars.ContextVar("openai_query_type", default=None)
+
+
+def set_query_type(query_type):
+    """
+    Setzt den query_type, dem die folgenden OpenAI-Aufrufe zugeordnet werden.
+
+    Returns:
+        contextvars.Token: Token für reset_query_type()
+    """
+    return _query_type.set(query_type)
+
+
+def reset_query_type(token):
+    """Stellt den vorherigen query_type wieder her."""
+    _query_type.reset(token)
+
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """
+    Schätzt die Kosten eines Aufrufs anhand der Preistabelle.
+
+    Returns:
+        float: Kosten in USD oder None, wenn für das Modell kein Preis hinterlegt ist
+    """
+    price = _prices.get(model)
+    if price is None:
+        return None
+    return (prompt_tokens * price[0] + completion_tokens * price[1]) / 1000
+
+
+class _Aggregate:
+    """Summen und Latenzen eines query_type."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.models = defaultdict(int)
+        self.latency = LatencyTracker()
+        self.ttft = LatencyTracker()
+
+    def add(self, record):
+        self.calls += 1
+        self.models[record["model"]] += 1
+        if not record["ok"]:
+            self.errors += 1
+        self.prompt_tokens += record["prompt_tokens"]
+        self.completion_tokens += record["completion_tokens"]
+        self.cost += record["cost"] or 0.0
+        self.latency.record(record["latency"], ok=record["ok"])
+        if record["ok"] and record["ttft"] is not None:
+            self.ttft.record(record["ttft"])
+
+    def snapshot(self):
+        successful = self.calls - self.errors
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "models": dict(self.models),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / successful, 1) if successful else None,
+            "avg_completion_tokens": round(self.completion_tokens / successful, 1) if successful else None,
+            "estimated_cost_usd": round(self.cost, 4),
+            "latency_p50": self.latency.percentile(50),
+            "latency_p95": self.latency.percentile(95),
+            "ttft_p50": self.ttft.percentile(50),
+            "ttft_p95": self.ttft.percentile(95),
+        }
+
+
+class UsageAccountant:
+    """Sammelt die Nutzungsdaten aller OpenAI-Aufrufe eines Prozesses."""
+
+    def __init__(self, log_path=None):
+        self._lock = threading.Lock()
+        self._by_query_type = defaultdict(_Aggregate)
+        self._recent = deque(maxlen=OPENAI_USAGE_RECENT)
+        self._log = self._create_log(OPENAI_USAGE_LOG if log_path is None else log_path)
+
+    @staticmethod
+    def _create_log(path):
+        """Richtet das rotierende JSON-Lines-Log ein (None, wenn kein Pfad gesetzt ist)."""
+        if not path:
+            return None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        usage_log = logging.getLogger(f"{__name__}.log.{path}")
+        usage_log.propagate = False
+        usage_log.setLevel(logging.INFO)
+        if not usage_log.handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                path, maxBytes=OPENAI_USAGE_LOG_MAX_BYTES, backupCount=OPENAI_USAGE_LOG_BACKUPS,
+                encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            usage_log.addHandler(handler)
+        return usage_log
+
+    def record(self, model, latency, prompt_tokens=0, completion_tokens=0, ttft=None, ok=True,
+               query_type=None):
+        """
+        Erfasst einen OpenAI-Aufruf.
+
+        Args:
+            model (str): Verwendetes Modell
+            latency (float): Gesamtdauer in Sekunden
+            prompt_tokens (int): Tokens des Prompts laut usage-Block
+            completion_tokens (int): Tokens der Antwort laut usage-Block
+            ttft (float): Gemessene Time-to-first-Token in Sekunden oder None, wenn nicht gemessen
+            ok (bool): False bei einem fehlgeschlagenen Aufruf
+            query_type (str): Zuordnung (Standard: query_type der laufenden Anfrage)
+
+        Returns:
+            dict: Der erfasste Datensatz
+        """
+        record = {
+            "ts": round(time.time(), 3),
+            "query_type": query_type or _query_type.get() or "unknown",
+            "model": model,
+            "ok": ok,
+            "prompt_tokens": prompt_tokens or 0,
+            "completion_tokens": completion_tokens or 0,
+            "latency": round(latency, 4),
+            "ttft": round(ttft, 4) if ttft is not None else None,
+            "cost": estimate_cost(model, prompt_tokens or 0, completion_tokens or 0),
+        }
+        with self._lock:
+            self._by_query_type[record["query_type"]].add(record)
+            self._recent.append(record)
+        if self._log is not None:
+            self._log.info(json.dumps(record, separators=(",", ":")))
+        return record
+
+    def snapshot(self):
+        """
+        Liefert die Kennzahlen pro query_type und die letzten Aufrufe.
+
+        Returns:
+            dict: "query_types" mit Aggregaten und "recent" mit den letzten Datensätzen
+        """
+        with self._lock:
+            return {
+                "query_types": {name: aggregate.snapshot()
+                                for name, aggregate in sorted(self._by_query_type.items())},
+                "recent": list(self._recent),
+            }
+
+
+# Prozessweite Erfassung
+_accountant = UsageAccountant()
+
+
+def get_accountant():
+    """
+    Liefert die prozessweite Nutzungserfassung.
+
+    Returns:
+        UsageAccountant: Die Erfassung
+    """
+    return _accountant